@@ -6,7 +6,7 @@ This script synchronizes market data from OpenBB Platform to local storage.
 It can be run manually or scheduled via cron/Task Scheduler.
 
 Usage:
-    python sync_market_data.py [--symbols AAPL,MSFT] [--days 30]
+    python sync_market_data.py [--symbols AAPL,MSFT] [--days 30] [--format json|store]
 """
 
 import argparse
@@ -18,7 +18,9 @@ from typing import List, Optional
 import json
 
 # Add parent directory to path to import backend modules
-sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+TRADING_BRIDGE_PATH = os.path.join(REPO_ROOT, 'trading-bridge', 'python')
 
 from backend.services.openbb_service import OpenBBService
 
@@ -34,21 +36,69 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def use_trading_bridge():
+    """Make the trading bridge's modules importable"""
+    if TRADING_BRIDGE_PATH not in sys.path:
+        sys.path.insert(0, TRADING_BRIDGE_PATH)
+
+
+def open_candle_store(path: str):
+    """Open the trading bridge's columnar candle store at path"""
+    use_trading_bridge()
+    from market_data.candle_store import CandleStore
+    return CandleStore(path)
+
+
+def to_daily_candles(data) -> List[dict]:
+    """
+    Daily candles from an OpenBB historical response
+    
+    Args:
+        data: List of bar records, or a dict holding them under 'results' or 'data'
+        
+    Returns:
+        Candles sorted by time, one per timestamp (dates, datetimes and
+        epoch numbers compared as instants, as CandleStore.append does)
+    """
+    use_trading_bridge()
+    from market_data.timestamps import to_millis
+    
+    records = data.get('results', data.get('data', [])) if isinstance(data, dict) else data
+    candles = {}
+    for record in records:
+        timestamp = record.get('date') or record.get('timestamp')
+        candle = {
+            'timestamp': timestamp,
+            'open': record['open'],
+            'high': record['high'],
+            'low': record['low'],
+            'close': record['close']
+        }
+        if record.get('volume') is not None:
+            candle['volume'] = record['volume']
+        candles[to_millis(timestamp)] = candle
+    return [candles[key] for key in sorted(candles)]
+
+
 class MarketDataSynchronizer:
     """
     Synchronizes market data from OpenBB to local storage
     """
     
-    def __init__(self, openbb_service: OpenBBService, output_dir: str = "data/market"):
+    def __init__(self, openbb_service: OpenBBService, output_dir: str = "data/market",
+                 candle_store=None):
         """
         Initialize synchronizer
         
         Args:
             openbb_service: OpenBB service instance
             output_dir: Directory to store synchronized data
+            candle_store: CandleStore to append daily bars to instead of
+                writing a JSON file per symbol (see open_candle_store)
         """
         self.service = openbb_service
         self.output_dir = output_dir
+        self.candle_store = candle_store
         
         # Create output directory if it doesn't exist
         os.makedirs(output_dir, exist_ok=True)
@@ -90,20 +140,29 @@ class MarketDataSynchronizer:
                     end_date=end_date.strftime('%Y-%m-%d')
                 )
                 
-                # Save to file
-                output_file = os.path.join(
-                    self.output_dir,
-                    f"{symbol}_{datetime.now().strftime('%Y%m%d')}.json"
-                )
-                
-                with open(output_file, 'w') as f:
-                    json.dump(data, f, indent=2)
+                if self.candle_store is not None:
+                    # Append only the days not stored yet
+                    candles = to_daily_candles(data)
+                    added = self.candle_store.append(symbol, "D1", candles)
+                    output_file = str(self.candle_store.root / symbol / "D1")
+                    records = len(candles)
+                else:
+                    # Save to file
+                    output_file = os.path.join(
+                        self.output_dir,
+                        f"{symbol}_{datetime.now().strftime('%Y%m%d')}.json"
+                    )
+                    
+                    with open(output_file, 'w') as f:
+                        json.dump(data, f, indent=2)
+                    added = records = len(data) if isinstance(data, list) else 1
                 
                 results["symbols"].append({
                     "symbol": symbol,
                     "status": "success",
                     "file": output_file,
-                    "records": len(data) if isinstance(data, list) else 1
+                    "records": records,
+                    "added": added
                 })
                 
                 results["success_count"] += 1
@@ -244,6 +303,19 @@ def main():
         action='store_true',
         help='Also sync market overview data'
     )
+    parser.add_argument(
+        '--format',
+        choices=['json', 'store'],
+        default='json',
+        help='json: one JSON file per symbol per day; store: append daily bars to the '
+             'columnar candle store (default: json)'
+    )
+    parser.add_argument(
+        '--store-dir',
+        type=str,
+        default=os.path.join(REPO_ROOT, 'trading-bridge', 'data', 'candles'),
+        help='Candle store directory for --format store'
+    )
     
     args = parser.parse_args()
     
@@ -270,7 +342,8 @@ def main():
     logger.info("✓ OpenBB service is healthy")
     
     # Initialize synchronizer
-    synchronizer = MarketDataSynchronizer(service)
+    candle_store = open_candle_store(args.store_dir) if args.format == 'store' else None
+    synchronizer = MarketDataSynchronizer(service, candle_store=candle_store)
     
     # Sync stock data
     stock_results = synchronizer.sync_stock_data(symbols, args.days)
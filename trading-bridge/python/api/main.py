@@ -69,9 +69,18 @@ async def lifespan(app: FastAPI):
         # Get bridge configuration from environment
         bridge_port = int(os.getenv("BRIDGE_PORT", "5500"))
         bridge_host = os.getenv("BRIDGE_HOST", "127.0.0.1")
+        bridge_transport = os.getenv("BRIDGE_TRANSPORT", "REP")
+        bridge_pub_port = os.getenv("BRIDGE_PUB_PORT")
+        bridge_journal_path = os.getenv("BRIDGE_JOURNAL_PATH")
         
-        logger.info(f"Initializing MQL5 bridge on {bridge_host}:{bridge_port}")
-        bridge = MQL5Bridge(port=bridge_port, host=bridge_host)
+        logger.info(f"Initializing MQL5 bridge on {bridge_host}:{bridge_port} ({bridge_transport})")
+        bridge = MQL5Bridge(
+            port=bridge_port,
+            host=bridge_host,
+            transport=bridge_transport,
+            pub_port=int(bridge_pub_port) if bridge_pub_port else None,
+            journal_path=bridge_journal_path or None
+        )
         
         # Start bridge in background thread
         import threading
@@ -127,8 +136,15 @@ class HealthResponse(BaseModel):
 class BridgeStatusResponse(BaseModel):
     """Bridge status response"""
     connection_status: str
+    transport: Optional[str] = None
+    clients: Optional[List[Dict[str, Any]]] = None
     queue_size: int
+    queue_lanes: Optional[Dict[str, Dict[str, int]]] = None
     stats: Dict[str, int]
+    latency: Optional[Dict[str, Any]] = None
+    dedup: Optional[Dict[str, Any]] = None
+    journal: Optional[Dict[str, Any]] = None
+    push: Optional[Dict[str, Any]] = None
     last_heartbeat: Optional[str]
 
 
@@ -0,0 +1,20 @@
+"""Backtesting package"""
+from market_data.resampler import TimeframeAggregator
+
+from .data import read_bars, read_csv_bars, read_parquet_bars
+from .engine import Backtester, BacktestResult, Trade
+from .optimizer import MarketFeatures, OptimizationReport, StrategyOptimizer, WalkForwardReport
+
+__all__ = [
+    'Backtester',
+    'BacktestResult',
+    'Trade',
+    'StrategyOptimizer',
+    'MarketFeatures',
+    'OptimizationReport',
+    'WalkForwardReport',
+    'TimeframeAggregator',
+    'read_bars',
+    'read_csv_bars',
+    'read_parquet_bars'
+]
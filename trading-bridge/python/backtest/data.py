@@ -0,0 +1,137 @@
+"""
+Backtest Bar Sources
+Streams OHLCV bars from CSV or Parquet files
+"""
+
+import csv
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Union
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional - only needed for Parquet files
+    pq = None
+
+# Accepted column names (lower case) for each bar field
+_COLUMN_ALIASES = {
+    'timestamp': ('timestamp', 'time', 'datetime', 'date'),
+    'open': ('open', 'o'),
+    'high': ('high', 'h'),
+    'low': ('low', 'l'),
+    'close': ('close', 'c'),
+    'volume': ('volume', 'tick_volume', 'tickvol', 'vol', 'v')
+}
+
+
+def parse_timestamp(value) -> datetime:
+    """
+    Parse a bar timestamp
+
+    Accepts datetimes, epoch seconds or milliseconds (as numbers or digit
+    strings, read as UTC and returned naive), ISO 8601 strings and MT5 export
+    strings such as '2024.01.02 10:05'.
+
+    Args:
+        value: Raw timestamp
+
+    Returns:
+        datetime
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.strip().isdigit()):
+        seconds = float(value)
+        if seconds > 1e11:  # milliseconds
+            seconds /= 1000
+        return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(tzinfo=None)
+    text = str(value).strip()
+    if text[4:5] == '.':  # MT5 style 2024.01.02
+        text = text.replace('.', '-', 2)
+    return datetime.fromisoformat(text)
+
+
+def _header_map(fieldnames: List[str]) -> Dict[str, str]:
+    """Map bar fields to the file's column names"""
+    columns = {name.strip().strip('<>').lower(): name for name in fieldnames}
+    mapping = {}
+    for field, aliases in _COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in columns:
+                mapping[field] = columns[alias]
+                break
+    # MT5 exports split the timestamp into <DATE> and <TIME>
+    if 'date' in columns and 'time' in columns and mapping['timestamp'] in (columns['date'], columns['time']):
+        mapping['timestamp'] = columns['date']
+        mapping['time_of_day'] = columns['time']
+    missing = [f for f in ('timestamp', 'open', 'high', 'low', 'close') if f not in mapping]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+    return mapping
+
+
+def read_csv_bars(path: Union[str, Path]) -> Iterator[Dict]:
+    """
+    Stream bars from a CSV file (comma, semicolon or tab separated)
+
+    Args:
+        path: CSV file with a header row
+
+    Yields:
+        Bar dicts with timestamp, open, high, low, close and volume (if present)
+    """
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        sample = f.readline()
+        f.seek(0)
+        delimiter = max(',;\t', key=sample.count)
+        reader = csv.DictReader(f, delimiter=delimiter)
+        mapping = _header_map(reader.fieldnames or [])
+        ts_col = mapping['timestamp']
+        tod_col = mapping.get('time_of_day')
+        o, h, l, c = mapping['open'], mapping['high'], mapping['low'], mapping['close']
+        v = mapping.get('volume')
+        for row in reader:
+            raw = row[ts_col] if tod_col is None else f"{row[ts_col]} {row[tod_col]}"
+            bar = {
+                'timestamp': parse_timestamp(raw),
+                'open': float(row[o]),
+                'high': float(row[h]),
+                'low': float(row[l]),
+                'close': float(row[c])
+            }
+            if v is not None and row[v] != '':
+                bar['volume'] = float(row[v])
+            yield bar
+
+
+def read_parquet_bars(path: Union[str, Path], batch_size: int = 65536) -> Iterator[Dict]:
+    """
+    Stream bars from a Parquet file, one record batch at a time
+
+    Args:
+        path: Parquet file
+        batch_size: Rows read per batch
+
+    Yields:
+        Bar dicts with timestamp, open, high, low, close and volume (if present)
+    """
+    if pq is None:
+        raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow)")
+    parquet = pq.ParquetFile(str(path))
+    mapping = _header_map(parquet.schema_arrow.names)
+    fields = ['timestamp', 'open', 'high', 'low', 'close'] + (['volume'] if 'volume' in mapping else [])
+    columns = [mapping[f] for f in fields]
+    for batch in parquet.iter_batches(batch_size=batch_size, columns=columns):
+        data = batch.to_pydict()
+        for values in zip(*(data[col] for col in columns)):
+            bar = dict(zip(fields, values))
+            bar['timestamp'] = parse_timestamp(bar['timestamp'])
+            yield bar
+
+
+def read_bars(path: Union[str, Path]) -> Iterator[Dict]:
+    """Stream bars from a .csv/.txt or .parquet file"""
+    if Path(path).suffix.lower() in ('.parquet', '.pq'):
+        return read_parquet_bars(path)
+    return read_csv_bars(path)
+
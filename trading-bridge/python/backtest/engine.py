@@ -0,0 +1,388 @@
+"""
+Event-Driven Backtester
+Replays bars through SMCStrategy and RiskCalculator and simulates fills
+"""
+
+import time
+from array import array
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from market_data.resampler import TimeframeAggregator
+from risk.risk_calculator import RiskCalculator
+from strategies.smc_strategy import SMCStrategy
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional - drawdown falls back to a loop
+    np = None
+
+
+@dataclass
+class Trade:
+    """Closed backtest trade"""
+    direction: str
+    entry_time: datetime
+    entry_price: float
+    exit_time: datetime
+    exit_price: float
+    lot_size: float
+    stop_loss: float
+    take_profit: float
+    pnl: float
+    exit_reason: str  # 'stop_loss', 'take_profit' or 'end_of_data'
+
+
+@dataclass
+class BacktestResult:
+    """Backtest output: trades, equity curve and statistics"""
+    symbol: str
+    initial_balance: float
+    final_balance: float
+    bars: int
+    trades: List[Trade]
+    equity: array         # equity at every bar close
+    equity_times: array   # bar timestamps (epoch seconds)
+    rejected: Dict[str, int]
+    elapsed: float
+
+    def max_drawdown(self) -> Tuple[float, float]:
+        """
+        Largest peak-to-trough equity decline
+
+        Returns:
+            Tuple of (drawdown in account currency, drawdown in percent of the peak)
+        """
+        if not self.equity:
+            return 0.0, 0.0
+        if np is not None:
+            equity = np.frombuffer(self.equity, dtype=np.float64)
+            peaks = np.maximum.accumulate(equity)
+            drawdown = peaks - equity
+            worst = int(drawdown.argmax())
+            return float(drawdown[worst]), float(drawdown[worst] / peaks[worst] * 100) if peaks[worst] else 0.0
+        peak = float('-inf')
+        worst = worst_pct = 0.0
+        for value in self.equity:
+            peak = max(peak, value)
+            if peak - value > worst:
+                worst = peak - value
+                worst_pct = worst / peak * 100 if peak else 0.0
+        return worst, worst_pct
+
+    def summary(self) -> Dict:
+        """
+        Trade statistics
+
+        Returns:
+            Dictionary of performance figures
+        """
+        pnls = [t.pnl for t in self.trades]
+        wins = [p for p in pnls if p > 0]
+        losses = [p for p in pnls if p <= 0]
+        gross_profit = sum(wins)
+        gross_loss = -sum(losses)
+        streak = max_streak = 0
+        for pnl in pnls:
+            streak = streak + 1 if pnl <= 0 else 0
+            max_streak = max(max_streak, streak)
+        drawdown, drawdown_pct = self.max_drawdown()
+        net = self.final_balance - self.initial_balance
+        return {
+            'symbol': self.symbol,
+            'bars': self.bars,
+            'trades': len(pnls),
+            'wins': len(wins),
+            'losses': len(losses),
+            'win_rate': len(wins) / len(pnls) * 100 if pnls else 0.0,
+            'net_profit': net,
+            'return_pct': net / self.initial_balance * 100 if self.initial_balance else 0.0,
+            'gross_profit': gross_profit,
+            'gross_loss': gross_loss,
+            'profit_factor': gross_profit / gross_loss if gross_loss else None,
+            'average_win': gross_profit / len(wins) if wins else 0.0,
+            'average_loss': -gross_loss / len(losses) if losses else 0.0,
+            'expectancy': sum(pnls) / len(pnls) if pnls else 0.0,
+            'largest_win': max(wins, default=0.0),
+            'largest_loss': min(losses, default=0.0),
+            'max_consecutive_losses': max_streak,
+            'max_drawdown': drawdown,
+            'max_drawdown_pct': drawdown_pct,
+            'recovery_factor': net / drawdown if drawdown else None,
+            'final_balance': self.final_balance,
+            'rejected_signals': dict(self.rejected),
+            'elapsed_seconds': self.elapsed,
+            'bars_per_minute': self.bars / self.elapsed * 60 if self.elapsed else 0.0
+        }
+
+    def trades_as_dicts(self) -> List[Dict]:
+        """Trades as plain dictionaries (e.g. for JSON or CSV export)"""
+        return [asdict(t) for t in self.trades]
+
+
+class Backtester:
+    """
+    Event-driven backtester for SMCStrategy
+
+    Entry-timeframe (M5) bars are streamed one at a time; M15 and H1 bars are
+    built from them as they close. After every bar the strategy is asked for
+    an entry signal with the closed bars only, and a signal is filled at the
+    next bar's open. Its structure tracker and indicators keep their state
+    between bars, so each bar costs the same however long the run is.
+
+    Fills:
+    - Prices are bid prices; buys pay the spread on entry, sells on exit
+    - Slippage is charged against every fill
+    - Stops and targets are checked on each bar's high/low; when both are
+      touched in the same bar the stop is assumed to fill first
+    - A bar opening beyond the stop or target fills at the open
+
+    Position size comes from RiskCalculator.calculate_position_sizing and
+    every entry must pass RiskCalculator.validate_risk_limits (open positions,
+    daily loss).
+    """
+
+    def __init__(self, symbol: str, strategy: Optional[SMCStrategy] = None,
+                 risk_calculator: Optional[RiskCalculator] = None,
+                 initial_balance: float = 10000.0, risk_percent: float = 1.0,
+                 spread_pips: float = 1.0, slippage_pips: float = 0.0,
+                 commission_per_lot: float = 0.0, tp_ratio: float = 2.0,
+                 max_positions: int = 1, min_lot: float = 0.01, max_lot: float = 10.0,
+                 min_confidence: float = 0.0, base_minutes: int = 5, window: int = 1000):
+        """
+        Initialize Backtester
+
+        Args:
+            symbol: Trading symbol (selects pip size and value)
+            strategy: Strategy to test (default: SMCStrategy with default config)
+            risk_calculator: Position sizing and risk limits (default: RiskCalculator())
+            initial_balance: Starting balance
+            risk_percent: Risk per trade in percent of balance
+            spread_pips: Bid/ask spread
+            slippage_pips: Adverse slippage per fill
+            commission_per_lot: Round-turn commission per lot
+            tp_ratio: Risk-reward ratio for signals without a take profit
+            max_positions: Open positions allowed at once for the symbol
+            min_lot: Minimum lot size
+            max_lot: Maximum lot size
+            min_confidence: Signals with a lower confidence are not traded
+            base_minutes: Timeframe of the bars fed to run()
+            window: Bars kept per timeframe for the strategy
+        """
+        self.symbol = symbol
+        self.strategy = strategy or SMCStrategy()
+        self.risk = risk_calculator or RiskCalculator()
+        self.initial_balance = initial_balance
+        self.risk_percent = risk_percent
+        self.commission_per_lot = commission_per_lot
+        self.tp_ratio = tp_ratio
+        self.max_positions = max_positions
+        self.min_lot = min_lot
+        self.max_lot = max_lot
+        self.min_confidence = min_confidence
+        self.base_minutes = base_minutes
+        self.window = window
+
+        symbol_type = self.risk.get_symbol_type(symbol)
+        self.pip_size = self.risk.pip_values.get(symbol_type, 0.0001)
+        self.pip_value = self.risk.pip_value_per_lot.get(symbol_type, 10.0)
+        self.spread = spread_pips * self.pip_size
+        self.slippage = slippage_pips * self.pip_size
+
+    def run(self, bars: Iterable[Dict]) -> BacktestResult:
+        """
+        Replay bars through the strategy
+
+        Args:
+            bars: Closed entry-timeframe OHLCV bars in time order (e.g. read_bars(path))
+
+        Returns:
+            BacktestResult
+        """
+        strategy, symbol = self.strategy, self.symbol
+        # Own series, started fresh: live state of the same symbol is left alone
+        # and a second run is not mistaken for bars the strategy has already seen
+        series = "BACKTEST"
+        strategy.reset_state(symbol, series)
+        m15_builder = TimeframeAggregator(15, self.base_minutes)
+        h1_builder = TimeframeAggregator(60, self.base_minutes)
+        h1: List[Dict] = []
+        m15: List[Dict] = []
+        m5: List[Dict] = []
+        limit = 2 * self.window
+
+        def next_signal(index: int, bar: Dict) -> Optional[Dict]:
+            m5.append(bar)
+            m15.extend(m15_builder.update(bar))
+            h1.extend(h1_builder.update(bar))
+            if len(m5) > limit:
+                del m5[:-self.window]
+            if len(m15) > limit:
+                del m15[:-self.window]
+            if len(h1) > limit:
+                del h1[:-self.window]
+            if h1 and m15:
+                return strategy.calculate_entry_signal(symbol, h1, m15, m5, series=series)
+            return None
+
+        return self.simulate(bars, next_signal)
+
+    def simulate(self, bars: Iterable[Dict], next_signal: Callable[[int, Dict], Optional[Dict]],
+                 skip_when_full: bool = False) -> BacktestResult:
+        """
+        Simulate fills, exits and equity for a stream of bars
+
+        Args:
+            bars: Closed entry-timeframe OHLCV bars in time order
+            next_signal: Called with (bar number, bar) after every bar closes;
+                returns an entry signal to fill at the next open, or None
+            skip_when_full: Don't call next_signal while max_positions are open
+                (only for signal sources that keep no state between bars)
+
+        Returns:
+            BacktestResult
+        """
+        started = time.perf_counter()
+        symbol = self.symbol
+
+        balance = self.initial_balance
+        positions: List[Dict] = []
+        trades: List[Trade] = []
+        rejected: Dict[str, int] = {}
+        equity = array('d')
+        equity_times = array('d')
+        pending: Optional[Dict] = None
+        day = None
+        day_pnl = 0.0
+        count = 0
+        bar = None
+
+        for bar in bars:
+            count += 1
+            ts = bar['timestamp']
+            if ts.date() != day:
+                day, day_pnl = ts.date(), 0.0
+
+            if pending is not None:
+                position, reason = self._open(pending, bar, balance, day_pnl, len(positions))
+                if position is not None:
+                    positions.append(position)
+                else:
+                    rejected[reason] = rejected.get(reason, 0) + 1
+                pending = None
+
+            if positions:
+                for position in list(positions):
+                    exit_price, exit_reason = self._exit_price(position, bar)
+                    if exit_price is not None:
+                        positions.remove(position)
+                        trade = self._close(position, ts, exit_price, exit_reason)
+                        trades.append(trade)
+                        balance += trade.pnl
+                        day_pnl += trade.pnl
+
+            value = balance
+            for position in positions:
+                value += self._pnl(position, self._exit_side(position, bar['close']))
+            equity.append(value)
+            equity_times.append(ts.timestamp())
+
+            if skip_when_full and len(positions) >= self.max_positions:
+                continue
+            signal = next_signal(count - 1, bar)
+            if (signal and len(positions) < self.max_positions and
+                    signal.get('confidence', 0.0) >= self.min_confidence):
+                pending = signal
+
+        for position in positions:
+            trade = self._close(position, bar['timestamp'], self._exit_side(position, bar['close']),
+                                'end_of_data')
+            trades.append(trade)
+            balance += trade.pnl
+        if positions:
+            equity[-1] = balance
+
+        return BacktestResult(
+            symbol=symbol,
+            initial_balance=self.initial_balance,
+            final_balance=balance,
+            bars=count,
+            trades=trades,
+            equity=equity,
+            equity_times=equity_times,
+            rejected=rejected,
+            elapsed=time.perf_counter() - started
+        )
+
+    def _open(self, signal: Dict, bar: Dict, balance: float, day_pnl: float,
+              open_positions: int) -> Tuple[Optional[Dict], Optional[str]]:
+        """Fill a signal at the bar's open, or return why it was rejected"""
+        direction = signal['direction']
+        if direction == 'BUY':
+            entry = bar['open'] + self.spread + self.slippage
+        else:
+            entry = bar['open'] - self.slippage
+        stop_loss = signal['stop_loss']
+        if (direction == 'BUY' and stop_loss >= entry) or (direction == 'SELL' and stop_loss <= entry):
+            return None, "Stop loss on the wrong side of the entry"
+
+        take_profit = signal.get('take_profit') or self.risk.calculate_take_profit(
+            entry, stop_loss, direction, self.tp_ratio)
+        sizing = self.risk.calculate_position_sizing(
+            self.symbol, balance, self.risk_percent, entry, stop_loss, take_profit,
+            self.min_lot, self.max_lot)
+        valid, reason = self.risk.validate_risk_limits(balance, open_positions, min(day_pnl, 0.0),
+                                                       sizing.risk_amount)
+        if not valid:
+            return None, reason.split(' (')[0]
+
+        return {
+            'direction': direction,
+            'entry_time': bar['timestamp'],
+            'entry_price': entry,
+            'stop_loss': stop_loss,
+            'take_profit': take_profit,
+            'lot_size': sizing.lot_size
+        }, None
+
+    def _exit_side(self, position: Dict, bid: float) -> float:
+        """Price a position would close at for a given bid"""
+        return bid if position['direction'] == 'BUY' else bid + self.spread
+
+    def _exit_price(self, position: Dict, bar: Dict) -> Tuple[Optional[float], Optional[str]]:
+        """Stop or target fill inside this bar, if any"""
+        stop_loss, take_profit = position['stop_loss'], position['take_profit']
+        if position['direction'] == 'BUY':
+            if bar['low'] <= stop_loss:
+                return min(bar['open'], stop_loss) - self.slippage, 'stop_loss'
+            if bar['high'] >= take_profit:
+                return max(bar['open'], take_profit) - self.slippage, 'take_profit'
+        else:
+            if bar['high'] + self.spread >= stop_loss:
+                return max(bar['open'] + self.spread, stop_loss) + self.slippage, 'stop_loss'
+            if bar['low'] + self.spread <= take_profit:
+                return min(bar['open'] + self.spread, take_profit) + self.slippage, 'take_profit'
+        return None, None
+
+    def _pnl(self, position: Dict, exit_price: float) -> float:
+        """Profit of a position closed at exit_price, after commission"""
+        move = exit_price - position['entry_price']
+        if position['direction'] == 'SELL':
+            move = -move
+        return (move / self.pip_size * self.pip_value - self.commission_per_lot) * position['lot_size']
+
+    def _close(self, position: Dict, ts: datetime, exit_price: float, reason: str) -> Trade:
+        """Turn an open position into a closed Trade"""
+        return Trade(
+            direction=position['direction'],
+            entry_time=position['entry_time'],
+            entry_price=position['entry_price'],
+            exit_time=ts,
+            exit_price=exit_price,
+            lot_size=position['lot_size'],
+            stop_loss=position['stop_loss'],
+            take_profit=position['take_profit'],
+            pnl=self._pnl(position, exit_price),
+            exit_reason=reason
+        )
@@ -0,0 +1,583 @@
+"""
+Strategy Parameter Optimizer
+Grid, random and walk-forward searches over the SMCStrategy config, run in parallel
+"""
+
+import copy
+import csv
+import itertools
+import logging
+import os
+import random
+import time
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from indicators.streaming import EMA, RSI
+from market_data.resampler import TimeframeAggregator
+from strategies.smc_strategy import SMCStrategy
+from strategies.smc_tracker import SMCStructureTracker
+
+from .engine import Backtester, BacktestResult
+
+logger = logging.getLogger(__name__)
+
+# Parameters that are Backtester arguments rather than strategy config paths
+BACKTEST_PARAMETERS = ('risk_percent', 'tp_ratio', 'min_confidence', 'max_positions',
+                       'spread_pips', 'slippage_pips', 'commission_per_lot')
+
+# Config paths that change the H1 structure; every other parameter reuses the same features
+STRUCTURE_PARAMETERS = ('smc.swing_window', 'smc.swing_symmetric')
+
+# Summary fields copied into each ranked result
+REPORT_FIELDS = ('trades', 'win_rate', 'net_profit', 'return_pct', 'profit_factor', 'expectancy',
+                 'max_drawdown_pct', 'recovery_factor', 'max_consecutive_losses')
+
+
+def apply_parameters(config: Dict, params: Dict) -> Dict:
+    """
+    Copy of a strategy config with dotted-path parameters set
+
+    Args:
+        config: Strategy config (SMCStrategy.config format)
+        params: Parameters such as {'indicators.ema_fast': 12}; Backtester
+            parameters (BACKTEST_PARAMETERS) are ignored
+
+    Returns:
+        New config dictionary
+    """
+    config = copy.deepcopy(config)
+    for name, value in params.items():
+        if name in BACKTEST_PARAMETERS:
+            continue
+        section, _, key = name.rpartition('.')
+        target = config
+        for part in section.split('.') if section else []:
+            target = target.setdefault(part, {})
+        target[key] = value
+    return config
+
+
+def valid_parameters(config: Dict) -> bool:
+    """Default constraint: fast EMA shorter than slow EMA, RSI bounds ordered"""
+    indicators = config['indicators']
+    return (indicators['ema_fast'] < indicators['ema_slow'] and
+            indicators.get('rsi_oversold', 30) < indicators.get('rsi_overbought', 70))
+
+
+def score(summary: Dict, metric: str, min_trades: int) -> float:
+    """
+    Ranking score of a backtest summary (higher is better)
+
+    Runs with fewer than min_trades trades score -inf. A profit or recovery
+    factor with nothing to divide by (no losses, no drawdown) counts as
+    infinite when the run made money.
+    """
+    if summary['trades'] < min_trades:
+        return float('-inf')
+    value = summary[metric]
+    if value is None:
+        return float('inf') if summary['net_profit'] > 0 else 0.0
+    return float(value)
+
+
+class MarketFeatures:
+    """
+    Everything about a bar series that the swept entry parameters do not change
+
+    Built once per data set (and per structure setting): the H1 structure
+    state the strategy sees after every M5 bar, and EMA/RSI series per period,
+    computed on first use and shared by every run with that period. A run
+    then only replays the entry rules and the fill simulation.
+    """
+
+    def __init__(self, bars: List[Dict], config: Optional[Dict] = None, base_minutes: int = 5):
+        """
+        Initialize MarketFeatures
+
+        Args:
+            bars: Closed M5 bars in time order
+            config: Strategy config (structure settings are taken from it)
+            base_minutes: Timeframe of the bars
+        """
+        self.bars = bars
+        self.state_index = array('l')  # per bar: index into states, -1 until H1/M15 bars exist
+        self.states: List[Optional[Tuple[Dict, Optional[Dict], int]]] = []
+        self._ema: Dict[int, array] = {}
+        self._rsi: Dict[int, array] = {}
+
+        strategy = SMCStrategy()
+        if config is not None:
+            strategy.config = config
+        tracker = SMCStructureTracker(strategy, "H1")
+        m15_builder = TimeframeAggregator(15, base_minutes)
+        h1_builder = TimeframeAggregator(60, base_minutes)
+        have_m15 = False
+        index = -1
+        for bar in bars:
+            have_m15 = have_m15 or bool(m15_builder.update(bar))
+            closed = h1_builder.update(bar)
+            for h1_bar in closed:
+                tracker.update(h1_bar)
+            if tracker.count and have_m15 and (closed or index < 0):
+                # Same inputs calculate_entry_signal reads after this bar
+                breakout = tracker.trend_breakout()
+                order_block = tracker.last_order_block
+                self.states.append((breakout, order_block and dict(order_block),
+                                    tracker.open_fvg_count()) if breakout['type'] else None)
+                index = len(self.states) - 1
+            self.state_index.append(index)
+
+    def ema(self, period: int) -> array:
+        """M5 EMA after every bar (0 before `period` bars, as SMCStrategy._calculate_ema)"""
+        series = self._ema.get(period)
+        if series is None:
+            series = self._ema[period] = self._series(EMA(period), period, 0.0)
+        return series
+
+    def rsi(self, period: int) -> array:
+        """M5 RSI after every bar (50 before `period` + 1 bars, as SMCStrategy._calculate_rsi)"""
+        series = self._rsi.get(period)
+        if series is None:
+            series = self._rsi[period] = self._series(RSI(period), period + 1, 50.0)
+        return series
+
+    def _series(self, indicator, warmup: int, default: float) -> array:
+        """Indicator value after every bar"""
+        values = array('d')
+        update = indicator.update_candle
+        for i, bar in enumerate(self.bars):
+            update(bar)
+            values.append(default if i + 1 < warmup else indicator.value)
+        return values
+
+    def prepare(self, configs: Iterable[Dict]):
+        """Compute the indicator series the given configs use (before sharing with workers)"""
+        for config in configs:
+            indicators = config['indicators']
+            self.ema(indicators['ema_fast'])
+            self.ema(indicators['ema_slow'])
+            self.rsi(indicators['rsi_period'])
+
+
+def replay(features: MarketFeatures, config: Dict, symbol: str, backtest_args: Dict,
+           start: int = 0, end: Optional[int] = None) -> BacktestResult:
+    """
+    Backtest one config over precomputed features
+
+    Gives the same trades as Backtester(symbol, SMCStrategy with config).run(bars)
+    over the whole range; a sub-range starts flat with warmed-up structure and
+    indicators.
+
+    Args:
+        features: MarketFeatures for the bars
+        config: Strategy config
+        symbol: Trading symbol
+        backtest_args: Backtester keyword arguments
+        start: First bar
+        end: Bar after the last (default: all)
+
+    Returns:
+        BacktestResult
+    """
+    strategy = SMCStrategy()
+    strategy.config = config
+    indicators = config['indicators']
+    ema_fast = features.ema(indicators['ema_fast'])
+    ema_slow = features.ema(indicators['ema_slow'])
+    rsi = features.rsi(indicators['rsi_period'])
+    bars, states, state_index = features.bars, features.states, features.state_index
+    evaluate = strategy.evaluate_entry
+
+    def next_signal(index: int, bar: Dict) -> Optional[Dict]:
+        i = start + index
+        k = state_index[i]
+        if k < 0 or states[k] is None:
+            return None
+        breakout, order_block, open_fvgs = states[k]
+        return evaluate(symbol, breakout, order_block, open_fvgs, ema_fast[i], ema_slow[i], rsi[i],
+                        bars[max(0, i - 19):i + 1])
+
+    backtester = Backtester(symbol, strategy=strategy, **backtest_args)
+    return backtester.simulate(itertools.islice(bars, start, end), next_signal, skip_when_full=True)
+
+
+@dataclass
+class OptimizationReport:
+    """Ranked optimizer results"""
+    metric: str
+    results: List[Dict]  # best first: rank, score, params and REPORT_FIELDS
+    runs: int
+    elapsed: float
+    bars: int
+
+    @property
+    def best(self) -> Optional[Dict]:
+        """Best result (None if nothing ran)"""
+        return self.results[0] if self.results else None
+
+    def table(self, top: int = 20) -> str:
+        """
+        Text table of the best results
+
+        Args:
+            top: Rows to show
+
+        Returns:
+            Formatted table
+        """
+        rows = self.results[:top]
+        names = sorted({name for row in rows for name in row['params']})
+        header = (f"{'rank':>4} {self.metric:>16} {'trades':>7} {'net':>11} {'dd %':>7} {'pf':>6}  "
+                  + "  ".join(names))
+        lines = [f"{self.runs} runs over {self.bars:,} bars in {self.elapsed:.1f}s", header,
+                 "=" * len(header)]
+        for row in rows:
+            pf = '-' if row['profit_factor'] is None else f"{row['profit_factor']:.2f}"
+            values = "  ".join(f"{row['params'].get(name, '-')!s:>{len(name)}}" for name in names)
+            lines.append(f"{row['rank']:>4} {row['score']:>16,.4g} {row['trades']:>7} "
+                         f"{row['net_profit']:>11,.2f} {row['max_drawdown_pct']:>7.2f} "
+                         f"{pf:>6}  {values}")
+        return "\n".join(lines)
+
+    def to_csv(self, path: Union[str, Path]):
+        """Write every result (one column per parameter) to a CSV file"""
+        names = sorted({name for row in self.results for name in row['params']})
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['rank', 'score'] + names + list(REPORT_FIELDS))
+            for row in self.results:
+                writer.writerow([row['rank'], row['score']] + [row['params'].get(n) for n in names]
+                                + [row[n] for n in REPORT_FIELDS])
+
+
+@dataclass
+class WalkForwardReport:
+    """Walk-forward folds: parameters chosen in-sample, results out-of-sample"""
+    metric: str
+    folds: List[Dict] = field(default_factory=list)
+    skipped: List[int] = field(default_factory=list)  # folds where no run reached min_trades
+    elapsed: float = 0.0
+
+    def summary(self) -> Dict:
+        """
+        Out-of-sample totals
+
+        Returns:
+            Dictionary of combined test figures
+        """
+        tests = [fold['test'] for fold in self.folds]
+        train_net = sum(fold['train']['net_profit'] for fold in self.folds)
+        test_net = sum(t['net_profit'] for t in tests)
+        return {
+            'folds': len(self.folds),
+            'skipped_folds': len(self.skipped),
+            'profitable_folds': sum(1 for t in tests if t['net_profit'] > 0),
+            'test_trades': sum(t['trades'] for t in tests),
+            'test_net_profit': test_net,
+            'test_return_pct': sum(t['return_pct'] for t in tests),
+            'worst_test_drawdown_pct': max((t['max_drawdown_pct'] for t in tests), default=0.0),
+            # Out-of-sample profit per bar relative to in-sample profit per bar
+            'efficiency': ((test_net / sum(f['test_bars'] for f in self.folds)) /
+                           (train_net / sum(f['train_bars'] for f in self.folds))
+                           if self.folds and train_net > 0 else None)
+        }
+
+    def table(self) -> str:
+        """Text table of the folds"""
+        header = f"{'fold':>4} {'test period':<33} {'train ' + self.metric:>18} {'test net':>11} {'trades':>7}  params"
+        lines = [header, "=" * len(header)]
+        for fold in self.folds:
+            period = f"{fold['test_start']:%Y-%m-%d %H:%M} - {fold['test_end']:%Y-%m-%d %H:%M}"
+            params = "  ".join(f"{k}={v}" for k, v in sorted(fold['params'].items()))
+            lines.append(f"{fold['fold']:>4} {period:<33} {fold['train_score']:>18,.4g} "
+                         f"{fold['test']['net_profit']:>11,.2f} {fold['test']['trades']:>7}  {params}")
+        return "\n".join(lines)
+
+
+# Per-process state for pool workers: (features by structure key, base config, symbol, backtest args)
+_worker_context: Optional[Tuple] = None
+
+
+def _init_worker(context: Tuple):
+    """Pool initializer: keep the shared features for every task"""
+    global _worker_context
+    _worker_context = context
+
+
+def _worker_run(task: Tuple) -> Dict:
+    """Run one backtest task (params, start, end) against the worker's features"""
+    features_by_key, base_config, symbol, backtest_args = _worker_context
+    params, start, end = task
+    return _run_task(features_by_key, base_config, symbol, backtest_args, params, start, end)
+
+
+def _run_task(features_by_key: Dict, base_config: Dict, symbol: str, backtest_args: Dict,
+              params: Dict, start: int, end: Optional[int]) -> Dict:
+    """Backtest summary for one parameter set"""
+    config = apply_parameters(base_config, params)
+    args = dict(backtest_args)
+    args.update((k, v) for k, v in params.items() if k in BACKTEST_PARAMETERS)
+    features = features_by_key[_structure_key(params)]
+    return replay(features, config, symbol, args, start, end).summary()
+
+
+def _structure_key(params: Dict) -> Tuple:
+    """Structure settings of a parameter set (selects its MarketFeatures)"""
+    return tuple(params.get(name) for name in STRUCTURE_PARAMETERS)
+
+
+class StrategyOptimizer:
+    """
+    Parallel parameter search for SMCStrategy
+
+    A search space maps parameter names to candidate values. Names are
+    dotted strategy config paths ('indicators.ema_fast', 'smc.order_blocks')
+    or Backtester arguments ('tp_ratio', 'risk_percent', 'min_confidence').
+
+    The H1 structure and the EMA/RSI series are computed once per data set
+    (MarketFeatures) and shared by every run, so a run costs about a quarter
+    of a full Backtester.run. Runs are spread over a process pool; each
+    worker receives the features once.
+    """
+
+    def __init__(self, bars: Iterable[Dict], symbol: str, base_config: Optional[Dict] = None,
+                 backtest_args: Optional[Dict] = None, metric: str = 'recovery_factor',
+                 min_trades: int = 10, workers: Optional[int] = None, use_processes: bool = True,
+                 base_minutes: int = 5):
+        """
+        Initialize StrategyOptimizer
+
+        Args:
+            bars: Closed M5 bars (kept in memory for the whole search)
+            symbol: Trading symbol
+            base_config: Strategy config the parameters are applied to (default: SMCStrategy default)
+            backtest_args: Fixed Backtester keyword arguments (spread_pips, commission_per_lot, ...)
+            metric: BacktestResult.summary() field to rank by (higher is better)
+            min_trades: Runs with fewer trades rank last
+            workers: Pool size (default: CPU count; 0 or 1 = run in the calling thread)
+            use_processes: Use a process pool (False = thread pool)
+            base_minutes: Timeframe of the bars
+        """
+        self.bars = list(bars)
+        self.symbol = symbol
+        self.base_config = copy.deepcopy(base_config or SMCStrategy().config)
+        self.backtest_args = dict(backtest_args or {})
+        self.backtest_args['base_minutes'] = base_minutes
+        self.metric = metric
+        self.min_trades = min_trades
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.use_processes = use_processes
+        self.base_minutes = base_minutes
+        self._features: Dict[Tuple, MarketFeatures] = {}
+
+    def features(self, params: Optional[Dict] = None) -> MarketFeatures:
+        """
+        MarketFeatures for a parameter set's structure settings (built once)
+
+        Args:
+            params: Parameter set (default: base config)
+
+        Returns:
+            MarketFeatures
+        """
+        params = params or {}
+        key = _structure_key(params)
+        features = self._features.get(key)
+        if features is None:
+            started = time.perf_counter()
+            features = MarketFeatures(self.bars, apply_parameters(self.base_config, params),
+                                      self.base_minutes)
+            self._features[key] = features
+            logger.info(f"Built features for {key} in {time.perf_counter() - started:.1f}s")
+        return features
+
+    def grid_search(self, space: Dict[str, Sequence],
+                    constraint: Optional[Callable[[Dict], bool]] = None) -> OptimizationReport:
+        """
+        Backtest every combination in the search space
+
+        Args:
+            space: Parameter name -> candidate values
+            constraint: Called with each combination's strategy config; False
+                skips it (default: valid_parameters)
+
+        Returns:
+            OptimizationReport
+        """
+        names = list(space)
+        combos = [dict(zip(names, values)) for values in itertools.product(*space.values())]
+        return self.evaluate(self._allowed(combos, constraint))
+
+    def random_search(self, space: Dict[str, Sequence], samples: int, seed: Optional[int] = None,
+                      constraint: Optional[Callable[[Dict], bool]] = None) -> OptimizationReport:
+        """
+        Backtest a random sample of distinct combinations
+
+        The grid is never built, so the space can be far larger than the
+        sample.
+
+        Args:
+            space: Parameter name -> candidate values
+            samples: Combinations to try (fewer if the space is smaller)
+            seed: Random seed
+            constraint: As for grid_search()
+
+        Returns:
+            OptimizationReport
+        """
+        return self.evaluate(self._sample(space, samples, random.Random(seed), constraint))
+
+    def walk_forward(self, space: Dict[str, Sequence], folds: int = 4, train_ratio: float = 3.0,
+                     anchored: bool = False, samples: Optional[int] = None, seed: Optional[int] = None,
+                     constraint: Optional[Callable[[Dict], bool]] = None) -> WalkForwardReport:
+        """
+        Walk-forward optimization
+
+        The bars are cut into `folds` consecutive test windows, each preceded
+        by a training window `train_ratio` times as long (rolling, or growing
+        from the first bar when anchored). The best parameters on each training
+        window are then backtested on the test window that follows it. A fold
+        where no parameter set reaches min_trades in training is skipped
+        (listed in WalkForwardReport.skipped).
+
+        Args:
+            space: Parameter name -> candidate values
+            folds: Number of test windows
+            train_ratio: Training window length in test windows
+            anchored: Training windows all start at the first bar
+            samples: Random combinations per search (default: the full grid)
+            seed: Random seed for sampling
+            constraint: As for grid_search()
+
+        Returns:
+            WalkForwardReport
+
+        Raises:
+            ValueError: If there are too few bars, or the constraint rejects
+                every combination
+        """
+        started = time.perf_counter()
+        test_bars = int(len(self.bars) / (folds + train_ratio))
+        train_bars = int(test_bars * train_ratio)
+        if test_bars < 1:
+            raise ValueError("Not enough bars for the requested folds")
+        rng = random.Random(seed)
+        if samples is None:
+            names = list(space)
+            combos = self._allowed([dict(zip(names, values))
+                                    for values in itertools.product(*space.values())], constraint)
+        report = WalkForwardReport(self.metric)
+
+        for fold in range(folds):
+            test_start = train_bars + fold * test_bars
+            test_end = test_start + test_bars if fold < folds - 1 else len(self.bars)
+            train_start = 0 if anchored else fold * test_bars
+            if samples is not None:
+                combos = self._sample(space, samples, rng, constraint)
+            train = self.evaluate(combos, train_start, test_start)
+            best = train.best
+            if best is None:
+                raise ValueError("No parameter combination passes the constraint")
+            if best['score'] == float('-inf'):
+                logger.warning(f"Walk-forward fold {fold + 1} skipped: no run reached "
+                               f"{self.min_trades} trades in training")
+                report.skipped.append(fold + 1)
+                continue
+            test = self._run([(best['params'], test_start, test_end)])[0]
+            report.folds.append({
+                'fold': fold + 1,
+                'train_start': self.bars[train_start]['timestamp'],
+                'train_end': self.bars[test_start - 1]['timestamp'],
+                'test_start': self.bars[test_start]['timestamp'],
+                'test_end': self.bars[test_end - 1]['timestamp'],
+                'train_bars': test_start - train_start,
+                'test_bars': test_end - test_start,
+                'params': best['params'],
+                'train_score': best['score'],
+                'train': {name: best[name] for name in REPORT_FIELDS},
+                'test': {name: test[name] for name in REPORT_FIELDS}
+            })
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def evaluate(self, combos: List[Dict], start: int = 0, end: Optional[int] = None) -> OptimizationReport:
+        """
+        Backtest parameter sets and rank them
+
+        Args:
+            combos: Parameter sets
+            start: First bar
+            end: Bar after the last (default: all)
+
+        Returns:
+            OptimizationReport
+        """
+        started = time.perf_counter()
+        summaries = self._run([(params, start, end) for params in combos])
+        results = []
+        for params, summary in zip(combos, summaries):
+            row = {'params': params, 'score': score(summary, self.metric, self.min_trades)}
+            row.update((name, summary[name]) for name in REPORT_FIELDS)
+            results.append(row)
+        results.sort(key=lambda row: row['score'], reverse=True)
+        for rank, row in enumerate(results, 1):
+            row['rank'] = rank
+        bars = len(range(len(self.bars))[start:end])
+        return OptimizationReport(self.metric, results, len(results), time.perf_counter() - started, bars)
+
+    def _run(self, tasks: List[Tuple]) -> List[Dict]:
+        """Summaries for (params, start, end) tasks, in order"""
+        for params, _, _ in tasks:
+            self.features(params).prepare([apply_parameters(self.base_config, params)])
+        context = (self._features, self.base_config, self.symbol, self.backtest_args)
+        if self.workers <= 1 or len(tasks) == 1:
+            return [_run_task(*context, *task) for task in tasks]
+
+        executor: Executor
+        if self.use_processes:
+            executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                           initargs=(context,))
+        else:
+            executor = ThreadPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                          initargs=(context,))
+        chunksize = max(1, len(tasks) // (self.workers * 4))
+        with executor:
+            return list(executor.map(_worker_run, tasks, chunksize=chunksize))
+
+    def _allowed(self, combos: List[Dict], constraint: Optional[Callable[[Dict], bool]]) -> List[Dict]:
+        """Combinations whose config passes the constraint"""
+        constraint = constraint or valid_parameters
+        return [params for params in combos if constraint(apply_parameters(self.base_config, params))]
+
+    def _sample(self, space: Dict[str, Sequence], samples: int, rng: random.Random,
+                constraint: Optional[Callable[[Dict], bool]]) -> List[Dict]:
+        """Distinct random combinations drawn by index, without building the grid"""
+        names = list(space)
+        sizes = [len(values) for values in space.values()]
+        total = 1
+        for size in sizes:
+            total *= size
+        if total <= 4 * samples:  # small space: walk a shuffle of it
+            numbers = iter(rng.sample(range(total), total))
+        else:  # large space: draw until enough distinct ones pass the constraint
+            numbers = (rng.randrange(total) for _ in range(50 * samples))
+        combos = []
+        seen = set()
+        for number in numbers:
+            if number in seen:
+                continue
+            seen.add(number)
+            params = {}
+            for name, size in zip(reversed(names), reversed(sizes)):
+                number, choice = divmod(number, size)
+                params[name] = space[name][choice]
+            params = {name: params[name] for name in names}
+            if self._allowed([params], constraint):
+                combos.append(params)
+                if len(combos) == samples:
+                    break
+        return combos
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CLI tool for backtesting SMCStrategy on historical bars
+"""
+import argparse
+import csv
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import Backtester, read_bars
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Backtest SMCStrategy on M5 bars',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # CSV (plain or MT5 export) or Parquet file of M5 bars
+  python backtest/run_backtest.py -i EURUSD_M5.csv -s EURUSD
+
+  # With costs, and the trade list written to CSV
+  python backtest/run_backtest.py -i EURUSD_M5.parquet -s EURUSD --spread 0.8 --commission 7 -t trades.csv
+"""
+    )
+    parser.add_argument('-i', '--input', required=True, help='Bar file (.csv, .txt or .parquet)')
+    parser.add_argument('-s', '--symbol', required=True, help='Symbol (selects pip size and value)')
+    parser.add_argument('--balance', type=float, default=10000.0, help='Initial balance')
+    parser.add_argument('--risk', type=float, default=1.0, help='Risk per trade in percent')
+    parser.add_argument('--spread', type=float, default=1.0, help='Spread in pips')
+    parser.add_argument('--slippage', type=float, default=0.0, help='Slippage per fill in pips')
+    parser.add_argument('--commission', type=float, default=0.0, help='Round-turn commission per lot')
+    parser.add_argument('--tp-ratio', type=float, default=2.0, help='Risk-reward ratio for take profits')
+    parser.add_argument('--base-minutes', type=int, default=5, help='Timeframe of the input bars')
+    parser.add_argument('-t', '--trades', help='Write the trade list to this CSV file')
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    tester = Backtester(
+        args.symbol,
+        initial_balance=args.balance,
+        risk_percent=args.risk,
+        spread_pips=args.spread,
+        slippage_pips=args.slippage,
+        commission_per_lot=args.commission,
+        tp_ratio=args.tp_ratio,
+        base_minutes=args.base_minutes
+    )
+    result = tester.run(read_bars(args.input))
+
+    if args.trades:
+        trades = result.trades_as_dicts()
+        with open(args.trades, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(trades[0]) if trades else ['direction'])
+            writer.writeheader()
+            writer.writerows(trades)
+
+    print(json.dumps(result.summary(), indent=2, default=str))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+CLI tool for optimizing SMCStrategy parameters
+"""
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import StrategyOptimizer, read_bars
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Grid, random or walk-forward search over SMCStrategy parameters',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+The search space is a JSON object of parameter -> candidate values. Parameters
+are strategy config paths or Backtester arguments, e.g.
+  {"indicators.ema_fast": [5, 9, 13], "indicators.ema_slow": [21, 34, 55],
+   "indicators.rsi_period": [7, 14], "smc.order_blocks": [true, false],
+   "tp_ratio": [1.5, 2, 3]}
+
+Examples:
+  # Every combination, best 20 by recovery factor
+  python backtest/run_optimizer.py -i EURUSD_M5.csv -s EURUSD --space space.json
+
+  # 500 random combinations ranked by net profit, all results to CSV
+  python backtest/run_optimizer.py -i EURUSD_M5.csv -s EURUSD --space space.json \\
+      --mode random --samples 500 --metric net_profit -o results.csv
+
+  # Walk-forward: 6 test windows, each after a training window 4x as long
+  python backtest/run_optimizer.py -i EURUSD_M5.csv -s EURUSD --space space.json \\
+      --mode walk-forward --folds 6 --train-ratio 4
+"""
+    )
+    parser.add_argument('-i', '--input', required=True, help='Bar file (.csv, .txt or .parquet)')
+    parser.add_argument('-s', '--symbol', required=True, help='Symbol (selects pip size and value)')
+    parser.add_argument('--space', required=True, help='Search space JSON file (or inline JSON)')
+    parser.add_argument('--mode', choices=['grid', 'random', 'walk-forward'], default='grid')
+    parser.add_argument('--samples', type=int, help='Random combinations (random mode; optional for walk-forward)')
+    parser.add_argument('--seed', type=int, help='Random seed')
+    parser.add_argument('--folds', type=int, default=4, help='Walk-forward test windows')
+    parser.add_argument('--train-ratio', type=float, default=3.0, help='Training window length in test windows')
+    parser.add_argument('--anchored', action='store_true', help='Walk-forward training windows start at the first bar')
+    parser.add_argument('--metric', default='recovery_factor', help='Summary field to rank by')
+    parser.add_argument('--min-trades', type=int, default=10, help='Runs with fewer trades rank last')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--spread', type=float, default=1.0, help='Spread in pips')
+    parser.add_argument('--commission', type=float, default=0.0, help='Round-turn commission per lot')
+    parser.add_argument('--top', type=int, default=20, help='Results to print')
+    parser.add_argument('-o', '--output', help='Write every ranked result to this CSV file')
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    space_text = args.space
+    if Path(space_text).is_file():
+        space_text = Path(space_text).read_text(encoding='utf-8')
+    space = json.loads(space_text)
+
+    optimizer = StrategyOptimizer(
+        read_bars(args.input),
+        args.symbol,
+        backtest_args={'spread_pips': args.spread, 'commission_per_lot': args.commission},
+        metric=args.metric,
+        min_trades=args.min_trades,
+        workers=args.workers
+    )
+
+    if args.mode == 'walk-forward':
+        report = optimizer.walk_forward(space, folds=args.folds, train_ratio=args.train_ratio,
+                                        anchored=args.anchored, samples=args.samples, seed=args.seed)
+        print(report.table())
+        print(json.dumps(report.summary(), indent=2))
+        return 0
+
+    if args.mode == 'random':
+        if not args.samples:
+            print("--samples is required in random mode", file=sys.stderr)
+            return 1
+        report = optimizer.random_search(space, args.samples, seed=args.seed)
+    else:
+        report = optimizer.grid_search(space)
+    print(report.table(top=args.top))
+    if args.output:
+        report.to_csv(args.output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
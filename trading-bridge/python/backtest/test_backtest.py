@@ -0,0 +1,232 @@
+"""
+Backtester Test Script
+Checks bar sources, timeframe aggregation, fill simulation and reporting
+"""
+import logging
+import math
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import Backtester, TimeframeAggregator, read_bars
+from backtest import engine
+from risk.risk_calculator import RiskCalculator
+from strategies.test_smc_vectorized import make_candles
+
+logging.disable(logging.INFO)
+
+
+class ScriptedStrategy:
+    """Strategy that emits fixed signals after given bar numbers"""
+
+    def __init__(self, signals: dict):
+        self.signals = signals
+        self.calls = 0
+
+    def reset_state(self, symbol, series=None):
+        pass
+
+    def calculate_entry_signal(self, symbol, candles_h1, candles_m15, candles_m5, series=None):
+        self.calls += 1
+        return self.signals.get(len(candles_m5))
+
+
+def flat_bars(count: int, price: float = 1.1, start: datetime = datetime(2024, 1, 1)) -> list:
+    """Bars that never move unless edited"""
+    return [{'timestamp': start + timedelta(minutes=5 * i), 'open': price, 'high': price,
+             'low': price, 'close': price} for i in range(count)]
+
+
+def test_timeframe_aggregator():
+    """Higher-timeframe bars equal a direct grouping, with gaps handled"""
+    print("\n=== Testing TimeframeAggregator ===")
+
+    bars = make_candles(2000, 1)
+    del bars[500:530]  # a 2.5 hour gap
+    for minutes in (15, 60, 240):
+        aggregator = TimeframeAggregator(minutes)
+        built = [b for bar in bars for b in aggregator.update(bar)]
+        groups = {}
+        for bar in bars:
+            ts = bar['timestamp']
+            key = ts.replace(minute=0) - timedelta(minutes=(ts.hour * 60) % minutes) \
+                if minutes >= 60 else ts.replace(minute=ts.minute - ts.minute % minutes)
+            groups.setdefault(key, []).append(bar)
+        expected = [{'timestamp': key, 'open': group[0]['open'], 'high': max(b['high'] for b in group),
+                     'low': min(b['low'] for b in group), 'close': group[-1]['close'],
+                     'volume': sum(b['volume'] for b in group)}
+                    for key, group in groups.items()]
+        # The last bucket is still open unless the data ends exactly on its boundary
+        assert built == expected[:len(built)] and len(expected) - len(built) <= 1, minutes
+    print("✓ M15, H1 and H4 bars match direct grouping")
+
+
+def test_read_bars():
+    """CSV files in plain and MT5 export layouts stream the same bars"""
+    print("\n=== Testing bar readers ===")
+
+    bars = make_candles(50, 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain = Path(tmp) / "bars.csv"
+        with open(plain, 'w') as f:
+            f.write("timestamp,open,high,low,close,volume\n")
+            for b in bars:
+                f.write(f"{b['timestamp'].isoformat()},{b['open']!r},{b['high']!r},"
+                        f"{b['low']!r},{b['close']!r},{b['volume']}\n")
+        mt5 = Path(tmp) / "EURUSD_M5.csv"
+        with open(mt5, 'w') as f:
+            f.write("<DATE>\t<TIME>\t<OPEN>\t<HIGH>\t<LOW>\t<CLOSE>\t<TICKVOL>\n")
+            for b in bars:
+                f.write(f"{b['timestamp']:%Y.%m.%d}\t{b['timestamp']:%H:%M:%S}\t{b['open']!r}\t"
+                        f"{b['high']!r}\t{b['low']!r}\t{b['close']!r}\t{b['volume']}\n")
+        expected = [dict(b, volume=float(b['volume'])) for b in bars]
+        assert list(read_bars(plain)) == expected
+        assert list(read_bars(mt5)) == expected
+    print("✓ Plain and MT5 CSV layouts parse identically")
+
+
+def test_fills_and_pnl():
+    """Entries fill at the next open with spread and slippage; stops and targets pay out by pip value"""
+    print("\n=== Testing fills ===")
+
+    risk = RiskCalculator()
+    bars = flat_bars(40)
+    # The first H1 bar closes after bar 12, so the strategy is first asked then.
+    # BUY after bar 14, stop 20 pips below; bar 18 trades through the target
+    bars[18].update(high=1.1100)
+    # SELL after bar 24, stop 20 pips above; bar 28 gaps above the stop
+    for bar in bars[28:]:
+        bar.update(open=1.1030, high=1.1030, low=1.1030, close=1.1030)
+    strategy = ScriptedStrategy({
+        14: {'direction': 'BUY', 'stop_loss': 1.0980},
+        24: {'direction': 'SELL', 'stop_loss': 1.1020}
+    })
+    tester = Backtester("EURUSD", strategy=strategy, risk_calculator=risk, spread_pips=1.0,
+                        slippage_pips=0.5, commission_per_lot=7.0)
+    result = tester.run(bars)
+    assert strategy.calls > 0
+    buy, sell = result.trades
+
+    assert buy.entry_time == bars[14]['timestamp'] and math.isclose(buy.entry_price, 1.10015)
+    assert math.isclose(buy.take_profit, round(1.10015 + 2 * (1.10015 - 1.0980), 5))
+    assert buy.exit_reason == 'take_profit' and math.isclose(buy.exit_price, buy.take_profit - 0.00005)
+    expected = ((buy.exit_price - buy.entry_price) / 0.0001 * 10 - 7.0) * buy.lot_size
+    assert math.isclose(buy.pnl, expected)
+
+    assert math.isclose(sell.entry_price, 1.1 - 0.00005)
+    assert sell.exit_reason == 'stop_loss'
+    assert math.isclose(sell.exit_price, 1.1030 + 0.0001 + 0.00005)  # gap: filled at the ask open
+    assert sell.pnl < -result.initial_balance * 0.01  # the gap lost more than the planned risk
+
+    assert math.isclose(result.final_balance, result.initial_balance + buy.pnl + sell.pnl)
+    assert len(result.equity) == len(bars) and result.equity[-1] == result.final_balance
+    print("✓ Fills, gaps, commission and P&L are correct")
+
+
+def test_risk_limits():
+    """Entries that break validate_risk_limits are rejected and counted"""
+    print("\n=== Testing risk limits ===")
+
+    bars = flat_bars(60)
+    for i in range(15, 60, 4):
+        bars[i].update(low=1.0900)  # every long is stopped out on the bar after its fill
+    signals = {n: {'direction': 'BUY', 'stop_loss': 1.0950} for n in range(14, 59, 4)}
+    risk = RiskCalculator()
+    risk.config['max_daily_loss_percent'] = 2.5
+    result = Backtester("EURUSD", strategy=ScriptedStrategy(signals), risk_calculator=risk,
+                        spread_pips=0.0).run(bars)
+    assert len(result.trades) == 2  # the third 1% loss would pass the 2.5% daily limit
+    assert result.rejected == {'Trade would exceed daily loss limit': len(signals) - 2}
+
+    next_day = flat_bars(20, start=datetime(2024, 1, 2))
+    for i in range(3, 20, 4):
+        next_day[i].update(low=1.0900)
+    result = Backtester("EURUSD", strategy=ScriptedStrategy(signals), risk_calculator=risk,
+                        spread_pips=0.0).run(bars[:20] + next_day)
+    assert len(result.trades) == 4  # the limit resets each day
+    print("✓ Daily loss limit enforced and reset per day")
+
+
+def test_smc_run_and_report():
+    """A full SMCStrategy run is reproducible and its report is consistent"""
+    print("\n=== Testing SMC run ===")
+
+    bars = make_candles(20000, 4)
+    tester = Backtester("EURUSD", slippage_pips=0.2)
+    first = tester.run(bars)
+    second = tester.run(iter(bars))  # same strategy: its kept state starts over
+    assert first.trades and first.trades == second.trades
+    assert list(first.equity) == list(second.equity)
+
+    summary = first.summary()
+    assert summary['bars'] == 20000 and summary['trades'] == len(first.trades)
+    assert math.isclose(summary['net_profit'], sum(t.pnl for t in first.trades), abs_tol=1e-6)
+    assert summary['wins'] + summary['losses'] == summary['trades']
+    assert 0 <= summary['max_drawdown_pct'] <= 100
+
+    fast = first.max_drawdown()
+    numpy_module, engine.np = engine.np, None
+    try:
+        assert all(math.isclose(a, b) for a, b in zip(first.max_drawdown(), fast))
+    finally:
+        engine.np = numpy_module
+    print(f"✓ {summary['trades']} trades, {summary['bars_per_minute']:,.0f} bars/minute")
+
+
+def test_runs_without_numpy():
+    """numpy stays optional: the backtester imports and runs with it blocked"""
+    print("\n=== Testing without numpy ===")
+
+    bars = make_candles(3000, 4)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bars.csv"
+        with open(path, 'w') as f:
+            f.write("timestamp,open,high,low,close,volume\n")
+            for b in bars:
+                f.write(f"{b['timestamp'].isoformat()},{b['open']!r},{b['high']!r},"
+                        f"{b['low']!r},{b['close']!r},{b['volume']}\n")
+        script = (
+            "import sys; sys.modules['numpy'] = None\n"
+            "from backtest import Backtester, read_bars\n"
+            f"print(Backtester('EURUSD').run(read_bars({str(path)!r})).summary()['bars'])\n"
+        )
+        done = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent.parent,
+                              capture_output=True, text=True, timeout=300)
+    assert done.returncode == 0, done.stderr
+    assert done.stdout.split() == ["3000"]
+    print("✓ Backtest runs with numpy unavailable")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Backtester Test Suite")
+    print("=" * 50)
+
+    try:
+        test_timeframe_aggregator()
+        test_read_bars()
+        test_fills_and_pnl()
+        test_risk_limits()
+        test_smc_run_and_report()
+        test_runs_without_numpy()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Strategy Optimizer Test Script
+Checks feature replay against full backtests and the grid, random and walk-forward searches
+"""
+import logging
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import Backtester, MarketFeatures, StrategyOptimizer
+from backtest.optimizer import apply_parameters, replay
+from strategies.smc_strategy import SMCStrategy
+from strategies.test_smc_vectorized import make_candles
+
+logging.disable(logging.INFO)
+
+SPACE = {
+    'indicators.ema_fast': [5, 9, 21],
+    'indicators.ema_slow': [21, 34],
+    'smc.order_blocks': [True, False],
+    'tp_ratio': [1.5, 3.0]
+}
+
+
+def strategy_for(params: dict) -> SMCStrategy:
+    """SMCStrategy with parameters applied to its default config"""
+    strategy = SMCStrategy()
+    strategy.config = apply_parameters(strategy.config, params)
+    return strategy
+
+
+def test_replay_matches_backtester():
+    """Replaying precomputed features gives the trades and equity of a full backtest"""
+    print("\n=== Testing feature replay ===")
+
+    bars = make_candles(12000, 4)
+    features = MarketFeatures(bars, SMCStrategy().config)
+    for params in ({},
+                   {'indicators.ema_fast': 5, 'indicators.ema_slow': 34, 'indicators.rsi_period': 7},
+                   {'indicators.rsi_oversold': 40, 'indicators.rsi_overbought': 60},
+                   {'smc.order_blocks': False, 'tp_ratio': 3.0},
+                   {'smc.fair_value_gaps': False, 'min_confidence': 0.8, 'max_positions': 2}):
+        strategy = strategy_for(params)
+        args = {k: v for k, v in params.items() if '.' not in k}
+        expected = Backtester("EURUSD", strategy=strategy, **args).run(bars)
+        got = replay(features, strategy.config, "EURUSD", args)
+        assert expected.trades, params
+        assert got.trades == expected.trades, params
+        assert list(got.equity) == list(expected.equity), params
+    print("✓ Replay matches Backtester.run for indicator, toggle and backtest parameters")
+
+
+def test_toggles_change_signals():
+    """Disabling order blocks drops the OB confirmation; FVGs only move confidence"""
+    print("\n=== Testing config toggles ===")
+
+    bars = make_candles(6000, 5)
+    base = Backtester("EURUSD").run(bars)
+    no_ob = Backtester("EURUSD", strategy=strategy_for({'smc.order_blocks': False})).run(bars)
+    assert len(no_ob.trades) > len(base.trades)
+
+    # FVGs add 0.1 confidence, so without them no signal reaches 0.95
+    strict = {'min_confidence': 0.95}
+    with_fvg = Backtester("EURUSD", **strict).run(bars)
+    without_fvg = Backtester("EURUSD", strategy=strategy_for({'smc.fair_value_gaps': False}), **strict).run(bars)
+    assert with_fvg.trades and not without_fvg.trades
+    print(f"✓ Trades: default {len(base.trades)}, no OB {len(no_ob.trades)}, "
+          f"confidence>=0.95 {len(with_fvg.trades)} (none without FVGs)")
+
+
+def test_grid_search():
+    """Grid search skips invalid combinations, ranks by the metric and agrees across pool types"""
+    print("\n=== Testing grid search ===")
+
+    bars = make_candles(8000, 6)
+    reports = []
+    for workers, use_processes in ((0, False), (2, False), (2, True)):
+        optimizer = StrategyOptimizer(bars, "EURUSD", metric='net_profit', min_trades=1,
+                                      workers=workers, use_processes=use_processes)
+        reports.append(optimizer.grid_search(SPACE))
+    report = reports[0]
+    # ema_fast 21 is only valid with ema_slow 34
+    assert report.runs == (3 * 2 - 1) * 2 * 2
+    for other in reports[1:]:
+        assert [(r['params'], r['net_profit']) for r in other.results] == \
+               [(r['params'], r['net_profit']) for r in report.results]
+    scores = [r['score'] for r in report.results]
+    assert scores == sorted(scores, reverse=True)
+    assert [r['rank'] for r in report.results] == list(range(1, report.runs + 1))
+
+    best = report.best
+    strategy = strategy_for(best['params'])
+    direct = Backtester("EURUSD", strategy=strategy, tp_ratio=best['params']['tp_ratio']).run(bars)
+    assert abs(direct.summary()['net_profit'] - best['net_profit']) < 1e-6
+    assert report.table(top=3).count('\n') == 5
+    print(f"✓ {report.runs} runs ranked identically inline, on threads and on processes")
+
+
+def test_random_search():
+    """Random search draws distinct valid combinations reproducibly, even from huge spaces"""
+    print("\n=== Testing random search ===")
+
+    bars = make_candles(4000, 7)
+    optimizer = StrategyOptimizer(bars, "EURUSD", min_trades=0, workers=0)
+    first = optimizer.random_search(SPACE, samples=6, seed=3)
+    second = optimizer.random_search(SPACE, samples=6, seed=3)
+    params = [r['params'] for r in first.results]
+    assert len(params) == 6 and len({tuple(p.items()) for p in params}) == 6
+    assert sorted(map(str, params)) == sorted(str(r['params']) for r in second.results)
+    assert all(p['indicators.ema_fast'] < p['indicators.ema_slow'] for p in params)
+    assert len(optimizer.random_search(SPACE, samples=100).results) == 20
+
+    huge = {f'indicators.p{i}': list(range(50)) for i in range(8)}  # 3.9e13 combinations
+    huge.update({'indicators.ema_fast': [9], 'indicators.ema_slow': [21]})
+    sample = optimizer._sample(huge, 5, random.Random(1), None)
+    assert len(sample) == 5
+    print("✓ Samples are distinct, valid and reproducible")
+
+
+def test_walk_forward():
+    """Folds tile the data; each test result is the chosen parameters replayed on its window"""
+    print("\n=== Testing walk-forward ===")
+
+    bars = make_candles(10000, 8)
+    optimizer = StrategyOptimizer(bars, "EURUSD", metric='net_profit', min_trades=1, workers=0)
+    space = {'indicators.ema_fast': [5, 9], 'tp_ratio': [1.5, 2.5]}
+    report = optimizer.walk_forward(space, folds=3, train_ratio=2.0)
+    assert len(report.folds) == 3
+    previous_end = None
+    for fold in report.folds:
+        assert fold['test_bars'] >= 2000 and fold['train_bars'] == 4000
+        assert fold['train_end'] < fold['test_start']
+        if previous_end is not None:
+            assert fold['test_start'] > previous_end
+        previous_end = fold['test_end']
+    assert previous_end == bars[-1]['timestamp']
+
+    last = report.folds[-1]
+    start = next(i for i, b in enumerate(bars) if b['timestamp'] == last['test_start'])
+    params = last['params']
+    direct = replay(optimizer.features(params), apply_parameters(optimizer.base_config, params),
+                    "EURUSD", {'tp_ratio': params['tp_ratio']}, start)
+    assert abs(direct.summary()['net_profit'] - last['test']['net_profit']) < 1e-6
+
+    anchored = optimizer.walk_forward(space, folds=3, train_ratio=2.0, anchored=True)
+    assert [f['train_bars'] for f in anchored.folds] == [4000, 6000, 8000]
+    summary = report.summary()
+    assert summary['folds'] == 3
+    assert summary['test_trades'] == sum(f['test']['trades'] for f in report.folds)
+    print(f"✓ 3 folds, out-of-sample net {summary['test_net_profit']:,.2f}")
+
+
+def test_walk_forward_without_candidates():
+    """A fold with no usable training result is skipped; no combination at all is an error"""
+    print("\n=== Testing walk-forward without candidates ===")
+
+    bars = make_candles(3000, 8)
+    space = {'indicators.ema_fast': [5, 9]}
+    optimizer = StrategyOptimizer(bars, "EURUSD", min_trades=10**6, workers=0)
+    report = optimizer.walk_forward(space, folds=2)
+    assert report.folds == [] and report.skipped == [1, 2]
+    assert report.summary()['skipped_folds'] == 2 and report.summary()['efficiency'] is None
+
+    for samples in (None, 2):
+        try:
+            optimizer.walk_forward(space, folds=2, samples=samples, constraint=lambda config: False)
+            raise AssertionError("walk_forward() ran without a single combination")
+        except ValueError as e:
+            assert "constraint" in str(e)
+    print("✓ Folds without min_trades skipped, empty search rejected")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Strategy Optimizer Test Suite")
+    print("=" * 50)
+
+    try:
+        test_replay_matches_backtester()
+        test_toggles_change_signals()
+        test_grid_search()
+        test_random_search()
+        test_walk_forward()
+        test_walk_forward_without_candidates()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Backtester Benchmark
+M5 bars replayed per minute through SMCStrategy, from memory and from a CSV file
+
+Usage:
+    python benchmarks/bench_backtest.py [--bars 100000 500000]
+"""
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import Backtester, read_bars
+from strategies.test_smc_vectorized import make_candles
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='Backtester benchmark')
+    parser.add_argument('--bars', type=int, nargs='+', default=[100_000, 500_000], help='M5 bars per run')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'bars':>10} {'source':>8} {'seconds':>9} {'bars/minute':>14} {'trades':>8}")
+    print("=" * 53)
+    for count in args.bars:
+        bars = make_candles(count, 7)
+        result = Backtester("EURUSD").run(bars)
+        print(f"{count:>10,} {'memory':>8} {result.elapsed:>9.2f} "
+              f"{result.summary()['bars_per_minute']:>14,.0f} {len(result.trades):>8}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "bars.csv"
+            with open(path, 'w') as f:
+                f.write("timestamp,open,high,low,close,volume\n")
+                for b in bars:
+                    f.write(f"{b['timestamp'].isoformat()},{b['open']},{b['high']},"
+                            f"{b['low']},{b['close']},{b['volume']}\n")
+            del bars
+            start = time.perf_counter()
+            result = Backtester("EURUSD").run(read_bars(path))
+            elapsed = time.perf_counter() - start
+        print(f"{count:>10,} {'csv':>8} {elapsed:>9.2f} {count / elapsed * 60:>14,.0f} {len(result.trades):>8}")
+    print("=" * 53)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
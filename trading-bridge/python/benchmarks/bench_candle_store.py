@@ -0,0 +1,76 @@
+"""
+Candle Store Benchmark
+Loading a year of M1 bars from JSON vs the memory-mapped candle store
+
+Usage:
+    python benchmarks/bench_candle_store.py [--bars 525600]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from market_data import CandleStore
+from strategies.test_smc_vectorized import make_candles
+
+
+def timed(label: str, func, baseline: float = None):
+    """Run func once, print its time, return (seconds, result)"""
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    ratio = f"{baseline / elapsed:>9,.0f}x" if baseline else ""
+    print(f"{label:<44} {elapsed * 1e3:>11,.2f} {ratio}")
+    return elapsed, result
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='Candle store benchmark')
+    parser.add_argument('--bars', type=int, default=525_600, help='M1 bars (525,600 = one year)')
+    args = parser.parse_args()
+
+    candles = make_candles(args.bars, 9)
+    start = datetime(2024, 1, 1)
+    for i, candle in enumerate(candles):
+        candle['timestamp'] = start + timedelta(minutes=i)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "EURUSD_M1.json"
+        with open(json_path, 'w') as f:
+            json.dump([dict(c, timestamp=c['timestamp'].isoformat()) for c in candles], f)
+        store = CandleStore(Path(tmp) / "store")
+        store.append("EURUSD", "M1", candles)
+        del candles
+
+        def load_json():
+            with open(json_path) as f:
+                data = json.load(f)
+            for c in data:
+                c['timestamp'] = datetime.fromisoformat(c['timestamp'])
+            return data
+
+        print(f"{args.bars:,} M1 bars ({json_path.stat().st_size / 1e6:,.0f} MB of JSON)")
+        print("=" * 66)
+        print(f"{'operation':<44} {'ms':>11} {'vs JSON':>10}")
+        print("=" * 66)
+        base, _ = timed("JSON: load + parse timestamps", load_json)
+        timed("store: open series (memory map)", lambda: CandleStore(Path(tmp) / "store").read("EURUSD", "M1"), base)
+        series = store.read("EURUSD", "M1")
+        month = (datetime(2024, 6, 1), datetime(2024, 7, 1))
+        timed("store: slice one month by time", lambda: series.between(*month), base)
+        timed("store: mean close over the year", lambda: float(series.close.mean()), base)
+        timed("store: to CandleArray (vectorized detectors)", series.to_candle_array, base)
+        timed("store: to list of dicts", series.to_dicts, base)
+        print("=" * 66)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
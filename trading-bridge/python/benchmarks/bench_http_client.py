@@ -0,0 +1,102 @@
+"""
+Broker HTTP Client Benchmark
+Order round-trips with a new connection per request (urlopen) vs BitgetAPI's keep-alive pool
+
+The local server sleeps --handshake-ms on every new connection to stand in
+for the TCP + TLS handshake to the exchange.
+
+Usage:
+    python benchmarks/bench_http_client.py [--orders 100] [--handshake-ms 30]
+"""
+import argparse
+import json
+import sys
+import time
+import urllib.request
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brokers.test_http_client import make_api, serve_fake_bitget
+
+
+def urlopen_orders(api, count: int) -> float:
+    """Seconds per order sent the old way: signed urlopen request, fresh connection each time"""
+    endpoint = "/api/v2/mix/order/place-order"
+    start = time.perf_counter()
+    for i in range(count):
+        body = json.dumps({"symbol": "BTCUSDT", "size": "0.01", "clientOid": str(i)})
+        timestamp = str(int(time.time() * 1000))
+        headers = {
+            "ACCESS-KEY": api.api_key,
+            "ACCESS-SIGN": api._generate_signature(timestamp, "POST", endpoint, body),
+            "ACCESS-TIMESTAMP": timestamp,
+            "ACCESS-PASSPHRASE": api.passphrase,
+            "Content-Type": "application/json"
+        }
+        request = urllib.request.Request(api.base_url + endpoint, data=body.encode('utf-8'),
+                                         headers=headers, method="POST")
+        with urllib.request.urlopen(request, timeout=10) as response:
+            assert json.loads(response.read())["code"] == "00000"
+    return (time.perf_counter() - start) / count
+
+
+def pooled_orders(api, count: int) -> float:
+    """Seconds per order through BitgetAPI.place_order"""
+    start = time.perf_counter()
+    for _ in range(count):
+        assert api.place_order("BTCUSDT", "BUY", 0.01).success
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='Broker HTTP client benchmark')
+    parser.add_argument('--orders', type=int, default=100, help='Orders per client')
+    parser.add_argument('--handshake-ms', type=float, default=30.0, help='Simulated connection setup time')
+    parser.add_argument('--accounts', type=int, default=8, help='Accounts polled in the fan-out test')
+    args = parser.parse_args()
+
+    server = serve_fake_bitget(handshake_delay=args.handshake_ms / 1000, slow=0.02)
+    api = make_api(server.url)
+    try:
+        fresh = urlopen_orders(api, args.orders)
+        connections = server.connections
+        pooled = pooled_orders(api, args.orders)
+        pooled_connections = server.connections - connections
+
+        accounts = [make_api(server.url, http_client=api.http) for _ in range(args.accounts)]
+        start = time.perf_counter()
+        for account in accounts:
+            account.get_account_info()
+            account.get_positions()
+        sequential = time.perf_counter() - start
+        start = time.perf_counter()
+        api.http.fan_out([call for account in accounts for call in (account.get_account_info, account.get_positions)])
+        concurrent = time.perf_counter() - start
+
+        print(f"{args.orders} orders, {args.handshake_ms:.0f} ms simulated handshake")
+        print("=" * 60)
+        print(f"{'':<26} {'ms/order':>10} {'connections':>12}")
+        print("=" * 60)
+        print(f"{'urlopen per request':<26} {fresh * 1e3:>10.2f} {connections:>12}")
+        print(f"{'pooled keep-alive':<26} {pooled * 1e3:>10.2f} {pooled_connections:>12}")
+        print("=" * 60)
+        print(f"Saved per order: {(fresh - pooled) * 1e3:.2f} ms")
+        print()
+        print(f"{args.accounts} accounts x (account info + positions), 20 ms server time each:")
+        print(f"  sequential {sequential * 1e3:.0f} ms, fan-out ({api.http.pool_size} connections) "
+              f"{concurrent * 1e3:.0f} ms")
+        print()
+        for endpoint, stats in api.get_latency_stats().items():
+            print(f"  {endpoint:<42} n={stats['count']:<4} p50={stats['p50_ms']} ms p99={stats['p99_ms']} ms")
+    finally:
+        api.close()
+        server.shutdown()
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
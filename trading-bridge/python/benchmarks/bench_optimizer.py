@@ -0,0 +1,74 @@
+"""
+Strategy Optimizer Benchmark
+Backtests per minute: one Backtester.run per combination vs StrategyOptimizer
+
+Usage:
+    python benchmarks/bench_optimizer.py [--bars 100000] [--workers 4]
+"""
+import argparse
+import itertools
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import Backtester, StrategyOptimizer
+from backtest.optimizer import apply_parameters
+from strategies.smc_strategy import SMCStrategy
+from strategies.test_smc_vectorized import make_candles
+
+SPACE = {
+    'indicators.ema_fast': [5, 8, 9, 13],
+    'indicators.ema_slow': [21, 34, 55],
+    'indicators.rsi_period': [7, 14],
+    'smc.order_blocks': [True, False],
+    'tp_ratio': [1.5, 2.0, 3.0]
+}
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='Strategy optimizer benchmark')
+    parser.add_argument('--bars', type=int, default=100_000, help='M5 bars per backtest')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes')
+    parser.add_argument('--baseline-runs', type=int, default=3, help='Full backtests timed for the baseline')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    bars = make_candles(args.bars, 11)
+    combos = [dict(zip(SPACE, values)) for values in itertools.product(*SPACE.values())]
+
+    start = time.perf_counter()
+    for params in combos[:args.baseline_runs]:
+        strategy = SMCStrategy()
+        strategy.config = apply_parameters(strategy.config, params)
+        Backtester("EURUSD", strategy=strategy, tp_ratio=params['tp_ratio']).run(bars)
+    per_run = (time.perf_counter() - start) / args.baseline_runs
+
+    optimizer = StrategyOptimizer(bars, "EURUSD", workers=args.workers)
+    start = time.perf_counter()
+    optimizer.features()
+    features_time = time.perf_counter() - start
+    report = optimizer.grid_search(SPACE)
+    search_time = time.perf_counter() - start
+
+    print(f"{args.bars:,} M5 bars, {report.runs} combinations, {args.workers} worker(s)")
+    print("=" * 60)
+    print(f"{'':<28} {'per run s':>10} {'runs/minute':>12} {'total s':>8}")
+    print("=" * 60)
+    print(f"{'Backtester.run each':<28} {per_run:>10.2f} {60 / per_run:>12,.1f} {per_run * report.runs:>8.0f}")
+    print(f"{'StrategyOptimizer':<28} {search_time / report.runs:>10.3f} "
+          f"{report.runs / search_time * 60:>12,.1f} {search_time:>8.1f}")
+    print("=" * 60)
+    print(f"(features built once in {features_time:.1f}s; speedup {per_run * report.runs / search_time:.1f}x)")
+    print()
+    print(report.table(top=5))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+"""
+Position Book Benchmark
+Pre-trade position count: prefix scan over a plain dict vs PositionBook's index
+
+Usage:
+    python benchmarks/bench_position_book.py [--positions 500] [--symbols 50] [--checks 10000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from trader.position_book import PositionBook
+
+
+def scan_count(positions: dict, symbol_key: str) -> int:
+    """The old MultiSymbolTrader._count_positions"""
+    count = 0
+    for pos_key, pos_data in positions.items():
+        if pos_key.startswith(symbol_key):
+            count += 1
+    return count
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='Position book benchmark')
+    parser.add_argument('--positions', type=int, default=500, help='Open positions')
+    parser.add_argument('--symbols', type=int, default=50, help='Symbols they are spread over')
+    parser.add_argument('--checks', type=int, default=10000, help='Pre-trade checks timed')
+    args = parser.parse_args()
+
+    book = PositionBook()
+    for i in range(args.positions):
+        book.add(f"SYM{i % args.symbols:03d}@EXNESS", str(i), "BUY" if i % 3 else "SELL", 0.1)
+    plain = dict(book)
+    keys = [f"SYM{i % args.symbols:03d}@EXNESS" for i in range(args.checks)]
+    assert all(scan_count(plain, key) == book.count(key) for key in keys[:args.symbols])
+
+    start = time.perf_counter()
+    for key in keys:
+        scan_count(plain, key)
+    scan = (time.perf_counter() - start) / args.checks
+
+    start = time.perf_counter()
+    for key in keys:
+        book.count(key)
+        book.net_exposure(key.split('@')[0])
+    indexed = (time.perf_counter() - start) / args.checks
+
+    print(f"{args.positions} open positions over {args.symbols} symbols, {args.checks:,} checks")
+    print("=" * 50)
+    print(f"{'prefix scan':<28} {scan * 1e6:>10.2f} us/check")
+    print(f"{'PositionBook count+exposure':<28} {indexed * 1e6:>10.2f} us/check")
+    print("=" * 50)
+    print(f"Speedup: {scan / indexed:.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
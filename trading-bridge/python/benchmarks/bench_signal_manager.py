@@ -0,0 +1,150 @@
+"""
+SignalManager Microbenchmark
+Pushes 1M signals through the queue and history and reports per-operation cost
+
+Usage:
+    python benchmarks/bench_signal_manager.py [--signals 1000000] [--journal DIR]
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.signal_journal import SignalJournal
+from bridge.signal_manager import SignalManager, TradeSignal
+
+
+def make_signals(total: int):
+    """Pre-build signals so only queue operations are timed"""
+    now = datetime.now()
+    return [
+        TradeSignal(
+            symbol="EURUSD",
+            action="BUY",
+            broker="EXNESS",
+            lot_size=0.01,
+            timestamp=now,
+            signal_id=f"bench_{i}"
+        )
+        for i in range(total)
+    ]
+
+
+def run_throughput(signals, depth: int, batch: int, journal_dir: str = None) -> dict:
+    """
+    Keep the queue at `depth` signals and drain `batch` at a time
+
+    With O(1) operations the cost per signal must not depend on depth.
+    """
+    journal = None
+    if journal_dir is not None:
+        journal = SignalJournal(str(Path(journal_dir) / f"bench_{depth}.jsonl"))
+    manager = SignalManager(max_queue_size=depth + batch, max_history=10000, journal=journal)
+
+    it = iter(signals)
+    for _ in range(depth):
+        manager.add_signal(next(it))
+
+    enqueue_time = 0.0
+    dequeue_time = 0.0
+    lookup_time = 0.0
+    processed = 0
+    remaining = len(signals) - depth
+
+    while remaining >= batch:
+        chunk = [next(it) for _ in range(batch)]
+
+        start = time.perf_counter()
+        for signal in chunk:
+            manager.add_signal(signal)
+        enqueue_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        drained = manager.get_signals(batch)
+        dequeue_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for signal in drained:
+            manager.get_signal_by_id(signal.signal_id)
+        lookup_time += time.perf_counter() - start
+
+        processed += batch
+        remaining -= batch
+    manager.close()
+
+    return {
+        'depth': depth,
+        'processed': processed,
+        'enqueue_ns': enqueue_time / processed * 1e9,
+        'dequeue_ns': dequeue_time / processed * 1e9,
+        'lookup_ns': lookup_time / processed * 1e9,
+        'total_s': enqueue_time + dequeue_time + lookup_time,
+        'dedup': manager.get_dedup_stats(),
+    }
+
+
+def measure_history_memory(entries: int = 10_000) -> float:
+    """Bytes per signal for a full history of validated, serialized signals"""
+    now = datetime.now()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    manager = SignalManager(max_queue_size=entries, max_history=entries)
+    for i in range(entries):
+        manager.add_signal(TradeSignal(
+            symbol="EURUSD",
+            action="BUY",
+            broker="EXNESS",
+            lot_size=0.01,
+            timestamp=now,
+            signal_id=f"mem_{i}"
+        ))
+    manager.get_signals()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used / entries
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='SignalManager microbenchmark')
+    parser.add_argument('--signals', type=int, default=1_000_000, help='Signals per run')
+    parser.add_argument('--batch', type=int, default=100, help='Signals drained per GET_SIGNALS')
+    parser.add_argument('--journal', metavar='DIR', nargs='?', const='', default=None,
+                        help='Journal the queue (to DIR, or a temporary directory)')
+    args = parser.parse_args()
+
+    journal_dir = args.journal
+    if journal_dir == '':
+        journal_dir = tempfile.mkdtemp(prefix='bench_journal_')
+    if journal_dir is not None:
+        print(f"Journaling to {journal_dir}")
+
+    print(f"Building {args.signals:,} signals...")
+    signals = make_signals(args.signals)
+
+    print("=" * 84)
+    print(f"{'queue depth':>12} {'signals':>10} {'enqueue ns':>12} {'dequeue ns':>12} "
+          f"{'lookup ns':>12} {'dedup MB':>10}")
+    print("=" * 84)
+    for depth in (0, 1_000, 10_000, 100_000):
+        if depth + args.batch > args.signals:
+            break
+        result = run_throughput(signals, depth, args.batch, journal_dir)
+        print(f"{result['depth']:>12,} {result['processed']:>10,} "
+              f"{result['enqueue_ns']:>12.0f} {result['dequeue_ns']:>12.0f} {result['lookup_ns']:>12.0f} "
+              f"{result['dedup']['memory_bytes'] / 1e6:>10.1f}")
+    print("=" * 84)
+    print("Per-signal cost and dedup memory should stay flat as queue depth grows.")
+    print(f"History memory: {measure_history_memory():.0f} bytes/signal "
+          f"(10k validated signals incl. queue, history, index and dedup)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
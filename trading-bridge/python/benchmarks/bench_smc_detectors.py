@@ -0,0 +1,104 @@
+"""
+SMC Detector Benchmark
+Times the pure-Python and vectorized SMCStrategy detectors on a long history
+
+Usage:
+    python benchmarks/bench_smc_detectors.py [--candles 100000] [--repeat 3]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from strategies import smc_vectorized
+from strategies.candles import CandleArray
+from strategies.smc_strategy import SMCStrategy
+from strategies.test_smc_vectorized import make_candles
+
+
+def best_of(func, repeat: int) -> float:
+    """Fastest of `repeat` runs, in milliseconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='SMC detector benchmark')
+    parser.add_argument('--candles', type=int, default=100_000, help='Candles in the history')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+    parser.add_argument('--scan-limit', type=int, default=100_000_000,
+                        help='Skip the per-OB breaker scan above OB x candles')
+    args = parser.parse_args()
+
+    strategy = SMCStrategy()
+    candles = make_candles(args.candles)
+    convert_ms = best_of(lambda: CandleArray.from_dicts(candles), args.repeat)
+    columns = CandleArray.from_dicts(candles)
+
+    detectors = (
+        ('order blocks',
+         lambda: strategy._detect_order_blocks_loop(candles, "M5"),
+         lambda: smc_vectorized.detect_order_blocks(columns, "M5")),
+        ('fair value gaps',
+         lambda: strategy._detect_fair_value_gaps_loop(candles),
+         lambda: smc_vectorized.detect_fair_value_gaps(columns)),
+        ('liquidity zones',
+         lambda: strategy._detect_liquidity_zones_loop(candles),
+         lambda: smc_vectorized.detect_liquidity_zones(columns)),
+    )
+
+    print(f"{args.candles:,} candles, list -> CandleArray conversion: {convert_ms:.1f} ms")
+    print("=" * 70)
+    print(f"{'detector':<18} {'found':>8} {'loop ms':>10} {'numpy ms':>10} {'speedup':>10}")
+    print("=" * 70)
+    total_loop = total_numpy = 0.0
+    for name, loop, vectorized in detectors:
+        found = len(vectorized())
+        loop_ms = best_of(loop, args.repeat)
+        numpy_ms = best_of(vectorized, args.repeat)
+        total_loop += loop_ms
+        total_numpy += numpy_ms
+        print(f"{name:<18} {found:>8,} {loop_ms:>10.1f} {numpy_ms:>10.1f} {loop_ms / numpy_ms:>9.1f}x")
+    print("=" * 70)
+    print(f"{'all three':<18} {'':>8} {total_loop:>10.1f} {total_numpy:>10.1f} "
+          f"{total_loop / total_numpy:>9.1f}x  (+{convert_ms:.1f} ms conversion from dicts)")
+
+    # Swing detection is O(n) in both paths, so cost must stay flat as the window grows
+    print()
+    print(f"{'swing window':<18} {'zones':>8} {'loop ms':>10} {'numpy ms':>10}")
+    print("=" * 70)
+    for window in (5, 20, 50, 200):
+        found = len(smc_vectorized.detect_liquidity_zones(columns, window, window))
+        loop_ms = best_of(lambda: strategy._detect_liquidity_zones_loop(candles, window, window), args.repeat)
+        numpy_ms = best_of(lambda: smc_vectorized.detect_liquidity_zones(columns, window, window), args.repeat)
+        print(f"{'+/- ' + str(window):<18} {found:>8,} {loop_ms:>10.1f} {numpy_ms:>10.1f}")
+    print("=" * 70)
+
+    # Breaker blocks: per-OB scan is O(OB x N), the sweep is O((N + OB) log OB)
+    order_blocks = smc_vectorized.detect_order_blocks(columns, "M5")
+    print()
+    print(f"{'order blocks':<18} {'breakers':>8} {'scan ms':>10} {'sweep ms':>10} {'speedup':>10}")
+    print("=" * 70)
+    for count in (100, 500, len(order_blocks)):
+        subset = order_blocks[::max(1, len(order_blocks) // count)][:count]
+        found = len(strategy.detect_breaker_blocks(columns, subset))
+        sweep_ms = best_of(lambda: strategy.detect_breaker_blocks(columns, subset), args.repeat)
+        scan_col, speedup_col = '(skipped)', ''
+        if len(subset) * len(candles) <= args.scan_limit:
+            scan_ms = best_of(lambda: strategy._detect_breaker_blocks_scan(candles, subset), 1)
+            scan_col, speedup_col = f"{scan_ms:.1f}", f"{scan_ms / sweep_ms:.1f}x"
+        print(f"{len(subset):<18,} {found:>8,} {scan_col:>10} {sweep_ms:>10.1f} {speedup_col:>10}")
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
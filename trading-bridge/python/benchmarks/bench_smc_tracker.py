@@ -0,0 +1,65 @@
+"""
+SMC Structure Tracker Benchmark
+Per-bar cost of re-running the batch detectors vs updating SMCStructureTracker
+
+Usage:
+    python benchmarks/bench_smc_tracker.py [--bars 200] [--history 1000 10000 100000]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from strategies.smc_strategy import SMCStrategy
+from strategies.test_smc_vectorized import make_candles
+
+
+def batch_evaluation(strategy: SMCStrategy, candles: list):
+    """What calculate_entry_signal did per call before the tracker"""
+    strategy.detect_order_blocks(candles, "H1")
+    strategy.detect_fair_value_gaps(candles)
+    strategy.detect_liquidity_zones(candles)
+    strategy.detect_trend_breakout(candles)
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='SMC structure tracker benchmark')
+    parser.add_argument('--bars', type=int, default=200, help='New bars timed per history length')
+    parser.add_argument('--history', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help='History lengths before the timed bars')
+    args = parser.parse_args()
+
+    print(f"{'history':>10} {'batch us/bar':>14} {'tracker us/bar':>16} {'speedup':>10}")
+    print("=" * 54)
+    for history in args.history:
+        candles = make_candles(history + args.bars)
+        strategy = SMCStrategy()
+        tracker = strategy.structure_tracker("EURUSD", "H1")
+        tracker.sync(candles[:history])
+
+        # The batch path is slow on long histories, so time a sample of its bars
+        sample = range(history + 1, history + args.bars + 1, max(1, args.bars // 10))
+        start = time.perf_counter()
+        for end in sample:
+            batch_evaluation(strategy, candles[:end])
+        batch_us = (time.perf_counter() - start) / len(sample) * 1e6
+
+        live = candles[:history]
+        start = time.perf_counter()
+        for candle in candles[history:]:
+            live.append(candle)
+            tracker.sync(live)
+            tracker.last_order_block, tracker.open_fair_value_gaps(), tracker.trend_breakout()
+        tracker_us = (time.perf_counter() - start) / args.bars * 1e6
+
+        print(f"{history:>10,} {batch_us:>14,.0f} {tracker_us:>16,.1f} {batch_us / tracker_us:>9,.0f}x")
+    print("=" * 54)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Symbol Scanner Benchmark
+Time to evaluate a whole symbol universe, inline vs thread pool vs process pool
+
+Usage:
+    python benchmarks/bench_symbol_scanner.py [--symbols 50] [--history 2000] [--bars 5]
+"""
+import argparse
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from strategies.test_smc_vectorized import make_candles
+from trader.multi_symbol_trader import MultiSymbolTrader
+from trader.symbol_scanner import SymbolScanner
+from trader.test_symbol_scanner import FakeBroker
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='Symbol scanner benchmark')
+    parser.add_argument('--symbols', type=int, default=50, help='Symbols in the universe')
+    parser.add_argument('--history', type=int, default=2000, help='Candles per timeframe before the first scan')
+    parser.add_argument('--bars', type=int, default=5, help='New bars (scans) timed after the first scan')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Pool size')
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    total = args.history + args.bars
+    data = {
+        f"SYM{i:03d}": {tf: make_candles(total, seed=3 * i + k) for k, tf in enumerate(('H1', 'M15', 'M5'))}
+        for i in range(args.symbols)
+    }
+
+    print(f"{args.symbols} symbols x 3 timeframes, {args.history:,} candles each, {args.workers} worker(s)")
+    print("=" * 66)
+    print(f"{'mode':<16} {'first scan ms':>14} {'per bar ms':>12} {'of M5 bar':>12} {'signals':>8}")
+    print("=" * 66)
+    for label, workers, use_processes in (('inline', 0, False),
+                                          ('threads', args.workers, False),
+                                          ('processes', args.workers, True)):
+        trader = MultiSymbolTrader(broker_manager={"FAKE": FakeBroker()})
+        for symbol in data:
+            trader.add_symbol(symbol, "FAKE")
+        with SymbolScanner(trader, workers=workers, use_processes=use_processes) as scanner:
+            signals = 0
+            for end in range(args.history, total + 1):
+                for symbol, frames in data.items():
+                    for timeframe, candles in frames.items():
+                        scanner.update_candles(symbol, "FAKE", timeframe, candles[:end])
+                start = time.perf_counter()
+                signals += len(scanner.scan(execute=False))
+                elapsed = (time.perf_counter() - start) * 1e3
+                if end == args.history:
+                    first_ms, bar_total = elapsed, 0.0
+                else:
+                    bar_total += elapsed
+        per_bar = bar_total / max(1, args.bars)
+        print(f"{label:<16} {first_ms:>14,.1f} {per_bar:>12,.2f} {per_bar / 300_000:>11.4%} {signals:>8}")
+    print("=" * 66)
+    print("(first scan builds each symbol's structure and indicators; later scans only add the new bar)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
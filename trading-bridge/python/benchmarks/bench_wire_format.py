@@ -0,0 +1,88 @@
+"""
+Wire Format Benchmark
+Compares JSON and MessagePack encode/decode time and size for GET_SIGNALS replies
+
+Usage:
+    python benchmarks/bench_wire_format.py [--repeat 200]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.signal_manager import TradeSignal
+from bridge.wire import available_formats, decode_message, encode_message
+
+
+def make_response(batch: int) -> dict:
+    """Build a GET_SIGNALS reply carrying `batch` signals"""
+    now = datetime.now()
+    signals = [
+        TradeSignal(
+            symbol="EURUSD" if i % 2 else "XAUUSD",
+            action="BUY" if i % 3 else "SELL",
+            broker="EXNESS",
+            lot_size=0.01 * (i % 10 + 1),
+            stop_loss=1.0810 + i * 1e-5,
+            take_profit=1.0950 + i * 1e-5,
+            comment="SMC entry",
+            timestamp=now,
+            signal_id=f"EURUSD_BUY_{1700000000 + i}"
+        ).to_dict()
+        for i in range(batch)
+    ]
+    return {'status': 'OK', 'signals': signals, 'queue_size': 0}
+
+
+def measure(response: dict, fmt: str, repeat: int) -> dict:
+    """Time encode and decode of one response"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        data = encode_message(response, fmt)
+    encode_time = (time.perf_counter() - start) / repeat
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode_message(data)
+    decode_time = (time.perf_counter() - start) / repeat
+
+    return {
+        'bytes': len(data),
+        'encode_us': encode_time * 1e6,
+        'decode_us': decode_time * 1e6,
+    }
+
+
+def main():
+    """Run benchmark"""
+    parser = argparse.ArgumentParser(description='Bridge wire format benchmark')
+    parser.add_argument('--repeat', type=int, default=200, help='Iterations per measurement')
+    args = parser.parse_args()
+
+    formats = available_formats()
+    if len(formats) == 1:
+        print("msgpack is not installed - only JSON will be measured (pip install msgpack)")
+
+    print("=" * 66)
+    print(f"{'batch':>6} {'format':>8} {'bytes':>10} {'encode us':>12} {'decode us':>12} {'vs JSON':>10}")
+    print("=" * 66)
+    for batch in (1, 100, 1000):
+        response = make_response(batch)
+        baseline = None
+        for fmt in formats:
+            result = measure(response, fmt, max(1, args.repeat // max(1, batch // 100)))
+            if baseline is None:
+                baseline = result
+            ratio = (result['encode_us'] + result['decode_us']) / (baseline['encode_us'] + baseline['decode_us'])
+            print(f"{batch:>6} {fmt:>8} {result['bytes']:>10,} {result['encode_us']:>12.1f} "
+                  f"{result['decode_us']:>12.1f} {ratio:>9.2f}x")
+    print("=" * 66)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,15 +3,17 @@ Python-MQL5 Bridge
 ZeroMQ-based communication bridge between Python trading engine and MQL5 EA
 """
 import zmq
-import json
 import time
 import threading
 import logging
-from typing import Dict, List, Optional, Any
+from collections import deque, OrderedDict
+from typing import Dict, List, Optional, Any, Set
 from datetime import datetime
 from pathlib import Path
 
+from .signal_journal import SignalJournal
 from .signal_manager import SignalManager, TradeSignal
+from .wire import FORMAT_JSON, WireFormatError, available_formats, decode_message, encode_message
 
 
 # Setup logging
@@ -30,32 +32,151 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Supported EA transports
+TRANSPORT_REP = "REP"        # Single client, strict request/reply lockstep (legacy EAs)
+TRANSPORT_ROUTER = "ROUTER"  # Many clients served concurrently, identified by ZMQ identity
+TRANSPORTS = (TRANSPORT_REP, TRANSPORT_ROUTER)
+
+# Topic prefix for pushed signals: SIGNAL.<BROKER>.<SYMBOL>.
+SIGNAL_TOPIC_PREFIX = "SIGNAL"
+
+
+def signal_topic(broker: str, symbol: Optional[str] = None) -> str:
+    """
+    Build the PUB/SUB topic for a broker (and optionally a symbol)
+    
+    The trailing dot stops a subscription to 'EURUSD' also matching
+    suffixed symbols such as 'EURUSDm'.
+    
+    Args:
+        broker: Broker name
+        symbol: Trading symbol (None = every symbol of the broker)
+        
+    Returns:
+        Topic string usable as a ZMQ subscription prefix
+    """
+    topic = f"{SIGNAL_TOPIC_PREFIX}.{broker.upper()}."
+    if symbol:
+        topic += f"{symbol.upper()}."
+    return topic
+
+
+class LatencyTracker:
+    """Rolling window of request-handling latencies"""
+    
+    def __init__(self, window: int = 1024):
+        """
+        Initialize LatencyTracker
+        
+        Args:
+            window: Number of most recent samples kept for percentiles
+        """
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self._lock = threading.Lock()
+    
+    def record(self, seconds: float):
+        """Record one latency sample (in seconds)"""
+        with self._lock:
+            self.samples.append(seconds)
+            self.count += 1
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Get latency percentile over the current window
+        
+        Args:
+            pct: Percentile (0-100)
+            
+        Returns:
+            Latency in milliseconds or None if no samples
+        """
+        with self._lock:
+            ordered = sorted(self.samples)
+        if not ordered:
+            return None
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+        return ordered[index] * 1000
+    
+    def summary(self) -> Dict[str, Any]:
+        """Get p50/p99 summary in milliseconds"""
+        p50 = self.percentile(50)
+        p99 = self.percentile(99)
+        return {
+            'p50_ms': round(p50, 3) if p50 is not None else None,
+            'p99_ms': round(p99, 3) if p99 is not None else None,
+            'samples': len(self.samples),
+            'total': self.count
+        }
+
 
 class MQL5Bridge:
     """Bridge between Python trading engine and MQL5 EA"""
     
-    def __init__(self, port: int = 5500, host: str = "127.0.0.1"):
+    def __init__(self, port: int = 5500, host: str = "127.0.0.1",
+                 transport: str = TRANSPORT_REP, pub_port: Optional[int] = None,
+                 journal_path: Optional[str] = None):
         """
         Initialize MQL5 Bridge
         
         Args:
             port: ZeroMQ port number
             host: Host address (default: localhost)
+            transport: 'REP' (one EA at a time) or 'ROUTER' (many EAs concurrently)
+            pub_port: Port for pushing signals to subscribed EAs (None = polling only)
+            journal_path: Write-ahead journal for the signal queue (None = in-memory only)
         """
+        transport = transport.upper()
+        if transport not in TRANSPORTS:
+            raise ValueError(f"Unknown transport: {transport} (expected one of {', '.join(TRANSPORTS)})")
+        
         self.port = port
         self.host = host
+        self.transport = transport
+        self.pub_port = pub_port
         self.context = None
         self.socket = None
+        self.poller = None
         self.running = False
-        self.signal_manager = SignalManager()
+        self.journal_path = journal_path
+        journal = SignalJournal(journal_path) if journal_path else None
+        self.signal_manager = SignalManager(journal=journal)
         self.connection_status = "disconnected"
         self.last_heartbeat = None
         self.heartbeat_timeout = 30  # seconds
+        self.client_expiry = 10 * self.heartbeat_timeout  # forget silent ROUTER clients
+        self.shutdown_timeout = 5  # seconds to wait for the loop to exit on stop()
+        
+        # Wake-up channel used by stop() to interrupt the poller immediately
+        self._control = None
+        self._control_address = f"inproc://mql5-bridge-control-{id(self)}"
+        self._stopped = threading.Event()
+        self._stopped.set()
+        
+        # Request-handling latency (receive -> reply sent)
+        self.latency = LatencyTracker()
+        
+        # Push delivery: the PUB socket is only ever used under _publish_lock, so
+        # send_signal() may publish from any thread. Published signals wait in
+        # _pending_acks (signal_id -> publish time) until the EA sends ACK;
+        # GET_SIGNALS skips them for ack_timeout seconds so an EA that both
+        # subscribes and polls does not get them twice.
+        self.publisher = None
+        self._publish_lock = threading.Lock()
+        self._pending_acks: "OrderedDict[str, float]" = OrderedDict()
+        self.ack_timeout = 10.0  # seconds before an unacknowledged push is served to pollers
+        self.ack_latency = LatencyTracker()
+        
+        # Per-EA state in ROUTER mode, keyed by ZMQ identity
+        self.clients: Dict[bytes, Dict[str, Any]] = {}
+        self._clients_lock = threading.Lock()
         
         # Statistics
         self.stats = {
             'signals_sent': 0,
             'signals_received': 0,
+            'signals_published': 0,
+            'signals_acked': 0,
             'errors': 0,
             'reconnections': 0
         }
@@ -64,14 +185,32 @@ class MQL5Bridge:
         """Start the bridge server"""
         try:
             self.context = zmq.Context()
-            self.socket = self.context.socket(zmq.REP)
+            socket_type = zmq.ROUTER if self.transport == TRANSPORT_ROUTER else zmq.REP
+            self.socket = self.context.socket(socket_type)
+            self.socket.setsockopt(zmq.LINGER, 0)
             bind_address = f"tcp://{self.host}:{self.port}"
             self.socket.bind(bind_address)
-            self.socket.setsockopt(zmq.RCVTIMEO, 5000)  # 5 second timeout
             
+            if self.pub_port is not None:
+                publisher = self.context.socket(zmq.PUB)
+                publisher.setsockopt(zmq.LINGER, 0)
+                publisher.bind(f"tcp://{self.host}:{self.pub_port}")
+                with self._publish_lock:
+                    self.publisher = publisher
+                logger.info(f"Signal publisher bound on tcp://{self.host}:{self.pub_port}")
+            
+            self._control = self.context.socket(zmq.PAIR)
+            self._control.setsockopt(zmq.LINGER, 0)
+            self._control.bind(self._control_address)
+            
+            self.poller = zmq.Poller()
+            self.poller.register(self.socket, zmq.POLLIN)
+            self.poller.register(self._control, zmq.POLLIN)
+            
+            self._stopped.clear()
             self.running = True
             self.connection_status = "listening"
-            logger.info(f"MQL5 Bridge started on {bind_address}")
+            logger.info(f"MQL5 Bridge started on {bind_address} ({self.transport})")
             
             # Start heartbeat monitor
             heartbeat_thread = threading.Thread(target=self._monitor_heartbeat, daemon=True)
@@ -83,67 +222,165 @@ class MQL5Bridge:
         except Exception as e:
             logger.error(f"Failed to start bridge: {e}")
             self.connection_status = "error"
+            self._close_sockets()
+            self._stopped.set()
             raise
     
     def _run(self):
-        """Main bridge loop"""
-        while self.running:
-            try:
-                # Wait for request from MQL5 EA
-                try:
-                    message = self.socket.recv_string(zmq.NOBLOCK)
-                except zmq.Again:
-                    time.sleep(0.1)
-                    continue
-                
-                # Parse request
-                try:
-                    request = json.loads(message)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON received: {e}")
-                    response = {'status': 'ERROR', 'message': 'Invalid JSON'}
-                    self.socket.send_string(json.dumps(response))
-                    continue
-                
-                # Process request
-                response = self._process_request(request)
+        """Main bridge loop - blocks in the poller until a request or stop() arrives"""
+        try:
+            while self.running:
+                events = dict(self.poller.poll())
                 
-                # Send response
-                self.socket.send_string(json.dumps(response))
+                if self._control in events:
+                    self._control.recv()
+                    break
                 
-            except Exception as e:
-                logger.error(f"Bridge error: {e}")
-                self.stats['errors'] += 1
-                if self.running:
-                    response = {'status': 'ERROR', 'message': str(e)}
-                    try:
-                        self.socket.send_string(json.dumps(response))
-                    except:
-                        pass
-                time.sleep(1)
+                if self.socket in events:
+                    self._handle_request()
+        finally:
+            self._close_sockets()
+            self._stopped.set()
+    
+    def _handle_request(self):
+        """
+        Receive one request, process it and send the reply
+        
+        Never raises: a failure at any step is logged and counted, and the
+        loop keeps serving (a failed receive leaves nothing to answer, a reply
+        that cannot be encoded is replaced by a JSON error reply).
+        """
+        try:
+            if self.transport == TRANSPORT_ROUTER:
+                # [identity, (empty delimiter from REQ peers,) payload]
+                frames = self.socket.recv_multipart()
+                envelope = frames[:-1]
+                payload = frames[-1]
+                client = self._touch_client(frames[0])
+            else:
+                envelope = None
+                payload = self.socket.recv()
+                client = None
+        except Exception as e:
+            logger.error(f"Failed to receive request: {e}")
+            self.stats['errors'] += 1
+            return
+        started = time.perf_counter()
+        
+        # Replies use the request's format unless it asks for another one
+        fmt = FORMAT_JSON
+        try:
+            # Parse request
+            try:
+                request, fmt = decode_message(payload)
+            except WireFormatError as e:
+                logger.error(f"{e} received: {e.__cause__}")
+                response = {'status': 'ERROR', 'message': str(e)}
+            else:
+                fmt = str(request.get('format', fmt)).lower()
+                if fmt not in available_formats():
+                    # Refuse before processing so no signals are drained into an unsendable reply
+                    response = {'status': 'ERROR', 'message': f"Unsupported format: {fmt}"}
+                    fmt = FORMAT_JSON
+                else:
+                    # Process request
+                    response = self._process_request(request, client)
+        except Exception as e:
+            logger.error(f"Bridge error: {e}")
+            self.stats['errors'] += 1
+            response = {'status': 'ERROR', 'message': str(e)}
+        
+        try:
+            reply = encode_message(response, fmt)
+        except Exception as e:
+            logger.error(f"Failed to encode {fmt} reply: {e}")
+            self.stats['errors'] += 1
+            reply = encode_message({'status': 'ERROR', 'message': f"Failed to encode reply: {e}"}, FORMAT_JSON)
+        
+        # Send response (REP socket must always answer before the next recv)
+        try:
+            if envelope is not None:
+                self.socket.send_multipart(envelope + [reply])
+            else:
+                self.socket.send(reply)
+        except zmq.ZMQError as e:
+            logger.error(f"Failed to send reply: {e}")
+            self.stats['errors'] += 1
+            return
+        self.latency.record(time.perf_counter() - started)
+    
+    def _touch_client(self, identity: bytes) -> Dict[str, Any]:
+        """
+        Get (or register) the state of a ROUTER client
+        
+        Args:
+            identity: ZMQ routing identity of the EA connection
+            
+        Returns:
+            Client state dictionary
+        """
+        now = datetime.now()
+        with self._clients_lock:
+            client = self.clients.get(identity)
+            if client is None:
+                client = {
+                    'identity': identity.hex(),
+                    'broker': None,
+                    'connection_status': 'connected',
+                    'last_heartbeat': None,
+                    'last_seen': now,
+                    'requests': 0
+                }
+                self.clients[identity] = client
+                logger.info(f"New EA client connected: {client['identity']}")
+            client['last_seen'] = now
+            client['requests'] += 1
+            return client
     
-    def _process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+    def _close_sockets(self):
+        """Close sockets owned by the bridge loop thread"""
+        with self._publish_lock:
+            if self.publisher is not None:
+                self.publisher.close(linger=0)
+            self.publisher = None
+        for sock in (self.socket, self._control):
+            if sock is not None:
+                sock.close(linger=0)
+        self.socket = None
+        self._control = None
+        self.poller = None
+    
+    def _process_request(self, request: Dict[str, Any],
+                         client: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Process request from MQL5 EA
         
         Args:
             request: Request dictionary
+            client: ROUTER client state (None in REP mode)
             
         Returns:
             Response dictionary
         """
         action = request.get('action', '').upper()
         
+        # EAs announce their broker on any request; it sticks to the connection
+        if client is not None and request.get('broker'):
+            client['broker'] = str(request['broker']).upper()
+        
         if action == 'GET_SIGNALS':
-            # Return pending trade signals
+            # Return pending trade signals (only this EA's broker in ROUTER mode)
             count = request.get('count', None)
-            signals = self.signal_manager.get_signals(count)
-            signal_dicts = [s.to_dict() for s in signals]
+            broker = request.get('broker') or (client['broker'] if client else None)
+            if client is not None and broker is None:
+                # Without a broker a ROUTER client would drain every EA's signals
+                return {'status': 'ERROR', 'message': "Unknown broker: send 'broker' with the request"}
+            signals = self.signal_manager.get_signals(count, broker=broker, exclude=self._awaiting_ack())
             self.stats['signals_sent'] += len(signals)
             logger.info(f"Sending {len(signals)} signals to MQL5")
             return {
                 'status': 'OK',
-                'signals': signal_dicts,
+                'signals': signals,  # encoded from each signal's cached form
                 'queue_size': self.signal_manager.get_queue_size()
             }
         
@@ -151,21 +388,31 @@ class MQL5Bridge:
             # Receive status from MQL5
             status = request.get('status', '')
             message = request.get('message', '')
-            self.last_heartbeat = datetime.now()
-            self.connection_status = "connected"
+            self._mark_heartbeat(client)
             logger.debug(f"MQL5 Status: {status} - {message}")
             return {'status': 'OK'}
         
         elif action == 'HEARTBEAT':
             # Heartbeat from MQL5
-            self.last_heartbeat = datetime.now()
-            self.connection_status = "connected"
+            self._mark_heartbeat(client)
             return {
                 'status': 'OK',
                 'timestamp': datetime.now().isoformat(),
                 'queue_size': self.signal_manager.get_queue_size()
             }
         
+        elif action == 'ACK':
+            # Delivery confirmation for pushed (or polled) signals
+            signal_ids = list(request.get('signal_ids') or [])
+            if request.get('signal_id'):
+                signal_ids.append(request['signal_id'])
+            acked = self._acknowledge(signal_ids)
+            return {
+                'status': 'OK',
+                'acked': acked,
+                'queue_size': self.signal_manager.get_queue_size()
+            }
+        
         elif action == 'GET_BRIDGE_STATUS':
             # Get bridge status
             return {
@@ -180,6 +427,15 @@ class MQL5Bridge:
             logger.warning(f"Unknown action: {action}")
             return {'status': 'ERROR', 'message': f'Unknown action: {action}'}
     
+    def _mark_heartbeat(self, client: Optional[Dict[str, Any]] = None):
+        """Record a heartbeat for the bridge and, in ROUTER mode, for the client"""
+        now = datetime.now()
+        self.last_heartbeat = now
+        self.connection_status = "connected"
+        if client is not None:
+            client['last_heartbeat'] = now
+            client['connection_status'] = "connected"
+    
     def send_signal(self, signal: TradeSignal) -> tuple[bool, Optional[str]]:
         """
         Send trade signal to MQL5
@@ -193,44 +449,160 @@ class MQL5Bridge:
         success, error = self.signal_manager.add_signal(signal)
         if success:
             logger.info(f"Signal queued: {signal.action} {signal.symbol} @ {signal.broker}")
+            self._publish(signal)
         else:
             logger.warning(f"Failed to queue signal: {error}")
         return success, error
     
+    def _publish(self, signal: TradeSignal):
+        """
+        Push a queued signal to subscribed EAs
+        
+        The signal stays in the queue until it is acknowledged, so an EA that
+        missed the publication (slow joiner, reconnect) still gets it from
+        GET_SIGNALS once ack_timeout has passed without an ACK.
+        """
+        with self._publish_lock:
+            if self.publisher is None:
+                return
+            topic = signal_topic(signal.broker, signal.symbol)
+            try:
+                self.publisher.send_multipart([topic.encode('utf-8'), signal.to_json().encode('utf-8')])
+            except zmq.ZMQError as e:
+                logger.error(f"Failed to publish signal {signal.signal_id}: {e}")
+                self.stats['errors'] += 1
+                return
+            self._pending_acks[signal.signal_id] = time.perf_counter()
+            while len(self._pending_acks) > self.signal_manager.max_queue_size:
+                self._pending_acks.popitem(last=False)
+            self.stats['signals_published'] += 1
+    
+    def _awaiting_ack(self) -> Set[str]:
+        """IDs of signals pushed less than ack_timeout seconds ago and not yet acknowledged"""
+        cutoff = time.perf_counter() - self.ack_timeout
+        awaiting = set()
+        with self._publish_lock:
+            # Newest first: stop at the first push older than the cutoff
+            for signal_id in reversed(self._pending_acks):
+                if self._pending_acks[signal_id] < cutoff:
+                    break
+                awaiting.add(signal_id)
+        return awaiting
+    
+    def _acknowledge(self, signal_ids: List[str]) -> int:
+        """
+        Confirm delivery of signals and take them off the queue
+        
+        Args:
+            signal_ids: IDs reported by the EA
+            
+        Returns:
+            Number of signals acknowledged
+        """
+        acked = 0
+        now = time.perf_counter()
+        for signal_id in signal_ids:
+            with self._publish_lock:
+                published_at = self._pending_acks.pop(signal_id, None)
+            removed = self.signal_manager.remove_signal(signal_id)
+            if published_at is None and removed is None:
+                continue
+            if published_at is not None:
+                self.ack_latency.record(now - published_at)
+            acked += 1
+        self.stats['signals_acked'] += acked
+        if acked:
+            logger.info(f"MQL5 acknowledged {acked} signal(s)")
+        return acked
+    
     def _monitor_heartbeat(self):
         """Monitor MQL5 connection heartbeat"""
-        while self.running:
-            time.sleep(5)
+        while not self._stopped.wait(5):
             if self.last_heartbeat:
                 elapsed = (datetime.now() - self.last_heartbeat).total_seconds()
                 if elapsed > self.heartbeat_timeout:
                     self.connection_status = "disconnected"
                     logger.warning(f"MQL5 connection lost (no heartbeat for {elapsed:.1f}s)")
+            self._check_clients()
+    
+    def _check_clients(self):
+        """Mark silent ROUTER clients disconnected and forget long-gone ones"""
+        now = datetime.now()
+        with self._clients_lock:
+            for identity, client in list(self.clients.items()):
+                last = client['last_heartbeat'] or client['last_seen']
+                elapsed = (now - last).total_seconds()
+                if elapsed > self.client_expiry:
+                    del self.clients[identity]
+                    logger.info(f"EA client {client['identity']} expired")
+                elif elapsed > self.heartbeat_timeout and client['connection_status'] == "connected":
+                    client['connection_status'] = "disconnected"
+                    logger.warning(f"EA client {client['identity']} ({client['broker']}) "
+                                   f"lost (no heartbeat for {elapsed:.1f}s)")
     
     def stop(self):
-        """Stop the bridge"""
+        """Stop the bridge and wait for the loop to release its sockets"""
         self.running = False
-        if self.socket:
-            self.socket.close()
+        if self.context and not self._stopped.is_set():
+            # Wake the poller so the loop thread closes its own sockets
+            wakeup = self.context.socket(zmq.PAIR)
+            wakeup.setsockopt(zmq.LINGER, 0)
+            wakeup.connect(self._control_address)
+            try:
+                wakeup.send(b"STOP", zmq.NOBLOCK)
+            except zmq.Again:
+                pass  # The loop already saw running=False and closed its end
+            wakeup.close()
+            if not self._stopped.wait(self.shutdown_timeout):
+                logger.warning("Bridge loop did not exit in time, forcing shutdown")
         if self.context:
-            self.context.term()
+            if self._stopped.is_set():
+                self.context.term()
+            else:
+                self.context.destroy(linger=0)
+            self.context = None
+        self.signal_manager.close()
         self.connection_status = "stopped"
         logger.info("MQL5 Bridge stopped")
     
+    def get_clients(self) -> List[Dict[str, Any]]:
+        """Get state of connected ROUTER clients"""
+        with self._clients_lock:
+            clients = [client.copy() for client in self.clients.values()]
+        for client in clients:
+            for key in ('last_heartbeat', 'last_seen'):
+                if client[key] is not None:
+                    client[key] = client[key].isoformat()
+        return clients
+    
     def get_status(self) -> Dict[str, Any]:
         """Get bridge status"""
         return {
             'connection_status': self.connection_status,
+            'transport': self.transport,
+            'clients': self.get_clients(),
             'queue_size': self.signal_manager.get_queue_size(),
+            'queue_lanes': self.signal_manager.get_lane_sizes(),
             'stats': self.stats.copy(),
+            'latency': self.latency.summary(),
+            'dedup': self.signal_manager.get_dedup_stats(),
+            'journal': self.signal_manager.get_journal_stats(),
+            'push': {
+                'enabled': self.pub_port is not None,
+                'pub_port': self.pub_port,
+                'pending_acks': len(self._pending_acks),
+                'ack_latency': self.ack_latency.summary()
+            },
             'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None
         }
 
 
 # Convenience function for standalone usage
-def start_bridge(port: int = 5500, host: str = "127.0.0.1"):
+def start_bridge(port: int = 5500, host: str = "127.0.0.1", transport: str = TRANSPORT_REP,
+                 pub_port: Optional[int] = None, journal_path: Optional[str] = None):
     """Start bridge server (for standalone usage)"""
-    bridge = MQL5Bridge(port=port, host=host)
+    bridge = MQL5Bridge(port=port, host=host, transport=transport, pub_port=pub_port,
+                        journal_path=journal_path)
     try:
         bridge.start()
     except KeyboardInterrupt:
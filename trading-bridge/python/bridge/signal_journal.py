@@ -0,0 +1,320 @@
+"""
+Signal Journal
+Append-only write-ahead log for the signal queue with group commit and replay
+"""
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .signal_manager import TradeSignal
+
+
+logger = logging.getLogger(__name__)
+
+# Record types (one JSON object per line)
+OP_ENQUEUE = "E"  # {"op": "E", "signal": {...}}
+OP_DEQUEUE = "D"  # {"op": "D", "ids": [...]}  handed to an EA by GET_SIGNALS
+OP_ACK = "A"      # {"op": "A", "ids": [...]}  confirmed by an EA
+OP_SEEN = "S"     # {"op": "S", "ids": [...]}  dedup IDs carried over by compaction
+
+
+class SignalJournal:
+    """
+    Durable journal of signal queue events
+
+    Records are appended to an in-memory buffer and written by a background
+    flusher every `flush_interval` seconds with a single write + fsync for the
+    whole batch (group commit), so the cost per signal is a string append
+    rather than an fsync. Callers that need to know a record is on disk can
+    wait_durable() on the sequence number append() returned; every caller
+    waiting on the same batch shares its fsync.
+
+    On startup replay() rebuilds the pending queue (enqueued but not yet
+    dequeued or acknowledged) and the set of signal IDs already seen, and
+    rewrite() compacts the file down to that state. Compaction while running
+    is split in two: begin_compaction() marks where the caller's snapshot of
+    the queue is taken (cheap, under the caller's lock), and rewrite() writes
+    that snapshot out afterwards while producers keep appending; records
+    appended after the mark are carried over into the new file.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.01, fsync: bool = True,
+                 compact_bytes: int = 64 * 1024 * 1024):
+        """
+        Initialize SignalJournal
+
+        Args:
+            path: Journal file path
+            flush_interval: Seconds between group commits
+            fsync: fsync after each group commit (False = OS page cache only)
+            compact_bytes: File size that makes needs_compaction() true
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.compact_bytes = compact_bytes
+
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._durable = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()
+        self._appended_seq = 0
+        self._durable_seq = 0
+        self._file = None
+        self._size = 0  # bytes on disk
+        self._compacting = False
+        self._superseded: List[str] = []  # records covered by the snapshot being written
+        self._closing = threading.Event()
+        self._thread = None
+
+        self.stats = {
+            'records': 0,
+            'group_commits': 0,
+            'bytes_written': 0,
+            'compactions': 0,
+            'replayed_pending': 0,
+            'replay_errors': 0
+        }
+
+    def replay(self) -> Tuple[List[TradeSignal], List[str]]:
+        """
+        Read the journal and rebuild queue state
+
+        Returns:
+            (pending signals in enqueue order, every signal ID seen)
+        """
+        pending: "OrderedDict[str, TradeSignal]" = OrderedDict()
+        seen: "OrderedDict[str, None]" = OrderedDict()
+        if not self.path.exists():
+            return [], []
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    op = record['op']
+                    if op == OP_ENQUEUE:
+                        signal = TradeSignal.from_dict(record['signal'])
+                        pending[signal.signal_id] = signal
+                        seen[signal.signal_id] = None
+                    elif op in (OP_DEQUEUE, OP_ACK):
+                        for signal_id in record['ids']:
+                            pending.pop(signal_id, None)
+                    elif op == OP_SEEN:
+                        for signal_id in record['ids']:
+                            seen[signal_id] = None
+                except (ValueError, KeyError, TypeError) as e:
+                    # A torn final line is expected after a crash mid-write
+                    self.stats['replay_errors'] += 1
+                    logger.warning(f"Skipping bad journal record at line {line_number}: {e}")
+
+        self.stats['replayed_pending'] = len(pending)
+        logger.info(f"Journal replayed: {len(pending)} pending signal(s), {len(seen)} known ID(s)")
+        return list(pending.values()), list(seen)
+
+    def open(self):
+        """Open the journal for appending and start the group-commit flusher"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'ab')
+        self._size = self.path.stat().st_size
+        self._closing.clear()
+        self._thread = threading.Thread(target=self._flush_loop, name="signal-journal", daemon=True)
+        self._thread.start()
+
+    def append(self, record: str) -> int:
+        """
+        Buffer one encoded record
+
+        Args:
+            record: One JSON object, without trailing newline
+
+        Returns:
+            Sequence number to pass to wait_durable()
+        """
+        with self._lock:
+            self._buffer.append(record)
+            self._appended_seq += 1
+            self.stats['records'] += 1
+            return self._appended_seq
+
+    def record_enqueue(self, signal: TradeSignal) -> int:
+        """Journal a queued signal (reuses the signal's cached JSON)"""
+        return self.append(f'{{"op": "{OP_ENQUEUE}", "signal": {signal.to_json()}}}')
+
+    def record_dequeue(self, signal_ids: Iterable[str]) -> int:
+        """Journal signals handed out by GET_SIGNALS"""
+        return self.append(json.dumps({'op': OP_DEQUEUE, 'ids': list(signal_ids)}))
+
+    def record_ack(self, signal_ids: Iterable[str]) -> int:
+        """Journal signals acknowledged by an EA"""
+        return self.append(json.dumps({'op': OP_ACK, 'ids': list(signal_ids)}))
+
+    def wait_durable(self, seq: int, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a record is on disk
+
+        Args:
+            seq: Sequence number returned by append()
+            timeout: Seconds to wait (None = indefinitely)
+
+        Returns:
+            True if the record is durable
+        """
+        with self._durable:
+            return self._durable.wait_for(lambda: self._durable_seq >= seq, timeout)
+
+    def flush(self):
+        """Write and fsync everything buffered so far (one group commit)"""
+        with self._io_lock:
+            with self._lock:
+                if self._compacting:
+                    # Records after the mark belong in the compacted file; rewrite() writes them
+                    return
+                lines = self._buffer
+                self._buffer = []
+                seq = self._appended_seq
+            self._write(lines)
+            with self._durable:
+                self._durable_seq = seq
+                self._durable.notify_all()
+    
+    def _write(self, lines: List[str]):
+        """Append records to the open file and fsync them (caller holds _io_lock)"""
+        if not lines or self._file is None:
+            return
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+        self._file.write(data)
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self._size += len(data)
+        self.stats['bytes_written'] += len(data)
+        self.stats['group_commits'] += 1
+
+    def _flush_loop(self):
+        """Group-commit loop"""
+        while not self._closing.wait(self.flush_interval):
+            try:
+                self.flush()
+            except OSError as e:
+                logger.error(f"Journal flush failed: {e}")
+
+    def needs_compaction(self) -> bool:
+        """Check whether the file has grown past compact_bytes"""
+        return self._size >= self.compact_bytes
+
+    def begin_compaction(self) -> Optional[int]:
+        """
+        Mark the point a compaction snapshot is taken at
+
+        Call while holding the lock that keeps the caller's queue consistent
+        with the records appended so far, take the snapshot under the same
+        lock, then pass both to rewrite() after releasing it. Until rewrite()
+        finishes, the flusher leaves new records in the buffer.
+
+        Returns:
+            Sequence number the snapshot covers, or None if a compaction is
+            already running
+        """
+        with self._lock:
+            if self._compacting:
+                return None
+            self._compacting = True
+            self._superseded = self._buffer
+            self._buffer = []
+            return self._appended_seq
+
+    def rewrite(self, pending: Iterable[TradeSignal], seen_ids: Iterable[str],
+                seq: Optional[int] = None):
+        """
+        Atomically replace the journal with a compacted snapshot
+
+        Without `seq` the snapshot is marked here, so the caller must hold
+        whatever lock keeps `pending` and `seen_ids` consistent with the
+        records appended so far (as on startup). With the `seq` returned by
+        begin_compaction() the snapshot can be written without that lock:
+        records appended since the mark follow it in the new file.
+
+        Args:
+            pending: Signals still queued at the mark, in order
+            seen_ids: Signal IDs that must stay deduplicated
+            seq: Sequence number returned by begin_compaction()
+
+        Raises:
+            OSError: If the snapshot cannot be written (the old file is kept,
+                     as on any other error, e.g. a signal failing to encode)
+        """
+        if seq is None:
+            seq = self.begin_compaction()
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with self._io_lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    seen_ids = list(seen_ids)
+                    if seen_ids:
+                        f.write(json.dumps({'op': OP_SEEN, 'ids': seen_ids}) + '\n')
+                    for signal in pending:
+                        f.write(f'{{"op": "{OP_ENQUEUE}", "signal": {signal.to_json()}}}\n')
+                    f.flush()
+                    os.fsync(f.fileno())
+                reopen = self._file is not None
+                if reopen:
+                    self._file.close()
+                os.replace(tmp_path, self.path)
+                self._size = self.path.stat().st_size
+                if reopen:
+                    self._file = open(self.path, 'ab')
+            except BaseException:
+                # Keep journaling to the old file, superseded records included
+                if self._file is not None and self._file.closed:
+                    self._file = open(self.path, 'ab')
+                with self._lock:
+                    self._buffer[:0] = self._superseded
+                    self._superseded = []
+                    self._compacting = False
+                raise
+            with self._lock:
+                self._superseded = []
+                self._compacting = False
+                if self._file is None:
+                    # Not open yet (startup): later records stay buffered for open()
+                    lines, appended = [], seq
+                else:
+                    lines, appended = self._buffer, self._appended_seq
+                    self._buffer = []
+            self.stats['compactions'] += 1
+            self._write(lines)
+            with self._durable:
+                self._durable_seq = appended
+                self._durable.notify_all()
+
+    def close(self):
+        """Flush remaining records and stop the flusher"""
+        self._closing.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._io_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get journal counters"""
+        with self._lock:
+            return {
+                'path': str(self.path),
+                'size_bytes': self._size,
+                'buffered': len(self._buffer),
+                'durable_seq': self._durable_seq,
+                **self.stats
+            }
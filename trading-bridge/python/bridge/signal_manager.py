@@ -2,11 +2,23 @@
 Trade Signal Manager
 Manages trade signals, validation, and queue operations
 """
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any
+from collections import deque, OrderedDict
+from dataclasses import dataclass, field, fields
+from itertools import islice
+from typing import AbstractSet, Deque, Iterator, List, Optional, Dict, Any, Tuple, TYPE_CHECKING
 from datetime import datetime
-from enum import Enum
+from enum import Enum, IntEnum
 import json
+import logging
+import sys
+import threading
+import time
+
+if TYPE_CHECKING:
+    from .signal_journal import SignalJournal
+
+
+logger = logging.getLogger(__name__)
 
 
 class TradeAction(Enum):
@@ -17,9 +29,35 @@ class TradeAction(Enum):
     MODIFY = "MODIFY"
 
 
-@dataclass
+_INTERNED_FIELDS = ('symbol', 'action', 'broker')
+
+
+class SignalPriority(IntEnum):
+    """Queue lanes, drained lowest value first"""
+    CLOSE = 0   # Protective exits go first
+    MODIFY = 1  # SL/TP changes
+    ENTRY = 2   # New BUY/SELL positions
+
+
+ACTION_PRIORITY = {
+    TradeAction.CLOSE.value: SignalPriority.CLOSE,
+    TradeAction.MODIFY.value: SignalPriority.MODIFY,
+    TradeAction.BUY.value: SignalPriority.ENTRY,
+    TradeAction.SELL.value: SignalPriority.ENTRY,
+}
+
+
+@dataclass(slots=True)
 class TradeSignal:
-    """Trade signal data structure"""
+    """
+    Trade signal data structure
+    
+    Slotted to keep long histories compact; symbol, action and broker are
+    interned so thousands of signals share one copy of each string. The JSON
+    form is built once (when the signal validates, or on first use) and
+    reused for the wire, push delivery and logging; assigning any field
+    drops the cached form.
+    """
     symbol: str
     action: str  # BUY, SELL, CLOSE, MODIFY
     broker: str
@@ -29,6 +67,7 @@ class TradeSignal:
     comment: str = ""
     timestamp: Optional[datetime] = None
     signal_id: Optional[str] = None
+    _json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Initialize timestamp and signal_id if not provided"""
@@ -36,17 +75,28 @@ class TradeSignal:
             self.timestamp = datetime.now()
         if self.signal_id is None:
             self.signal_id = f"{self.symbol}_{self.action}_{int(self.timestamp.timestamp())}"
+        for name in _INTERNED_FIELDS:
+            value = getattr(self, name)
+            if type(value) is str:
+                object.__setattr__(self, name, sys.intern(value))
+    
+    def __setattr__(self, name: str, value: Any):
+        object.__setattr__(self, name, value)
+        if name[0] != '_':
+            object.__setattr__(self, '_json', None)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert signal to dictionary"""
-        data = asdict(self)
+        data = {name: getattr(self, name) for name in _SIGNAL_FIELDS}
         if isinstance(data['timestamp'], datetime):
             data['timestamp'] = data['timestamp'].isoformat()
         return data
     
     def to_json(self) -> str:
-        """Convert signal to JSON string"""
-        return json.dumps(self.to_dict())
+        """Convert signal to JSON string (cached)"""
+        if self._json is None:
+            object.__setattr__(self, '_json', json.dumps(self.to_dict()))
+        return self._json
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TradeSignal':
@@ -61,6 +111,11 @@ class TradeSignal:
         data = json.loads(json_str)
         return cls.from_dict(data)
     
+    @property
+    def priority(self) -> SignalPriority:
+        """Queue lane for this signal"""
+        return ACTION_PRIORITY.get(self.action.upper(), SignalPriority.ENTRY)
+    
     def validate(self) -> tuple[bool, Optional[str]]:
         """
         Validate signal parameters
@@ -99,25 +154,224 @@ class TradeSignal:
             if self.stop_loss <= self.take_profit:
                 return False, "Stop loss must be greater than take profit for SELL"
         
+        # Serialize once now, on the producer's thread, instead of per consumer
+        self.to_json()
         return True, None
 
 
+# Public fields, in declaration order (excludes the serialization caches)
+_SIGNAL_FIELDS = tuple(f.name for f in fields(TradeSignal) if not f.name.startswith('_'))
+
+
+class DedupWindow:
+    """
+    Bounded, time-expiring set of seen signal IDs (TTL + LRU)
+    
+    IDs are kept in insertion order with the time they were last seen. Entries
+    older than `ttl` seconds are dropped from the front lazily, and the oldest
+    entry is dropped when `max_size` is reached, so memory stays flat however
+    long the process runs. Membership is exact: there are no false positives,
+    only IDs that have aged out of the window are forgotten.
+    """
+    
+    # Approximate per-entry overhead of the OrderedDict (hash slot + links + float)
+    _ENTRY_OVERHEAD = 100
+    
+    def __init__(self, ttl: Optional[float] = 86400, max_size: int = 100000):
+        """
+        Initialize DedupWindow
+        
+        Args:
+            ttl: Seconds an ID is remembered (None = no time limit)
+            max_size: Maximum number of IDs remembered
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, float]" = OrderedDict()
+        self._key_bytes = 0
+        self.stats = {
+            'added': 0,
+            'duplicates': 0,
+            'expired': 0,
+            'evicted': 0
+        }
+    
+    def _expire(self, now: float):
+        """Drop entries older than the TTL from the front"""
+        if self.ttl is None:
+            return
+        cutoff = now - self.ttl
+        while self._entries:
+            seen = next(iter(self._entries.values()))
+            if seen > cutoff:
+                break
+            self._drop_oldest()
+            self.stats['expired'] += 1
+    
+    def _drop_oldest(self):
+        """Remove the least recently seen entry"""
+        key, _ = self._entries.popitem(last=False)
+        self._key_bytes -= sys.getsizeof(key)
+    
+    def __contains__(self, key: str) -> bool:
+        seen = self._entries.get(key)
+        if seen is None:
+            return False
+        return self.ttl is None or time.monotonic() - seen < self.ttl
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+    
+    def add(self, key: str):
+        """Remember an ID (refreshes its age if already present)"""
+        now = time.monotonic()
+        self._expire(now)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        else:
+            while len(self._entries) >= self.max_size:
+                self._drop_oldest()
+                self.stats['evicted'] += 1
+            self._key_bytes += sys.getsizeof(key)
+            self.stats['added'] += 1
+        self._entries[key] = now
+    
+    def record_duplicate(self):
+        """Count a rejected duplicate"""
+        self.stats['duplicates'] += 1
+    
+    def clear(self):
+        """Forget every ID"""
+        self._entries.clear()
+        self._key_bytes = 0
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get window size, eviction counters and approximate memory use"""
+        self._expire(time.monotonic())
+        return {
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl_seconds': self.ttl,
+            **self.stats,
+            'memory_bytes': self._key_bytes + len(self._entries) * self._ENTRY_OVERHEAD
+        }
+
+
 class SignalManager:
-    """Manages trade signal queue and history"""
+    """
+    Manages trade signal queue and history
+    
+    The queue is an insertion-ordered dict keyed by signal_id, so enqueue,
+    dequeue from the front and removal by ID are all O(1). History is a
+    bounded deque with an ID index; trimming happens as old entries fall off
+    the left end instead of by re-slicing the list.
     
-    def __init__(self, max_queue_size: int = 1000, max_history: int = 10000):
+    Every queued signal is also filed in a priority lane (CLOSE > MODIFY >
+    entries) and in a per-broker lane of the same priority, each of them an
+    insertion-ordered dict. get_signals() drains lanes in priority order,
+    FIFO within a lane, so a protective CLOSE never waits behind a burst of
+    MODIFY or entry signals, and a broker-filtered drain of k signals costs
+    O(k) instead of a scan of the whole queue.
+    
+    Thread safety: the manager is shared by the FastAPI handlers, the trader
+    and the bridge thread. Every read or write of queue, history, the history
+    index and the dedup window happens while holding `_lock` (shared with the
+    condition `_not_empty` that blocked consumers wait on), so a
+    check-then-append such as "queue not full -> add" is atomic and every
+    thread sees the state left by the previous holder. get_queue_size() reads
+    len() without the lock; it is a snapshot that may be stale immediately.
+    Validation runs before the lock is taken and each critical section is a
+    handful of O(1) dict/deque operations (O(k) for a batch of k), so
+    producers only contend for microseconds. Consumers may block in
+    get_signals(timeout=...) and are woken as soon as a producer enqueues.
+    
+    Durability: with a SignalJournal attached, every enqueue, dequeue and
+    acknowledgement is appended to the journal inside the same critical
+    section (so the log order matches the queue order) and written by the
+    journal's group-commit flusher. On construction the journal is replayed:
+    signals that were queued but never delivered are queued again and every
+    ID seen before the restart stays deduplicated. By default producers do
+    not wait for the fsync (at most `flush_interval` of signals can be lost
+    on a crash); journal_wait=True makes add_signal() return only once the
+    signal is on disk. When the journal outgrows its compaction size, the
+    queue and dedup IDs are copied inside the critical section and the
+    producer that crossed the threshold writes the compacted file after
+    releasing the lock.
+    """
+    
+    def __init__(self, max_queue_size: int = 1000, max_history: int = 10000,
+                 dedup_ttl: Optional[float] = 86400, dedup_max_size: int = 100000,
+                 journal: Optional["SignalJournal"] = None, journal_wait: bool = False):
         """
         Initialize SignalManager
         
         Args:
             max_queue_size: Maximum number of signals in queue
             max_history: Maximum number of signals in history
+            dedup_ttl: Seconds a signal ID is remembered for deduplication
+            dedup_max_size: Maximum number of signal IDs remembered for deduplication
+            journal: Write-ahead journal to replay now and append to from then on
+            journal_wait: Wait for the journal fsync before add_signal() returns
         """
-        self.queue: List[TradeSignal] = []
-        self.history: List[TradeSignal] = []
+        self.queue: "OrderedDict[str, TradeSignal]" = OrderedDict()
+        self.history: Deque[TradeSignal] = deque(maxlen=max_history)
         self.max_queue_size = max_queue_size
         self.max_history = max_history
-        self.processed_signals: set = set()  # For deduplication
+        self.processed_signals = DedupWindow(ttl=dedup_ttl, max_size=dedup_max_size)
+        self._history_index: Dict[str, TradeSignal] = {}
+        self._priority_lanes: List["OrderedDict[str, TradeSignal]"] = [OrderedDict() for _ in SignalPriority]
+        self._broker_lanes: Dict[str, List["OrderedDict[str, TradeSignal]"]] = {}
+        # Lane keys chosen at enqueue: action and broker may still be assigned while queued
+        self._placement: Dict[str, Tuple[SignalPriority, str]] = {}
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self.journal = journal
+        self.journal_wait = journal_wait
+        if journal is not None:
+            self._restore(journal)
+    
+    def _restore(self, journal: "SignalJournal"):
+        """Rebuild queue and dedup window from the journal, compact it and open it"""
+        pending, seen_ids = journal.replay()
+        for signal in pending:
+            success, error = self._enqueue(signal)
+            if not success:
+                logger.warning(f"Dropping journaled signal {signal.signal_id}: {error}")
+        for signal_id in seen_ids:
+            self.processed_signals.add(signal_id)
+        journal.rewrite(self.queue.values(), self.processed_signals)
+        journal.open()
+    
+    def _compaction_snapshot(self) -> Optional[tuple]:
+        """
+        Start a journal compaction if the file is large (caller holds the lock)
+        
+        Only the snapshot is taken here; _compact() writes it after the lock
+        is released, so producers and consumers never wait for the rewrite.
+        
+        Returns:
+            (pending signals, seen IDs, journal sequence) or None
+        """
+        if not self.journal.needs_compaction():
+            return None
+        seq = self.journal.begin_compaction()
+        if seq is None:
+            return None
+        return list(self.queue.values()), list(self.processed_signals), seq
+    
+    def _compact(self, snapshot: Optional[tuple]):
+        """Write a snapshot from _compaction_snapshot() to the journal (without the lock)"""
+        if snapshot is None:
+            return
+        try:
+            self.journal.rewrite(*snapshot)
+        except OSError as e:
+            logger.error(f"Journal compaction failed: {e}")
+        except Exception:
+            logger.exception("Journal compaction failed")
     
     def add_signal(self, signal: TradeSignal) -> tuple[bool, Optional[str]]:
         """
@@ -134,53 +388,224 @@ class SignalManager:
         if not is_valid:
             return False, error
         
-        # Check for duplicates
-        if signal.signal_id in self.processed_signals:
+        seq = 0
+        snapshot = None
+        with self._not_empty:
+            result = self._enqueue(signal)
+            if result[0]:
+                if self.journal is not None:
+                    seq = self.journal.record_enqueue(signal)
+                    snapshot = self._compaction_snapshot()
+                self._not_empty.notify()
+        self._compact(snapshot)
+        if seq and self.journal_wait:
+            self.journal.wait_durable(seq)
+        return result
+    
+    def add_signals(self, signals: List[TradeSignal]) -> List[tuple[bool, Optional[str]]]:
+        """
+        Add a batch of signals under a single lock acquisition
+        
+        Args:
+            signals: Trade signals to add, in order
+            
+        Returns:
+            (success, error_message) for each signal, in the same order
+        """
+        validated = [signal.validate() for signal in signals]
+        results = []
+        added = 0
+        seq = 0
+        snapshot = None
+        with self._not_empty:
+            for signal, (is_valid, error) in zip(signals, validated):
+                if not is_valid:
+                    results.append((False, error))
+                    continue
+                result = self._enqueue(signal)
+                if result[0]:
+                    added += 1
+                    if self.journal is not None:
+                        seq = self.journal.record_enqueue(signal)
+                results.append(result)
+            if added:
+                if self.journal is not None:
+                    snapshot = self._compaction_snapshot()
+                self._not_empty.notify_all()
+        self._compact(snapshot)
+        if seq and self.journal_wait:
+            self.journal.wait_durable(seq)
+        return results
+    
+    def _enqueue(self, signal: TradeSignal) -> tuple[bool, Optional[str]]:
+        """Dedup, capacity check and append (caller holds the lock)"""
+        # Check for duplicates (anything still queued or in history always counts,
+        # older IDs only while they are inside the dedup window)
+        if (signal.signal_id in self.queue or
+                signal.signal_id in self._history_index or
+                signal.signal_id in self.processed_signals):
+            self.processed_signals.record_duplicate()
             return False, "Duplicate signal"
         
         # Check queue size
         if len(self.queue) >= self.max_queue_size:
             return False, "Queue is full"
         
-        # Add to queue
-        self.queue.append(signal)
+        # Add to queue and lanes
+        priority = signal.priority
+        broker = signal.broker.upper()
+        if broker not in self._broker_lanes:
+            self._broker_lanes[broker] = [OrderedDict() for _ in SignalPriority]
+        self.queue[signal.signal_id] = signal
+        self._placement[signal.signal_id] = (priority, broker)
+        self._priority_lanes[priority][signal.signal_id] = signal
+        self._broker_lanes[broker][priority][signal.signal_id] = signal
         self.processed_signals.add(signal.signal_id)
         
         return True, None
     
-    def get_signals(self, count: Optional[int] = None) -> List[TradeSignal]:
+    def get_signals(self, count: Optional[int] = None,
+                    broker: Optional[str] = None,
+                    timeout: Optional[float] = 0,
+                    exclude: AbstractSet[str] = frozenset()) -> List[TradeSignal]:
         """
         Get signals from queue
         
         Args:
             count: Number of signals to retrieve (None = all)
+            broker: Only retrieve signals for this broker (None = any broker)
+            timeout: Seconds to wait for at least one signal
+                     (0 = return immediately, None = wait indefinitely)
+            exclude: Signal IDs to leave in the queue (e.g. pushed and awaiting ACK)
             
         Returns:
-            List of trade signals
+            List of trade signals (empty if the timeout expired)
         """
-        if count is None:
-            signals = self.queue.copy()
-            self.queue.clear()
-        else:
-            signals = self.queue[:count]
-            self.queue = self.queue[count:]
-        
-        # Add to history
-        self.history.extend(signals)
+        with self._not_empty:
+            if timeout != 0:
+                self._not_empty.wait_for(lambda: self._has_signals(broker, exclude), timeout)
+            return self._dequeue(count, broker, exclude)
+    
+    def _lanes(self, broker: Optional[str]) -> List["OrderedDict[str, TradeSignal]"]:
+        """Priority lanes of one broker, or of every broker (caller holds the lock)"""
+        if broker is not None:
+            return self._broker_lanes.get(broker.upper(), [])
+        return self._priority_lanes
+    
+    def _has_signals(self, broker: Optional[str], exclude: AbstractSet[str] = frozenset()) -> bool:
+        """Check whether a get_signals() call would return anything (caller holds the lock)"""
+        if exclude:
+            return any(signal_id not in exclude for lane in self._lanes(broker) for signal_id in lane)
+        if broker is None:
+            return bool(self.queue)
+        return any(self._broker_lanes.get(broker.upper(), ()))
+    
+    def _dequeue(self, count: Optional[int], broker: Optional[str],
+                 exclude: AbstractSet[str] = frozenset()) -> List[TradeSignal]:
+        """Take signals off the queue into history, highest priority first (caller holds the lock)"""
+        signals = []
+        for lane in self._lanes(broker):
+            if not exclude:
+                while lane and (count is None or len(signals) < count):
+                    signals.append(lane.popitem(last=False)[1])
+                continue
+            # Stops once `count` signals are taken, so the walk costs O(skipped + taken)
+            taken = []
+            for signal_id, signal in lane.items():
+                if count is not None and len(signals) + len(taken) >= count:
+                    break
+                if signal_id not in exclude:
+                    taken.append(signal)
+            for signal in taken:
+                del lane[signal.signal_id]
+            signals.extend(taken)
         
-        # Trim history if needed
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
+        for signal in signals:
+            self._unlink(signal, from_broker_lane=broker is None, from_priority_lane=broker is not None)
+            self._add_to_history(signal)
+        if signals and self.journal is not None:
+            self.journal.record_dequeue(signal.signal_id for signal in signals)
         
         return signals
     
+    def _unlink(self, signal: TradeSignal, from_broker_lane: bool = True,
+                from_priority_lane: bool = True):
+        """Drop a signal from the queue index and its lanes (caller holds the lock)"""
+        del self.queue[signal.signal_id]
+        priority, broker = self._placement.pop(signal.signal_id)
+        if from_priority_lane:
+            del self._priority_lanes[priority][signal.signal_id]
+        if from_broker_lane:
+            del self._broker_lanes[broker][priority][signal.signal_id]
+    
+    def remove_signal(self, signal_id: str) -> Optional[TradeSignal]:
+        """
+        Remove a delivered signal from the queue and move it to history
+        
+        Args:
+            signal_id: ID of the signal to remove
+            
+        Returns:
+            Removed signal or None if it was not queued
+        """
+        with self._lock:
+            signal = self.queue.get(signal_id)
+            if signal is not None:
+                self._unlink(signal)
+                self._add_to_history(signal)
+                if self.journal is not None:
+                    self.journal.record_ack((signal_id,))
+        return signal
+    
+    def _add_to_history(self, signal: TradeSignal):
+        """Append to history, dropping the oldest entry (and its index) when full (caller holds the lock)"""
+        if self.max_history <= 0:
+            return
+        if len(self.history) == self.max_history:
+            evicted = self.history[0]
+            if self._history_index.get(evicted.signal_id) is evicted:
+                del self._history_index[evicted.signal_id]
+        self.history.append(signal)
+        self._history_index[signal.signal_id] = signal
+    
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """Get deduplication window statistics"""
+        with self._lock:
+            return self.processed_signals.get_stats()
+    
+    def get_journal_stats(self) -> Optional[Dict[str, Any]]:
+        """Get journal counters (None without a journal)"""
+        if self.journal is None:
+            return None
+        return self.journal.get_stats()
+    
+    def close(self):
+        """Flush and close the journal, if any"""
+        if self.journal is not None:
+            self.journal.close()
+    
     def get_queue_size(self) -> int:
         """Get current queue size"""
         return len(self.queue)
     
+    def get_lane_sizes(self) -> Dict[str, Dict[str, int]]:
+        """Get number of queued signals per broker and priority lane"""
+        with self._lock:
+            return {
+                broker: {priority.name: len(lanes[priority]) for priority in SignalPriority}
+                for broker, lanes in self._broker_lanes.items()
+            }
+    
     def clear_queue(self):
         """Clear signal queue"""
-        self.queue.clear()
+        with self._lock:
+            if self.queue and self.journal is not None:
+                self.journal.record_dequeue(list(self.queue))
+            self.queue.clear()
+            self._placement.clear()
+            for lane in self._priority_lanes:
+                lane.clear()
+            self._broker_lanes.clear()
     
     def get_history(self, limit: Optional[int] = None) -> List[TradeSignal]:
         """
@@ -192,9 +617,14 @@ class SignalManager:
         Returns:
             List of historical signals
         """
-        if limit is None:
-            return self.history.copy()
-        return self.history[-limit:] if limit > 0 else []
+        if limit is not None and limit <= 0:
+            return []
+        with self._lock:
+            if limit is None:
+                return list(self.history)
+            recent = list(islice(reversed(self.history), limit))
+        recent.reverse()
+        return recent
     
     def get_signal_by_id(self, signal_id: str) -> Optional[TradeSignal]:
         """
@@ -206,8 +636,5 @@ class SignalManager:
         Returns:
             Trade signal or None
         """
-        for signal in reversed(self.history):
-            if signal.signal_id == signal_id:
-                return signal
-        return None
-
+        with self._lock:
+            return self._history_index.get(signal_id)
@@ -0,0 +1,229 @@
+"""
+MQL5 Bridge Test Script
+Talks to a running bridge over ZeroMQ the way an EA does
+"""
+import json
+import socket
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+import zmq
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.mql5_bridge import TRANSPORT_REP, TRANSPORT_ROUTER, MQL5Bridge, signal_topic
+from bridge.signal_manager import TradeSignal
+from bridge.wire import msgpack
+
+
+def free_port() -> int:
+    """Get a TCP port nobody is listening on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_bridge(transport: str = TRANSPORT_REP, pub: bool = False) -> MQL5Bridge:
+    """Run a bridge on free ports in a background thread"""
+    bridge = MQL5Bridge(port=free_port(), transport=transport,
+                        pub_port=free_port() if pub else None)
+    thread = threading.Thread(target=bridge.start, daemon=True)
+    thread.start()
+    for _ in range(200):
+        if bridge.running and bridge.poller is not None:
+            break
+        threading.Event().wait(0.01)
+    assert bridge.running, "bridge did not start"
+    return bridge
+
+
+def connect(context: zmq.Context, bridge: MQL5Bridge) -> zmq.Socket:
+    """REQ socket connected to the bridge, as a polling EA uses"""
+    sock = context.socket(zmq.REQ)
+    sock.setsockopt(zmq.LINGER, 0)
+    sock.setsockopt(zmq.RCVTIMEO, 2000)
+    sock.connect(f"tcp://127.0.0.1:{bridge.port}")
+    return sock
+
+
+def request(sock: zmq.Socket, message: dict) -> dict:
+    """Send a JSON request and decode the JSON reply"""
+    sock.send(json.dumps(message).encode('utf-8'))
+    return json.loads(sock.recv().decode('utf-8'))
+
+
+def make_signal(index: int, broker: str = "EXNESS", symbol: str = "EURUSD") -> TradeSignal:
+    """Build a valid signal with a unique ID"""
+    return TradeSignal(
+        symbol=symbol,
+        action="BUY",
+        broker=broker,
+        lot_size=0.01,
+        timestamp=datetime.now(),
+        signal_id=f"b{index}"
+    )
+
+
+def signal_ids(reply: dict) -> list:
+    """IDs of the signals in a GET_SIGNALS reply"""
+    return [signal['signal_id'] for signal in reply['signals']]
+
+
+def test_rep_survives_bad_replies():
+    """A reply that cannot be encoded becomes a JSON error and the loop keeps serving"""
+    print("\n=== Testing REP error handling ===")
+
+    bridge = start_bridge()
+    context = zmq.Context()
+    sock = connect(context, bridge)
+    try:
+        process = bridge._process_request
+        bridge._process_request = lambda request, client=None: {'status': 'OK', 'value': object()}
+        reply = request(sock, {'action': 'HEARTBEAT'})
+        assert reply['status'] == 'ERROR' and reply['message'].startswith("Failed to encode reply")
+        bridge._process_request = process
+
+        sock.send(b"not json")
+        assert json.loads(sock.recv()) == {'status': 'ERROR', 'message': 'Invalid JSON'}
+        assert request(sock, {'action': 'HEARTBEAT'})['status'] == 'OK'
+        assert bridge.running and bridge.stats['errors'] == 1
+    finally:
+        sock.close()
+        context.term()
+        bridge.stop()
+    print("✓ Encode failures answered with a JSON error, bridge still serving")
+
+
+def test_router_routes_by_broker():
+    """Each ROUTER client only drains the broker it announced, and nothing before that"""
+    print("\n=== Testing ROUTER per-broker routing ===")
+
+    bridge = start_bridge(TRANSPORT_ROUTER)
+    context = zmq.Context()
+    exness, bitget = connect(context, bridge), connect(context, bridge)
+    try:
+        for i, broker in enumerate(["EXNESS", "BITGET", "EXNESS", "BITGET"]):
+            assert bridge.send_signal(make_signal(i, broker))[0]
+
+        reply = request(exness, {'action': 'GET_SIGNALS'})
+        assert reply['status'] == 'ERROR' and "Unknown broker" in reply['message']
+        assert bridge.signal_manager.get_queue_size() == 4
+
+        assert request(exness, {'action': 'HEARTBEAT', 'broker': 'exness'})['status'] == 'OK'
+        assert signal_ids(request(exness, {'action': 'GET_SIGNALS', 'count': 1})) == ["b0"]
+        assert signal_ids(request(bitget, {'action': 'GET_SIGNALS', 'broker': 'BITGET'})) == ["b1", "b3"]
+        reply = request(exness, {'action': 'GET_SIGNALS'})  # broker remembered per connection
+        assert signal_ids(reply) == ["b2"] and reply['queue_size'] == 0
+
+        clients = bridge.get_clients()
+        assert sorted(client['broker'] for client in clients) == ["BITGET", "EXNESS"]
+        assert {client['connection_status'] for client in clients} == {"connected"}
+    finally:
+        exness.close()
+        bitget.close()
+        context.term()
+        bridge.stop()
+    print("✓ Signals routed to the EA that announced their broker")
+
+
+def test_pub_topics_and_ack():
+    """Subscribers get their topics only; pushed signals skip polling until ACK or ack_timeout"""
+    print("\n=== Testing PUB topics and ACK ===")
+
+    bridge = start_bridge(TRANSPORT_ROUTER, pub=True)
+    context = zmq.Context()
+    sub = context.socket(zmq.SUB)
+    sub.setsockopt(zmq.LINGER, 0)
+    sub.setsockopt(zmq.RCVTIMEO, 2000)
+    sub.setsockopt_string(zmq.SUBSCRIBE, signal_topic("EXNESS", "EURUSD"))
+    sub.connect(f"tcp://127.0.0.1:{bridge.pub_port}")
+    ea = connect(context, bridge)
+    try:
+        time.sleep(0.3)  # let the subscription reach the PUB socket
+        assert bridge.send_signal(make_signal(0, "EXNESS", "EURUSDm"))[0]  # suffixed symbol
+        assert bridge.send_signal(make_signal(1, "BITGET", "EURUSD"))[0]
+        assert bridge.send_signal(make_signal(2, "EXNESS", "EURUSD"))[0]
+        topic, payload = sub.recv_multipart()
+        assert topic == b"SIGNAL.EXNESS.EURUSD." and json.loads(payload)['signal_id'] == "b2"
+        assert sub.poll(100) == 0  # nothing else matched the topic
+        assert bridge.stats['signals_published'] == 3
+
+        # Polling skips everything pushed and not yet acknowledged
+        assert signal_ids(request(ea, {'action': 'GET_SIGNALS', 'broker': 'EXNESS'})) == []
+        reply = request(ea, {'action': 'ACK', 'signal_ids': ["b2", "unknown"]})
+        assert reply['acked'] == 1 and reply['queue_size'] == 2
+        assert request(ea, {'action': 'ACK', 'signal_id': "b2"})['acked'] == 0
+        assert bridge.stats['signals_acked'] == 1 and bridge.ack_latency.count == 1
+
+        # Once ack_timeout passes, unacknowledged pushes are served to pollers
+        bridge.ack_timeout = 0
+        assert signal_ids(request(ea, {'action': 'GET_SIGNALS'})) == ["b0"]
+        assert bridge.signal_manager.get_queue_size() == 1  # BITGET's push is still queued
+    finally:
+        sub.close()
+        ea.close()
+        context.term()
+        bridge.stop()
+    print("✓ Topics filtered, ACK removes from the queue, no double delivery")
+
+
+def test_msgpack_replies():
+    """Replies use the request's format unless it asks for another one"""
+    print("\n=== Testing wire formats ===")
+    if msgpack is None:
+        print("msgpack is not installed - skipped")
+        return
+
+    bridge = start_bridge()
+    context = zmq.Context()
+    sock = connect(context, bridge)
+    try:
+        assert bridge.send_signal(make_signal(0))[0]
+        sock.send(msgpack.packb({'action': 'GET_SIGNALS'}))
+        reply = msgpack.unpackb(sock.recv())
+        assert reply['status'] == 'OK' and signal_ids(reply) == ["b0"]
+        assert reply['signals'][0]['lot_size'] == 0.01
+
+        sock.send(msgpack.packb({'action': 'HEARTBEAT', 'format': 'json'}))
+        assert json.loads(sock.recv())['status'] == 'OK'
+        sock.send(json.dumps({'action': 'HEARTBEAT', 'format': 'msgpack'}).encode('utf-8'))
+        assert msgpack.unpackb(sock.recv())['status'] == 'OK'
+        reply = request(sock, {'action': 'HEARTBEAT', 'format': 'xml'})
+        assert reply == {'status': 'ERROR', 'message': "Unsupported format: xml"}
+    finally:
+        sock.close()
+        context.term()
+        bridge.stop()
+    print("✓ JSON and MessagePack requests answered in the negotiated format")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("MQL5 Bridge Test Suite")
+    print("=" * 50)
+
+    try:
+        test_rep_survives_bad_replies()
+        test_router_routes_by_broker()
+        test_pub_topics_and_ack()
+        test_msgpack_replies()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+"""
+Signal Journal Test Script
+Tests write-ahead journaling, replay and compaction of the signal queue
+"""
+import json
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.signal_journal import OP_SEEN, SignalJournal
+from bridge.signal_manager import SignalManager, TradeSignal
+
+
+def _make_signal(index: int, action: str = "BUY") -> TradeSignal:
+    """Build a valid signal with a unique ID"""
+    return TradeSignal(
+        symbol="EURUSD",
+        action=action,
+        broker="EXNESS",
+        lot_size=0.01,
+        stop_loss=1.08,
+        take_profit=1.10 if action == "BUY" else None,
+        timestamp=datetime.now(),
+        signal_id=f"j{index}"
+    )
+
+
+def test_replay_restores_pending_and_dedup():
+    """Undelivered signals come back after a restart, delivered ones stay deduplicated"""
+    print("\n=== Testing journal replay ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "replay.jsonl"
+        manager = SignalManager(journal=SignalJournal(str(path)))
+        for i in range(10):
+            assert manager.add_signal(_make_signal(i))[0]
+        delivered = manager.get_signals(3)
+        manager.remove_signal("j5")
+        manager.close()
+
+        restored = SignalManager(journal=SignalJournal(str(path)))
+        pending = [signal.signal_id for signal in restored.get_signals()]
+        assert pending == ["j3", "j4", "j6", "j7", "j8", "j9"], pending
+        for signal in delivered:
+            assert restored.add_signal(_make_signal(int(signal.signal_id[1:])))[1] == "Duplicate signal"
+        assert restored.get_queue_size() == 0
+        restored.close()
+        print("✓ Pending signals and dedup window restored")
+
+
+def test_torn_record_is_skipped():
+    """A partially written final record (crash mid-write) does not break replay"""
+    print("\n=== Testing torn journal record ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "torn.jsonl"
+        manager = SignalManager(journal=SignalJournal(str(path)))
+        manager.add_signal(_make_signal(1))
+        manager.add_signal(_make_signal(2, action="CLOSE"))
+        manager.close()
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"op": "E", "signal": {"symbol": "EURU')
+
+        journal = SignalJournal(str(path))
+        restored = SignalManager(journal=journal)
+        assert [signal.signal_id for signal in restored.get_signals()] == ["j2", "j1"]
+        assert journal.get_stats()['replay_errors'] == 1
+        restored.close()
+        print("✓ Torn record skipped")
+
+
+def test_group_commit_and_wait():
+    """Concurrent durable adds share fsyncs and all survive a restart"""
+    print("\n=== Testing group commit ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "group.jsonl"
+        journal = SignalJournal(str(path), flush_interval=0.005)
+        manager = SignalManager(max_queue_size=1000, journal=journal, journal_wait=True)
+
+        def produce(producer: int):
+            for i in range(50):
+                assert manager.add_signal(_make_signal(producer * 1000 + i))[0]
+
+        threads = [threading.Thread(target=produce, args=(p,)) for p in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = journal.get_stats()
+        assert stats['records'] == 400
+        assert stats['group_commits'] < 400, "Every record paid its own fsync"
+        manager.close()
+
+        restored = SignalManager(max_queue_size=1000, journal=SignalJournal(str(path)))
+        assert restored.get_queue_size() == 400
+        restored.close()
+        print(f"✓ 400 durable signals in {stats['group_commits']} group commits")
+
+
+def test_compaction():
+    """A journal past its size limit is rewritten down to live state"""
+    print("\n=== Testing compaction ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "compact.jsonl"
+        journal = SignalJournal(str(path), compact_bytes=20_000)
+        manager = SignalManager(journal=journal)
+        for i in range(300):
+            manager.add_signal(_make_signal(i))
+            manager.get_signals()
+            journal.flush()
+        manager.add_signal(_make_signal(300))
+        manager.close()
+
+        assert journal.get_stats()['compactions'] > 1
+        assert path.stat().st_size < 20_000 + 1000
+        restored = SignalManager(journal=SignalJournal(str(path)))
+        assert [signal.signal_id for signal in restored.get_signals()] == ["j300"]
+        assert restored.add_signal(_make_signal(0))[1] == "Duplicate signal"
+        restored.close()
+        print("✓ Compacted journal replays correctly")
+
+
+def test_compaction_outside_lock():
+    """The rewrite runs without the manager lock; records appended meanwhile survive it"""
+    print("\n=== Testing compaction outside the lock ===")
+
+    class SlowJournal(SignalJournal):
+        """Journal whose compaction blocks until released"""
+        started = threading.Event()
+        release = threading.Event()
+
+        def rewrite(self, pending, seen_ids, seq=None):
+            if seq is not None:
+                self.started.set()
+                assert self.release.wait(5)
+            super().rewrite(pending, seen_ids, seq)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "slow.jsonl"
+        journal = SlowJournal(str(path), compact_bytes=5_000, flush_interval=0.001)
+        manager = SignalManager(journal=journal)
+        i = 0
+        while journal.get_stats()['size_bytes'] < 5_000:
+            manager.add_signal(_make_signal(i))
+            manager.get_signals()
+            journal.flush()
+            i += 1
+        producer = threading.Thread(target=manager.add_signal, args=(_make_signal(i),))
+        producer.start()
+        assert journal.started.wait(5)
+
+        # Mid-compaction the queue stays usable and new records are kept for the new file
+        assert [signal.signal_id for signal in manager.get_signals(timeout=None)] == [f"j{i}"]
+        assert manager.add_signal(_make_signal(i + 1))[0]
+        time.sleep(0.01)  # flusher ticks, but must not write to the file being replaced
+        journal.release.set()
+        producer.join()
+        manager.close()
+
+        assert journal.get_stats()['compactions'] == 2  # startup and the threshold
+        restored = SignalManager(journal=SignalJournal(str(path)))
+        assert [signal.signal_id for signal in restored.get_signals()] == [f"j{i + 1}"]
+        assert restored.add_signal(_make_signal(i))[1] == "Duplicate signal"
+        restored.close()
+    print("✓ Queue usable during compaction, later records carried over")
+
+
+def test_failed_compaction_keeps_journaling():
+    """A rewrite that fails on anything, not just I/O, leaves the old file in use"""
+    print("\n=== Testing failed compaction ===")
+
+    class Unencodable:
+        """Pending entry whose JSON cannot be built"""
+        def to_json(self):
+            raise ValueError("cannot encode")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "failed.jsonl"
+        journal = SignalJournal(str(path), flush_interval=0.001)
+        journal.open()
+        journal.append(json.dumps({'op': OP_SEEN, 'ids': ["a"]}))
+        seq = journal.begin_compaction()
+        after = journal.append(json.dumps({'op': OP_SEEN, 'ids': ["b"]}))
+        try:
+            journal.rewrite([Unencodable()], ["a"], seq)
+            raise AssertionError("rewrite() swallowed the error")
+        except ValueError:
+            pass
+
+        assert journal.wait_durable(after, timeout=2), "Flusher stuck after the failed compaction"
+        journal.close()
+        ids = [json.loads(line)['ids'] for line in path.read_text().splitlines()]
+        assert ids == [["a"], ["b"]]
+        assert journal.get_stats()['compactions'] == 0
+    print("✓ Superseded records written to the old file after the failed compaction")
+
+
+def test_size_counts_bytes():
+    """The compaction threshold is measured in encoded bytes"""
+    print("\n=== Testing journal size ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bytes.jsonl"
+        journal = SignalJournal(str(path))
+        journal.open()
+        for i in range(50):
+            journal.append(json.dumps({'op': OP_SEEN, 'ids': [f"€{i}"]}, ensure_ascii=False))
+        journal.flush()
+        assert journal.get_stats()['size_bytes'] == path.stat().st_size
+        assert journal.get_stats()['bytes_written'] == path.stat().st_size
+        journal.close()
+    print("✓ Size tracked in bytes")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Signal Journal Test Suite")
+    print("=" * 50)
+
+    try:
+        test_replay_restores_pending_and_dedup()
+        test_torn_record_is_skipped()
+        test_group_commit_and_wait()
+        test_compaction()
+        test_compaction_outside_lock()
+        test_failed_compaction_keeps_journaling()
+        test_size_counts_bytes()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
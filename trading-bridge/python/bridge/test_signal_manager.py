@@ -0,0 +1,267 @@
+"""
+Signal Manager Test Script
+Stress-tests SignalManager with concurrent producers and consumers
+"""
+import json
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bridge.signal_manager import DedupWindow, SignalManager, TradeSignal
+from bridge.wire import encode_message
+
+
+PRODUCERS = 16
+SIGNALS_PER_PRODUCER = 2000
+BATCH_SIZE = 25
+
+
+def _make_signal(producer: int, index: int) -> TradeSignal:
+    """Build a valid signal with a unique ID"""
+    return TradeSignal(
+        symbol="EURUSD",
+        action="BUY",
+        broker="EXNESS" if index % 2 else "BITGET",
+        lot_size=0.01,
+        timestamp=datetime.now(),
+        signal_id=f"p{producer}_s{index}"
+    )
+
+
+def test_concurrent_producers_no_loss_no_duplicates():
+    """Many producers + consumers: every signal delivered exactly once"""
+    print("\n=== Testing concurrent producers/consumers ===")
+
+    manager = SignalManager(max_queue_size=PRODUCERS * SIGNALS_PER_PRODUCER, max_history=100)
+    total = PRODUCERS * SIGNALS_PER_PRODUCER
+    start = threading.Barrier(PRODUCERS + 2)
+    received = [[], []]
+    done = threading.Event()
+
+    def produce(producer: int):
+        signals = [_make_signal(producer, i) for i in range(SIGNALS_PER_PRODUCER)]
+        start.wait()
+        # Half the producers use single adds, half use batched adds
+        if producer % 2:
+            for signal in signals:
+                success, error = manager.add_signal(signal)
+                assert success, error
+        else:
+            for i in range(0, len(signals), BATCH_SIZE):
+                for success, error in manager.add_signals(signals[i:i + BATCH_SIZE]):
+                    assert success, error
+
+    def consume(slot: int):
+        start.wait()
+        while not (done.is_set() and manager.get_queue_size() == 0):
+            received[slot].extend(manager.get_signals(50, timeout=0.05))
+
+    producers = [threading.Thread(target=produce, args=(p,)) for p in range(PRODUCERS)]
+    consumers = [threading.Thread(target=consume, args=(c,)) for c in range(2)]
+    for thread in producers + consumers:
+        thread.start()
+    for thread in producers:
+        thread.join()
+    done.set()
+    for thread in consumers:
+        thread.join()
+
+    ids = [signal.signal_id for signal in received[0] + received[1]]
+    assert len(ids) == total, f"Expected {total} signals, got {len(ids)}"
+    assert len(set(ids)) == total, "Duplicate signals delivered"
+    print(f"✓ {total} signals delivered exactly once")
+
+
+def test_concurrent_duplicate_submissions():
+    """The same signal submitted from many threads is accepted once"""
+    print("\n=== Testing concurrent duplicate submissions ===")
+
+    manager = SignalManager()
+    signal = _make_signal(0, 0)
+    start = threading.Barrier(PRODUCERS)
+    results = []
+    lock = threading.Lock()
+
+    def submit():
+        start.wait()
+        result = manager.add_signal(signal)
+        with lock:
+            results.append(result)
+
+    threads = [threading.Thread(target=submit) for _ in range(PRODUCERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(1 for success, _ in results if success) == 1
+    assert manager.get_queue_size() == 1
+    print("✓ Duplicate accepted exactly once")
+
+
+def test_queue_limit_under_contention():
+    """Concurrent producers never overfill the queue"""
+    print("\n=== Testing queue limit under contention ===")
+
+    manager = SignalManager(max_queue_size=100)
+    start = threading.Barrier(PRODUCERS)
+
+    def produce(producer: int):
+        start.wait()
+        for i in range(50):
+            manager.add_signal(_make_signal(producer, i))
+
+    threads = [threading.Thread(target=produce, args=(p,)) for p in range(PRODUCERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert manager.get_queue_size() == 100
+    print("✓ Queue limit respected")
+
+
+def test_blocking_get_signals():
+    """A blocked consumer wakes up when a producer enqueues"""
+    print("\n=== Testing blocking get_signals ===")
+
+    manager = SignalManager()
+    assert manager.get_signals(timeout=0.01) == []
+
+    result = []
+    consumer = threading.Thread(target=lambda: result.extend(manager.get_signals(broker="EXNESS", timeout=5)))
+    consumer.start()
+    manager.add_signal(_make_signal(0, 0))  # BITGET - must not wake the EXNESS consumer
+    manager.add_signal(_make_signal(0, 1))  # EXNESS
+    consumer.join(5)
+
+    assert not consumer.is_alive()
+    assert [signal.signal_id for signal in result] == ["p0_s1"]
+    assert manager.get_queue_size() == 1
+    print("✓ Blocking get_signals working")
+
+
+def test_priority_lanes():
+    """CLOSE drains before MODIFY before entries, per broker in O(k)"""
+    print("\n=== Testing priority lanes ===")
+
+    manager = SignalManager()
+    actions = ["BUY"] * 5 + ["MODIFY"] * 5 + ["CLOSE", "SELL", "CLOSE"]
+    for i, action in enumerate(actions):
+        signal = _make_signal(0, i)
+        signal.action = action
+        signal.broker = "EXNESS"
+        manager.add_signal(signal)
+    manager.add_signal(_make_signal(1, 0))  # BITGET entry
+
+    drained = manager.get_signals(4, broker="EXNESS")
+    assert [signal.action for signal in drained] == ["CLOSE", "CLOSE", "MODIFY", "MODIFY"]
+    assert [signal.signal_id for signal in drained[:2]] == ["p0_s10", "p0_s12"]
+
+    rest = manager.get_signals()
+    assert [signal.action for signal in rest[:3]] == ["MODIFY"] * 3
+    assert {signal.broker for signal in rest} == {"EXNESS", "BITGET"}
+    assert manager.get_queue_size() == 0
+    print("✓ Priority lanes working")
+
+
+def test_lane_change_while_queued():
+    """A signal whose action or broker changes after enqueue still leaves its lanes cleanly"""
+    print("\n=== Testing lane changes while queued ===")
+
+    manager = SignalManager()
+    moved, retargeted = _make_signal(0, 1), _make_signal(0, 2)  # EXNESS, BITGET entries
+    manager.add_signals([moved, retargeted])
+    moved.action = "CLOSE"
+    retargeted.broker = "EXNESS"
+
+    assert manager.get_signals(broker="EXNESS") == [moved]
+    assert manager.get_signals(broker="BITGET") == [retargeted]
+    assert manager.get_queue_size() == 0
+    assert all(count == 0 for lanes in manager.get_lane_sizes().values() for count in lanes.values())
+    print("✓ Signals drained from the lanes chosen at enqueue")
+
+
+def test_dedup_window_lru_and_ttl():
+    """The least recently seen ID is evicted at max_size, every ID expires after the TTL"""
+    print("\n=== Testing dedup window ===")
+
+    window = DedupWindow(ttl=0.2, max_size=3)
+    for key in ["a", "b", "c", "a"]:  # seeing "a" again makes "b" the oldest
+        window.add(key)
+    window.add("d")
+    assert list(window) == ["c", "a", "d"] and "b" not in window
+    stats = window.get_stats()
+    assert stats['size'] == 3 and stats['added'] == 4 and stats['evicted'] == 1
+    time.sleep(0.25)
+    assert "a" not in window
+    stats = window.get_stats()
+    assert stats['size'] == 0 and stats['expired'] == 3 and stats['memory_bytes'] == 0
+
+    # Delivered signals (history disabled) are rejected only while inside the window
+    manager = SignalManager(max_history=0, dedup_ttl=0.2, dedup_max_size=2)
+    signals = [_make_signal(0, i) for i in range(3)]
+    assert all(success for success, _ in manager.add_signals(signals))
+    assert len(manager.get_signals()) == 3
+    assert manager.add_signal(_make_signal(0, 0))[0]  # evicted when s2 was added
+    assert manager.add_signal(_make_signal(0, 2)) == (False, "Duplicate signal")
+    time.sleep(0.25)
+    assert manager.add_signal(_make_signal(0, 2))[0]
+    assert manager.get_dedup_stats()['duplicates'] == 1
+    print("✓ Dedup window evicts LRU and expires by TTL")
+
+
+def test_json_cache_invalidation():
+    """Assigning a field after serialization drops the cached JSON"""
+    print("\n=== Testing signal JSON cache ===")
+
+    signal = _make_signal(0, 0)
+    assert signal.validate() == (True, None)
+    cached = signal.to_json()
+    assert signal.to_json() is cached  # built once by validate()
+
+    signal.lot_size = 0.5
+    signal.comment = "resized"
+    data = json.loads(signal.to_json())
+    assert data['lot_size'] == 0.5 and data['comment'] == "resized"
+    assert TradeSignal.from_json(signal.to_json()) == signal
+    reply = json.loads(encode_message({'status': 'OK', 'signals': [signal]}))
+    assert reply['signals'][0]['lot_size'] == 0.5  # the wire splices the fresh form
+    print("✓ Field changes refresh the cached JSON")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Signal Manager Test Suite")
+    print("=" * 50)
+
+    try:
+        test_concurrent_producers_no_loss_no_duplicates()
+        test_concurrent_duplicate_submissions()
+        test_queue_limit_under_contention()
+        test_blocking_get_signals()
+        test_priority_lanes()
+        test_lane_change_while_queued()
+        test_dedup_window_lru_and_ttl()
+        test_json_cache_invalidation()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
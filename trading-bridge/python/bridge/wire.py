@@ -0,0 +1,128 @@
+"""
+Bridge Wire Formats
+Encoding/decoding of bridge messages as JSON (default) or MessagePack
+"""
+import json
+from typing import Any, Dict, Tuple
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional - JSON keeps working without it
+    msgpack = None
+
+
+FORMAT_JSON = "json"
+FORMAT_MSGPACK = "msgpack"
+FORMATS = (FORMAT_JSON, FORMAT_MSGPACK)
+
+
+class WireFormatError(ValueError):
+    """Raised when a message cannot be decoded or a format is unavailable"""
+
+
+def available_formats() -> Tuple[str, ...]:
+    """Get formats usable in this process"""
+    if msgpack is None:
+        return (FORMAT_JSON,)
+    return FORMATS
+
+
+def detect_format(data: bytes) -> str:
+    """
+    Guess the format of a raw request
+
+    Requests are always maps, so a MessagePack request starts with a map
+    marker (fixmap 0x80-0x8f, map16 0xde or map32 0xdf). Everything else,
+    including malformed text, is treated as JSON.
+
+    Args:
+        data: Raw message bytes
+
+    Returns:
+        Format name
+    """
+    if data and (0x80 <= data[0] <= 0x8f or data[0] in (0xde, 0xdf)):
+        return FORMAT_MSGPACK
+    return FORMAT_JSON
+
+
+def decode_message(data: bytes) -> Tuple[Dict[str, Any], str]:
+    """
+    Decode a request in whichever format it was sent
+
+    Args:
+        data: Raw message bytes
+
+    Returns:
+        (message dictionary, format name)
+
+    Raises:
+        WireFormatError: If the message cannot be decoded
+    """
+    fmt = detect_format(data)
+    if fmt == FORMAT_JSON:
+        try:
+            message = json.loads(data.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise WireFormatError("Invalid JSON") from e
+    else:
+        if msgpack is None:
+            raise WireFormatError("MessagePack is not available (pip install msgpack)")
+        try:
+            message = msgpack.unpackb(data, raw=False)
+        except Exception as e:
+            raise WireFormatError("Invalid MessagePack") from e
+
+    if not isinstance(message, dict):
+        raise WireFormatError("Message must be an object")
+    return message, fmt
+
+
+def _to_plain(obj: Any) -> Any:
+    """Fallback for objects such as TradeSignal that know how to become a dict"""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+def _encode_json(message: Dict[str, Any]) -> str:
+    """
+    JSON-encode a message, splicing in the cached JSON of signal objects
+
+    A GET_SIGNALS reply carries TradeSignal objects that already hold their
+    JSON form, so only the envelope is encoded here.
+    """
+    signals = message.get('signals')
+    if not signals or not all(hasattr(signal, 'to_json') for signal in signals):
+        return json.dumps(message, default=_to_plain)
+    rest = {key: value for key, value in message.items() if key != 'signals'}
+    head = json.dumps(rest, default=_to_plain)
+    separator = ', ' if rest else ''
+    joined = ', '.join(signal.to_json() for signal in signals)
+    return f'{head[:-1]}{separator}"signals": [{joined}]}}'
+
+
+def encode_message(message: Dict[str, Any], fmt: str = FORMAT_JSON) -> bytes:
+    """
+    Encode a response in the requested format
+
+    Values with a to_dict() method (e.g. TradeSignal) are encoded as their
+    dictionary form.
+
+    Args:
+        message: Message dictionary
+        fmt: Format name
+
+    Returns:
+        Encoded bytes
+
+    Raises:
+        WireFormatError: If the format is unknown or unavailable
+    """
+    if fmt == FORMAT_JSON:
+        return _encode_json(message).encode('utf-8')
+    if fmt == FORMAT_MSGPACK:
+        if msgpack is None:
+            raise WireFormatError("MessagePack is not available (pip install msgpack)")
+        return msgpack.packb(message, use_bin_type=True, default=_to_plain)
+    raise WireFormatError(f"Unknown format: {fmt} (expected one of {', '.join(FORMATS)})")
@@ -1,20 +1,29 @@
 """
 Broker API Module
 """
-from .base_broker import BaseBroker, BrokerConfig, OrderResult, Position, AccountInfo
+from .base_broker import BaseBroker, BrokerConfig, BrokerError, OrderRequest, OrderResult, Position, AccountInfo
 from .exness_api import ExnessAPI
 from .bitget_api import BitgetAPI, BitgetConfig
 from .broker_factory import BrokerFactory
+from .http_client import LatencyHistogram, PooledHttpClient
+from .rate_limiter import RateLimiter, TokenBucket, shared_rate_limiter
 
 __all__ = [
     'BaseBroker',
     'BrokerConfig',
+    'BrokerError',
+    'OrderRequest',
     'OrderResult',
     'Position',
     'AccountInfo',
     'ExnessAPI',
     'BitgetAPI',
     'BitgetConfig',
-    'BrokerFactory'
+    'BrokerFactory',
+    'PooledHttpClient',
+    'LatencyHistogram',
+    'RateLimiter',
+    'TokenBucket',
+    'shared_rate_limiter'
 ]
 
@@ -3,10 +3,15 @@ Base Broker Abstract Class
 Defines interface for all broker implementations
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any
 from dataclasses import dataclass
 
 
+class BrokerError(Exception):
+    """A broker request failed (transport error or error response)"""
+
+
 @dataclass
 class BrokerConfig:
     """Broker configuration"""
@@ -28,6 +33,17 @@ class OrderResult:
     error_code: Optional[str] = None
 
 
+@dataclass
+class OrderRequest:
+    """Order to place in a batch (the arguments of place_order)"""
+    symbol: str
+    action: str  # BUY or SELL
+    lot_size: float
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    comment: str = ""
+
+
 @dataclass
 class Position:
     """Open position information"""
@@ -56,6 +72,9 @@ class AccountInfo:
 class BaseBroker(ABC):
     """Abstract base class for broker implementations"""
     
+    # Orders sent at once by the generic place_orders/close_positions
+    batch_workers = 8
+    
     def __init__(self, config: BrokerConfig):
         """
         Initialize broker
@@ -111,6 +130,25 @@ class BaseBroker(ABC):
         """
         pass
     
+    def fetch_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """
+        Get open positions, raising if the broker could not be asked
+        
+        get_positions returns an empty list on errors; here an empty list
+        always means no open positions. Brokers whose get_positions hides
+        errors override this.
+        
+        Args:
+            symbol: Filter by symbol (None = all positions)
+            
+        Returns:
+            List of open positions
+            
+        Raises:
+            BrokerError: The request or the broker failed
+        """
+        return self.get_positions(symbol)
+    
     @abstractmethod
     def close_position(self, position_id: str) -> OrderResult:
         """
@@ -140,6 +178,74 @@ class BaseBroker(ABC):
         """
         pass
     
+    def place_orders(self, orders: List[OrderRequest]) -> List[OrderResult]:
+        """
+        Place several orders at once
+        
+        The default sends place_order calls concurrently; brokers with a
+        batch endpoint override this to use it.
+        
+        Args:
+            orders: Orders to place
+            
+        Returns:
+            One OrderResult per order, in the order given
+        """
+        return self._run_batch([
+            lambda order=order: self.place_order(
+                symbol=order.symbol,
+                action=order.action,
+                lot_size=order.lot_size,
+                stop_loss=order.stop_loss,
+                take_profit=order.take_profit,
+                comment=order.comment
+            )
+            for order in orders
+        ], "placing order")
+    
+    def close_positions(self, position_ids: List[str]) -> List[OrderResult]:
+        """
+        Close several positions at once
+        
+        The default sends close_position calls concurrently; brokers with a
+        batch endpoint override this to use it.
+        
+        Args:
+            position_ids: Position IDs to close
+            
+        Returns:
+            One OrderResult per position, in the order given
+        """
+        return self._run_batch([
+            lambda position_id=position_id: self.close_position(position_id)
+            for position_id in position_ids
+        ], "closing position")
+    
+    def _run_batch(self, calls: List[Callable[[], OrderResult]], action: str) -> List[OrderResult]:
+        """
+        Run order calls concurrently, turning exceptions into failed results
+        
+        Args:
+            calls: Zero-argument calls returning an OrderResult
+            action: What the calls do, for error messages
+            
+        Returns:
+            Results in the order of calls
+        """
+        def run(call: Callable[[], OrderResult]) -> OrderResult:
+            try:
+                return call()
+            except Exception as e:
+                return OrderResult(
+                    success=False,
+                    message=f"Error {action}: {str(e)}"
+                )
+        
+        if len(calls) <= 1:
+            return [run(call) for call in calls]
+        with ThreadPoolExecutor(max_workers=min(len(calls), self.batch_workers)) as pool:
+            return list(pool.map(run, calls))
+    
     def is_enabled(self) -> bool:
         """Check if broker is enabled"""
         return self.enabled
@@ -16,12 +16,15 @@ import hmac
 import json
 import time
 import urllib.parse
-import urllib.request
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
 from .base_broker import (
-    BaseBroker, BrokerConfig, OrderResult, Position, AccountInfo
+    BaseBroker, BrokerConfig, BrokerError, OrderRequest, OrderResult, Position, AccountInfo
+)
+from .http_client import PooledHttpClient
+from .rate_limiter import (
+    PRIORITY_ACCOUNT, PRIORITY_POLLING, PRIORITY_TRADING, retry_after_seconds, shared_rate_limiter
 )
 
 # Network endpoints configuration
@@ -31,6 +34,26 @@ BITGET_NETWORKS = {
     "Automatic": "https://api.bitget.com",  # Will auto-select best network
 }
 
+# Default request quota per API key (Bitget allows 10-20 requests/second on most endpoints)
+BITGET_RATE_LIMIT = {'requests_per_minute': 600, 'burst': 10}
+
+# Most orders in one batch request
+BITGET_BATCH_SIZE = 50
+
+# Request weight and priority by endpoint prefix: trading calls go before polling
+# (batch orders and close-positions have half the request quota of single orders)
+BITGET_RATE_RULES = {
+    'POST /api/v2/mix/order': (1, PRIORITY_TRADING),
+    'POST /api/v2/mix/order/batch-place-order': (2, PRIORITY_TRADING),
+    'POST /api/v2/mix/order/close-positions': (2, PRIORITY_TRADING),
+    'POST /api/v2/spot/trade': (1, PRIORITY_TRADING),
+    'POST /api/v2/spot/trade/batch-orders': (2, PRIORITY_TRADING),
+    'GET /api/v2/mix/account': (1, PRIORITY_ACCOUNT),
+    'GET /api/v2/spot/account': (1, PRIORITY_ACCOUNT),
+    'GET /api/v2/mix/position': (1, PRIORITY_POLLING),
+    'GET /api/v2/public': (1, PRIORITY_POLLING),
+}
+
 
 @dataclass
 class BitgetConfig(BrokerConfig):
@@ -39,17 +62,20 @@ class BitgetConfig(BrokerConfig):
     network: str = "Automatic"  # Network-1, Network-2, Network-3, Network-4, or Automatic
     product_type: str = "USDT-FUTURES"  # SPOT or USDT-FUTURES
     test_mode: bool = False  # Use testnet
+    pool_size: int = 4  # Keep-alive connections (and concurrent requests)
 
 
 class BitgetAPI(BaseBroker):
     """Bitget broker implementation"""
     
-    def __init__(self, config: BitgetConfig):
+    def __init__(self, config: BitgetConfig, http_client: Optional[PooledHttpClient] = None):
         """
         Initialize Bitget API client
         
         Args:
             config: Bitget configuration
+            http_client: Connection pool to share with other accounts
+                (default: a pool of config.pool_size connections)
         """
         super().__init__(config)
         self.config: BitgetConfig = config
@@ -63,6 +89,14 @@ class BitgetAPI(BaseBroker):
         # Validate credentials
         if not all([self.api_key, self.api_secret, self.passphrase]):
             raise ValueError("Bitget API requires api_key, api_secret, and passphrase")
+        
+        # Keep-alive connections, reused across requests
+        self.http = http_client or PooledHttpClient(getattr(config, 'pool_size', 4), self.timeout)
+        
+        # Rate limiting, shared by every instance using this API key
+        self.rate_limiter = shared_rate_limiter(
+            config.name, self.api_key, config.rate_limit or BITGET_RATE_LIMIT, BITGET_RATE_RULES
+        )
     
     def _get_network_url(self, network: str) -> str:
         """
@@ -119,6 +153,16 @@ class BitgetAPI(BaseBroker):
         Returns:
             API response as dictionary
         """
+        try:
+            # Wait for quota first, so the signed timestamp is fresh
+            self.rate_limiter.acquire(f"{method.upper()} {endpoint}")
+        except Exception as e:
+            return {
+                "code": "error",
+                "msg": str(e),
+                "data": None
+            }
+        
         # Generate timestamp
         timestamp = str(int(time.time() * 1000))
         
@@ -149,21 +193,23 @@ class BitgetAPI(BaseBroker):
         # Build full URL
         url = self.base_url + request_path
         
-        # Make request
+        # Make request on a pooled connection
         try:
-            if method.upper() == "GET":
-                req = urllib.request.Request(url, headers=headers, method="GET")
-            else:
-                req = urllib.request.Request(
-                    url,
-                    data=body.encode('utf-8') if body else None,
-                    headers=headers,
-                    method=method.upper()
-                )
-            
-            with urllib.request.urlopen(req, timeout=self.timeout) as response:
-                response_text = response.read().decode('utf-8')
-                return json.loads(response_text)
+            response = self.http.request(
+                method.upper(),
+                url,
+                timeout=self.timeout,
+                data=body.encode('utf-8') if body else None,
+                headers=headers
+            )
+            if response.status_code == 429:
+                self.rate_limiter.penalize(retry_after_seconds(response.headers.get('Retry-After')))
+            try:
+                # Bitget explains rejected requests (4xx) in the JSON body
+                return response.json()
+            except ValueError:
+                response.raise_for_status()
+                raise
         except Exception as e:
             return {
                 "code": "error",
@@ -196,19 +242,9 @@ class BitgetAPI(BaseBroker):
                 "productType": self.product_type,
                 "marginMode": "crossed",
                 "marginCoin": "USDT",
-                "size": str(lot_size),
-                "side": "buy" if action.upper() == "BUY" else "sell",
-                "tradeSide": "open",
-                "orderType": "market",
-                "clientOid": f"{int(time.time() * 1000)}",
+                **self._order_fields(action, lot_size, stop_loss, take_profit, f"{int(time.time() * 1000)}")
             }
             
-            # Add stop loss and take profit if provided
-            if stop_loss:
-                order_data["presetStopLossPrice"] = str(stop_loss)
-            if take_profit:
-                order_data["presetTakeProfitPrice"] = str(take_profit)
-            
             # Make API request
             if self.product_type == "USDT-FUTURES":
                 endpoint = "/api/v2/mix/order/place-order"
@@ -236,6 +272,133 @@ class BitgetAPI(BaseBroker):
                 message=f"Error placing order: {str(e)}"
             )
     
+    def _order_fields(self, action: str, lot_size: float, stop_loss: Optional[float],
+                      take_profit: Optional[float], client_oid: str) -> Dict[str, str]:
+        """
+        Per-order fields of a market order (shared by single and batch orders)
+        
+        Args:
+            action: Order action ('BUY' or 'SELL')
+            lot_size: Position size
+            stop_loss: Stop loss price
+            take_profit: Take profit price
+            client_oid: Client order id
+            
+        Returns:
+            Order fields
+        """
+        fields = {
+            "size": str(lot_size),
+            "side": "buy" if action.upper() == "BUY" else "sell",
+            "tradeSide": "open",
+            "orderType": "market",
+            "clientOid": client_oid,
+        }
+        
+        # Add stop loss and take profit if provided
+        if stop_loss:
+            fields["presetStopLossPrice"] = str(stop_loss)
+        if take_profit:
+            fields["presetTakeProfitPrice"] = str(take_profit)
+        return fields
+    
+    def place_orders(self, orders: List[OrderRequest]) -> List[OrderResult]:
+        """
+        Place several orders with Bitget's batch-order endpoint
+        
+        Orders are grouped by symbol (a batch request takes one symbol and
+        up to BITGET_BATCH_SIZE orders) and the batch requests are sent
+        concurrently, so a basket on one symbol is a single round-trip.
+        
+        Args:
+            orders: Orders to place
+            
+        Returns:
+            One OrderResult per order, in the order given
+        """
+        if len(orders) <= 1:
+            return super().place_orders(orders)
+        
+        # Unique client order ids map the batch responses back to orders
+        prefix = int(time.time() * 1000)
+        client_oids = [f"{prefix}-{index}" for index in range(len(orders))]
+        by_symbol: Dict[str, List[int]] = {}
+        for index, order in enumerate(orders):
+            by_symbol.setdefault(order.symbol, []).append(index)
+        batches = [
+            [(client_oids[index], orders[index]) for index in indexes[start:start + BITGET_BATCH_SIZE]]
+            for indexes in by_symbol.values()
+            for start in range(0, len(indexes), BITGET_BATCH_SIZE)
+        ]
+        
+        results: Dict[str, OrderResult] = {}
+        for batch_results in self.http.fan_out([lambda batch=batch: self._place_batch(batch) for batch in batches]):
+            results.update(batch_results)
+        return [results[client_oid] for client_oid in client_oids]
+    
+    def _place_batch(self, batch: List[Tuple[str, OrderRequest]]) -> Dict[str, OrderResult]:
+        """
+        Send one batch-order request (all orders on one symbol)
+        
+        Args:
+            batch: (client order id, order) pairs
+            
+        Returns:
+            Client order id -> OrderResult
+        """
+        symbol = batch[0][1].symbol
+        order_list = [
+            self._order_fields(order.action, order.lot_size, order.stop_loss, order.take_profit, client_oid)
+            for client_oid, order in batch
+        ]
+        if self.product_type == "USDT-FUTURES":
+            endpoint = "/api/v2/mix/order/batch-place-order"
+            order_data = {
+                "symbol": symbol,
+                "productType": self.product_type,
+                "marginMode": "crossed",
+                "marginCoin": "USDT",
+                "orderList": order_list
+            }
+        else:
+            endpoint = "/api/v2/spot/trade/batch-orders"
+            order_data = {"symbol": symbol, "orderList": order_list}
+        
+        response = self._make_request("POST", endpoint, data=order_data)
+        
+        # Check response
+        if response.get("code") != "00000":
+            return {
+                client_oid: OrderResult(
+                    success=False,
+                    message=response.get("msg", "Unknown error"),
+                    error_code=response.get("code")
+                )
+                for client_oid, _ in batch
+            }
+        
+        data = response.get("data") or {}
+        results = {}
+        for item in data.get("successList") or []:
+            results[item.get("clientOid")] = OrderResult(
+                success=True,
+                order_id=item.get("orderId"),
+                message="Order placed successfully"
+            )
+        for item in data.get("failureList") or []:
+            results[item.get("clientOid")] = OrderResult(
+                success=False,
+                message=item.get("errorMsg", "Unknown error"),
+                error_code=item.get("errorCode")
+            )
+        return {
+            client_oid: results.get(client_oid) or OrderResult(
+                success=False,
+                message="Order missing from batch response"
+            )
+            for client_oid, _ in batch
+        }
+    
     def get_account_info(self) -> AccountInfo:
         """
         Get Bitget account information
@@ -292,59 +455,191 @@ class BitgetAPI(BaseBroker):
             symbol: Filter by symbol
             
         Returns:
-            List of open positions
+            List of open positions (empty on errors)
         """
         try:
-            if self.product_type == "USDT-FUTURES":
-                endpoint = "/api/v2/mix/position/all-position"
-                params = {"productType": self.product_type}
-                if symbol:
-                    params["symbol"] = symbol
-            else:
-                # Spot doesn't have positions, return empty list
-                return []
-            
-            response = self._make_request("GET", endpoint, params=params)
+            return self.fetch_positions(symbol)
+        except Exception:
+            return []
+    
+    def fetch_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """
+        Get open positions from Bitget, raising on errors
+        
+        Args:
+            symbol: Filter by symbol
             
-            positions = []
-            if response.get("code") == "00000":
-                data = response.get("data", [])
-                for pos in data:
-                    if float(pos.get("total", 0)) > 0:
-                        positions.append(Position(
-                            symbol=pos.get("symbol", ""),
-                            volume=float(pos.get("total", 0)),
-                            type="BUY" if pos.get("holdSide") == "long" else "SELL",
-                            open_price=float(pos.get("openPriceAvg", 0)),
-                            current_price=float(pos.get("markPrice", 0)),
-                            profit=float(pos.get("unrealizedPL", 0)),
-                            swap=0.0,
-                            commission=0.0,
-                            position_id=pos.get("positionId")
-                        ))
+        Returns:
+            List of open positions
             
-            return positions
-        except Exception:
+        Raises:
+            BrokerError: The request failed or Bitget rejected it
+        """
+        if self.product_type == "USDT-FUTURES":
+            endpoint = "/api/v2/mix/position/all-position"
+            params = {"productType": self.product_type}
+            if symbol:
+                params["symbol"] = symbol
+        else:
+            # Spot doesn't have positions, return empty list
             return []
+        
+        response = self._make_request("GET", endpoint, params=params)
+        
+        if response.get("code") != "00000":
+            raise BrokerError(f"{response.get('code')}: {response.get('msg', 'Unknown error')}")
+        
+        positions = []
+        for pos in response.get("data") or []:
+            if float(pos.get("total", 0)) > 0:
+                positions.append(Position(
+                    symbol=pos.get("symbol", ""),
+                    volume=float(pos.get("total", 0)),
+                    type="BUY" if pos.get("holdSide") == "long" else "SELL",
+                    open_price=float(pos.get("openPriceAvg", 0)),
+                    current_price=float(pos.get("markPrice", 0)),
+                    profit=float(pos.get("unrealizedPL", 0)),
+                    swap=0.0,
+                    commission=0.0,
+                    position_id=pos.get("positionId")
+                ))
+        
+        return positions
+    
+    def get_account_snapshot(self, symbol: Optional[str] = None) -> Tuple[AccountInfo, List[Position]]:
+        """
+        Get account information and open positions concurrently
+        
+        Args:
+            symbol: Filter positions by symbol
+            
+        Returns:
+            (AccountInfo, list of open positions)
+        """
+        account, positions = self.http.fan_out([
+            self.get_account_info,
+            lambda: self.get_positions(symbol)
+        ])
+        return account, positions
+    
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get request latency histograms per endpoint
+        
+        Returns:
+            {'<METHOD> <path>': summary} (see LatencyHistogram.summary);
+            shared with accounts using the same http_client
+        """
+        return self.http.latency_stats()
+    
+    def close(self):
+        """Close pooled connections (shared with accounts using the same http_client)"""
+        self.http.close()
     
     def close_position(self, position_id: str) -> OrderResult:
         """
-        Close a position on Bitget
+        Close a position on Bitget at market
         
         Args:
             position_id: Position ID to close
             
         Returns:
             OrderResult with execution details
+        """
+        return self.close_positions([position_id])[0]
+    
+    def close_positions(self, position_ids: List[str]) -> List[OrderResult]:
+        """
+        Close several positions at market with Bitget's close-positions endpoint
+        
+        Position ids are resolved to symbol and side with one positions
+        request (if it fails, every result carries its error), then one
+        request per symbol and side is sent, concurrently. The endpoint's
+        close-everything form is never used: it would also close positions
+        opened after the lookup that the caller did not name.
+        
+        Args:
+            position_ids: Position IDs to close
             
-        Raises:
-            NotImplementedError: This method is not yet implemented
+        Returns:
+            One OrderResult per position, in the order given
         """
-        # TODO: Implement position closing for Bitget
-        # Bitget requires placing a reverse order to close a position
-        raise NotImplementedError(
-            "Close position is not yet fully implemented for Bitget. "
-            "To close a position, place a reverse order manually."
+        if self.product_type != "USDT-FUTURES":
+            return [
+                OrderResult(
+                    success=False,
+                    message="Spot accounts have no positions to close",
+                    error_code="NOT_SUPPORTED"
+                )
+                for _ in position_ids
+            ]
+        
+        try:
+            open_positions = {pos.position_id: pos for pos in self.fetch_positions()}
+        except Exception as e:
+            return [
+                OrderResult(
+                    success=False,
+                    message=f"Error closing position: {str(e)}"
+                )
+                for _ in position_ids
+            ]
+        targets: Dict[Tuple[str, str], List[int]] = {}
+        results: List[Optional[OrderResult]] = [None] * len(position_ids)
+        for index, position_id in enumerate(position_ids):
+            pos = open_positions.get(position_id)
+            if pos is None:
+                results[index] = OrderResult(
+                    success=False,
+                    message=f"Position {position_id} not found",
+                    error_code="POSITION_NOT_FOUND"
+                )
+            else:
+                hold_side = "long" if pos.type == "BUY" else "short"
+                targets.setdefault((pos.symbol, hold_side), []).append(index)
+        
+        calls = [lambda target=target: self._close_group(*target) for target in targets]
+        for indexes, result in zip(targets.values(), self.http.fan_out(calls)):
+            for index in indexes:
+                results[index] = result
+        return results
+    
+    def _close_group(self, symbol: str, hold_side: str) -> OrderResult:
+        """
+        Send one close-positions request for a symbol and side
+        
+        Args:
+            symbol: Trading symbol
+            hold_side: 'long' or 'short'
+            
+        Returns:
+            OrderResult for every position of that symbol and side
+        """
+        order_data = {"productType": self.product_type, "symbol": symbol, "holdSide": hold_side}
+        response = self._make_request("POST", "/api/v2/mix/order/close-positions", data=order_data)
+        
+        # Check response
+        if response.get("code") != "00000":
+            return OrderResult(
+                success=False,
+                message=response.get("msg", "Unknown error"),
+                error_code=response.get("code")
+            )
+        
+        data = response.get("data") or {}
+        items = [(item, True) for item in data.get("successList") or []]
+        items += [(item, False) for item in data.get("failureList") or []]
+        for item, success in items:
+            if item.get("symbol") == symbol:
+                return OrderResult(
+                    success=success,
+                    order_id=item.get("orderId"),
+                    message="Position closed" if success else item.get("errorMsg", "Unknown error"),
+                    error_code=None if success else item.get("errorCode")
+                )
+        return OrderResult(
+            success=False,
+            message="Position missing from close response"
         )
     
     def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
@@ -2,11 +2,22 @@
 Exness Broker API Implementation
 """
 import requests
-import time
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
-from .base_broker import BaseBroker, BrokerConfig, OrderResult, Position, AccountInfo
+from .base_broker import BaseBroker, BrokerConfig, BrokerError, OrderResult, Position, AccountInfo
+from .rate_limiter import (
+    PRIORITY_ACCOUNT, PRIORITY_POLLING, PRIORITY_TRADING, retry_after_seconds, shared_rate_limiter
+)
+
+# Request weight and priority by endpoint prefix: trading calls go before polling
+EXNESS_RATE_RULES = {
+    'POST /orders': (1, PRIORITY_TRADING),
+    'DELETE /positions': (1, PRIORITY_TRADING),
+    'PATCH /positions': (1, PRIORITY_TRADING),
+    'GET /accounts': (1, PRIORITY_ACCOUNT),
+    'GET /positions': (1, PRIORITY_POLLING),
+}
 
 
 class ExnessAPI(BaseBroker):
@@ -32,18 +43,15 @@ class ExnessAPI(BaseBroker):
                 'X-Account-ID': config.account_id
             })
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        # Rate limiting, shared by every instance using this API key
         self.rate_limit = config.rate_limit or {'requests_per_minute': 60}
+        self.rate_limiter = shared_rate_limiter(
+            config.name, config.api_key or config.account_id, self.rate_limit, EXNESS_RATE_RULES
+        )
     
-    def _rate_limit(self):
-        """Apply rate limiting"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+    def _rate_limit(self, method: str, endpoint: str):
+        """Wait for the account's request quota"""
+        self.rate_limiter.acquire(f"{method.upper()} {endpoint}")
     
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
         """
@@ -57,12 +65,14 @@ class ExnessAPI(BaseBroker):
         Returns:
             Response data as dictionary
         """
-        self._rate_limit()
+        self._rate_limit(method, endpoint)
         
         url = f"{self.base_url}{endpoint}"
         
         try:
             response = self.session.request(method, url, timeout=10, **kwargs)
+            if response.status_code == 429:
+                self.rate_limiter.penalize(retry_after_seconds(response.headers.get('Retry-After')))
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -159,11 +169,29 @@ class ExnessAPI(BaseBroker):
         """
         Get open positions from Exness
         
+        Args:
+            symbol: Filter by symbol (None = all)
+            
+        Returns:
+            List of positions (empty on errors)
+        """
+        try:
+            return self.fetch_positions(symbol)
+        except BrokerError:
+            return []
+    
+    def fetch_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """
+        Get open positions from Exness, raising on errors
+        
         Args:
             symbol: Filter by symbol (None = all)
             
         Returns:
             List of positions
+            
+        Raises:
+            BrokerError: The request failed or the response has no positions
         """
         endpoint = '/positions'
         if symbol:
@@ -171,8 +199,10 @@ class ExnessAPI(BaseBroker):
         
         response = self._make_request('GET', endpoint)
         
-        if 'error' in response or 'positions' not in response:
-            return []
+        if 'error' in response:
+            raise BrokerError(f"{response['error']}: {response.get('details', '')}")
+        if 'positions' not in response:
+            raise BrokerError("Positions missing from response")
         
         positions = []
         for pos_data in response.get('positions', []):
@@ -0,0 +1,245 @@
+"""
+Pooled Broker HTTP Client
+Keep-alive connection pool with concurrent request fan-out and per-endpoint latency histograms
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+T = TypeVar('T')
+
+# Upper bounds of the latency histogram buckets, in milliseconds (plus one overflow bucket)
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of request latencies since start"""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        """
+        Initialize LatencyHistogram
+
+        Args:
+            bounds: Increasing bucket upper bounds in milliseconds
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.min_ms: Optional[float] = None
+        self.max_ms: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, error: bool = False):
+        """
+        Record one request
+
+        Args:
+            seconds: Round-trip time
+            error: The request failed (transport error or HTTP 5xx)
+        """
+        ms = seconds * 1000
+        index = 0
+        bounds = self.bounds
+        while index < len(bounds) and ms > bounds[index]:
+            index += 1
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.errors += error
+            self.total_ms += ms
+            if self.min_ms is None or ms < self.min_ms:
+                self.min_ms = ms
+            if self.max_ms is None or ms > self.max_ms:
+                self.max_ms = ms
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """
+        Estimate a latency percentile
+
+        Args:
+            pct: Percentile (0-100)
+
+        Returns:
+            Upper bound of the bucket holding the percentile (the maximum seen
+            for the overflow bucket) in milliseconds, or None if empty
+        """
+        with self._lock:
+            if not self.count:
+                return None
+            rank = max(1, pct / 100 * self.count)
+            seen = 0
+            for index, count in enumerate(self.counts):
+                seen += count
+                if seen >= rank:
+                    break
+            if index < len(self.bounds):
+                return min(self.bounds[index], self.max_ms)
+            return self.max_ms
+
+    def summary(self) -> Dict[str, Any]:
+        """Get count, mean, min/max, p50/p90/p99 and bucket counts in milliseconds"""
+        p50, p90, p99 = self.percentile(50), self.percentile(90), self.percentile(99)
+        with self._lock:
+            labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+            return {
+                'count': self.count,
+                'errors': self.errors,
+                'mean_ms': round(self.total_ms / self.count, 3) if self.count else None,
+                'min_ms': round(self.min_ms, 3) if self.min_ms is not None else None,
+                'max_ms': round(self.max_ms, 3) if self.max_ms is not None else None,
+                'p50_ms': p50 and round(p50, 3),
+                'p90_ms': p90 and round(p90, 3),
+                'p99_ms': p99 and round(p99, 3),
+                'buckets': {label: count for label, count in zip(labels, self.counts) if count}
+            }
+
+
+class PooledHttpClient:
+    """
+    HTTP client that keeps connections to each host open between requests
+
+    Requests go through one requests.Session whose pool holds up to
+    `pool_size` keep-alive connections per host, so only the first request
+    on a connection pays the TCP and TLS handshake. The session and pool are
+    thread-safe: one client can be shared by every broker instance talking
+    to the same exchange. fan_out() runs calls concurrently on a thread pool
+    of the same size, and every request's latency is recorded in a
+    histogram for its endpoint.
+    """
+
+    def __init__(self, pool_size: int = 4, timeout: float = 10.0,
+                 headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize PooledHttpClient
+
+        Args:
+            pool_size: Connections kept open per host (and fan-out threads)
+            timeout: Default request timeout in seconds
+            headers: Headers sent with every request
+        """
+        if pool_size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._local = threading.local()
+
+    def request(self, method: str, url: str, endpoint: Optional[str] = None,
+                timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        Send a request on a pooled connection
+
+        Args:
+            method: HTTP method
+            url: Full URL
+            endpoint: Histogram key (default: '<METHOD> <path>', without the query)
+            timeout: Request timeout in seconds (default: the client's)
+            **kwargs: Passed to requests.Session.request (data, json, headers, ...)
+
+        Returns:
+            Response (any status)
+
+        Raises:
+            requests.RequestException: Connection or timeout errors
+        """
+        if endpoint is None:
+            endpoint = f"{method.upper()} {urlsplit(url).path}"
+        histogram = self.histogram(endpoint)
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+        except requests.RequestException:
+            histogram.record(time.perf_counter() - start, error=True)
+            raise
+        histogram.record(time.perf_counter() - start, error=response.status_code >= 500)
+        return response
+
+    def histogram(self, endpoint: str) -> LatencyHistogram:
+        """Latency histogram of one endpoint (created on first use)"""
+        histogram = self._histograms.get(endpoint)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(endpoint, LatencyHistogram())
+        return histogram
+
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latency summary per endpoint"""
+        return {endpoint: histogram.summary() for endpoint, histogram in sorted(self._histograms.items())}
+
+    def fan_out(self, calls: Iterable[Callable[[], T]]) -> List[T]:
+        """
+        Run calls concurrently, at most pool_size at a time
+
+        Args:
+            calls: Zero-argument callables (e.g. bound broker methods or lambdas)
+
+        Returns:
+            Results in the order of calls
+
+        Raises:
+            The exception of the first failed call, once every call finished
+        """
+        if getattr(self._local, 'in_pool', False):
+            # Already on a fan-out thread: waiting on the pool could deadlock it
+            return [call() for call in calls]
+        pool = self._pool()
+        futures = [pool.submit(self._run, call) for call in calls]
+        wait(futures)
+        return [future.result() for future in futures]
+
+    async def gather(self, calls: Iterable[Callable[[], T]]) -> List[T]:
+        """
+        fan_out() for asyncio code: awaits the calls without blocking the event loop
+
+        Args:
+            calls: Zero-argument callables
+
+        Returns:
+            Results in the order of calls
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        return list(await asyncio.gather(*(loop.run_in_executor(pool, self._run, call) for call in calls)))
+
+    def _run(self, call: Callable[[], T]) -> T:
+        """Run a call on a fan-out thread"""
+        self._local.in_pool = True
+        return call()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Fan-out thread pool (started on first use)"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.pool_size,
+                                                        thread_name_prefix='http-fan-out')
+        return self._executor
+
+    def close(self):
+        """Stop the fan-out threads and close pooled connections"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.session.close()
+
+    def __enter__(self) -> 'PooledHttpClient':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,372 @@
+"""
+Broker Rate Limiter
+Token buckets with burst capacity, endpoint weights and priority classes, shared per API key
+"""
+import asyncio
+import hashlib
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Priority classes: lower values are served first when requests queue for tokens
+PRIORITY_TRADING = 0   # Orders, closes and modifications
+PRIORITY_ACCOUNT = 1   # Account and balance queries
+PRIORITY_POLLING = 2   # Position and status polling
+
+
+class _Waiter:
+    """A request queued for tokens"""
+
+    __slots__ = ('priority', 'seq', 'weight', 'event', 'loop')
+
+    def __init__(self, priority: int, seq: int, weight: float, loop: Optional[asyncio.AbstractEventLoop]):
+        self.priority = priority
+        self.seq = seq
+        self.weight = weight
+        self.loop = loop
+        self.event = asyncio.Event() if loop is not None else threading.Event()
+
+    def __lt__(self, other: '_Waiter') -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    def wake(self):
+        """Wake the waiting thread or coroutine"""
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+
+class TokenBucket:
+    """
+    Token bucket shared by threads and asyncio tasks
+
+    Tokens refill continuously at `rate` per second up to `capacity` (the
+    burst size). A request takes `weight` tokens. When requests have to
+    wait they queue by priority, then arrival: only the head of the queue
+    may take tokens, so a queued order is served before any position poll
+    that is also waiting, and a heavy request is not starved by light ones.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initialize TokenBucket
+
+        Args:
+            rate: Tokens added per second
+            capacity: Most tokens held (burst size); the bucket starts full
+        """
+        if rate <= 0 or capacity <= 0:
+            raise ValueError("Rate and capacity must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+
+    @property
+    def tokens(self) -> float:
+        """Tokens available now (negative while paused)"""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, weight: float = 1) -> bool:
+        """
+        Take tokens only if no request is queued and enough are available
+
+        Args:
+            weight: Tokens to take
+
+        Returns:
+            True if taken
+        """
+        self._check(weight)
+        with self._lock:
+            self._refill()
+            if not self._waiters and self._tokens >= weight:
+                self._tokens -= weight
+                self.acquired += 1
+                return True
+            return False
+
+    def acquire(self, weight: float = 1, priority: int = PRIORITY_ACCOUNT,
+                timeout: Optional[float] = None) -> bool:
+        """
+        Take tokens, blocking until they are available
+
+        Args:
+            weight: Tokens to take
+            priority: Priority class (PRIORITY_TRADING first)
+            timeout: Most seconds to wait (None = no limit)
+
+        Returns:
+            True if taken, False on timeout
+        """
+        if self.try_acquire(weight):
+            return True
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        waiter = self._enqueue(weight, priority, None)
+        while True:
+            waiter.event.clear()
+            delay = self._take_or_delay(waiter, start)
+            if delay is None:
+                return True
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._cancel(waiter)
+                    return False
+                delay = remaining if delay < 0 else min(delay, remaining)
+            waiter.event.wait(None if delay < 0 else delay)
+
+    async def acquire_async(self, weight: float = 1, priority: int = PRIORITY_ACCOUNT,
+                            timeout: Optional[float] = None) -> bool:
+        """
+        acquire() for asyncio code: waits without blocking the event loop
+
+        Args:
+            weight: Tokens to take
+            priority: Priority class (PRIORITY_TRADING first)
+            timeout: Most seconds to wait (None = no limit)
+
+        Returns:
+            True if taken, False on timeout
+        """
+        if self.try_acquire(weight):
+            return True
+        start = time.monotonic()
+        deadline = None if timeout is None else start + timeout
+        waiter = self._enqueue(weight, priority, asyncio.get_running_loop())
+        try:
+            while True:
+                waiter.event.clear()
+                delay = self._take_or_delay(waiter, start)
+                if delay is None:
+                    return True
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._cancel(waiter)
+                        return False
+                    delay = remaining if delay < 0 else min(delay, remaining)
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), None if delay < 0 else delay)
+                except asyncio.TimeoutError:
+                    pass
+        except asyncio.CancelledError:
+            self._cancel(waiter)
+            raise
+
+    def penalize(self, seconds: float):
+        """
+        Stop granting tokens for a while (e.g. after an HTTP 429)
+
+        Args:
+            seconds: Pause length; the bucket then refills from empty
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+            if self._waiters:
+                self._waiters[0].wake()
+
+    def _check(self, weight: float):
+        """Reject requests the bucket could never hold tokens for"""
+        if weight > self.capacity:
+            raise ValueError(f"Weight {weight} exceeds bucket capacity {self.capacity}")
+
+    def _refill(self):
+        """Add the tokens earned since the last update (lock held)"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _enqueue(self, weight: float, priority: int, loop) -> _Waiter:
+        """Queue a request for tokens"""
+        self._check(weight)
+        waiter = _Waiter(priority, next(self._seq), weight, loop)
+        with self._lock:
+            heapq.heappush(self._waiters, waiter)
+        return waiter
+
+    def _take_or_delay(self, waiter: _Waiter, start: float) -> Optional[float]:
+        """
+        Take tokens if the waiter is at the head of the queue and they are there
+
+        Returns:
+            None if taken, else seconds until the tokens will be there
+            (-1 = not at the head, wait to be woken)
+        """
+        with self._lock:
+            self._refill()
+            if self._waiters[0] is not waiter:
+                return -1
+            if self._tokens >= waiter.weight:
+                heapq.heappop(self._waiters)
+                self._tokens -= waiter.weight
+                self.acquired += 1
+                self.waited += 1
+                self.wait_seconds += time.monotonic() - start
+                if self._waiters:
+                    self._waiters[0].wake()
+                return None
+            return (waiter.weight - self._tokens) / self.rate
+
+    def _cancel(self, waiter: _Waiter):
+        """Drop a waiter that gave up and wake the new head"""
+        with self._lock:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self.timeouts += 1
+            if self._waiters:
+                self._waiters[0].wake()
+
+    def get_stats(self) -> Dict:
+        """Get bucket statistics"""
+        with self._lock:
+            self._refill()
+            return {
+                'rate_per_second': self.rate,
+                'capacity': self.capacity,
+                'tokens': round(self._tokens, 3),
+                'queued': len(self._waiters),
+                'acquired': self.acquired,
+                'waited': self.waited,
+                'avg_wait_ms': round(self.wait_seconds / self.waited * 1000, 3) if self.waited else 0.0,
+                'timeouts': self.timeouts
+            }
+
+
+class RateLimiter:
+    """
+    Request quota of one account: a TokenBucket plus per-endpoint rules
+
+    Rules map an endpoint prefix such as 'POST /api/v2/mix/order' to
+    (weight, priority); the longest matching prefix applies, otherwise
+    weight 1 and the default priority.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: Optional[float] = None,
+                 rules: Optional[Dict[str, Tuple[float, int]]] = None,
+                 default_priority: int = PRIORITY_ACCOUNT):
+        """
+        Initialize RateLimiter
+
+        Args:
+            requests_per_minute: Sustained quota (weight units per minute)
+            burst: Requests allowed at once (default: one second of quota, at least 1);
+                raised to the heaviest rule's weight so every endpoint can be called
+            rules: {endpoint prefix: (weight, priority)}
+            default_priority: Priority of endpoints without a rule
+        """
+        rate = requests_per_minute / 60.0
+        self.rules = dict(rules or {})
+        heaviest = max((weight for weight, _ in self.rules.values()), default=1)
+        self.bucket = TokenBucket(rate, max(burst if burst else max(1.0, rate), heaviest))
+        self.default_priority = default_priority
+        self._resolved: Dict[str, Tuple[float, int]] = {}
+
+    def rule(self, endpoint: str) -> Tuple[float, int]:
+        """
+        Weight and priority of an endpoint
+
+        Args:
+            endpoint: '<METHOD> <path>' (query strings are ignored)
+
+        Returns:
+            (weight, priority)
+        """
+        endpoint = endpoint.split('?', 1)[0]
+        resolved = self._resolved.get(endpoint)
+        if resolved is None:
+            matches = [prefix for prefix in self.rules if endpoint.startswith(prefix)]
+            resolved = self.rules[max(matches, key=len)] if matches else (1, self.default_priority)
+            if len(self._resolved) < 1024:
+                self._resolved[endpoint] = resolved
+        return resolved
+
+    def acquire(self, endpoint: str, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for quota to call an endpoint
+
+        Args:
+            endpoint: '<METHOD> <path>'
+            timeout: Most seconds to wait (None = no limit)
+
+        Returns:
+            True if the request may be sent, False on timeout
+        """
+        weight, priority = self.rule(endpoint)
+        return self.bucket.acquire(weight, priority, timeout)
+
+    async def acquire_async(self, endpoint: str, timeout: Optional[float] = None) -> bool:
+        """acquire() for asyncio code"""
+        weight, priority = self.rule(endpoint)
+        return await self.bucket.acquire_async(weight, priority, timeout)
+
+    def penalize(self, seconds: float):
+        """Pause the account's requests (e.g. for a 429's Retry-After)"""
+        logger.warning(f"Rate limited by the broker, pausing requests for {seconds:.1f}s")
+        self.bucket.penalize(seconds)
+
+    def get_stats(self) -> Dict:
+        """Get limiter statistics"""
+        return self.bucket.get_stats()
+
+
+# Limiters shared by every broker instance using the same account/API key
+_shared_limiters: Dict[str, RateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_rate_limiter(broker: str, account: str, rate_limit: Dict,
+                        rules: Optional[Dict[str, Tuple[float, int]]] = None) -> RateLimiter:
+    """
+    Get the process-wide limiter of an account, creating it on first use
+
+    The exchange counts requests per account/API key, so every instance
+    (and thread) using the same key must draw from one bucket. Settings are
+    taken from the first caller.
+
+    Args:
+        broker: Broker name
+        account: API key or account id (only a hash is kept)
+        rate_limit: Broker config quota: 'requests_per_minute' (sustained) and
+            'burst' or 'requests_per_second' (burst size)
+        rules: {endpoint prefix: (weight, priority)}
+
+    Returns:
+        RateLimiter
+    """
+    key = f"{broker.upper()}:{hashlib.sha256(account.encode('utf-8')).hexdigest()[:16]}"
+    with _shared_lock:
+        limiter = _shared_limiters.get(key)
+        if limiter is None:
+            limiter = _shared_limiters[key] = RateLimiter(
+                rate_limit.get('requests_per_minute', 60),
+                rate_limit.get('burst', rate_limit.get('requests_per_second')),
+                rules
+            )
+        return limiter
+
+
+def retry_after_seconds(value: Optional[str], default: float = 1.0) -> float:
+    """Seconds from a Retry-After header (delay seconds only), else default"""
+    try:
+        return max(0.0, float(value)) if value else default
+    except ValueError:
+        return default
@@ -0,0 +1,193 @@
+"""
+Batch Order Test Script
+Checks the concurrent place_orders/close_positions fallback and Bitget's batch endpoints
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brokers.base_broker import AccountInfo, BaseBroker, BrokerConfig, OrderRequest, OrderResult, Position
+from brokers.rate_limiter import PRIORITY_TRADING
+from brokers.test_http_client import make_api, serve_fake_bitget
+
+
+class SlowBroker(BaseBroker):
+    """Broker whose single-order calls take 100 ms each"""
+
+    def __init__(self):
+        super().__init__(BrokerConfig(name="SLOW", api_url="", account_id="1"))
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def place_order(self, symbol: str, action: str, lot_size: float,
+                    stop_loss: Optional[float] = None,
+                    take_profit: Optional[float] = None,
+                    comment: str = "") -> OrderResult:
+        with self.lock:
+            self.calls += 1
+        time.sleep(0.1)
+        if lot_size <= 0:
+            raise ValueError("lot size must be positive")
+        return OrderResult(success=True, order_id=f"{symbol}-{action}-{comment}")
+
+    def get_account_info(self) -> AccountInfo:
+        return AccountInfo(balance=0.0, equity=0.0, margin=0.0, free_margin=0.0, margin_level=0.0)
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        return []
+
+    def close_position(self, position_id: str) -> OrderResult:
+        time.sleep(0.1)
+        return OrderResult(success=position_id != "missing", order_id=position_id)
+
+    def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
+                        take_profit: Optional[float] = None) -> OrderResult:
+        return OrderResult(success=True)
+
+
+def test_generic_fallback():
+    """Brokers without a batch endpoint run their single calls concurrently"""
+    print("\n=== Testing generic batch fallback ===")
+
+    broker = SlowBroker()
+    orders = [OrderRequest("EURUSD", "BUY", 0.1, comment=str(i)) for i in range(8)]
+    orders.append(OrderRequest("EURUSD", "SELL", 0))
+    start = time.monotonic()
+    results = broker.place_orders(orders)
+    elapsed = time.monotonic() - start
+    assert elapsed < 0.35, elapsed  # 9 calls, 8 at a time
+    assert [r.order_id for r in results[:8]] == [f"EURUSD-BUY-{i}" for i in range(8)]
+    assert not results[8].success and results[8].message == "Error placing order: lot size must be positive"
+
+    start = time.monotonic()
+    closed = broker.close_positions(["1", "missing", "3"])
+    assert time.monotonic() - start < 0.2
+    assert [r.success for r in closed] == [True, False, True]
+    assert broker.place_orders([]) == [] and broker.calls == 9
+    print(f"✓ 9 orders in {elapsed * 1000:.0f} ms instead of 900 ms")
+
+
+def test_bitget_batch_orders():
+    """A basket on one symbol is one request; results map back per order"""
+    print("\n=== Testing Bitget batch orders ===")
+
+    server = serve_fake_bitget()
+    api = make_api(server.url)
+    try:
+        basket = [OrderRequest("BTCUSDT", "BUY" if i % 2 else "SELL", 0.01, stop_loss=59000) for i in range(20)]
+        results = api.place_orders(basket)
+        assert all(r.success for r in results) and len({r.order_id for r in results}) == 20
+        assert [path for _, method, path in server.requests] == ["/api/v2/mix/order/batch-place-order"]
+
+        server.requests.clear()
+        mixed = [OrderRequest("ETHUSDT", "BUY", 0.1), OrderRequest("BTCUSDT", "SELL", 0),
+                 OrderRequest("ETHUSDT", "SELL", 0.2)]
+        mixed += [OrderRequest("SOLUSDT", "BUY", 1) for _ in range(55)]
+        results = api.place_orders(mixed)
+        assert len(server.requests) == 4  # ETH, BTC and two SOL batches (50 + 5)
+        assert results[0].success and results[2].success and results[0].order_id != results[2].order_id
+        assert not results[1].success and results[1].error_code == "40034"
+        assert results[1].message == "size must be positive"
+        assert all(r.success for r in results[3:])
+
+        server.requests.clear()
+        single = api.place_orders([OrderRequest("BTCUSDT", "BUY", 0.01)])
+        assert single[0].success and server.requests[0][2] == "/api/v2/mix/order/place-order"
+    finally:
+        api.close()
+        server.shutdown()
+        server.server_close()
+    print("✓ 20-leg basket placed in one request")
+
+
+def test_bitget_close_positions():
+    """Closes go out as one request per symbol and side, even when they cover every position"""
+    print("\n=== Testing Bitget close_positions ===")
+
+    server = serve_fake_bitget()
+    server.positions = [
+        {"symbol": f"SYM{i}USDT", "total": "1", "holdSide": "long" if i % 2 else "short",
+         "openPriceAvg": "10", "markPrice": "11", "unrealizedPL": "1", "positionId": f"p{i}"}
+        for i in range(20)
+    ]
+    api = make_api(server.url)
+    try:
+        results = api.close_positions(["p0", "p1"])
+        assert [r.order_id for r in results] == ["c-p0", "c-p1"]
+        closes = [path for _, method, path in server.requests if method == "POST"]
+        assert closes == ["/api/v2/mix/order/close-positions"] * 2 and len(server.positions) == 18
+
+        server.requests.clear()
+        results = api.close_positions([f"p{i}" for i in range(2, 20)] + ["gone"])
+        assert [r.order_id for r in results[:18]] == [f"c-p{i}" for i in range(2, 20)]
+        assert results[18].error_code == "POSITION_NOT_FOUND" and server.positions == []
+        assert [method for _, method, path in server.requests] == ["GET"] + ["POST"] * 18  # never close all
+
+        assert api.close_position("p1").error_code == "POSITION_NOT_FOUND"
+    finally:
+        api.close()
+        server.shutdown()
+        server.server_close()
+    print("✓ 18-position basket closed per symbol and side")
+
+
+def test_bitget_batch_errors():
+    """Tight quotas and error responses still give one OrderResult per order"""
+    print("\n=== Testing Bitget batch errors ===")
+
+    server = serve_fake_bitget()
+    api = make_api(server.url, rate_limit={'requests_per_minute': 60})
+    try:
+        assert api.rate_limiter.rule('POST /api/v2/mix/order/close-positions')[0] == 2
+        assert api.rate_limiter.bucket.capacity == 2  # burst 1 raised to the batch weight
+        results = api.place_orders([OrderRequest("BTCUSDT", "BUY", 0.01) for _ in range(3)])
+        assert len(results) == 3 and all(r.success for r in results)
+        api.rate_limiter.rules['POST /api/v2/mix/order/batch-place-order'] = (5, PRIORITY_TRADING)  # above capacity
+        api.rate_limiter._resolved.clear()
+        results = api.place_orders([OrderRequest("BTCUSDT", "BUY", 0.01) for _ in range(2)])
+        assert [r.success for r in results] == [False, False] and "exceeds bucket capacity" in results[0].message
+
+        api.api_secret = "wrong"
+        api.rate_limiter = make_api(server.url).rate_limiter  # unthrottled for the rest
+        closed = api.close_positions(["p1", "p2"])
+        assert [r.success for r in closed] == [False, False]
+        assert closed[0].message == "Error closing position: 40009: sign signature error"
+        assert [path for _, _, path in server.requests].count("/api/v2/mix/order/close-positions") == 0
+    finally:
+        api.close()
+        server.shutdown()
+        server.server_close()
+    print("✓ Batch weights fit small buckets, failed lookups close nothing")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Batch Order Test Suite")
+    print("=" * 50)
+
+    try:
+        test_generic_fallback()
+        test_bitget_batch_orders()
+        test_bitget_close_positions()
+        test_bitget_batch_errors()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
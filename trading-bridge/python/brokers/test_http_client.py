@@ -0,0 +1,272 @@
+"""
+Pooled HTTP Client Test Script
+Checks connection reuse, concurrent fan-out, latency histograms and BitgetAPI against a local server
+"""
+import asyncio
+import base64
+import hashlib
+import hmac
+import json
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brokers.bitget_api import BitgetAPI, BitgetConfig
+from brokers.http_client import LatencyHistogram, PooledHttpClient
+
+SECRET = "test-secret"
+
+
+class FakeBitgetHandler(BaseHTTPRequestHandler):
+    """Answers a few Bitget v2 endpoints over keep-alive HTTP/1.1"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        time.sleep(server.handshake_delay)  # stands in for TCP + TLS setup
+        super().setup()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict, headers: dict = None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _signed(self, body: str) -> bool:
+        message = self.headers["ACCESS-TIMESTAMP"] + self.command + self.path + body
+        expected = base64.b64encode(hmac.new(SECRET.encode(), message.encode(), hashlib.sha256).digest())
+        return self.headers["ACCESS-SIGN"] == expected.decode()
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        with self.server.lock:
+            self.server.requests.append((time.monotonic(), self.command, path))
+            throttled = self.server.throttled > 0
+            self.server.throttled -= throttled
+        if throttled:
+            self._reply(429, {"code": "429", "msg": "Too Many Requests"}, {"Retry-After": "0.3"})
+        elif not self._signed(""):
+            self._reply(401, {"code": "40009", "msg": "sign signature error"})
+        elif path == "/api/v2/public/time":
+            self._reply(200, {"code": "00000", "data": {"serverTime": str(int(time.time() * 1000))}})
+        elif path == "/api/v2/mix/account/account":
+            time.sleep(self.server.slow)
+            self._reply(200, {"code": "00000", "data": [{"available": "1000", "equity": "1100", "locked": "100"}]})
+        elif path == "/api/v2/mix/position/all-position":
+            time.sleep(self.server.slow)
+            self._reply(200, {"code": "00000", "data": self.server.positions})
+        else:
+            self._reply(404, {"code": "40404", "msg": "not found"})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode('utf-8')
+        order = json.loads(body)
+        with self.server.lock:
+            self.server.requests.append((time.monotonic(), self.command, self.path))
+        if not self._signed(body):
+            self._reply(401, {"code": "40009", "msg": "sign signature error"})
+        elif self.path in ("/api/v2/mix/order/batch-place-order", "/api/v2/spot/trade/batch-orders"):
+            placed = [o for o in order["orderList"] if o["size"] != "0"]
+            rejected = [o for o in order["orderList"] if o["size"] == "0"]
+            self._reply(200, {"code": "00000", "data": {
+                "successList": [{"orderId": f"o-{o['clientOid']}", "clientOid": o["clientOid"]} for o in placed],
+                "failureList": [{"clientOid": o["clientOid"], "errorMsg": "size must be positive",
+                                 "errorCode": "40034"} for o in rejected]
+            }})
+        elif self.path == "/api/v2/mix/order/close-positions":
+            with self.server.lock:
+                closing = [p for p in self.server.positions if float(p["total"]) > 0
+                           and p["symbol"] == order.get("symbol", p["symbol"])
+                           and p["holdSide"] == order.get("holdSide", p["holdSide"])]
+                for position in closing:
+                    self.server.positions.remove(position)
+            self._reply(200, {"code": "00000", "data": {
+                "successList": [{"orderId": f"c-{p['positionId']}", "symbol": p["symbol"]} for p in closing],
+                "failureList": []
+            }})
+        elif order["size"] == "0":
+            self._reply(400, {"code": "40034", "msg": "size must be positive"})
+        else:
+            self._reply(200, {"code": "00000", "data": {"orderId": f"o-{order['clientOid']}"}})
+
+
+def serve_fake_bitget(handshake_delay: float = 0.0, slow: float = 0.0) -> ThreadingHTTPServer:
+    """Start a fake Bitget server on a free local port (server.url is its base URL)"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBitgetHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = []  # (arrival time, method, path)
+    server.throttled = 0  # answer this many GETs with 429
+    server.handshake_delay = handshake_delay
+    server.slow = slow
+    server.positions = [
+        {"symbol": "BTCUSDT", "total": "0.5", "holdSide": "long", "openPriceAvg": "60000",
+         "markPrice": "61000", "unrealizedPL": "500", "positionId": "p1"},
+        {"symbol": "ETHUSDT", "total": "0", "holdSide": "short"}
+    ]
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_api(url: str, rate_limit: dict = None, **kwargs) -> BitgetAPI:
+    """BitgetAPI with its own API key (and rate limiter, unthrottled by default) pointed at a local server"""
+    config = BitgetConfig(name="BITGET", api_url=url, account_id="1", api_key=uuid.uuid4().hex,
+                          api_secret=SECRET, passphrase="pass",
+                          rate_limit=rate_limit or {'requests_per_minute': 600000, 'burst': 1000})
+    api = BitgetAPI(config, **kwargs)
+    api.base_url = url
+    return api
+
+
+def test_connections_reused():
+    """Sequential requests share one keep-alive connection and are histogrammed per endpoint"""
+    print("\n=== Testing connection reuse ===")
+
+    server = serve_fake_bitget()
+    api = make_api(server.url)
+    try:
+        for _ in range(20):
+            assert api.test_connection()
+        assert server.connections == 1
+        stats = api.get_latency_stats()["GET /api/v2/public/time"]
+        assert stats['count'] == 20 and stats['errors'] == 0
+        assert sum(stats['buckets'].values()) == 20 and stats['p50_ms'] <= stats['p99_ms']
+    finally:
+        api.close()
+        server.shutdown()
+        server.server_close()
+    print(f"✓ 20 requests over 1 connection (p50 {stats['p50_ms']} ms)")
+
+
+def test_bitget_responses():
+    """Signed requests parse accounts, positions, orders and JSON error bodies"""
+    print("\n=== Testing Bitget requests ===")
+
+    server = serve_fake_bitget()
+    api = make_api(server.url)
+    try:
+        account = api.get_account_info()
+        assert (account.balance, account.equity, account.margin) == (1000.0, 1100.0, 100.0)
+        positions = api.get_positions("BTCUSDT")
+        assert [(p.symbol, p.volume, p.type, p.position_id) for p in positions] == [("BTCUSDT", 0.5, "BUY", "p1")]
+
+        result = api.place_order("BTCUSDT", "BUY", 0.01, stop_loss=59000, take_profit=65000)
+        assert result.success and result.order_id.startswith("o-")
+        rejected = api.place_order("BTCUSDT", "SELL", 0)
+        assert not rejected.success and rejected.error_code == "40034"
+        assert rejected.message == "size must be positive"
+
+        api.api_secret = "wrong"
+        assert not api.test_connection()
+        assert server.connections == 1
+    finally:
+        api.close()
+        server.shutdown()
+        server.server_close()
+
+    closed = make_api(server.url)
+    try:
+        assert closed._make_request("GET", "/api/v2/public/time")["code"] == "error"
+        assert closed.get_latency_stats()["GET /api/v2/public/time"]['errors'] == 1
+    finally:
+        closed.close()
+    print("✓ Responses parsed, rejections keep Bitget's code and message")
+
+
+def test_fan_out():
+    """Account and position requests run concurrently, also from asyncio and nested fan-outs"""
+    print("\n=== Testing fan-out ===")
+
+    server = serve_fake_bitget(slow=0.2)
+    shared = PooledHttpClient(pool_size=4)
+    accounts = [make_api(server.url, http_client=shared) for _ in range(2)]
+    try:
+        start = time.perf_counter()
+        account, positions = accounts[0].get_account_snapshot()
+        assert account.balance == 1000.0 and len(positions) == 1
+        assert time.perf_counter() - start < 0.35
+
+        start = time.perf_counter()
+        snapshots = shared.fan_out([api.get_account_snapshot for api in accounts])  # nested fan-out
+        assert [s[0].equity for s in snapshots] == [1100.0, 1100.0]
+        assert time.perf_counter() - start < 0.7
+
+        start = time.perf_counter()
+        infos = asyncio.run(shared.gather([api.get_account_info for api in accounts * 2]))
+        assert len(infos) == 4 and time.perf_counter() - start < 0.35
+        assert server.connections <= shared.pool_size
+        assert accounts[1].get_latency_stats() == shared.latency_stats()
+
+        try:
+            shared.fan_out([lambda: 1, lambda: 1 / 0])
+            raise AssertionError("Call errors must propagate")
+        except ZeroDivisionError:
+            pass
+    finally:
+        shared.close()
+        server.shutdown()
+        server.server_close()
+    print(f"✓ Concurrent requests over {server.connections} pooled connections")
+
+
+def test_histogram():
+    """Percentiles come from bucket bounds; the overflow bucket reports the maximum"""
+    print("\n=== Testing latency histogram ===")
+
+    histogram = LatencyHistogram((10, 100))
+    assert histogram.percentile(50) is None and histogram.summary()['mean_ms'] is None
+    for ms in (3, 4, 5, 6, 50, 60, 70, 80, 90, 400):
+        histogram.record(ms / 1000, error=ms == 400)
+    assert histogram.percentile(40) == 10 and histogram.percentile(50) == 100
+    assert histogram.percentile(90) == 100 and histogram.percentile(99) == 400
+    summary = histogram.summary()
+    assert summary['buckets'] == {'<=10': 4, '<=100': 5, '>100': 1}
+    assert summary['errors'] == 1 and summary['min_ms'] == 3 and summary['mean_ms'] == 76.8
+    print("✓ Buckets and percentiles correct")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Pooled HTTP Client Test Suite")
+    print("=" * 50)
+
+    try:
+        test_connections_reused()
+        test_bitget_responses()
+        test_fan_out()
+        test_histogram()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Rate Limiter Test Script
+Checks token bucket bursts, priorities, weights, asyncio waiters and the shared broker quotas
+"""
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brokers.base_broker import BrokerConfig
+from brokers.exness_api import ExnessAPI
+from brokers.rate_limiter import (
+    PRIORITY_ACCOUNT, PRIORITY_POLLING, PRIORITY_TRADING, RateLimiter, TokenBucket, shared_rate_limiter
+)
+from brokers.test_http_client import make_api, serve_fake_bitget
+
+
+def test_burst_then_rate():
+    """A full bucket allows a burst, then requests are spaced at the refill rate"""
+    print("\n=== Testing burst and rate ===")
+
+    bucket = TokenBucket(rate=50, capacity=5)
+    start = time.monotonic()
+    for _ in range(5):
+        assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert time.monotonic() - start < 0.05
+    for _ in range(10):
+        assert bucket.acquire()
+    elapsed = time.monotonic() - start
+    assert 0.18 <= elapsed < 0.4, elapsed
+
+    assert bucket.acquire(weight=5, timeout=0.05) is False  # needs ~0.1s from empty
+    try:
+        bucket.acquire(weight=6)
+        raise AssertionError("Weights above the capacity must be rejected")
+    except ValueError:
+        pass
+    stats = bucket.get_stats()
+    assert stats['acquired'] == 15 and stats['waited'] == 10 and stats['timeouts'] == 1
+    print(f"✓ 5 at once, 10 more in {elapsed * 1000:.0f} ms at 50/s")
+
+
+def test_priorities():
+    """Queued trading requests are served before queued polling, whatever the arrival order"""
+    print("\n=== Testing priority classes ===")
+
+    bucket = TokenBucket(rate=20, capacity=1)
+    assert bucket.acquire()
+    order = []
+
+    def request(name: str, priority: int, weight: float = 1):
+        bucket.acquire(weight, priority)
+        order.append(name)
+
+    threads = [threading.Thread(target=request, args=(f"poll{i}", PRIORITY_POLLING)) for i in range(3)]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    threads.append(threading.Thread(target=request, args=("account", PRIORITY_ACCOUNT)))
+    threads.append(threading.Thread(target=request, args=("order", PRIORITY_TRADING)))
+    for thread in threads[3:]:
+        thread.start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+    assert order == ["order", "account", "poll0", "poll1", "poll2"], order
+    print(f"✓ Served {order}")
+
+
+def test_timeouts_and_penalty():
+    """A timed-out waiter leaves the queue; penalize() pauses everyone"""
+    print("\n=== Testing timeouts and penalties ===")
+
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.acquire(2)
+    done = []
+    waiter = threading.Thread(target=lambda: done.append(bucket.acquire(1, PRIORITY_POLLING)))
+    waiter.start()
+    time.sleep(0.01)
+    assert bucket.acquire(2, PRIORITY_TRADING, timeout=0.05) is False  # ahead of the poll, gives up
+    waiter.join()
+    assert done == [True] and bucket.get_stats()['timeouts'] == 1
+
+    bucket.penalize(0.3)
+    start = time.monotonic()
+    assert bucket.acquire(1)
+    assert 0.35 <= time.monotonic() - start < 0.6
+    print("✓ Timeouts release the queue, penalties delay the next request")
+
+
+def test_asyncio_and_threads():
+    """Coroutines and threads share one bucket without blocking the event loop"""
+    print("\n=== Testing asyncio waiters ===")
+
+    limiter = RateLimiter(requests_per_minute=6000, burst=5,
+                          rules={'POST /order': (1, PRIORITY_TRADING), 'GET /positions': (2, PRIORITY_POLLING)})
+    assert limiter.rule('POST /order/batch?x=1') == (1, PRIORITY_TRADING)
+    assert limiter.rule('GET /positions/5') == (2, PRIORITY_POLLING)
+    assert limiter.rule('GET /time') == (1, PRIORITY_ACCOUNT)
+
+    threads = [threading.Thread(target=limiter.acquire, args=('GET /positions',)) for _ in range(10)]
+    ticks = []
+
+    async def ticker():
+        for _ in range(20):
+            ticks.append(time.monotonic())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        for thread in threads:
+            thread.start()
+        results = await asyncio.gather(ticker(), *(limiter.acquire_async('POST /order') for _ in range(15)))
+        assert all(results[1:])
+        assert await limiter.acquire_async('GET /positions', timeout=0.001) is False
+
+    start = time.monotonic()
+    asyncio.run(run())
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - start
+    # 10 x 2 + 15 x 1 = 35 tokens, 5 up front, then 100/s
+    assert 0.28 <= elapsed < 0.6, elapsed
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.05  # the loop kept running
+    print(f"✓ 35 tokens across threads and tasks in {elapsed * 1000:.0f} ms")
+
+
+def test_shared_broker_quota():
+    """Instances with one API key share a limiter; BitgetAPI is throttled and backs off on 429"""
+    print("\n=== Testing shared broker quotas ===")
+
+    config = BrokerConfig(name="EXNESS", api_url="http://127.0.0.1:9", account_id="7",
+                          api_key="shared-key", rate_limit={'requests_per_minute': 120, 'burst': 3})
+    first, second = ExnessAPI(config), ExnessAPI(config)
+    other = ExnessAPI(BrokerConfig(name="EXNESS", api_url="http://127.0.0.1:9", account_id="8", api_key="other"))
+    assert first.rate_limiter is second.rate_limiter is shared_rate_limiter("exness", "shared-key", {})
+    assert other.rate_limiter is not first.rate_limiter
+    assert first.rate_limiter.bucket.capacity == 3 and other.rate_limiter.bucket.rate == 1.0
+    assert first.rate_limiter.rule('POST /orders') == (1, PRIORITY_TRADING)
+    example = shared_rate_limiter("exness", "example-key", {'requests_per_minute': 60, 'requests_per_second': 10})
+    assert example.bucket.rate == 1.0 and example.bucket.capacity == 10
+
+    server = serve_fake_bitget()
+    api = make_api(server.url, rate_limit={'requests_per_minute': 300, 'burst': 2})
+    clone = make_api(server.url)
+    clone.rate_limiter = api.rate_limiter
+    try:
+        start = time.monotonic()
+        for client in (api, clone) * 3:
+            assert client.test_connection()
+        assert 0.7 <= time.monotonic() - start < 1.2  # 2 at once, 4 more at 5/s
+
+        server.throttled = 1
+        start = time.monotonic()
+        assert not api.test_connection()
+        assert api.test_connection()
+        assert time.monotonic() - start >= 0.3  # waited out Retry-After
+        assert api.rate_limiter.get_stats()['waited'] >= 5
+    finally:
+        api.close()
+        clone.close()
+        server.shutdown()
+        server.server_close()
+    print("✓ One bucket per API key, 429 Retry-After honoured")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Rate Limiter Test Suite")
+    print("=" * 50)
+
+    try:
+        test_burst_then_rate()
+        test_priorities()
+        test_timeouts_and_penalty()
+        test_asyncio_and_threads()
+        test_shared_broker_quota()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,6 @@
+"""
+Streaming Indicators Module
+"""
+from .streaming import ATR, EMA, RSI, IndicatorFeed, StreamingIndicator
+
+__all__ = ['ATR', 'EMA', 'RSI', 'IndicatorFeed', 'StreamingIndicator']
@@ -0,0 +1,313 @@
+"""
+Streaming Indicators
+Stateful EMA, RSI and ATR that take one bar at a time in O(1)
+"""
+
+from typing import Any, Callable, Dict, Optional
+
+
+class StreamingIndicator:
+    """
+    Base class for indicators updated one closed bar at a time
+
+    Subclasses keep their whole state in __slots__, so snapshot() is a plain
+    dict (JSON-serializable) and restore() rebuilds an identical indicator:
+    feeding the same bars to the original and the restored copy gives the
+    same values.
+    """
+
+    __slots__ = ('period', 'value', 'count')
+
+    def __init__(self, period: int):
+        """
+        Initialize indicator
+
+        Args:
+            period: Lookback period
+        """
+        if period < 1:
+            raise ValueError("Period must be at least 1")
+        self.period = period
+        self.value: Optional[float] = None
+        self.count = 0
+
+    @property
+    def ready(self) -> bool:
+        """True once enough bars have been seen to produce a value"""
+        return self.value is not None
+
+    def update_candle(self, candle: Dict) -> Optional[float]:
+        """Feed one OHLCV candle dict"""
+        raise NotImplementedError
+
+    def reset(self):
+        """Forget every bar seen so far"""
+        type(self).__init__(self, self.period)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Capture the indicator state"""
+        state = {'indicator': type(self).__name__}
+        for cls in type(self).__mro__:
+            for name in getattr(cls, '__slots__', ()):
+                state[name] = getattr(self, name)
+        return state
+
+    @classmethod
+    def restore(cls, state: Dict[str, Any]) -> 'StreamingIndicator':
+        """
+        Rebuild an indicator from snapshot()
+
+        Args:
+            state: Snapshot dictionary
+
+        Returns:
+            Indicator in the captured state
+        """
+        if state.get('indicator') != cls.__name__:
+            raise ValueError(f"Snapshot is for {state.get('indicator')}, not {cls.__name__}")
+        indicator = cls(state['period'])
+        for name, value in state.items():
+            if name != 'indicator':
+                setattr(indicator, name, value)
+        return indicator
+
+
+class EMA(StreamingIndicator):
+    """
+    Exponential moving average (standard definition)
+
+    Seeded with the simple average of the first `period` values, then
+    ema = value * k + ema * (1 - k) with k = 2 / (period + 1) for every later
+    value, so after enough bars it converges on the full-history EMA.
+    """
+
+    __slots__ = ('_seed_sum',)
+
+    def __init__(self, period: int):
+        super().__init__(period)
+        self._seed_sum = 0.0
+
+    def update(self, value: float) -> Optional[float]:
+        """
+        Feed one value
+
+        Args:
+            value: New value (typically a close)
+
+        Returns:
+            Current EMA (None until `period` values have been seen)
+        """
+        self.count += 1
+        if self.count < self.period:
+            self._seed_sum += value
+        elif self.count == self.period:
+            self.value = (self._seed_sum + value) / self.period
+        else:
+            multiplier = 2 / (self.period + 1)
+            self.value = (value * multiplier) + (self.value * (1 - multiplier))
+        return self.value
+
+    def update_candle(self, candle: Dict) -> Optional[float]:
+        """Feed one candle's close"""
+        return self.update(candle['close'])
+
+
+def _wilder(average: float, value: float, count: int, period: int) -> float:
+    """
+    One step of Wilder smoothing
+
+    While count < period `average` is a running sum; at count == period it
+    becomes the simple mean of the first `period` inputs and afterwards
+    average = (average * (period - 1) + value) / period.
+    """
+    if count < period:
+        return average + value
+    if count == period:
+        return (average + value) / period
+    return (average * (period - 1) + value) / period
+
+
+class RSI(StreamingIndicator):
+    """
+    Relative Strength Index (Wilder)
+
+    Average gain and loss are seeded with the mean of the first `period`
+    close-to-close changes and Wilder-smoothed afterwards. RSI is 100 when
+    there are no losses.
+    """
+
+    __slots__ = ('prev_close', 'avg_gain', 'avg_loss')
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.prev_close: Optional[float] = None
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, close: float) -> Optional[float]:
+        """
+        Feed one close
+
+        Args:
+            close: Closing price
+
+        Returns:
+            Current RSI (None until `period` changes have been seen)
+        """
+        if self.prev_close is None:
+            self.prev_close = close
+            return None
+        change = close - self.prev_close
+        self.prev_close = close
+        self.count += 1
+        self.avg_gain = _wilder(self.avg_gain, change if change > 0 else 0.0, self.count, self.period)
+        self.avg_loss = _wilder(self.avg_loss, -change if change < 0 else 0.0, self.count, self.period)
+        if self.count < self.period:
+            return None
+        if self.avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100 - (100 / (1 + self.avg_gain / self.avg_loss))
+        return self.value
+
+    def update_candle(self, candle: Dict) -> Optional[float]:
+        """Feed one candle's close"""
+        return self.update(candle['close'])
+
+
+class ATR(StreamingIndicator):
+    """
+    Average True Range (Wilder)
+
+    The true range needs the previous close, so the first bar only primes
+    the state. ATR is the mean of the first `period` true ranges, then
+    Wilder-smoothed.
+    """
+
+    __slots__ = ('prev_close', '_average')
+
+    def __init__(self, period: int = 14):
+        super().__init__(period)
+        self.prev_close: Optional[float] = None
+        self._average = 0.0
+
+    def update(self, high: float, low: float, close: float) -> Optional[float]:
+        """
+        Feed one bar
+
+        Args:
+            high: Bar high
+            low: Bar low
+            close: Bar close
+
+        Returns:
+            Current ATR (None until `period` true ranges have been seen)
+        """
+        if self.prev_close is None:
+            self.prev_close = close
+            return None
+        true_range = max(
+            high - low,
+            abs(high - self.prev_close),
+            abs(low - self.prev_close)
+        )
+        self.prev_close = close
+        self.count += 1
+        self._average = _wilder(self._average, true_range, self.count, self.period)
+        if self.count >= self.period:
+            self.value = self._average
+        return self.value
+
+    def update_candle(self, candle: Dict) -> Optional[float]:
+        """Feed one candle's high, low and close"""
+        return self.update(candle['high'], candle['low'], candle['close'])
+
+
+class IndicatorFeed:
+    """
+    Keeps a streaming indicator in step with a growing list of candles
+
+    sync() remembers the timestamp of the last candle it consumed and only
+    feeds candles after it, walking back from the end of the list, so a call
+    after one new bar costs O(1) however long the history is. The last
+    candle may still be forming: the indicator state from before it is kept
+    as a snapshot, and when that timestamp comes round again the state is
+    restored and the candle fed with its current values. If the list no
+    longer contains that candle (history reloaded, gap, different series) the
+    indicator is rebuilt from the whole list.
+    """
+
+    __slots__ = ('indicator', 'last_timestamp', '_previous')
+
+    def __init__(self, indicator: StreamingIndicator):
+        """
+        Initialize IndicatorFeed
+
+        Args:
+            indicator: Indicator to keep up to date
+        """
+        self.indicator = indicator
+        self.last_timestamp = None
+        self._previous: Optional[Dict[str, Any]] = None  # indicator snapshot before the last candle
+
+    def sync(self, candles) -> Optional[float]:
+        """
+        Feed every candle not seen yet, re-applying the last one seen
+
+        Args:
+            candles: OHLCV candles in time order (list of dicts or CandleArray);
+                     the last one may be a forming bar that a later call updates
+
+        Returns:
+            Current indicator value (None while not ready)
+        """
+        n = len(candles)
+        start = 0
+        if self.last_timestamp is not None:
+            start = n
+            while start > 0 and candles[start - 1]['timestamp'] > self.last_timestamp:
+                start -= 1
+            if start and candles[start - 1]['timestamp'] == self.last_timestamp and self._previous:
+                # Undo the last candle seen: it may have changed since (forming bar)
+                self.indicator = type(self.indicator).restore(self._previous)
+                start -= 1
+            else:
+                self.indicator.reset()
+                self.last_timestamp = self._previous = None
+                start = 0
+        if start < n:
+            update = self.indicator.update_candle
+            for i in range(start, n - 1):
+                update(candles[i])
+            self._previous = self.indicator.snapshot()
+            update(candles[n - 1])
+            self.last_timestamp = candles[n - 1]['timestamp']
+        return self.indicator.value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Capture indicator state and position"""
+        return {'state': self.indicator.snapshot(), 'last_timestamp': self.last_timestamp,
+                'previous': self._previous}
+
+    @classmethod
+    def restore(cls, state: Dict[str, Any],
+                indicators: Optional[Dict[str, Callable]] = None) -> 'IndicatorFeed':
+        """
+        Rebuild a feed from snapshot()
+
+        Args:
+            state: Snapshot dictionary
+            indicators: Indicator classes by name (default: EMA, RSI, ATR)
+
+        Returns:
+            IndicatorFeed in the captured state
+        """
+        indicators = indicators or INDICATORS
+        indicator_state = state['state']
+        feed = cls(indicators[indicator_state['indicator']].restore(indicator_state))
+        feed.last_timestamp = state['last_timestamp']
+        feed._previous = state.get('previous')  # older snapshots rebuild on a repeated bar
+        return feed
+
+
+INDICATORS = {'EMA': EMA, 'RSI': RSI, 'ATR': ATR}
@@ -0,0 +1,207 @@
+"""
+Streaming Indicators Test Script
+Checks EMA/RSI/ATR against full-history reference definitions
+"""
+import json
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from indicators import ATR, EMA, RSI, IndicatorFeed
+from risk.risk_calculator import RiskCalculator
+from strategies.smc_strategy import SMCStrategy
+
+
+def make_candles(count: int, seed: int = 1) -> list:
+    """Random-walk OHLC candles"""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    price = 1.1
+    candles = []
+    for i in range(count):
+        close = price + rng.gauss(0, 0.002)
+        candles.append({
+            'timestamp': start + timedelta(minutes=5 * i),
+            'open': price,
+            'high': max(price, close) + abs(rng.gauss(0, 0.001)),
+            'low': min(price, close) - abs(rng.gauss(0, 0.001)),
+            'close': close
+        })
+        price = close
+    return candles
+
+
+def reference_ema(closes: list, period: int) -> float:
+    """SMA of the first `period` closes, then the standard EMA recursion"""
+    ema = sum(closes[:period]) / period
+    k = 2 / (period + 1)
+    for close in closes[period:]:
+        ema = close * k + ema * (1 - k)
+    return ema
+
+
+def reference_rsi(closes: list, period: int) -> float:
+    """Wilder RSI over the whole series"""
+    changes = [b - a for a, b in zip(closes, closes[1:])]
+    gains = [max(c, 0.0) for c in changes]
+    losses = [max(-c, 0.0) for c in changes]
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    return 100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def reference_atr(candles: list, period: int) -> float:
+    """Wilder ATR over the whole series"""
+    trs = [max(c['high'] - c['low'], abs(c['high'] - p['close']), abs(c['low'] - p['close']))
+           for p, c in zip(candles, candles[1:])]
+    atr = sum(trs[:period]) / period
+    for tr in trs[period:]:
+        atr = (atr * (period - 1) + tr) / period
+    return atr
+
+
+def test_matches_reference():
+    """Streaming values equal the full-history definitions"""
+    print("\n=== Testing streaming vs reference ===")
+
+    candles = make_candles(400)
+    closes = [c['close'] for c in candles]
+    for period in (1, 2, 9, 14, 21):
+        ema, rsi, atr = EMA(period), RSI(period), ATR(period)
+        for i, candle in enumerate(candles):
+            ema_value = ema.update_candle(candle)
+            rsi_value = rsi.update_candle(candle)
+            atr_value = atr.update_candle(candle)
+            bars = i + 1
+            assert (ema_value is None) == (bars < period)
+            assert (rsi_value is None) == (bars < period + 1)
+            assert (atr_value is None) == (bars < period + 1)
+            if bars in (period, period + 1, 50, 400) and ema_value is not None:
+                assert math.isclose(ema_value, reference_ema(closes[:bars], period), rel_tol=1e-12)
+            if bars in (period + 1, 50, 400) and rsi_value is not None:
+                assert math.isclose(rsi_value, reference_rsi(closes[:bars], period), rel_tol=1e-12)
+                assert math.isclose(atr_value, reference_atr(candles[:bars], period), rel_tol=1e-12)
+    print("✓ EMA, RSI and ATR match their definitions")
+
+
+def test_snapshot_restore():
+    """A restored indicator continues exactly like the original"""
+    print("\n=== Testing snapshot/restore ===")
+
+    candles = make_candles(300, seed=2)
+    for cls in (EMA, RSI, ATR):
+        original = cls(14)
+        for candle in candles[:150]:
+            original.update_candle(candle)
+        state = json.loads(json.dumps(original.snapshot()))
+        restored = cls.restore(state)
+        for candle in candles[150:]:
+            assert original.update_candle(candle) == restored.update_candle(candle)
+    try:
+        RSI.restore(EMA(3).snapshot())
+        raise AssertionError("Restoring a snapshot of another indicator must fail")
+    except ValueError:
+        pass
+    print("✓ Snapshots restore identical state")
+
+
+def test_feed_incremental():
+    """IndicatorFeed only consumes new bars and rebuilds on a different history"""
+    print("\n=== Testing IndicatorFeed ===")
+
+    candles = make_candles(500, seed=3)
+    feed = IndicatorFeed(RSI(14))
+    for end in range(20, 501, 7):
+        value = feed.sync(candles[:end])
+        assert value == IndicatorFeed(RSI(14)).sync(candles[:end])
+    feed.sync(candles)
+    assert feed.indicator.count == 499  # each close-to-close change fed exactly once
+
+    restored = IndicatorFeed.restore(feed.snapshot())
+    assert restored.sync(candles) == feed.sync(candles)
+
+    other = make_candles(100, seed=4)
+    assert feed.sync(other) == IndicatorFeed(RSI(14)).sync(other)
+    print("✓ Feeds update incrementally and rebuild when history changes")
+
+
+def test_feed_forming_bar():
+    """A last bar passed again with new prices replaces its first values"""
+    print("\n=== Testing IndicatorFeed forming bar ===")
+
+    candles = make_candles(200, seed=5)
+    for make in (lambda: EMA(21), lambda: RSI(14), lambda: ATR(14)):
+        feed = IndicatorFeed(make())
+        for end in range(30, 200):
+            forming = dict(candles[end], close=candles[end]['open'], high=candles[end]['open'],
+                           low=candles[end]['open'])
+            feed.sync(candles[:end] + [forming])  # the bar has only just opened
+            feed.sync(candles[:end] + [dict(forming, close=candles[end]['close'])])
+            assert feed.sync(candles[:end + 1]) == IndicatorFeed(make()).sync(candles[:end + 1])
+        fresh = IndicatorFeed(make())
+        fresh.sync(candles)
+        assert feed.indicator.count == fresh.indicator.count  # every bar counted once
+
+        restored = IndicatorFeed.restore(feed.snapshot())
+        changed = candles[:-1] + [dict(candles[-1], close=candles[-1]['close'] + 0.01)]
+        assert restored.sync(changed) == IndicatorFeed(make()).sync(changed)
+    print("✓ Forming bars re-applied from the snapshot before them")
+
+
+def test_strategy_and_risk_use_full_history():
+    """SMCStrategy and RiskCalculator give full-history values, keyed or not"""
+    print("\n=== Testing strategy and risk integration ===")
+
+    candles = make_candles(300, seed=5)
+    closes = [c['close'] for c in candles]
+    strategy = SMCStrategy()
+    calculator = RiskCalculator()
+    for end in (100, 101, 250, 300):
+        window = candles[:end]
+        assert math.isclose(strategy._calculate_ema(window, 21, ("EURUSD", "M5")),
+                            reference_ema(closes[:end], 21), rel_tol=1e-12)
+        assert strategy._calculate_rsi(window, 14, ("EURUSD", "M5")) == strategy._calculate_rsi(window, 14)
+        assert math.isclose(strategy._calculate_rsi(window, 14), reference_rsi(closes[:end], 14), rel_tol=1e-12)
+        assert calculator._calculate_atr(window, 14, "EURUSD:M5") == calculator._calculate_atr(window, 14)
+        assert math.isclose(calculator._calculate_atr(window, 14), reference_atr(window, 14), rel_tol=1e-12)
+    assert strategy._calculate_ema(candles[:5], 21) == 0
+    assert strategy._calculate_rsi(candles[:5], 14) == 50
+    assert calculator._calculate_atr(candles[:5], 14) == 0
+    print("✓ Strategy and risk indicators use the streaming definitions")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Streaming Indicators Test Suite")
+    print("=" * 50)
+
+    try:
+        test_matches_reference()
+        test_snapshot_restore()
+        test_feed_incremental()
+        test_feed_forming_bar()
+        test_strategy_and_risk_use_full_history()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,13 @@
+"""
+Market Data Storage Module
+"""
+from .resampler import MultiTimeframeResampler, TimeframeAggregator, timeframe_minutes
+from .timestamps import from_millis, to_millis
+
+try:
+    from .candle_store import CandleSeries, CandleStore
+except ImportError:  # numpy is optional - only the candle store needs it
+    CandleSeries = CandleStore = None
+
+__all__ = ['CandleSeries', 'CandleStore', 'MultiTimeframeResampler', 'TimeframeAggregator', 'timeframe_minutes',
+           'from_millis', 'to_millis']
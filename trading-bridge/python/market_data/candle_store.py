@@ -0,0 +1,346 @@
+"""
+Columnar Candle Store
+Append-only per-symbol/timeframe OHLCV columns on disk, read through memory maps
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from strategies.candles import CandleArray
+
+from .timestamps import Timestamp, from_millis, to_millis
+
+logger = logging.getLogger(__name__)
+
+# Column files of a series and their on-disk types (little-endian)
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+_DTYPES = {name: np.dtype('<f8') for name in COLUMNS}
+_DTYPES['timestamp'] = np.dtype('<i8')  # epoch milliseconds, UTC
+
+# Default store location: trading-bridge/data/candles (override with CANDLE_STORE_DIR)
+DEFAULT_STORE_DIR = Path(__file__).resolve().parent.parent.parent / 'data' / 'candles'
+
+_NAME = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9._-]*$')  # no path separators or leading dot
+
+
+class CandleSeries:
+    """
+    Read-only OHLCV columns of one symbol/timeframe
+
+    Columns are NumPy arrays over the store's memory maps: slicing (by
+    position or time range) returns views, so nothing is read from disk
+    until the data is touched. Timestamps are int64 epoch milliseconds;
+    candles come back as dicts with naive UTC datetime timestamps, and
+    missing volume is NaN in the column and absent from the dict.
+
+    The series behaves like a list of candle dicts (len, candles[-1],
+    candles[-20:], iteration), so it can be passed straight to
+    SMCStrategy.calculate_entry_signal or Backtester.run.
+    """
+
+    __slots__ = ('symbol', 'timeframe', 'timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, symbol: str, timeframe: str, columns: Dict[str, np.ndarray]):
+        """
+        Initialize CandleSeries
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe name (e.g. 'M1')
+            columns: Array per name in COLUMNS, all the same length
+        """
+        self.symbol = symbol
+        self.timeframe = timeframe
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+
+    def _columns(self) -> Dict[str, np.ndarray]:
+        """Column arrays by name"""
+        return {name: getattr(self, name) for name in COLUMNS}
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CandleSeries(self.symbol, self.timeframe,
+                                {name: column[index] for name, column in self._columns().items()})
+        candle = {
+            'timestamp': from_millis(self.timestamp[index]),
+            'open': float(self.open[index]),
+            'high': float(self.high[index]),
+            'low': float(self.low[index]),
+            'close': float(self.close[index])
+        }
+        volume = float(self.volume[index])
+        if volume == volume:  # not NaN
+            candle['volume'] = volume
+        return candle
+
+    def __iter__(self) -> Iterator[Dict]:
+        chunk = 65536
+        for start in range(0, len(self), chunk):
+            part = self[start:start + chunk]
+            rows = zip(part.datetimes().tolist(), part.open.tolist(), part.high.tolist(),
+                       part.low.tolist(), part.close.tolist(), part.volume.tolist())
+            for ts, o, h, l, c, v in rows:
+                candle = {'timestamp': ts, 'open': o, 'high': h, 'low': l, 'close': c}
+                if v == v:
+                    candle['volume'] = v
+                yield candle
+
+    def between(self, start: Optional[Timestamp] = None, end: Optional[Timestamp] = None) -> 'CandleSeries':
+        """
+        Candles with start <= timestamp < end (binary search, no copy)
+
+        Args:
+            start: First timestamp included (None = from the beginning)
+            end: First timestamp excluded (None = to the end)
+
+        Returns:
+            CandleSeries of views
+        """
+        first = 0 if start is None else int(np.searchsorted(self.timestamp, to_millis(start), 'left'))
+        last = len(self) if end is None else int(np.searchsorted(self.timestamp, to_millis(end), 'left'))
+        return self[first:max(first, last)]
+
+    def tail(self, count: int) -> 'CandleSeries':
+        """Last `count` candles"""
+        return self[max(0, len(self) - count):]
+
+    def datetimes(self) -> np.ndarray:
+        """Timestamps as datetime64[ms] (a view, no conversion)"""
+        return self.timestamp.view('datetime64[ms]')
+
+    def to_candle_array(self) -> CandleArray:
+        """CandleArray over the same prices (timestamps become naive UTC datetimes)"""
+        has_volume = ~np.isnan(self.volume)
+        return CandleArray(
+            open=self.open, high=self.high, low=self.low, close=self.close,
+            volume=np.where(has_volume, self.volume, 0.0),
+            timestamp=self.datetimes().astype(object),
+            has_volume=has_volume
+        )
+
+    def to_dicts(self) -> List[Dict]:
+        """Candles as a list of dicts"""
+        return list(self)
+
+
+class CandleStore:
+    """
+    On-disk candle store: one directory per symbol/timeframe, one file per column
+
+    Layout: <root>/<SYMBOL>/<TIMEFRAME>/{timestamp,open,high,low,close,volume}.bin
+    plus meta.json holding the committed candle count. Appends write the
+    column files first and replace meta.json last, so readers (in this or
+    other processes) never see a half-written candle, and a crashed append
+    is rolled back on the next one. Reads memory-map the columns; opening a
+    year of M1 bars costs a few system calls, not parsing.
+
+    One writer per series at a time; any number of readers.
+    """
+
+    def __init__(self, root: Optional[Union[str, Path]] = None):
+        """
+        Initialize CandleStore
+
+        Args:
+            root: Store directory, created if missing (default: CANDLE_STORE_DIR
+                or DEFAULT_STORE_DIR)
+        """
+        self.root = Path(root or os.environ.get('CANDLE_STORE_DIR') or DEFAULT_STORE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._maps: Dict[Tuple[str, str], Tuple[int, Dict[str, np.ndarray]]] = {}
+
+    def _path(self, symbol: str, timeframe: str) -> Path:
+        """Directory of a series"""
+        for name in (symbol, timeframe):
+            if not _NAME.match(name):
+                raise ValueError(f"Invalid symbol or timeframe name: {name!r}")
+        return self.root / symbol / timeframe
+
+    def _meta(self, path: Path) -> Dict:
+        """Committed metadata of a series (count 0 if it does not exist)"""
+        try:
+            with open(path / 'meta.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {'count': 0}
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        """Number of candles stored"""
+        return self._meta(self._path(symbol, timeframe))['count']
+
+    def symbols(self) -> List[str]:
+        """Symbols with at least one series"""
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def timeframes(self, symbol: str) -> List[str]:
+        """Timeframes stored for a symbol"""
+        path = self.root / symbol
+        if not path.is_dir():
+            return []
+        return sorted(p.name for p in path.iterdir() if (p / 'meta.json').exists())
+
+    def info(self, symbol: str, timeframe: str) -> Dict:
+        """
+        Series summary
+
+        Returns:
+            Dictionary with count, first and last timestamps (datetimes or None)
+        """
+        meta = self._meta(self._path(symbol, timeframe))
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'count': meta['count'],
+            'first': from_millis(meta['first']) if meta['count'] else None,
+            'last': from_millis(meta['last']) if meta['count'] else None
+        }
+
+    def append(self, symbol: str, timeframe: str,
+               candles: Union[Iterable[Dict], CandleArray, CandleSeries], fsync: bool = False) -> int:
+        """
+        Append candles newer than the last one stored
+
+        Candles at or before the last stored timestamp are skipped, so
+        re-appending an overlapping download only adds what is new.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe name
+            candles: Candles in time order (dicts, CandleArray or CandleSeries)
+            fsync: Flush the column files to disk before committing
+
+        Returns:
+            Number of candles added
+        """
+        columns = self._to_columns(candles)
+        path = self._path(symbol, timeframe)
+        with self._lock:
+            path.mkdir(parents=True, exist_ok=True)
+            meta = self._meta(path)
+            count = meta['count']
+            times = columns['timestamp']
+            if len(times) > 1 and not (np.diff(times) > 0).all():
+                raise ValueError("Candles must be in strictly increasing time order")
+            if count:
+                keep = int(np.searchsorted(times, meta['last'], 'right'))
+                columns = {name: column[keep:] for name, column in columns.items()}
+            added = len(columns['timestamp'])
+            if not added:
+                return 0
+
+            for name in COLUMNS:
+                file_path = path / f'{name}.bin'
+                size = count * _DTYPES[name].itemsize
+                with open(file_path, 'ab') as f:
+                    if f.tell() != size:  # left over from an interrupted append
+                        f.truncate(size)
+                        f.seek(size)
+                    f.write(np.ascontiguousarray(columns[name], dtype=_DTYPES[name]).tobytes())
+                    if fsync:
+                        f.flush()
+                        os.fsync(f.fileno())
+
+            meta = {
+                'version': 1,
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'count': count + added,
+                'first': int(meta['first'] if count else columns['timestamp'][0]),
+                'last': int(columns['timestamp'][-1])
+            }
+            temp = path / 'meta.json.tmp'
+            with open(temp, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+                if fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(temp, path / 'meta.json')
+        logger.debug(f"Appended {added} candles to {symbol} {timeframe}")
+        return added
+
+    def read(self, symbol: str, timeframe: str, start: Optional[Timestamp] = None,
+             end: Optional[Timestamp] = None) -> CandleSeries:
+        """
+        Memory-mapped candles of a series, optionally limited to start <= t < end
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe name
+            start: First timestamp included
+            end: First timestamp excluded
+
+        Returns:
+            CandleSeries (empty if the series does not exist)
+        """
+        path = self._path(symbol, timeframe)
+        count = self._meta(path)['count']
+        key = (symbol, timeframe)
+        cached = self._maps.get(key)
+        if cached is not None and cached[0] == count:
+            columns = cached[1]
+        else:
+            if count:
+                columns = {name: np.memmap(path / f'{name}.bin', dtype=_DTYPES[name], mode='r',
+                                           shape=(count,))
+                           for name in COLUMNS}
+            else:
+                columns = {name: np.empty(0, dtype=_DTYPES[name]) for name in COLUMNS}
+            self._maps[key] = (count, columns)
+        series = CandleSeries(symbol, timeframe, columns)
+        if start is None and end is None:
+            return series
+        return series.between(start, end)
+
+    def delete(self, symbol: str, timeframe: str):
+        """Remove a series"""
+        path = self._path(symbol, timeframe)
+        with self._lock:
+            self._maps.pop((symbol, timeframe), None)
+            for name in [f'{c}.bin' for c in COLUMNS] + ['meta.json']:
+                try:
+                    (path / name).unlink()
+                except FileNotFoundError:
+                    pass
+            try:
+                path.rmdir()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _to_columns(candles) -> Dict[str, np.ndarray]:
+        """Candles as one array per column"""
+        if isinstance(candles, CandleSeries):
+            return candles._columns()
+        if isinstance(candles, CandleArray):
+            return {
+                'timestamp': np.fromiter((to_millis(t) for t in candles.timestamp), dtype=np.int64,
+                                         count=len(candles)),
+                'open': candles.open, 'high': candles.high, 'low': candles.low, 'close': candles.close,
+                'volume': np.where(candles.has_volume, candles.volume, np.nan)
+            }
+        candles = candles if isinstance(candles, list) else list(candles)
+        n = len(candles)
+
+        def column(key: str) -> np.ndarray:
+            return np.fromiter((c[key] for c in candles), dtype=np.float64, count=n)
+
+        return {
+            'timestamp': np.fromiter((to_millis(c['timestamp']) for c in candles), dtype=np.int64, count=n),
+            'open': column('open'),
+            'high': column('high'),
+            'low': column('low'),
+            'close': column('close'),
+            'volume': np.fromiter((c.get('volume', np.nan) for c in candles), dtype=np.float64, count=n)
+        }
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+CLI tool for importing bar files into the candle store
+"""
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import read_bars
+from market_data import CandleStore
+
+
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description='Import CSV (plain or MT5 export) or Parquet bars into the candle store',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Import an MT5 M1 export into trading-bridge/data/candles/EURUSD/M1
+  python market_data/import_bars.py -i EURUSD_M1.csv -s EURUSD -t M1
+
+  # Show what a store holds
+  python market_data/import_bars.py --list --store /data/candles
+"""
+    )
+    parser.add_argument('-i', '--input', help='Bar file (.csv, .txt or .parquet)')
+    parser.add_argument('-s', '--symbol', help='Symbol')
+    parser.add_argument('-t', '--timeframe', help='Timeframe name (e.g. M1, M5, H1)')
+    parser.add_argument('--store', help='Store directory (default: CANDLE_STORE_DIR or trading-bridge/data/candles)')
+    parser.add_argument('--chunk', type=int, default=100_000, help='Bars written per append')
+    parser.add_argument('--list', action='store_true', help='List the stored series and exit')
+    return parser.parse_args()
+
+
+def main():
+    """Main entry point"""
+    args = parse_args()
+    store = CandleStore(args.store)
+
+    if args.list:
+        for symbol in store.symbols():
+            for timeframe in store.timeframes(symbol):
+                info = store.info(symbol, timeframe)
+                print(f"{symbol:<12} {timeframe:<5} {info['count']:>10,}  {info['first']} - {info['last']}")
+        return 0
+
+    if not (args.input and args.symbol and args.timeframe):
+        print("--input, --symbol and --timeframe are required", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    bars = read_bars(args.input)
+    added = read = 0
+    while True:
+        chunk = list(itertools.islice(bars, args.chunk))
+        if not chunk:
+            break
+        read += len(chunk)
+        added += store.append(args.symbol, args.timeframe, chunk)
+    print(f"{args.symbol} {args.timeframe}: {added:,} of {read:,} bars added "
+          f"({store.count(args.symbol, args.timeframe):,} stored) in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""
+Multi-Timeframe Resampler
+Builds higher-timeframe candles incrementally from one lower-timeframe stream
+"""
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Deque, Dict, Iterable, List, Optional
+
+from .timestamps import from_millis, to_millis
+
+# Timeframe names and their length in minutes
+TIMEFRAME_MINUTES = {
+    'M1': 1,
+    'M5': 5,
+    'M15': 15,
+    'M30': 30,
+    'H1': 60,
+    'H4': 240,
+    'D1': 1440
+}
+
+
+def timeframe_minutes(timeframe: str) -> int:
+    """
+    Length of a timeframe in minutes
+
+    Args:
+        timeframe: Timeframe name (e.g. 'M5', 'H1')
+
+    Returns:
+        Minutes per candle
+    """
+    try:
+        return TIMEFRAME_MINUTES[timeframe.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown timeframe {timeframe} (expected one of {', '.join(TIMEFRAME_MINUTES)})")
+
+
+class TimeframeAggregator:
+    """
+    Builds closed higher-timeframe bars from a stream of lower-timeframe bars
+
+    Buckets are aligned to midnight. A bucket is emitted as soon as the bar
+    that ends it has been seen, or when a bar from a later bucket arrives
+    (the data has a gap).
+    """
+
+    def __init__(self, minutes: int, base_minutes: int = 5):
+        """
+        Initialize TimeframeAggregator
+
+        Args:
+            minutes: Target timeframe in minutes (e.g. 60 for H1)
+            base_minutes: Timeframe of the incoming bars
+        """
+        if minutes % base_minutes or 1440 % minutes:
+            raise ValueError(f"{minutes}m bars cannot be built from {base_minutes}m bars")
+        self.span = timedelta(minutes=minutes)
+        self.base = timedelta(minutes=base_minutes)
+        self.minutes = minutes
+        self.current: Optional[Dict] = None
+        self.bucket_end: Optional[datetime] = None
+
+    def update(self, bar: Dict) -> List[Dict]:
+        """
+        Add one closed lower-timeframe bar
+
+        Args:
+            bar: OHLCV bar (timestamp = bar open time)
+
+        Returns:
+            Higher-timeframe bars closed by this bar (a bucket left incomplete
+            by a gap, and/or the bucket this bar ends), usually empty
+        """
+        ts = bar['timestamp']
+        closed = []
+        if self.current is not None and ts >= self.bucket_end:
+            closed.append(self.current)
+            self.current = None
+
+        if self.current is None:
+            minute_of_day = ts.hour * 60 + ts.minute
+            start = ts.replace(second=0, microsecond=0) - timedelta(minutes=minute_of_day % self.minutes)
+            self.bucket_end = start + self.span
+            self.current = {
+                'timestamp': start,
+                'open': bar['open'],
+                'high': bar['high'],
+                'low': bar['low'],
+                'close': bar['close'],
+                'volume': bar.get('volume', 0)
+            }
+        else:
+            current = self.current
+            if bar['high'] > current['high']:
+                current['high'] = bar['high']
+            if bar['low'] < current['low']:
+                current['low'] = bar['low']
+            current['close'] = bar['close']
+            current['volume'] += bar.get('volume', 0)
+
+        if ts + self.base >= self.bucket_end:
+            closed.append(self.current)
+            self.current = None
+        return closed
+
+    def flush(self, now: datetime) -> List[Dict]:
+        """
+        Close the open bucket if its time is up
+
+        For feeds that skip quiet periods, where the bar that ends a bucket
+        may never arrive.
+
+        Args:
+            now: Current time (same clock as the bar timestamps)
+
+        Returns:
+            The bucket ending at or before `now`, or an empty list
+        """
+        if self.current is None or now < self.bucket_end:
+            return []
+        closed, self.current = self.current, None
+        return [closed]
+
+
+class MultiTimeframeResampler:
+    """
+    Derives higher timeframes from one lower-timeframe candle stream
+
+    Only the base timeframe (e.g. M5) has to be fetched; M15/H1 candles are
+    aggregated from it as each base candle closes, so every timeframe is
+    built from the same prices. Buckets are aligned to midnight of the
+    timestamps' clock. A bucket the stream starts part-way through is
+    dropped, since its open would be wrong; buckets with gaps are closed
+    when a later bucket's candle arrives (or by flush()), and a late candle
+    for a bucket flush() already closed is not merged into it.
+
+    The last `capacity` closed candles of each timeframe are kept, ready for
+    SMCStrategy.calculate_entry_signal (see frames()).
+    """
+
+    def __init__(self, base_timeframe: str = 'M5', timeframes: Iterable[str] = ('M15', 'H1'),
+                 capacity: int = 5000):
+        """
+        Initialize MultiTimeframeResampler
+
+        Args:
+            base_timeframe: Timeframe of the incoming candles
+            timeframes: Higher timeframes to build (multiples of the base that divide a day)
+            capacity: Closed candles kept per timeframe
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        base_minutes = timeframe_minutes(base_timeframe)
+        self.base_timeframe = base_timeframe.upper()
+        self.capacity = capacity
+        self._aggregators: Dict[str, TimeframeAggregator] = {}
+        for timeframe in sorted({tf.upper() for tf in timeframes} - {self.base_timeframe},
+                                key=timeframe_minutes):
+            self._aggregators[timeframe] = TimeframeAggregator(timeframe_minutes(timeframe), base_minutes)
+        self.timeframes = (self.base_timeframe,) + tuple(self._aggregators)
+        self._closed: Dict[str, Deque[Dict]] = {tf: deque(maxlen=capacity) for tf in self.timeframes}
+        self.first_timestamp: Optional[datetime] = None
+        self.last_timestamp: Optional[datetime] = None
+
+    def update(self, candle: Dict) -> Dict[str, List[Dict]]:
+        """
+        Add one closed base-timeframe candle
+
+        Candles at or before the last one seen are ignored.
+
+        Args:
+            candle: OHLCV candle (timestamp = open time; datetime, ISO string or epoch)
+
+        Returns:
+            {timeframe: candles closed by this candle}, including the base
+            candle itself; empty if the candle was ignored
+        """
+        ts = candle['timestamp']
+        if not isinstance(ts, datetime):
+            ts = from_millis(to_millis(ts))
+            candle = dict(candle, timestamp=ts)
+        if self.last_timestamp is not None and ts <= self.last_timestamp:
+            return {}
+        if self.first_timestamp is None:
+            self.first_timestamp = ts
+        self.last_timestamp = ts
+
+        self._closed[self.base_timeframe].append(candle)
+        closed = {self.base_timeframe: [candle]}
+        for timeframe, aggregator in self._aggregators.items():
+            bars = self._complete(timeframe, aggregator.update(candle))
+            if bars:
+                self._closed[timeframe].extend(bars)
+                closed[timeframe] = bars
+        return closed
+
+    def sync(self, candles) -> int:
+        """
+        Add the candles of a fetched window that are newer than the last one seen
+
+        Brokers return the latest N candles, so consecutive windows overlap;
+        only the new tail is aggregated.
+
+        Args:
+            candles: Closed base-timeframe candles in time order
+
+        Returns:
+            Number of new base candles
+        """
+        n = len(candles)
+        start = n
+        if self.last_timestamp is None:
+            start = 0
+        else:
+            last = self.last_timestamp
+            while start > 0 and self._timestamp(candles[start - 1]) > last:
+                start -= 1
+        added = 0
+        for i in range(start, n):
+            added += bool(self.update(candles[i]))
+        return added
+
+    def flush(self, now: datetime) -> Dict[str, List[Dict]]:
+        """
+        Close higher-timeframe candles whose period ended by `now`
+
+        Args:
+            now: Current time (same clock as the candle timestamps)
+
+        Returns:
+            {timeframe: candles closed}
+        """
+        closed = {}
+        for timeframe, aggregator in self._aggregators.items():
+            bars = self._complete(timeframe, aggregator.flush(now))
+            if bars:
+                self._closed[timeframe].extend(bars)
+                closed[timeframe] = bars
+        return closed
+
+    def candles(self, timeframe: str) -> List[Dict]:
+        """Closed candles of a timeframe, oldest first"""
+        return list(self._closed[timeframe.upper()])
+
+    def frames(self) -> Dict[str, List[Dict]]:
+        """Closed candles of every timeframe, e.g. {'M5': [...], 'M15': [...], 'H1': [...]}"""
+        return {timeframe: list(candles) for timeframe, candles in self._closed.items()}
+
+    def forming(self, timeframe: str) -> Optional[Dict]:
+        """Higher-timeframe candle still being built (a copy), or None"""
+        aggregator = self._aggregators[timeframe.upper()]
+        return dict(aggregator.current) if aggregator.current is not None else None
+
+    def _complete(self, timeframe: str, bars: List[Dict]) -> List[Dict]:
+        """
+        Drop buckets that started before the first base candle, and a bucket
+        reopened by a late candle after flush() closed it
+        """
+        closed = self._closed[timeframe]
+        after = closed[-1]['timestamp'] if closed else None
+        return [bar for bar in bars if bar['timestamp'] >= self.first_timestamp
+                and (after is None or bar['timestamp'] > after)]
+
+    @staticmethod
+    def _timestamp(candle: Dict) -> datetime:
+        """Candle timestamp as a naive UTC datetime"""
+        ts = candle['timestamp']
+        return ts if isinstance(ts, datetime) else from_millis(to_millis(ts))
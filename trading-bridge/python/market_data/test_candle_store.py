@@ -0,0 +1,174 @@
+"""
+Candle Store Test Script
+Checks columnar storage, memory-mapped range reads and the strategy/backtester adapters
+"""
+import logging
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import Backtester
+from market_data import CandleSeries, CandleStore
+from market_data.candle_store import to_millis
+from strategies.smc_strategy import SMCStrategy
+from strategies.test_smc_vectorized import make_candles
+
+logging.disable(logging.INFO)
+
+
+def without_timestamp(signal):
+    """Signal minus its creation time"""
+    return signal and {k: v for k, v in signal.items() if k != 'timestamp'}
+
+
+def test_round_trip():
+    """Stored candles read back unchanged, as views over memory maps"""
+    print("\n=== Testing round trip ===")
+
+    candles = make_candles(3000, 1, volume="some")
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CandleStore(tmp)
+        assert store.append("EURUSD", "M5", candles) == 3000
+        series = store.read("EURUSD", "M5")
+        assert isinstance(series[10:20], CandleSeries) and len(series) == 3000
+        assert series.to_dicts() == candles
+        assert series[-1] == candles[-1] and series[5] == candles[5]
+        assert isinstance(series.close.base, np.memmap) or isinstance(series.close, np.memmap)
+        assert store.symbols() == ["EURUSD"] and store.timeframes("EURUSD") == ["M5"]
+        info = store.info("EURUSD", "M5")
+        assert info['first'] == candles[0]['timestamp'] and info['last'] == candles[-1]['timestamp']
+
+        array = series.to_candle_array()
+        assert array.to_dicts() == candles
+        assert np.shares_memory(array.close, series.close)
+
+        other = CandleStore(tmp)  # e.g. another process
+        assert other.read("EURUSD", "M5").to_dicts() == candles
+        assert len(store.read("GBPUSD", "M5")) == 0
+    print("✓ Candles round-trip and share memory with the files")
+
+
+def test_append():
+    """Appends add only newer candles, reject unordered input and survive interrupted writes"""
+    print("\n=== Testing appends ===")
+
+    candles = make_candles(1000, 2)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CandleStore(tmp)
+        assert store.append("EURUSD", "M1", candles[:400]) == 400
+        reader = store.read("EURUSD", "M1")
+        assert store.append("EURUSD", "M1", candles[300:700]) == 300  # overlap skipped
+        assert store.append("EURUSD", "M1", candles[:700]) == 0
+        assert len(reader) == 400  # an open series keeps its length
+        assert store.read("EURUSD", "M1").to_dicts() == candles[:700]
+
+        try:
+            store.append("EURUSD", "M1", [candles[800], candles[750]])
+            raise AssertionError("Unordered candles must be rejected")
+        except ValueError:
+            pass
+
+        # An append interrupted after writing some column data is invisible and rolled back
+        with open(Path(tmp) / "EURUSD" / "M1" / "close.bin", 'ab') as f:
+            f.write(b'\x00' * 24)
+        assert store.count("EURUSD", "M1") == 700
+        assert store.append("EURUSD", "M1", candles[700:]) == 300
+        assert CandleStore(tmp).read("EURUSD", "M1").to_dicts() == candles
+
+        store.delete("EURUSD", "M1")
+        assert store.count("EURUSD", "M1") == 0 and store.timeframes("EURUSD") == []
+    print("✓ Overlaps skipped, order enforced, torn appends rolled back")
+
+
+def test_time_ranges():
+    """between() returns exactly start <= t < end by binary search"""
+    print("\n=== Testing time ranges ===")
+
+    candles = make_candles(5000, 3)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CandleStore(tmp)
+        store.append("EURUSD", "M5", candles)
+        series = store.read("EURUSD", "M5")
+        first = candles[0]['timestamp']
+        for start, end in ((first + timedelta(minutes=7), first + timedelta(days=3)),
+                           (None, first + timedelta(hours=5)),
+                           (first + timedelta(days=10), None),
+                           (first - timedelta(days=1), first),
+                           (first + timedelta(days=2), first + timedelta(days=1))):
+            expected = [c for c in candles
+                        if (start is None or c['timestamp'] >= start) and (end is None or c['timestamp'] < end)]
+            part = store.read("EURUSD", "M5", start, end)
+            assert part.to_dicts() == expected, (start, end)
+            assert np.shares_memory(part.close, series.close) or not expected
+
+        assert series.tail(10).to_dicts() == candles[-10:]
+        assert to_millis("2024-01-01T00:00:00Z") == to_millis(datetime(2024, 1, 1)) == 1704067200000
+        assert to_millis(1704067200) == to_millis(1704067200000)
+    print("✓ Ranges match a linear filter and stay zero-copy")
+
+
+def test_strategy_and_backtester_adapter():
+    """Strategy and backtester give the same results from the store as from lists"""
+    print("\n=== Testing adapters ===")
+
+    h1, m15, m5 = make_candles(600, 4), make_candles(600, 5), make_candles(6000, 6)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CandleStore(tmp)
+        for timeframe, candles in (("H1", h1), ("M15", m15), ("M5", m5)):
+            store.append("EURUSD", timeframe, candles)
+
+        series = store.read("EURUSD", "H1")
+        strategy = SMCStrategy()
+        assert strategy.detect_order_blocks(series) == strategy.detect_order_blocks(h1)
+        assert strategy.detect_fair_value_gaps(series) == strategy.detect_fair_value_gaps(h1)
+
+        live, stored = SMCStrategy(), SMCStrategy()
+        signals = 0
+        for end in range(200, 601, 10):
+            at = h1[end - 1]['timestamp'] + timedelta(seconds=1)  # test candles share timestamps
+            expected = live.calculate_entry_signal("EURUSD", h1[:end], m15[:end], m5[:end])
+            got = stored.calculate_entry_signal("EURUSD", store.read("EURUSD", "H1", end=at),
+                                                store.read("EURUSD", "M15", end=at),
+                                                store.read("EURUSD", "M5", end=at))
+            assert without_timestamp(got) == without_timestamp(expected), end
+            signals += expected is not None
+        assert signals
+
+        expected = Backtester("EURUSD").run(m5)
+        got = Backtester("EURUSD").run(store.read("EURUSD", "M5"))
+        assert got.trades == expected.trades and expected.trades
+    print(f"✓ {signals} signals and {len(expected.trades)} backtest trades match list input")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Candle Store Test Suite")
+    print("=" * 50)
+
+    try:
+        test_round_trip()
+        test_append()
+        test_time_ranges()
+        test_strategy_and_backtester_adapter()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
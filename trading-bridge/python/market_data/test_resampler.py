@@ -0,0 +1,166 @@
+"""
+Multi-Timeframe Resampler Test Script
+Checks streaming aggregation against a batch resample, bucket boundaries and overlapping fetches
+"""
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from market_data import MultiTimeframeResampler, timeframe_minutes
+from strategies.test_smc_vectorized import make_candles
+
+
+def batch_resample(candles: list, minutes: int, base_minutes: int) -> list:
+    """Reference resample: group by bucket, keep buckets fully inside the data"""
+    buckets = {}
+    for candle in candles:
+        ts = candle['timestamp']
+        start = ts - timedelta(minutes=(ts.hour * 60 + ts.minute) % minutes)
+        buckets.setdefault(start, []).append(candle)
+    first, last = candles[0]['timestamp'], candles[-1]['timestamp']
+    end_of_data = last + timedelta(minutes=base_minutes)
+    result = []
+    for start, group in sorted(buckets.items()):
+        if start < first:
+            continue  # the stream started part-way through this bucket
+        ends = start + timedelta(minutes=minutes)
+        if ends > end_of_data and group[-1]['timestamp'] + timedelta(minutes=base_minutes) < ends:
+            continue  # still open
+        result.append({
+            'timestamp': start,
+            'open': group[0]['open'],
+            'high': max(c['high'] for c in group),
+            'low': min(c['low'] for c in group),
+            'close': group[-1]['close'],
+            'volume': sum(c.get('volume', 0) for c in group)
+        })
+    return result
+
+
+def gappy_m5(count: int, seed: int) -> list:
+    """M5 candles starting mid-hour, with a missing hour and scattered missing candles"""
+    candles = make_candles(count, seed, volume="some")[4:]  # starts 00:20
+    rng = random.Random(seed)
+    del candles[200:212]
+    return [c for c in candles if rng.random() > 0.03]
+
+
+def test_matches_batch_resample():
+    """Streamed M15/H1/H4 equal a batch resample, including gaps and a partial first bucket"""
+    print("\n=== Testing against a batch resample ===")
+
+    candles = gappy_m5(6000, 1)
+    resampler = MultiTimeframeResampler('M5', ('M15', 'H1', 'H4'), capacity=10000)
+    for candle in candles:
+        resampler.update(candle)
+    assert resampler.timeframes == ('M5', 'M15', 'H1', 'H4')
+    for timeframe in ('M15', 'H1', 'H4'):
+        expected = batch_resample(candles, timeframe_minutes(timeframe), 5)
+        assert resampler.candles(timeframe) == expected, timeframe
+    assert resampler.candles('M5') == candles
+    assert resampler.candles('H1')[0]['timestamp'] == datetime(2024, 1, 1, 1)
+    print(f"✓ {len(resampler.candles('H1'))} H1 candles match, first partial hour dropped")
+
+
+def test_overlapping_fetches():
+    """Syncing overlapping windows of any size gives the same result as one pass"""
+    print("\n=== Testing overlapping fetches ===")
+
+    candles = gappy_m5(4000, 2)
+    single = MultiTimeframeResampler(capacity=10000)
+    assert single.sync(candles) == len(candles)
+
+    rng = random.Random(2)
+    streamed = MultiTimeframeResampler(capacity=10000)
+    end, added = 300, 0
+    while end < len(candles):
+        window = [dict(c, timestamp=c['timestamp'].isoformat() + 'Z') for c in candles[max(0, end - 300):end]]
+        added += streamed.sync(candles[:1] + window if end == 300 else window)
+        end += rng.randint(0, 40)
+    added += streamed.sync(candles[-300:])
+    assert added == len(candles)
+    assert streamed.frames() == single.frames()
+    assert streamed.update(candles[10]) == {}  # already seen
+
+    closed = single.update(dict(candles[-1], timestamp=candles[-1]['timestamp'] + timedelta(minutes=5)))
+    assert list(closed) in (['M5'], ['M5', 'M15'], ['M5', 'M15', 'H1'])
+    print("✓ Overlaps skipped, string timestamps accepted")
+
+
+def test_m1_base():
+    """H1 from M1 equals H1 from the M5 built from the same M1 stream"""
+    print("\n=== Testing M1 base ===")
+
+    candles = make_candles(3000, 3)
+    start = candles[0]['timestamp']
+    m1 = [dict(c, timestamp=start + timedelta(minutes=i)) for i, c in enumerate(candles)]
+    direct = MultiTimeframeResampler('M1', ('M5', 'M15', 'H1'))
+    direct.sync(m1)
+    chained = MultiTimeframeResampler('M5', ('M15', 'H1'))
+    chained.sync(direct.candles('M5'))
+    assert len(direct.candles('M5')) == 600
+    for timeframe in ('M15', 'H1'):
+        assert direct.candles(timeframe) == chained.candles(timeframe), timeframe
+    try:
+        MultiTimeframeResampler('M5', ('M7',))
+        raise AssertionError("Unknown timeframe must be rejected")
+    except ValueError:
+        pass
+    print("✓ Timeframes agree however they are derived")
+
+
+def test_flush_and_forming():
+    """flush() closes a bucket whose last candle never came; late candles don't reopen it"""
+    print("\n=== Testing flush and forming candles ===")
+
+    candles = make_candles(132, 4)  # 00:00 - 10:55
+    resampler = MultiTimeframeResampler(capacity=5)
+    resampler.sync(candles[:129])  # up to 10:40
+    assert len(resampler.candles('H1')) == 5 and len(resampler.candles('M5')) == 5
+    forming = resampler.forming('H1')
+    assert forming['timestamp'] == datetime(2024, 1, 1, 10) and forming['open'] == candles[120]['open']
+    assert forming['close'] == candles[128]['close']
+
+    assert resampler.flush(datetime(2024, 1, 1, 10, 59)) == {}
+    closed = resampler.flush(datetime(2024, 1, 1, 11))
+    assert [c['timestamp'] for c in closed['H1']] == [datetime(2024, 1, 1, 10)]
+    assert list(closed) == ['H1']  # the 10:40 candle already closed M15 10:30
+    assert resampler.forming('H1') is None
+
+    resampler.sync(candles)  # 10:45 - 10:55 arrive late
+    assert resampler.candles('H1')[-1]['timestamp'] == datetime(2024, 1, 1, 10)
+    assert resampler.candles('M15')[-1]['timestamp'] == datetime(2024, 1, 1, 10, 45)
+    assert resampler.candles('M5')[-1] == candles[-1]
+    print("✓ Flushed buckets stay closed")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Multi-Timeframe Resampler Test Suite")
+    print("=" * 50)
+
+    try:
+        test_matches_batch_resample()
+        test_overlapping_fetches()
+        test_m1_base()
+        test_flush_and_forming()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+"""
+Candle Timestamps
+Conversions between candle timestamps and epoch milliseconds (no NumPy needed)
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Union
+
+_EPOCH = datetime(1970, 1, 1)
+
+Timestamp = Union[datetime, int, float, str]
+
+
+def to_millis(timestamp: Timestamp) -> int:
+    """
+    Epoch milliseconds of a candle timestamp
+
+    Naive datetimes are taken as UTC; aware ones are converted. Numbers are
+    epoch seconds (or milliseconds when above 1e11) and strings ISO 8601.
+
+    Args:
+        timestamp: Candle timestamp
+
+    Returns:
+        Milliseconds since 1970-01-01 UTC
+    """
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    if isinstance(timestamp, datetime):
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        delta = timestamp - _EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+    value = float(timestamp)
+    return int(value if value > 1e11 else value * 1000)
+
+
+def from_millis(millis: int) -> datetime:
+    """Naive UTC datetime of epoch milliseconds"""
+    return _EPOCH + timedelta(milliseconds=int(millis))
@@ -8,6 +8,8 @@ import logging
 from typing import Dict, Optional, Tuple
 from dataclasses import dataclass
 
+from indicators import ATR, IndicatorFeed
+
 
 @dataclass
 class PositionSize:
@@ -28,6 +30,7 @@ class RiskCalculator:
     def __init__(self, config_path: str = None):
         self.logger = logging.getLogger(__name__)
         self.config = self._load_config(config_path)
+        self._atr_feeds: Dict[Tuple[str, int], IndicatorFeed] = {}
         
         # Standard pip values for different symbol types
         self.pip_values = {
@@ -37,6 +40,16 @@ class RiskCalculator:
             'crypto': 1.0,             # BTCUSD, ETHUSD
             'index': 1.0               # US30, NAS100, etc.
         }
+        
+        # Value of one pip for one lot in account currency (assuming USD account)
+        # For standard lot (100,000 units), 1 pip = $10 for most pairs
+        self.pip_value_per_lot = {
+            'forex_standard': 10.0,
+            'forex_jpy': 10.0,
+            'gold': 1.0,
+            'crypto': 0.01,
+            'index': 1.0
+        }
     
     def _load_config(self, config_path: str) -> Dict:
         """Load risk management configuration"""
@@ -120,21 +133,8 @@ class RiskCalculator:
             self.logger.warning(f"Stop loss is 0 pips for {symbol}")
             return min_lot
         
-        # Calculate pip value in account currency (assuming USD account)
-        # For standard lot (100,000 units), 1 pip = $10 for most pairs
-        # Adjust for different symbol types
-        if symbol_type == 'forex_standard':
-            pip_value_per_lot = 10.0
-        elif symbol_type == 'forex_jpy':
-            pip_value_per_lot = 10.0
-        elif symbol_type == 'gold':
-            pip_value_per_lot = 1.0
-        elif symbol_type == 'crypto':
-            pip_value_per_lot = 0.01
-        elif symbol_type == 'index':
-            pip_value_per_lot = 1.0
-        else:
-            pip_value_per_lot = 10.0
+        # Pip value in account currency, adjusted for the symbol type
+        pip_value_per_lot = self.pip_value_per_lot.get(symbol_type, 10.0)
         
         # Calculate lot size
         # risk_amount = lot_size * sl_pips * pip_value_per_lot
@@ -185,7 +185,8 @@ class RiskCalculator:
                                    candles: list,
                                    direction: str,
                                    atr_multiplier: float = 1.5,
-                                   atr_period: int = 14) -> float:
+                                   atr_period: int = 14,
+                                   series_key: Optional[str] = None) -> float:
         """
         Calculate dynamic stop loss using ATR (Average True Range)
         
@@ -194,6 +195,7 @@ class RiskCalculator:
             direction: 'BUY' or 'SELL'
             atr_multiplier: Multiplier for ATR (default 1.5)
             atr_period: ATR calculation period (default 14)
+            series_key: Series identity (e.g. "EURUSD:M5") for incremental ATR updates
             
         Returns:
             Stop loss price
@@ -206,7 +208,7 @@ class RiskCalculator:
                 return max(c['high'] for c in candles[-10:])
         
         # Calculate ATR
-        atr = self._calculate_atr(candles, atr_period)
+        atr = self._calculate_atr(candles, atr_period, series_key)
         current_price = candles[-1]['close']
         
         # Calculate stop loss
@@ -395,13 +397,15 @@ class RiskCalculator:
         
         return True, "Risk limits validated"
     
-    def _calculate_atr(self, candles: list, period: int = 14) -> float:
+    def _calculate_atr(self, candles: list, period: int = 14, series_key: Optional[str] = None) -> float:
         """
-        Calculate Average True Range
+        Calculate Average True Range (Wilder smoothing over the full history)
         
         Args:
-            candles: List of OHLCV candles
+            candles: List of closed OHLCV candles
             period: ATR period
+            series_key: Series identity (e.g. "EURUSD:M5") to keep the ATR state
+                        between calls and only process new bars
             
         Returns:
             ATR value
@@ -409,21 +413,10 @@ class RiskCalculator:
         if len(candles) < period + 1:
             return 0
         
-        true_ranges = []
-        
-        for i in range(1, len(candles)):
-            high = candles[i]['high']
-            low = candles[i]['low']
-            prev_close = candles[i-1]['close']
-            
-            tr = max(
-                high - low,
-                abs(high - prev_close),
-                abs(low - prev_close)
-            )
-            true_ranges.append(tr)
-        
-        # Calculate average of last 'period' true ranges
-        atr = sum(true_ranges[-period:]) / period
-        
-        return atr
+        if series_key is None:
+            return IndicatorFeed(ATR(period)).sync(candles)
+        key = (series_key, period)
+        feed = self._atr_feeds.get(key)
+        if feed is None:
+            feed = self._atr_feeds[key] = IndicatorFeed(ATR(period))
+        return feed.sync(candles)
@@ -109,7 +109,11 @@ class BackgroundTradingService:
                 return
             
             # Initialize bridge
-            self.bridge = MQL5Bridge(port=self.bridge_port)
+            # Journal the signal queue so a restart does not lose undelivered signals
+            self.bridge = MQL5Bridge(
+                port=self.bridge_port,
+                journal_path=str(trading_bridge_dir / "data" / "signal_journal.jsonl")
+            )
             
             # Start bridge in separate thread
             self.bridge_thread = threading.Thread(target=self._run_bridge, daemon=True)
@@ -224,6 +228,9 @@ class BackgroundTradingService:
         if self.bridge:
             self.bridge.stop()
         
+        if self.trader:
+            self.trader.close()
+        
         logger.info("Background Trading Service stopped")
         _safe_telegram_notify("Service stopped.", tag="STOP")
     
@@ -0,0 +1,139 @@
+"""
+Columnar Candle Container
+OHLCV candles stored as contiguous NumPy arrays for vectorized analysis
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+class CandleArray:
+    """
+    OHLCV candles as columns instead of a list of dicts
+
+    open/high/low/close/volume are contiguous float64 arrays, timestamp is
+    an object array holding the original timestamp values unchanged, and
+    has_volume records which candles carried a 'volume' key (missing volume
+    is stored as 0, matching candle.get('volume', 0)).
+
+    Indexing with an int returns the candle as a dict and slicing returns a
+    CandleArray, so code written for List[Dict] candles (candles[-1]['close'],
+    for c in candles[-20:]) keeps working. Keys other than OHLCV and timestamp
+    are not kept.
+    """
+
+    __slots__ = ('open', 'high', 'low', 'close', 'volume', 'timestamp', 'has_volume')
+
+    def __init__(self, open: Sequence[float], high: Sequence[float], low: Sequence[float],
+                 close: Sequence[float], volume: Optional[Sequence[float]] = None,
+                 timestamp: Optional[Sequence[Any]] = None,
+                 has_volume: Optional[Sequence[bool]] = None):
+        """
+        Initialize CandleArray
+
+        Args:
+            open: Open prices
+            high: High prices
+            low: Low prices
+            close: Close prices
+            volume: Volumes (None = no volume data)
+            timestamp: Timestamps, any type (None = all None)
+            has_volume: Per-candle volume flags (default: volume is not None)
+        """
+        self.open = np.ascontiguousarray(open, dtype=np.float64)
+        self.high = np.ascontiguousarray(high, dtype=np.float64)
+        self.low = np.ascontiguousarray(low, dtype=np.float64)
+        self.close = np.ascontiguousarray(close, dtype=np.float64)
+        n = len(self.close)
+        if not (len(self.open) == len(self.high) == len(self.low) == n):
+            raise ValueError("open, high, low and close must have the same length")
+
+        if volume is None:
+            self.volume = np.zeros(n)
+        else:
+            self.volume = np.ascontiguousarray(volume, dtype=np.float64)
+        if has_volume is None:
+            self.has_volume = np.full(n, volume is not None)
+        else:
+            self.has_volume = np.asarray(has_volume, dtype=bool)
+
+        if timestamp is None:
+            self.timestamp = np.full(n, None, dtype=object)
+        elif isinstance(timestamp, np.ndarray) and timestamp.dtype == object:
+            self.timestamp = timestamp
+        else:
+            self.timestamp = np.empty(n, dtype=object)
+            self.timestamp[:] = list(timestamp)
+
+        if not (len(self.volume) == len(self.has_volume) == len(self.timestamp) == n):
+            raise ValueError("volume and timestamp must match the price columns")
+
+    @classmethod
+    def from_dicts(cls, candles: List[Dict]) -> 'CandleArray':
+        """
+        Build from a list of candle dicts
+
+        Args:
+            candles: Candles with open/high/low/close and optional volume/timestamp keys
+
+        Returns:
+            CandleArray
+        """
+        n = len(candles)
+
+        def column(key: str) -> np.ndarray:
+            return np.fromiter((c[key] for c in candles), dtype=np.float64, count=n)
+
+        return cls(
+            open=column('open'),
+            high=column('high'),
+            low=column('low'),
+            close=column('close'),
+            volume=np.fromiter((c.get('volume', 0) for c in candles), dtype=np.float64, count=n),
+            timestamp=[c.get('timestamp') for c in candles],
+            has_volume=np.fromiter(('volume' in c for c in candles), dtype=bool, count=n)
+        )
+
+    @classmethod
+    def from_candles(cls, candles: Union['CandleArray', List[Dict]]) -> 'CandleArray':
+        """Return candles as a CandleArray, converting a list of dicts if needed"""
+        if isinstance(candles, cls):
+            return candles
+        if hasattr(candles, 'to_candle_array'):  # e.g. market_data.CandleSeries
+            return candles.to_candle_array()
+        return cls.from_dicts(candles)
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return CandleArray(
+                self.open[index], self.high[index], self.low[index], self.close[index],
+                volume=self.volume[index],
+                timestamp=self.timestamp[index],
+                has_volume=self.has_volume[index]
+            )
+        return self._candle(index)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for i in range(len(self)):
+            yield self._candle(i)
+
+    def _candle(self, i: int) -> Dict:
+        """Candle at position i as a dict"""
+        candle = {
+            'open': float(self.open[i]),
+            'high': float(self.high[i]),
+            'low': float(self.low[i]),
+            'close': float(self.close[i]),
+            'timestamp': self.timestamp[i]
+        }
+        if self.has_volume[i]:
+            candle['volume'] = float(self.volume[i])
+        return candle
+
+    def to_dicts(self) -> List[Dict]:
+        """Convert back to a list of candle dicts"""
+        return list(self)
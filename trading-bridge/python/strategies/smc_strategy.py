@@ -4,20 +4,82 @@ Includes: Order Blocks, Fair Value Gaps, Liquidity Zones, Breaker Blocks
 Combined with: Trend Breakout and Multi-Timeframe Indicators
 """
 
+import heapq
 import json
-from typing import Dict, List, Optional, Tuple
+from bisect import bisect_right
+from collections import deque
+from typing import Dict, List, Optional, Tuple, Union
 from datetime import datetime
 import logging
 
+from indicators import EMA, RSI, IndicatorFeed
+from .smc_tracker import SMCStructureTracker
+
+try:
+    from .candles import CandleArray
+    from . import smc_vectorized
+except ImportError:  # numpy is optional - detectors fall back to pure Python loops
+    CandleArray = None
+    smc_vectorized = None
+
+# Candles as a list of OHLCV dicts, or a CandleArray (columnar, needs numpy)
+Candles = Union[List[Dict], 'CandleArray']
+
+
+def sliding_extremes(values: List[float], left: int, right: int,
+                     highest: bool = True) -> List[Optional[float]]:
+    """
+    Maximum (or minimum) of values[i-left : i+right+1] for every i
+    
+    Uses a monotonic deque of candidate indices, so each value is pushed and
+    popped at most once: O(n) for any window size.
+    
+    Args:
+        values: Input series
+        left: Values before i in the window
+        right: Values after i in the window
+        highest: True for the maximum, False for the minimum
+        
+    Returns:
+        Extreme per position (None where the window does not fit)
+    """
+    result: List[Optional[float]] = [None] * len(values)
+    window = deque()
+    for j, value in enumerate(values):
+        if highest:
+            while window and values[window[-1]] <= value:
+                window.pop()
+        else:
+            while window and values[window[-1]] >= value:
+                window.pop()
+        window.append(j)
+        
+        # The window centred on i = j - right ends at j and starts at i - left
+        start = j - right - left
+        while window[0] < start:
+            window.popleft()
+        if start >= 0:
+            result[j - right] = values[window[0]]
+    return result
+
 
 class SMCStrategy:
     """
     Smart Money Concepts strategy implementation
+    
+    When numpy is installed the order block, fair value gap and liquidity
+    zone detectors run vectorized over a CandleArray (converting a list of
+    dicts on the way in) and return exactly what the pure-Python loops
+    return; pass a CandleArray directly to skip the conversion.
     """
     
     def __init__(self, config_path: str = None):
         self.logger = logging.getLogger(__name__)
         self.config = self._load_config(config_path)
+        # Live state per (symbol, series, timeframe[, indicator, period]); the
+        # series (broker or feed id) keeps one symbol's brokers apart
+        self._indicator_feeds: Dict[Tuple, IndicatorFeed] = {}
+        self._trackers: Dict[Tuple[str, Optional[str], str], SMCStructureTracker] = {}
         
     def _load_config(self, config_path: str) -> Dict:
         """Load strategy configuration"""
@@ -34,7 +96,10 @@ class SMCStrategy:
                 "order_blocks": True,
                 "fair_value_gaps": True,
                 "liquidity_zones": True,
-                "breaker_blocks": True
+                "breaker_blocks": True,
+                "swing_window": 5,
+                "swing_symmetric": False,  # False = original range(i-5, i+5) window
+                "liquidity_touch_reach": 20
             },
             "trend_breakout": {
                 "structure_break": True,
@@ -53,7 +118,7 @@ class SMCStrategy:
             }
         }
     
-    def detect_order_blocks(self, candles: List[Dict], timeframe: str = "H1") -> List[Dict]:
+    def detect_order_blocks(self, candles: Candles, timeframe: str = "H1") -> List[Dict]:
         """
         Detect order blocks (OB) - areas where smart money placed orders
         
@@ -63,12 +128,18 @@ class SMCStrategy:
         - Often engulfs previous candles
         
         Args:
-            candles: List of OHLCV candles
+            candles: List of OHLCV candles or a CandleArray
             timeframe: Timeframe for analysis
             
         Returns:
             List of order block zones
         """
+        if smc_vectorized is not None:
+            return smc_vectorized.detect_order_blocks(CandleArray.from_candles(candles), timeframe)
+        return self._detect_order_blocks_loop(candles, timeframe)
+    
+    def _detect_order_blocks_loop(self, candles: List[Dict], timeframe: str) -> List[Dict]:
+        """Pure-Python order block detection"""
         order_blocks = []
         
         if len(candles) < 5:
@@ -91,7 +162,7 @@ class SMCStrategy:
                     'high': current['high'],
                     'low': current['low'],
                     'timestamp': current['timestamp'],
-                    'strength': self._calculate_ob_strength(candles, i)
+                    'strength': self._calculate_ob_strength(candles, i, 'bullish')
                 })
             
             # Bearish Order Block
@@ -106,12 +177,12 @@ class SMCStrategy:
                     'high': current['high'],
                     'low': current['low'],
                     'timestamp': current['timestamp'],
-                    'strength': self._calculate_ob_strength(candles, i)
+                    'strength': self._calculate_ob_strength(candles, i, 'bearish')
                 })
         
         return order_blocks
     
-    def detect_fair_value_gaps(self, candles: List[Dict]) -> List[Dict]:
+    def detect_fair_value_gaps(self, candles: Candles) -> List[Dict]:
         """
         Detect Fair Value Gaps (FVG) - price imbalances
         
@@ -119,17 +190,33 @@ class SMCStrategy:
         - There's a gap between candle[i-1].low and candle[i+1].high (bullish)
         - There's a gap between candle[i-1].high and candle[i+1].low (bearish)
         
+        A gap is 'filled' once a later candle trades back through all of it
+        (low at or below a bullish gap's low, high at or above a bearish gap's high).
+        
         Args:
-            candles: List of OHLCV candles
+            candles: List of OHLCV candles or a CandleArray
             
         Returns:
             List of fair value gaps
         """
+        if smc_vectorized is not None:
+            return smc_vectorized.detect_fair_value_gaps(CandleArray.from_candles(candles))
+        return self._detect_fair_value_gaps_loop(candles)
+    
+    def _detect_fair_value_gaps_loop(self, candles: List[Dict]) -> List[Dict]:
+        """Pure-Python fair value gap detection"""
         fvgs = []
         
         if len(candles) < 3:
             return fvgs
         
+        # Lowest low / highest high from each candle to the end, for the filled flag
+        later_low = [float('inf')] * (len(candles) + 1)
+        later_high = [float('-inf')] * (len(candles) + 1)
+        for i in range(len(candles) - 1, -1, -1):
+            later_low[i] = min(later_low[i + 1], candles[i]['low'])
+            later_high[i] = max(later_high[i + 1], candles[i]['high'])
+        
         for i in range(1, len(candles) - 1):
             prev = candles[i-1]
             current = candles[i]
@@ -144,7 +231,7 @@ class SMCStrategy:
                     'low': prev['high'],
                     'gap_size': gap_size,
                     'timestamp': current['timestamp'],
-                    'filled': False
+                    'filled': later_low[i + 2] <= prev['high']
                 })
             
             # Bearish FVG
@@ -156,12 +243,13 @@ class SMCStrategy:
                     'low': next_candle['high'],
                     'gap_size': gap_size,
                     'timestamp': current['timestamp'],
-                    'filled': False
+                    'filled': later_high[i + 2] >= prev['low']
                 })
         
         return fvgs
     
-    def detect_liquidity_zones(self, candles: List[Dict]) -> List[Dict]:
+    def detect_liquidity_zones(self, candles: Candles, window: Optional[int] = None,
+                               symmetric: Optional[bool] = None) -> List[Dict]:
         """
         Detect liquidity zones - areas where stop losses are likely placed
         
@@ -170,54 +258,78 @@ class SMCStrategy:
         - At round numbers
         - At previous day high/low
         
+        A candle is a swing high (low) when no candle in its window is higher
+        (lower). Swings are found with a sliding-window maximum/minimum, so the
+        cost is linear in the number of candles whatever the window size.
+        
         Args:
-            candles: List of OHLCV candles
+            candles: List of OHLCV candles or a CandleArray
+            window: Candles before a swing that it must dominate
+                    (default: config smc.swing_window, 5)
+            symmetric: Also check `window` candles after the swing. False keeps
+                       the original range(i - window, i + window) check, which
+                       looks one candle less ahead than behind
+                       (default: config smc.swing_symmetric, False)
             
         Returns:
             List of liquidity zones
         """
+        left, right, reach = self._swing_settings(window, symmetric)
+        
+        if smc_vectorized is not None:
+            return smc_vectorized.detect_liquidity_zones(CandleArray.from_candles(candles),
+                                                         left, right, reach)
+        return self._detect_liquidity_zones_loop(candles, left, right, reach)
+    
+    def _swing_settings(self, window: Optional[int] = None,
+                        symmetric: Optional[bool] = None) -> Tuple[int, int, int]:
+        """Candles before and after a swing, and touch reach, from arguments or config"""
+        settings = self.config.get('smc', {})
+        if window is None:
+            window = settings.get('swing_window', 5)
+        if symmetric is None:
+            symmetric = settings.get('swing_symmetric', False)
+        if window < 1:
+            raise ValueError("Swing window must be at least 1")
+        right = window if symmetric else window - 1
+        return window, right, settings.get('liquidity_touch_reach', 20)
+    
+    def _detect_liquidity_zones_loop(self, candles: List[Dict], left: int = 5, right: int = 4,
+                                     reach: int = 20) -> List[Dict]:
+        """Pure-Python liquidity zone detection"""
         liquidity_zones = []
         
         if len(candles) < 20:
             return liquidity_zones
         
-        # Find swing highs and lows
-        for i in range(10, len(candles) - 10):
-            current = candles[i]
-            
-            # Check for swing high
-            is_swing_high = True
-            for j in range(i-5, i+5):
-                if j != i and candles[j]['high'] > current['high']:
-                    is_swing_high = False
-                    break
-            
-            if is_swing_high:
+        highs = [c['high'] for c in candles]
+        lows = [c['low'] for c in candles]
+        highest = sliding_extremes(highs, left, right, highest=True)
+        lowest = sliding_extremes(lows, left, right, highest=False)
+        
+        # Find swing highs and lows (the window max/min includes the candle itself,
+        # so "nothing else is higher" is "the window max is this high")
+        margin = max(10, left, right)
+        for i in range(margin, len(candles) - margin):
+            if highest[i] <= highs[i]:
                 liquidity_zones.append({
                     'type': 'high',
-                    'level': current['high'],
-                    'timestamp': current['timestamp'],
-                    'strength': self._calculate_liquidity_strength(candles, i, 'high')
+                    'level': candles[i]['high'],
+                    'timestamp': candles[i]['timestamp'],
+                    'strength': self._calculate_liquidity_strength(candles, i, 'high', reach)
                 })
             
-            # Check for swing low
-            is_swing_low = True
-            for j in range(i-5, i+5):
-                if j != i and candles[j]['low'] < current['low']:
-                    is_swing_low = False
-                    break
-            
-            if is_swing_low:
+            if lowest[i] >= lows[i]:
                 liquidity_zones.append({
                     'type': 'low',
-                    'level': current['low'],
-                    'timestamp': current['timestamp'],
-                    'strength': self._calculate_liquidity_strength(candles, i, 'low')
+                    'level': candles[i]['low'],
+                    'timestamp': candles[i]['timestamp'],
+                    'strength': self._calculate_liquidity_strength(candles, i, 'low', reach)
                 })
         
         return liquidity_zones
     
-    def detect_breaker_blocks(self, candles: List[Dict], order_blocks: List[Dict]) -> List[Dict]:
+    def detect_breaker_blocks(self, candles: Candles, order_blocks: List[Dict]) -> List[Dict]:
         """
         Detect breaker blocks - failed order blocks that become support/resistance
         
@@ -225,13 +337,75 @@ class SMCStrategy:
         - An order block is broken
         - Price returns to test it from the other side
         
+        Candles are indexed by timestamp once: each order block's first later
+        candle is found by binary search, then a single forward sweep keeps the
+        unbroken bullish blocks in a heap by low (highest first) and bearish
+        blocks by high (lowest first), so every candle only has to check the
+        block that would break first. O((N + OB) log OB) instead of a scan of
+        all candles per order block. Candles that are not sorted by timestamp
+        fall back to the per-block scan.
+        
         Args:
-            candles: List of OHLCV candles
+            candles: List of OHLCV candles or a CandleArray
             order_blocks: Previously detected order blocks
             
         Returns:
             List of breaker blocks
         """
+        if CandleArray is not None and isinstance(candles, CandleArray):
+            timestamps = candles.timestamp.tolist()
+            highs = candles.high.tolist()
+            lows = candles.low.tolist()
+        else:
+            timestamps = [c['timestamp'] for c in candles]
+            highs = [c['high'] for c in candles]
+            lows = [c['low'] for c in candles]
+        
+        if any(timestamps[i] > timestamps[i + 1] for i in range(len(timestamps) - 1)):
+            return self._detect_breaker_blocks_scan(candles, order_blocks)
+        
+        # First candle strictly after each order block
+        starts = [bisect_right(timestamps, ob['timestamp']) for ob in order_blocks]
+        pending = sorted(range(len(order_blocks)), key=starts.__getitem__)
+        break_index: List[Optional[int]] = [None] * len(order_blocks)
+        bullish_heap: List[Tuple[float, int]] = []  # (-low, ob position)
+        bearish_heap: List[Tuple[float, int]] = []  # (high, ob position)
+        
+        next_pending = 0
+        first = starts[pending[0]] if pending else len(timestamps)
+        for j in range(first, len(timestamps)):
+            while next_pending < len(pending) and starts[pending[next_pending]] <= j:
+                k = pending[next_pending]
+                next_pending += 1
+                if order_blocks[k]['type'] == 'bullish':
+                    heapq.heappush(bullish_heap, (-order_blocks[k]['low'], k))
+                elif order_blocks[k]['type'] == 'bearish':
+                    heapq.heappush(bearish_heap, (order_blocks[k]['high'], k))
+            
+            while bullish_heap and lows[j] < -bullish_heap[0][0]:
+                break_index[heapq.heappop(bullish_heap)[1]] = j
+            while bearish_heap and highs[j] > bearish_heap[0][0]:
+                break_index[heapq.heappop(bearish_heap)[1]] = j
+            
+            if not bullish_heap and not bearish_heap and next_pending == len(pending):
+                break
+        
+        breaker_blocks = []
+        for ob, j in zip(order_blocks, break_index):
+            if j is not None:
+                breaker_blocks.append({
+                    'type': 'bearish' if ob['type'] == 'bullish' else 'bullish',
+                    'original_ob_type': ob['type'],
+                    'high': ob['high'],
+                    'low': ob['low'],
+                    'break_timestamp': timestamps[j],
+                    'original_timestamp': ob['timestamp']
+                })
+        
+        return breaker_blocks
+    
+    def _detect_breaker_blocks_scan(self, candles: Candles, order_blocks: List[Dict]) -> List[Dict]:
+        """Breaker block detection by scanning all candles per order block (any candle order)"""
         breaker_blocks = []
         
         for ob in order_blocks:
@@ -333,81 +507,161 @@ class SMCStrategy:
                               symbol: str,
                               candles_h1: List[Dict],
                               candles_m15: List[Dict],
-                              candles_m5: List[Dict]) -> Optional[Dict]:
+                              candles_m5: List[Dict],
+                              series: Optional[str] = None) -> Optional[Dict]:
         """
         Calculate entry signal using multi-timeframe analysis
         
+        The H1 structure (SMCStructureTracker) and the M5 indicators are kept
+        per symbol and series, so calling this again as bars close only
+        processes the new bars: latency does not grow with the length of the
+        history passed in.
+        
         Args:
             symbol: Trading symbol
-            candles_h1: H1 timeframe candles
+            candles_h1: H1 timeframe candles (the last one may still be forming)
             candles_m15: M15 timeframe candles
-            candles_m5: M5 timeframe candles
+            candles_m5: M5 timeframe candles (the last one may still be forming)
+            series: Broker or feed the candles come from (the same symbol from
+                    two brokers must not share state)
             
         Returns:
             Entry signal dictionary or None
         """
-        # Detect SMC elements
-        ob_h1 = self.detect_order_blocks(candles_h1, "H1")
-        fvg_h1 = self.detect_fair_value_gaps(candles_h1)
-        liq_zones = self.detect_liquidity_zones(candles_h1)
+        # Bring the live H1 structure up to date (only bars closed since the last call)
+        structure = self.structure_tracker(symbol, "H1", series)
+        structure.sync(candles_h1)
         
         # Detect trend breakout
-        breakout = self.detect_trend_breakout(candles_h1)
+        breakout = structure.trend_breakout()
         
         if not breakout['type']:
             return None
         
-        # Check alignment across timeframes
-        current_price_h1 = candles_h1[-1]['close']
-        current_price_m15 = candles_m15[-1]['close']
-        current_price_m5 = candles_m5[-1]['close']
+        # Latest order block (broken or not) and the number of gaps price has not filled yet
+        order_block = structure.last_order_block
+        open_fvgs = structure.open_fvg_count()
         
-        # Calculate indicators
-        ema_fast_m5 = self._calculate_ema(candles_m5, self.config['indicators']['ema_fast'])
-        ema_slow_m5 = self._calculate_ema(candles_m5, self.config['indicators']['ema_slow'])
-        rsi_m5 = self._calculate_rsi(candles_m5, self.config['indicators']['rsi_period'])
+        # Calculate indicators (state kept per symbol and series, so only new M5 bars are processed)
+        indicators = self.config['indicators']
+        key = (symbol, series, 'M5')
+        ema_fast_m5 = self._calculate_ema(candles_m5, indicators['ema_fast'], key)
+        ema_slow_m5 = self._calculate_ema(candles_m5, indicators['ema_slow'], key)
+        rsi_m5 = self._calculate_rsi(candles_m5, indicators['rsi_period'], key)
         
-        # Entry logic
-        signal = None
+        return self.evaluate_entry(symbol, breakout, order_block, open_fvgs,
+                                   ema_fast_m5, ema_slow_m5, rsi_m5, candles_m5)
+    
+    def evaluate_entry(self,
+                       symbol: str,
+                       breakout: Dict,
+                       order_block: Optional[Dict],
+                       open_fvgs: int,
+                       ema_fast: float,
+                       ema_slow: float,
+                       rsi: float,
+                       candles_m5: Candles) -> Optional[Dict]:
+        """
+        Apply the entry rules to already computed structure and indicators
+        
+        calculate_entry_signal gathers these inputs and calls this;
+        backtest.optimizer replays it over precomputed values.
+        
+        Args:
+            symbol: Trading symbol
+            breakout: H1 trend breakout (detect_trend_breakout format)
+            order_block: Latest H1 order block or None
+            open_fvgs: Number of unfilled H1 fair value gaps
+            ema_fast: Fast M5 EMA
+            ema_slow: Slow M5 EMA
+            rsi: M5 RSI
+            candles_m5: M5 timeframe candles (at least the last 20)
+            
+        Returns:
+            Entry signal dictionary or None
+        """
+        if not breakout['type']:
+            return None
+        
+        smc = self.config.get('smc', {})
+        indicators = self.config['indicators']
+        rsi_oversold = indicators.get('rsi_oversold', 30)
+        rsi_overbought = indicators.get('rsi_overbought', 70)
+        if not rsi_oversold < rsi < rsi_overbought:
+            return None
+        
+        # With order blocks disabled the entry needs no OB confirmation and the
+        # stop falls back to the recent M5 swing
+        use_order_blocks = smc.get('order_blocks', True)
+        if use_order_blocks and order_block is None:
+            return None
+        ob_h1 = [order_block] if use_order_blocks else []
+        open_fvgs = open_fvgs if smc.get('fair_value_gaps', True) else 0
+        confirmation = "OB confirmed, " if use_order_blocks else ""
         
         # Bullish entry conditions
         if (breakout['direction'] in ['bullish', 'bullish_reversal'] and
-            ema_fast_m5 > ema_slow_m5 and
-            rsi_m5 > 30 and rsi_m5 < 70 and
-            len(ob_h1) > 0 and ob_h1[-1]['type'] == 'bullish'):
-            
-            signal = {
-                'symbol': symbol,
-                'direction': 'BUY',
-                'entry_price': current_price_m5,
-                'stop_loss': self._calculate_stop_loss(candles_m5, 'BUY', ob_h1),
-                'take_profit': None,  # Will be calculated based on TP ratio
-                'timestamp': datetime.now().isoformat(),
-                'confidence': self._calculate_confidence(breakout, ob_h1, fvg_h1, rsi_m5),
-                'reason': f"SMC Bullish: {breakout['type']}, OB confirmed, EMAs aligned"
-            }
+            ema_fast > ema_slow and
+            (not ob_h1 or ob_h1[-1]['type'] == 'bullish')):
+            direction, bias = 'BUY', 'Bullish'
         
         # Bearish entry conditions
         elif (breakout['direction'] in ['bearish', 'bearish_reversal'] and
-              ema_fast_m5 < ema_slow_m5 and
-              rsi_m5 > 30 and rsi_m5 < 70 and
-              len(ob_h1) > 0 and ob_h1[-1]['type'] == 'bearish'):
+              ema_fast < ema_slow and
+              (not ob_h1 or ob_h1[-1]['type'] == 'bearish')):
+            direction, bias = 'SELL', 'Bearish'
+        
+        else:
+            return None
+        
+        return {
+            'symbol': symbol,
+            'direction': direction,
+            'entry_price': candles_m5[-1]['close'],
+            'stop_loss': self._calculate_stop_loss(candles_m5, direction, ob_h1),
+            'take_profit': None,  # Will be calculated based on TP ratio
+            'timestamp': datetime.now().isoformat(),
+            'confidence': self._calculate_confidence(breakout, ob_h1, open_fvgs, rsi),
+            'reason': f"SMC {bias}: {breakout['type']}, {confirmation}EMAs aligned"
+        }
+    
+    def structure_tracker(self, symbol: str, timeframe: str = "H1",
+                          series: Optional[str] = None) -> SMCStructureTracker:
+        """
+        Live SMC structure for a symbol/series/timeframe, kept between calls
+        
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe of the candles it will be fed
+            series: Broker or feed the candles come from
             
-            signal = {
-                'symbol': symbol,
-                'direction': 'SELL',
-                'entry_price': current_price_m5,
-                'stop_loss': self._calculate_stop_loss(candles_m5, 'SELL', ob_h1),
-                'take_profit': None,  # Will be calculated based on TP ratio
-                'timestamp': datetime.now().isoformat(),
-                'confidence': self._calculate_confidence(breakout, ob_h1, fvg_h1, rsi_m5),
-                'reason': f"SMC Bearish: {breakout['type']}, OB confirmed, EMAs aligned"
-            }
+        Returns:
+            SMCStructureTracker (sync() it with the latest closed candles)
+        """
+        key = (symbol, series, timeframe)
+        tracker = self._trackers.get(key)
+        if tracker is None:
+            tracker = self._trackers[key] = SMCStructureTracker(self, timeframe)
+        return tracker
+    
+    def reset_state(self, symbol: str, series: Optional[str] = None):
+        """
+        Forget the live structure and indicators of a symbol/series
+        
+        Needed before feeding the same series from an earlier point in time
+        (e.g. a second backtest run), since kept state ignores bars older than
+        the last one it has seen.
         
-        return signal
+        Args:
+            symbol: Trading symbol
+            series: Broker or feed the candles come from
+        """
+        for state in (self._trackers, self._indicator_feeds):
+            for key in [key for key in state if key[:2] == (symbol, series)]:
+                del state[key]
     
-    def _calculate_ob_strength(self, candles: List[Dict], index: int) -> float:
-        """Calculate order block strength (0-1)"""
+    def _calculate_ob_strength(self, candles: List[Dict], index: int, ob_type: str) -> float:
+        """Calculate order block strength (0-1) for a 'bullish' or 'bearish' order block"""
         if index < 1 or index >= len(candles) - 1:
             return 0.5
         
@@ -440,9 +694,9 @@ class SMCStrategy:
         # 3. Holding power (how many candles respect the OB)
         held_count = 0
         for i in range(index + 1, min(index + 10, len(candles))):
-            if current['type'] == 'bullish' and candles[i]['low'] >= current['low']:
+            if ob_type == 'bullish' and candles[i]['low'] >= current['low']:
                 held_count += 1
-            elif current['type'] == 'bearish' and candles[i]['high'] <= current['high']:
+            elif ob_type == 'bearish' and candles[i]['high'] <= current['high']:
                 held_count += 1
             else:
                 break
@@ -450,8 +704,9 @@ class SMCStrategy:
         
         return min(strength, 1.0)
     
-    def _calculate_liquidity_strength(self, candles: List[Dict], index: int, level_type: str) -> float:
-        """Calculate liquidity zone strength (0-1)"""
+    def _calculate_liquidity_strength(self, candles: List[Dict], index: int, level_type: str,
+                                      reach: int = 20) -> float:
+        """Calculate liquidity zone strength (0-1) from touches within `reach` candles, age and distance"""
         if index < 10 or index >= len(candles) - 10:
             return 0.5
         
@@ -462,7 +717,7 @@ class SMCStrategy:
         
         # 1. Number of times level was tested (40% weight)
         touch_count = 0
-        for i in range(max(0, index - 20), min(index + 20, len(candles))):
+        for i in range(max(0, index - reach), min(index + reach, len(candles))):
             if i == index:
                 continue
             candle = candles[i]
@@ -488,48 +743,46 @@ class SMCStrategy:
         
         return min(strength, 1.0)
     
-    def _calculate_ema(self, candles: List[Dict], period: int) -> float:
-        """Calculate Exponential Moving Average"""
-        if len(candles) < period:
-            return 0
-        
-        closes = [c['close'] for c in candles[-period:]]
-        multiplier = 2 / (period + 1)
-        ema = closes[0]
+    def _indicator_value(self, key: Optional[Tuple], factory, candles: Candles) -> Optional[float]:
+        """
+        Bring a streaming indicator up to date with candles and return its value
         
-        for close in closes[1:]:
-            ema = (close * multiplier) + (ema * (1 - multiplier))
+        With a key the indicator state is kept between calls, so only bars
+        closed since the previous call are fed (O(1) per new bar); without one
+        the indicator is built from the whole history.
+        """
+        if key is None:
+            return IndicatorFeed(factory()).sync(candles)
+        feed = self._indicator_feeds.get(key)
+        if feed is None:
+            feed = self._indicator_feeds[key] = IndicatorFeed(factory())
+        return feed.sync(candles)
+    
+    def _calculate_ema(self, candles: Candles, period: int, key: Optional[Tuple] = None) -> float:
+        """
+        Calculate Exponential Moving Average over the full history (SMA-seeded)
         
-        return ema
+        Args:
+            candles: Closed OHLCV candles
+            period: EMA period
+            key: Series identity (e.g. (symbol, series, timeframe)) to update incrementally
+        """
+        if len(candles) < period:
+            return 0
+        return self._indicator_value(key and (*key, 'EMA', period), lambda: EMA(period), candles)
     
-    def _calculate_rsi(self, candles: List[Dict], period: int = 14) -> float:
-        """Calculate Relative Strength Index"""
+    def _calculate_rsi(self, candles: Candles, period: int = 14, key: Optional[Tuple] = None) -> float:
+        """
+        Calculate Relative Strength Index over the full history (Wilder smoothing)
+        
+        Args:
+            candles: Closed OHLCV candles
+            period: RSI period
+            key: Series identity (e.g. (symbol, series, timeframe)) to update incrementally
+        """
         if len(candles) < period + 1:
             return 50
-        
-        closes = [c['close'] for c in candles[-(period+1):]]
-        gains = []
-        losses = []
-        
-        for i in range(1, len(closes)):
-            change = closes[i] - closes[i-1]
-            if change > 0:
-                gains.append(change)
-                losses.append(0)
-            else:
-                gains.append(0)
-                losses.append(abs(change))
-        
-        avg_gain = sum(gains) / period
-        avg_loss = sum(losses) / period
-        
-        if avg_loss == 0:
-            return 100
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return self._indicator_value(key and (*key, 'RSI', period), lambda: RSI(period), candles)
     
     def _calculate_stop_loss(self, candles: List[Dict], direction: str, order_blocks: List[Dict]) -> float:
         """Calculate stop loss based on order blocks and ATR"""
@@ -548,7 +801,7 @@ class SMCStrategy:
             return latest_ob['high'] * 1.001  # Slightly above OB
     
     def _calculate_confidence(self, breakout: Dict, order_blocks: List[Dict], 
-                            fvgs: List[Dict], rsi: float) -> float:
+                            open_fvgs: int, rsi: float) -> float:
         """Calculate signal confidence (0-1)"""
         confidence = 0.5  # Base confidence
         
@@ -561,7 +814,7 @@ class SMCStrategy:
             confidence += 0.15
         
         # Add confidence for FVG presence
-        if fvgs:
+        if open_fvgs:
             confidence += 0.1
         
         # Adjust for RSI (avoid extremes)
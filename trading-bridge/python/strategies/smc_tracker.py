@@ -0,0 +1,364 @@
+"""
+Incremental SMC Structure Tracker
+Keeps order blocks, fair value gaps and swing points as live state, one closed candle at a time
+"""
+
+import heapq
+from collections import deque
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .smc_strategy import SMCStrategy
+
+
+class SMCStructureTracker:
+    """
+    Live SMC market structure for one symbol and timeframe
+
+    Each closed candle is processed once, and the work per candle does not
+    depend on how much history has been seen:
+    - Open order blocks sit in two heaps (bullish by low, highest first;
+      bearish by high, lowest first), so a candle only checks the block that
+      would break first. A broken block moves to breaker_blocks.
+    - Unfilled fair value gaps are kept the same way and are marked
+      filled=True (and moved to filled_fvgs) when price trades back through them.
+    - Swing points are confirmed once the candles after them have closed.
+      Only a fixed-size window of recent candles is kept for this.
+
+    The results match the batch SMCStrategy detectors run on the same candles:
+    - open_order_blocks() returns the detect_order_blocks entries that
+      detect_breaker_blocks has not broken.
+    - open_fair_value_gaps() returns the detect_fair_value_gaps entries that
+      are not filled.
+    - breaker_blocks holds the breaker blocks.
+    - swing_points holds the detect_liquidity_zones levels, without the
+      strength score, because that score depends on the current price.
+
+    Timestamps are assumed to be strictly increasing. sync() also accepts a
+    still-forming last candle: the state from before it is kept, and when
+    that timestamp comes round again the candle is undone and re-applied
+    with its current values, as IndicatorFeed does for the M5 indicators.
+    """
+
+    def __init__(self, strategy: 'SMCStrategy', timeframe: str = "H1",
+                 max_open: int = 500, max_history: int = 200):
+        """
+        Initialize SMCStructureTracker
+
+        Args:
+            strategy: Strategy providing the config and strength scores
+            timeframe: Timeframe recorded on order blocks
+            max_open: Open order blocks / unfilled gaps kept per kind (oldest dropped first)
+            max_history: Breaker blocks, filled gaps and swing points kept
+        """
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.max_open = max_open
+        self.max_history = max_history
+        self.left, self.right, _ = strategy._swing_settings()
+        self.margin = max(10, self.left, self.right)
+        # Enough candles for the swing window, OB strength (5 before, 9 after) and trend breakout (50)
+        self._capacity = max(50, self.left + self.margin + 1)
+        self.reset()
+
+    def reset(self):
+        """Forget every candle seen so far"""
+        self._candles: deque = deque(maxlen=self._capacity)
+        self.count = 0
+        self.last_timestamp = None
+        self.last_order_block: Optional[Dict] = None
+        self._breakout: Optional[Dict] = None
+        self._open_obs: Dict[int, Dict] = {}
+        self._bullish_obs: List[Tuple[float, int]] = []  # (-low, candle index)
+        self._bearish_obs: List[Tuple[float, int]] = []  # (high, candle index)
+        self._unsettled_obs: deque = deque()  # (index, ob) whose strength can still change
+        self._open_fvgs: Dict[int, Dict] = {}
+        self._bullish_fvgs: List[Tuple[float, int]] = []  # (-low, candle index)
+        self._bearish_fvgs: List[Tuple[float, int]] = []  # (high, candle index)
+        self.breaker_blocks: deque = deque(maxlen=self.max_history)
+        self.filled_fvgs: deque = deque(maxlen=self.max_history)
+        self.swing_points: deque = deque(maxlen=self.max_history)
+        self._previous: Optional[Dict] = None  # state before the last candle sync() fed
+
+    def _snapshot(self) -> Dict:
+        """
+        Capture the state update() changes, for sync() to undo the last candle
+
+        Containers are copied, entries are shared: the only entry fields
+        update() changes in place are the strength of unsettled order blocks
+        and the filled flag of open gaps, and both are saved or implied here.
+        """
+        return {
+            'candles': list(self._candles),
+            'count': self.count,
+            'last_timestamp': self.last_timestamp,
+            'last_order_block': self.last_order_block,
+            'open_obs': dict(self._open_obs),
+            'bullish_obs': list(self._bullish_obs),
+            'bearish_obs': list(self._bearish_obs),
+            'unsettled_obs': [(i, ob, ob['strength']) for i, ob in self._unsettled_obs],
+            'open_fvgs': dict(self._open_fvgs),
+            'bullish_fvgs': list(self._bullish_fvgs),
+            'bearish_fvgs': list(self._bearish_fvgs),
+            'breaker_blocks': list(self.breaker_blocks),
+            'filled_fvgs': list(self.filled_fvgs),
+            'swing_points': list(self.swing_points)
+        }
+
+    def _restore(self, state: Dict):
+        """Return to a _snapshot() (which stays usable for another restore)"""
+        self._candles = deque(state['candles'], maxlen=self._capacity)
+        self.count = state['count']
+        self.last_timestamp = state['last_timestamp']
+        self.last_order_block = state['last_order_block']
+        self._breakout = None
+        self._open_obs = dict(state['open_obs'])
+        self._bullish_obs = list(state['bullish_obs'])
+        self._bearish_obs = list(state['bearish_obs'])
+        for _, ob, strength in state['unsettled_obs']:
+            ob['strength'] = strength
+        self._unsettled_obs = deque((i, ob) for i, ob, _ in state['unsettled_obs'])
+        self._open_fvgs = dict(state['open_fvgs'])
+        for gap in self._open_fvgs.values():
+            gap['filled'] = False
+        self._bullish_fvgs = list(state['bullish_fvgs'])
+        self._bearish_fvgs = list(state['bearish_fvgs'])
+        self.breaker_blocks = deque(state['breaker_blocks'], maxlen=self.max_history)
+        self.filled_fvgs = deque(state['filled_fvgs'], maxlen=self.max_history)
+        self.swing_points = deque(state['swing_points'], maxlen=self.max_history)
+
+    def _candle(self, index: int) -> Dict:
+        """Candle by absolute position (must still be in the recent window)"""
+        return self._candles[index - self.count + len(self._candles)]
+
+    def update(self, candle: Dict):
+        """
+        Process one closed candle
+
+        Args:
+            candle: OHLCV candle dict (must be newer than the previous one)
+        """
+        self._previous = None  # a candle fed directly cannot be undone by sync()
+        self._candles.append(candle)
+        self.count += 1
+        j = self.count - 1
+        self.last_timestamp = candle['timestamp']
+        self._breakout = None
+
+        self._break_order_blocks(candle)
+        self._fill_gaps(candle)
+        if j >= 4:
+            self._add_order_block(j - 2)
+        if j >= 2:
+            self._add_fair_value_gap(j - 1)
+        self._settle_strength()
+        if j >= 2 * self.margin:
+            self._add_swing_points(j - self.margin)
+
+    def sync(self, candles) -> int:
+        """
+        Process every candle not seen yet, re-applying the last one seen
+
+        Walks back from the end of the list to the last candle processed, so
+        a call after one new bar costs O(1) however long the history is. That
+        candle may have been a forming bar, so it is undone and processed
+        again with its current values. If it is no longer in the list the
+        tracker is rebuilt from the whole list.
+
+        Args:
+            candles: OHLCV candles in time order (list of dicts or CandleArray);
+                     the last one may be a forming bar that a later call updates
+
+        Returns:
+            Number of new candles processed (the re-applied one not counted)
+        """
+        n = len(candles)
+        start = 0
+        if self.last_timestamp is not None:
+            start = n
+            while start > 0 and candles[start - 1]['timestamp'] > self.last_timestamp:
+                start -= 1
+            if start == 0 or candles[start - 1]['timestamp'] != self.last_timestamp:
+                self.reset()
+                start = 0
+        added = n - start
+        if self._previous is not None:
+            # Undo the last candle seen: it may have changed since (forming bar)
+            self._restore(self._previous)
+            start -= 1
+        if start < n:
+            for i in range(start, n - 1):
+                self.update(candles[i])
+            # Re-applying only the repeated candle leaves the state at that snapshot
+            previous = self._previous if self._previous is not None else self._snapshot()
+            self.update(candles[n - 1])
+            self._previous = previous
+        return added
+
+    def open_order_blocks(self) -> List[Dict]:
+        """Order blocks not broken yet, oldest first"""
+        return list(self._open_obs.values())
+
+    def open_fair_value_gaps(self) -> List[Dict]:
+        """Fair value gaps not filled yet, oldest first"""
+        return list(self._open_fvgs.values())
+
+    def open_fvg_count(self) -> int:
+        """Number of fair value gaps not filled yet"""
+        return len(self._open_fvgs)
+
+    def trend_breakout(self) -> Dict:
+        """Trend breakout on the recent candles (see SMCStrategy.detect_trend_breakout)"""
+        if self._breakout is None:  # computed once per candle
+            self._breakout = self.strategy.detect_trend_breakout(list(self._candles))
+        return dict(self._breakout)
+
+    def get_stats(self) -> Dict:
+        """Get tracker state sizes"""
+        return {
+            'candles': self.count,
+            'open_order_blocks': len(self._open_obs),
+            'open_fair_value_gaps': len(self._open_fvgs),
+            'breaker_blocks': len(self.breaker_blocks),
+            'swing_points': len(self.swing_points)
+        }
+
+    def _add_order_block(self, i: int):
+        """Check whether candle i is an order block (candles i+1 and i+2 have closed)"""
+        current = self._candle(i)
+        next_candle = self._candle(i + 1)
+        if (current['close'] < current['open'] and
+                next_candle['close'] > next_candle['open'] and
+                next_candle['close'] - next_candle['open'] > current['open'] - current['close'] * 2):
+            ob_type = 'bullish'
+        elif (current['close'] > current['open'] and
+              next_candle['close'] < next_candle['open'] and
+              next_candle['open'] - next_candle['close'] > current['close'] - current['open'] * 2):
+            ob_type = 'bearish'
+        else:
+            return
+
+        ob = {
+            'type': ob_type,
+            'timeframe': self.timeframe,
+            'high': current['high'],
+            'low': current['low'],
+            'timestamp': current['timestamp'],
+            'strength': self._ob_strength(i, ob_type)
+        }
+        self.last_order_block = ob
+        self._unsettled_obs.append((i, ob))
+
+        # The two candles after it have already closed and may have broken it
+        for k in (i + 1, i + 2):
+            candle = self._candle(k)
+            if ((ob_type == 'bullish' and candle['low'] < ob['low']) or
+                    (ob_type == 'bearish' and candle['high'] > ob['high'])):
+                self._add_breaker(ob, candle)
+                return
+
+        self._open_obs[i] = ob
+        if ob_type == 'bullish':
+            heapq.heappush(self._bullish_obs, (-ob['low'], i))
+        else:
+            heapq.heappush(self._bearish_obs, (ob['high'], i))
+        self._trim(self._open_obs, self._bullish_obs, self._bearish_obs)
+
+    def _break_order_blocks(self, candle: Dict):
+        """Move every open order block this candle breaks to breaker_blocks"""
+        while self._bullish_obs and candle['low'] < -self._bullish_obs[0][0]:
+            ob = self._open_obs.pop(heapq.heappop(self._bullish_obs)[1], None)
+            if ob is not None:
+                self._add_breaker(ob, candle)
+        while self._bearish_obs and candle['high'] > self._bearish_obs[0][0]:
+            ob = self._open_obs.pop(heapq.heappop(self._bearish_obs)[1], None)
+            if ob is not None:
+                self._add_breaker(ob, candle)
+
+    def _add_breaker(self, ob: Dict, break_candle: Dict):
+        """Record a broken order block"""
+        self.breaker_blocks.append({
+            'type': 'bearish' if ob['type'] == 'bullish' else 'bullish',
+            'original_ob_type': ob['type'],
+            'high': ob['high'],
+            'low': ob['low'],
+            'break_timestamp': break_candle['timestamp'],
+            'original_timestamp': ob['timestamp']
+        })
+
+    def _ob_strength(self, i: int, ob_type: str) -> float:
+        """Order block strength from the candles seen so far"""
+        first = max(0, i - 5)
+        window = [self._candle(k) for k in range(first, self.count)]
+        return self.strategy._calculate_ob_strength(window, i - first, ob_type)
+
+    def _settle_strength(self):
+        """Rescore order blocks whose holding count still depends on newer candles"""
+        for i, ob in self._unsettled_obs:
+            ob['strength'] = self._ob_strength(i, ob['type'])
+        while self._unsettled_obs and self._unsettled_obs[0][0] + 10 <= self.count:
+            self._unsettled_obs.popleft()
+
+    def _add_fair_value_gap(self, i: int):
+        """Check for a gap around candle i (candle i+1 has closed)"""
+        prev = self._candle(i - 1)
+        next_candle = self._candle(i + 1)
+        if prev['high'] < next_candle['low']:
+            gap = {
+                'type': 'bullish',
+                'high': next_candle['low'],
+                'low': prev['high'],
+                'gap_size': next_candle['low'] - prev['high'],
+                'timestamp': self._candle(i)['timestamp'],
+                'filled': False
+            }
+            heapq.heappush(self._bullish_fvgs, (-gap['low'], i))
+        elif prev['low'] > next_candle['high']:
+            gap = {
+                'type': 'bearish',
+                'high': prev['low'],
+                'low': next_candle['high'],
+                'gap_size': prev['low'] - next_candle['high'],
+                'timestamp': self._candle(i)['timestamp'],
+                'filled': False
+            }
+            heapq.heappush(self._bearish_fvgs, (gap['high'], i))
+        else:
+            return
+        self._open_fvgs[i] = gap
+        self._trim(self._open_fvgs, self._bullish_fvgs, self._bearish_fvgs)
+
+    def _fill_gaps(self, candle: Dict):
+        """Mark every open gap this candle trades through as filled"""
+        while self._bullish_fvgs and candle['low'] <= -self._bullish_fvgs[0][0]:
+            self._mark_filled(heapq.heappop(self._bullish_fvgs)[1])
+        while self._bearish_fvgs and candle['high'] >= self._bearish_fvgs[0][0]:
+            self._mark_filled(heapq.heappop(self._bearish_fvgs)[1])
+
+    def _mark_filled(self, i: int):
+        """Move gap i from the open gaps to filled_fvgs"""
+        gap = self._open_fvgs.pop(i, None)
+        if gap is not None:
+            gap['filled'] = True
+            self.filled_fvgs.append(gap)
+
+    def _trim(self, entries: Dict[int, Dict], bullish: List, bearish: List):
+        """Drop the oldest entries above max_open and rebuild heaps full of dropped entries"""
+        while len(entries) > self.max_open:
+            del entries[next(iter(entries))]
+        if len(bullish) + len(bearish) > 2 * self.max_open + 64:
+            bullish[:] = [(-e['low'], i) for i, e in entries.items() if e['type'] == 'bullish']
+            bearish[:] = [(e['high'], i) for i, e in entries.items() if e['type'] == 'bearish']
+            heapq.heapify(bullish)
+            heapq.heapify(bearish)
+
+    def _add_swing_points(self, i: int):
+        """Check whether candle i is a swing high/low (margin candles after it have closed)"""
+        window = [self._candle(k) for k in range(i - self.left, i + self.right + 1)]
+        current = self._candle(i)
+        if max(c['high'] for c in window) <= current['high']:
+            self.swing_points.append({'type': 'high', 'level': current['high'],
+                                      'timestamp': current['timestamp']})
+        if min(c['low'] for c in window) >= current['low']:
+            self.swing_points.append({'type': 'low', 'level': current['low'],
+                                      'timestamp': current['timestamp']})
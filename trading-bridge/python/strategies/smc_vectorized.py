@@ -0,0 +1,283 @@
+"""
+Vectorized SMC Detectors
+NumPy implementations of the SMCStrategy detectors over a CandleArray
+
+Each function returns exactly what the corresponding pure-Python detector in
+smc_strategy.py returns for the same candles (same entries, same order, same
+floating-point values): the candle conditions are evaluated on whole columns
+at once and every strength score is accumulated in the same order as the
+scalar code, so results are bit-for-bit identical.
+"""
+
+from typing import Dict, List
+
+import numpy as np
+
+from .candles import CandleArray
+
+
+def detect_order_blocks(candles: CandleArray, timeframe: str = "H1") -> List[Dict]:
+    """
+    Detect order blocks (see SMCStrategy.detect_order_blocks)
+
+    Args:
+        candles: Candle columns
+        timeframe: Timeframe for analysis
+
+    Returns:
+        List of order block zones
+    """
+    n = len(candles)
+    if n < 5:
+        return []
+
+    o, c = candles.open, candles.close
+    cur_open, cur_close = o[2:n - 2], c[2:n - 2]
+    next_open, next_close = o[3:n - 1], c[3:n - 1]
+
+    bullish = ((cur_close < cur_open) &
+               (next_close > next_open) &
+               (next_close - next_open > cur_open - cur_close * 2))
+    bearish = (~bullish &
+               (cur_close > cur_open) &
+               (next_close < next_open) &
+               (next_open - next_close > cur_close - cur_open * 2))
+
+    found = np.flatnonzero(bullish | bearish)
+    index = found + 2
+    is_bullish = bullish[found]
+    strength = order_block_strength(candles, index, is_bullish)
+
+    return [
+        {
+            'type': 'bullish' if bull else 'bearish',
+            'timeframe': timeframe,
+            'high': high,
+            'low': low,
+            'timestamp': timestamp,
+            'strength': score
+        }
+        for bull, high, low, timestamp, score in zip(
+            is_bullish.tolist(),
+            candles.high[index].tolist(),
+            candles.low[index].tolist(),
+            candles.timestamp[index].tolist(),
+            strength.tolist()
+        )
+    ]
+
+
+def order_block_strength(candles: CandleArray, index: np.ndarray, is_bullish: np.ndarray) -> np.ndarray:
+    """
+    Order block strength (0-1) for every order block at once
+
+    Args:
+        candles: Candle columns
+        index: Positions of the order block candles (1 <= index < len - 1)
+        is_bullish: True for bullish order blocks
+
+    Returns:
+        Strength per order block
+    """
+    n = len(candles)
+    high, low, volume = candles.high, candles.low, candles.volume
+    strength = np.zeros(len(index))
+
+    # 1. Impulse move strength (50% weight)
+    ob_size = np.abs(high[index] - low[index])
+    impulse_size = np.abs(high[index + 1] - low[index + 1])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        impulse_ratio = np.minimum(impulse_size / ob_size, 3.0) / 3.0
+    strength = np.where(ob_size > 0, strength + impulse_ratio * 0.5, strength)
+
+    # 2. Volume strength (30% weight): mean of the 5 previous volumes, summed
+    # left to right like sum() so the result is identical
+    has_volume = candles.has_volume[index] & candles.has_volume[index + 1]
+    padded = np.concatenate((np.zeros(5), volume))
+    volume_sum = padded[index]
+    for offset in range(1, 5):
+        volume_sum = volume_sum + padded[index + offset]
+    avg_volume = volume_sum / 5
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_ratio = np.minimum(volume[index] / avg_volume, 2.0) / 2.0
+    strength = np.where(has_volume & (avg_volume > 0), strength + volume_ratio * 0.3, strength)
+    strength = np.where(has_volume, strength, strength + 0.15)
+
+    # 3. Holding power (20% weight): leading run of the next 9 candles that respect the OB
+    ahead = index[:, None] + np.arange(1, 10)
+    in_range = ahead < n
+    ahead = np.minimum(ahead, n - 1)
+    respects = np.where(
+        is_bullish[:, None],
+        low[ahead] >= low[index][:, None],
+        high[ahead] <= high[index][:, None]
+    ) & in_range
+    held_count = np.where(respects.all(axis=1), respects.shape[1], respects.argmin(axis=1))
+    strength = strength + np.minimum(held_count / 5.0, 1.0) * 0.2
+
+    return np.minimum(strength, 1.0)
+
+
+def detect_fair_value_gaps(candles: CandleArray) -> List[Dict]:
+    """
+    Detect fair value gaps (see SMCStrategy.detect_fair_value_gaps)
+
+    Args:
+        candles: Candle columns
+
+    Returns:
+        List of fair value gaps
+    """
+    n = len(candles)
+    if n < 3:
+        return []
+
+    prev_high, prev_low = candles.high[:n - 2], candles.low[:n - 2]
+    next_high, next_low = candles.high[2:], candles.low[2:]
+    bullish = prev_high < next_low
+    bearish = ~bullish & (prev_low > next_high)
+
+    found = np.flatnonzero(bullish | bearish)
+    is_bullish = bullish[found]
+    gap_high = np.where(is_bullish, next_low[found], prev_low[found])
+    gap_low = np.where(is_bullish, prev_high[found], next_high[found])
+
+    # Lowest low / highest high from each candle to the end, for the filled flag
+    later_low = np.append(np.minimum.accumulate(candles.low[::-1])[::-1], np.inf)
+    later_high = np.append(np.maximum.accumulate(candles.high[::-1])[::-1], -np.inf)
+    filled = np.where(is_bullish,
+                      later_low[found + 3] <= gap_low,
+                      later_high[found + 3] >= gap_high)
+
+    return [
+        {
+            'type': 'bullish' if bull else 'bearish',
+            'high': high,
+            'low': low,
+            'gap_size': high - low,
+            'timestamp': timestamp,
+            'filled': is_filled
+        }
+        for bull, high, low, timestamp, is_filled in zip(
+            is_bullish.tolist(),
+            gap_high.tolist(),
+            gap_low.tolist(),
+            candles.timestamp[found + 1].tolist(),
+            filled.tolist()
+        )
+    ]
+
+
+def rolling_extreme(values: np.ndarray, width: int, highest: bool = True) -> np.ndarray:
+    """
+    Maximum (or minimum) of every window values[j : j+width]
+
+    van Herk/Gil-Werman: the series is cut into blocks of `width`, and each
+    window is the combination of one block suffix and the next block's
+    prefix, so the cost is O(n) whatever the width.
+
+    Args:
+        values: Input series
+        width: Window length
+        highest: True for the maximum, False for the minimum
+
+    Returns:
+        Array of len(values) - width + 1 extremes (window j starts at j)
+    """
+    n = len(values)
+    if width > n:
+        return np.empty(0)
+    ufunc = np.maximum if highest else np.minimum
+    fill = -np.inf if highest else np.inf
+    blocks = np.concatenate((values, np.full(-n % width, fill))).reshape(-1, width)
+    prefix = ufunc.accumulate(blocks, axis=1).ravel()
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+    return ufunc(suffix[:n - width + 1], prefix[width - 1:n])
+
+
+def detect_liquidity_zones(candles: CandleArray, left: int = 5, right: int = 4,
+                           reach: int = 20) -> List[Dict]:
+    """
+    Detect liquidity zones (see SMCStrategy.detect_liquidity_zones)
+
+    Args:
+        candles: Candle columns
+        left: Candles before a swing that it must dominate
+        right: Candles after a swing that it must dominate
+        reach: Candles either side checked for touches of the level
+
+    Returns:
+        List of liquidity zones
+    """
+    n = len(candles)
+    margin = max(10, left, right)
+    if n < 20 or n <= 2 * margin:
+        return []
+
+    high, low = candles.high, candles.low
+    index = np.arange(margin, n - margin)
+
+    # Swing high: no candle in [i-left, i+right] is higher, i.e. the window
+    # maximum (which includes i) equals the candle's high
+    width = left + 1 + right
+    swing_high = index[rolling_extreme(high, width, True)[index - left] <= high[index]]
+    swing_low = index[rolling_extreme(low, width, False)[index - left] >= low[index]]
+
+    high_strength = liquidity_strength(candles, swing_high, 'high', reach)
+    low_strength = liquidity_strength(candles, swing_low, 'low', reach)
+
+    # Interleave: per candle the swing high comes before the swing low
+    position = np.concatenate((swing_high * 2, swing_low * 2 + 1))
+    order = np.argsort(position, kind='stable')
+    zone_index = np.concatenate((swing_high, swing_low))[order].tolist()
+    is_high = (position[order] % 2 == 0).tolist()
+    levels = np.concatenate((high[swing_high], low[swing_low]))[order].tolist()
+    strengths = np.concatenate((high_strength, low_strength))[order].tolist()
+    timestamps = candles.timestamp
+
+    return [
+        {
+            'type': 'high' if zone_high else 'low',
+            'level': level,
+            'timestamp': timestamps[i],
+            'strength': score
+        }
+        for zone_high, level, i, score in zip(is_high, levels, zone_index, strengths)
+    ]
+
+
+def liquidity_strength(candles: CandleArray, index: np.ndarray, level_type: str,
+                       reach: int = 20) -> np.ndarray:
+    """
+    Liquidity zone strength (0-1) for several swings at once
+
+    Args:
+        candles: Candle columns
+        index: Positions of the swing candles (10 <= index < len - 10)
+        level_type: 'high' or 'low'
+        reach: Candles either side checked for touches
+
+    Returns:
+        Strength per swing
+    """
+    n = len(candles)
+    source = candles.high if level_type == 'high' else candles.low
+    levels = source[index]
+
+    # 1. Number of times the level was tested within +/- reach candles (40% weight)
+    padded = np.concatenate((np.full(reach, np.nan), source, np.full(reach, np.nan)))
+    offsets = np.concatenate((np.arange(-reach, 0), np.arange(1, reach))) + reach
+    nearby = padded[index[:, None] + offsets]
+    with np.errstate(invalid='ignore'):
+        touches = (np.abs(nearby - levels[:, None]) / levels[:, None] < 0.001).sum(axis=1)
+    strength = np.minimum(touches / 5.0, 1.0) * 0.4
+
+    # 2. Time since formation (30% weight)
+    strength = strength + np.minimum(index / 50.0, 1.0) * 0.3
+
+    # 3. Distance from current price (30% weight)
+    current_price = candles.close[n - 1]
+    distance = np.abs(levels - current_price) / current_price
+    strength = strength + np.maximum(1.0 - (distance * 10), 0.0) * 0.3
+
+    return np.minimum(strength, 1.0)
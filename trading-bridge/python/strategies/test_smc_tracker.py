@@ -0,0 +1,218 @@
+"""
+SMC Structure Tracker Test Script
+Checks the incremental tracker against the batch SMCStrategy detectors
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from strategies.smc_strategy import SMCStrategy
+from strategies.smc_tracker import SMCStructureTracker
+from strategies.test_smc_vectorized import make_candles
+
+
+CHECKPOINTS = (1, 3, 5, 6, 20, 21, 22, 37, 50, 100, 777, 2000)
+
+
+def _check_against_batch(strategy: SMCStrategy, tracker: SMCStructureTracker, candles: list):
+    """Tracker state equals the batch detectors run on the same candles"""
+    label = f"{len(candles)} candles"
+    order_blocks = strategy.detect_order_blocks(candles, "H1")
+    breakers = strategy.detect_breaker_blocks(candles, order_blocks)
+    broken = {b['original_timestamp'] for b in breakers}
+    assert tracker.open_order_blocks() == [ob for ob in order_blocks if ob['timestamp'] not in broken], label
+    assert tracker.last_order_block == (order_blocks[-1] if order_blocks else None), label
+
+    def by_origin(b):
+        return b['original_timestamp']
+    assert sorted(tracker.breaker_blocks, key=by_origin) == sorted(breakers, key=by_origin), label
+
+    fvgs = strategy.detect_fair_value_gaps(candles)
+    assert tracker.open_fair_value_gaps() == [g for g in fvgs if not g['filled']], label
+    assert (sorted(tracker.filled_fvgs, key=lambda g: g['timestamp']) ==
+            [g for g in fvgs if g['filled']]), label
+
+    zones = strategy.detect_liquidity_zones(candles)
+    assert ([(s['type'], s['level'], s['timestamp']) for s in tracker.swing_points] ==
+            [(z['type'], z['level'], z['timestamp']) for z in zones]), label
+
+    assert tracker.trend_breakout() == strategy.detect_trend_breakout(candles), label
+
+
+def test_matches_batch_detectors():
+    """Candle-by-candle state equals a full batch run at every checkpoint"""
+    print("\n=== Testing tracker vs batch detectors ===")
+
+    for seed, coarse in ((1, False), (2, True), (3, False)):
+        strategy = SMCStrategy()
+        tracker = SMCStructureTracker(strategy, "H1", max_open=10_000, max_history=10_000)
+        candles = make_candles(2000, seed, coarse=coarse)
+        for n, candle in enumerate(candles, 1):
+            tracker.update(candle)
+            if n in CHECKPOINTS:
+                _check_against_batch(strategy, tracker, candles[:n])
+    print("✓ Order blocks, breakers, FVGs, swings and breakout match")
+
+
+def test_swing_config():
+    """Swing points follow the configured window"""
+    print("\n=== Testing swing window config ===")
+
+    for window, symmetric in ((3, True), (12, False), (15, True)):
+        strategy = SMCStrategy()
+        strategy.config['smc'].update(swing_window=window, swing_symmetric=symmetric)
+        tracker = SMCStructureTracker(strategy, max_history=10_000)
+        candles = make_candles(1500, 8, coarse=True)
+        tracker.sync(candles)
+        zones = strategy.detect_liquidity_zones(candles)
+        assert ([(s['type'], s['level'], s['timestamp']) for s in tracker.swing_points] ==
+                [(z['type'], z['level'], z['timestamp']) for z in zones])
+    print("✓ Swing points match for every window")
+
+
+def test_fvgs_get_filled():
+    """Gaps are marked filled when price trades back through them"""
+    print("\n=== Testing FVG fill ===")
+
+    strategy = SMCStrategy()
+    base = make_candles(4, 1)
+    prices = [(1.0, 1.1, 0.9), (1.2, 1.3, 1.15), (1.4, 1.5, 1.35), (1.2, 1.3, 1.12), (1.0, 1.2, 1.05)]
+    candles = [dict(base[0], timestamp=i, open=o, close=o, high=h, low=l) for i, (o, h, l) in enumerate(prices)]
+    tracker = SMCStructureTracker(strategy)
+    tracker.sync(candles[:3])
+    assert [g['low'] for g in tracker.open_fair_value_gaps()] == [1.1]
+    tracker.update(candles[3])  # low 1.12 is inside the gap, not through it
+    assert tracker.open_fair_value_gaps() and not tracker.filled_fvgs
+    tracker.update(candles[4])  # low 1.05 trades through the gap's low of 1.1
+    assert not any(g['low'] == 1.1 for g in tracker.open_fair_value_gaps())
+    assert [g['filled'] for g in tracker.filled_fvgs] == [True]
+    assert [g['filled'] for g in strategy.detect_fair_value_gaps(candles)][0] is True
+    print("✓ Filled gaps are flagged and leave the open set")
+
+
+def test_sync_and_limits():
+    """sync() only processes new candles, rebuilds on new history, and caps open state"""
+    print("\n=== Testing sync and limits ===")
+
+    strategy = SMCStrategy()
+    candles = make_candles(1200, 4)
+    tracker = SMCStructureTracker(strategy, max_open=10_000, max_history=10_000)
+    processed = sum(tracker.sync(candles[:end]) for end in range(30, 1201, 13))
+    processed += tracker.sync(candles)
+    assert processed == 1200 and tracker.count == 1200
+    assert tracker.sync(candles) == 0
+    _check_against_batch(strategy, tracker, candles)
+
+    other = make_candles(300, 5)
+    assert tracker.sync(other) == 300
+    _check_against_batch(strategy, tracker, other)
+
+    capped = SMCStructureTracker(strategy, max_open=3, max_history=5)
+    reference = SMCStructureTracker(strategy, max_open=10_000, max_history=10_000)
+    for candle in candles:
+        capped.update(candle)
+        reference.update(candle)
+        assert len(capped.open_order_blocks()) <= 3 and len(capped.open_fair_value_gaps()) <= 3
+        assert all(ob in reference.open_order_blocks() for ob in capped.open_order_blocks())
+        assert all(g in reference.open_fair_value_gaps() for g in capped.open_fair_value_gaps())
+    assert len(capped.breaker_blocks) == 5 and len(capped.swing_points) == 5
+    print("✓ Incremental sync, rebuild and caps work")
+
+
+def test_forming_bar_reapplied():
+    """A repeated last timestamp undoes the forming bar and applies its current values"""
+    print("\n=== Testing forming bar ===")
+
+    strategy = SMCStrategy()
+    candles = make_candles(400, 10, coarse=True)
+    noise = make_candles(400, 11, coarse=True)
+    tracker = SMCStructureTracker(strategy, max_open=10_000, max_history=10_000)
+    for end in range(1, len(candles) + 1):
+        timestamp = candles[end - 1]['timestamp']
+        for partial in (noise[end - 1], noise[-end]):
+            tracker.sync(candles[:end - 1] + [dict(partial, timestamp=timestamp)])
+        assert tracker.sync(candles[:end]) == 0 and tracker.count == end
+        if end in CHECKPOINTS or end % 50 == 0:
+            _check_against_batch(strategy, tracker, candles[:end])
+    print("✓ Forming bar re-applied, state matches the closed candles")
+
+
+def test_entry_signal_incremental():
+    """calculate_entry_signal gives the same answer with kept state as from scratch"""
+    print("\n=== Testing calculate_entry_signal ===")
+
+    strategy = SMCStrategy()
+    h1 = make_candles(600, 6)
+    m5 = make_candles(900, 7)
+    signals = 0
+    for end in range(60, 601, 9):
+        live = strategy.calculate_entry_signal("EURUSD", h1[:end], m5, m5[:end])
+        fresh = SMCStrategy().calculate_entry_signal("EURUSD", h1[:end], m5, m5[:end])
+        assert (live is None) == (fresh is None)
+        if live:
+            live.pop('timestamp')
+            fresh.pop('timestamp')
+            assert live == fresh
+            signals += 1
+    assert strategy.structure_tracker("EURUSD").count == 600
+    print(f"✓ Same signals with kept state ({signals} signals)")
+
+
+def test_state_per_series():
+    """The same symbol from two brokers keeps separate structure and indicators"""
+    print("\n=== Testing per-series state ===")
+
+    strategy = SMCStrategy()
+    feeds = {"EXNESS": (make_candles(600, 6), make_candles(900, 7)),
+             "BITGET": (make_candles(600, 8), make_candles(900, 9))}
+    for end in range(60, 601, 27):
+        for broker, (h1, m5) in feeds.items():
+            live = strategy.calculate_entry_signal("EURUSD", h1[:end], m5, m5[:end], series=broker)
+            fresh = SMCStrategy().calculate_entry_signal("EURUSD", h1[:end], m5, m5[:end])
+            assert (live is None) == (fresh is None)
+            if live:
+                live.pop('timestamp')
+                fresh.pop('timestamp')
+                assert live == fresh
+    exness = strategy.structure_tracker("EURUSD", "H1", "EXNESS")
+    assert exness is not strategy.structure_tracker("EURUSD", "H1", "BITGET")
+    assert exness.count == 600 and strategy.structure_tracker("EURUSD").count == 0
+
+    strategy.reset_state("EURUSD", "EXNESS")
+    assert strategy.structure_tracker("EURUSD", "H1", "EXNESS").count == 0
+    assert strategy.structure_tracker("EURUSD", "H1", "BITGET").count == 600
+    assert all(key[1] != "EXNESS" for key in strategy._indicator_feeds)
+    print("✓ Trackers and indicator feeds kept per symbol, series and timeframe")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("SMC Structure Tracker Test Suite")
+    print("=" * 50)
+
+    try:
+        test_matches_batch_detectors()
+        test_swing_config()
+        test_fvgs_get_filled()
+        test_sync_and_limits()
+        test_forming_bar_reapplied()
+        test_entry_signal_incremental()
+        test_state_per_series()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
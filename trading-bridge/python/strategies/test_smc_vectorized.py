@@ -0,0 +1,220 @@
+"""
+SMC Vectorized Detector Test Script
+Checks that the NumPy detectors return exactly what the pure-Python loops return
+"""
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from strategies import smc_vectorized
+from strategies.candles import CandleArray
+from strategies.smc_strategy import SMCStrategy, sliding_extremes
+
+
+SIZES = (0, 1, 2, 3, 4, 5, 6, 19, 20, 21, 22, 25, 50, 500, 5000)
+
+
+def make_candles(count: int, seed: int = 1, volume: str = "all", tick: float = 0.0001,
+                 coarse: bool = False) -> list:
+    """
+    Random-walk OHLCV candles
+
+    Args:
+        count: Number of candles
+        seed: Random seed
+        volume: 'all', 'none' or 'some' candles carry a volume key
+        tick: Price step
+        coarse: Round prices to a few ticks so equal highs/lows are common
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    price = 1.1000
+    candles = []
+    for i in range(count):
+        open_price = price
+        close_price = price + rng.gauss(0, 20) * tick
+        high = max(open_price, close_price) + abs(rng.gauss(0, 10)) * tick
+        low = min(open_price, close_price) - abs(rng.gauss(0, 10)) * tick
+        if coarse:
+            open_price, close_price, high, low = (round(p / (tick * 25)) * tick * 25
+                                                  for p in (open_price, close_price, high, low))
+        candle = {
+            'timestamp': start + timedelta(minutes=5 * i),
+            'open': open_price,
+            'high': high,
+            'low': low,
+            'close': close_price
+        }
+        if volume == "all" or (volume == "some" and rng.random() < 0.7):
+            candle['volume'] = rng.randint(0, 500)
+        candles.append(candle)
+        price = close_price
+    return candles
+
+
+def _check_parity(label: str, candles: list):
+    """Compare every vectorized detector with its loop counterpart"""
+    strategy = SMCStrategy()
+    columns = CandleArray.from_dicts(candles)
+
+    expected = strategy._detect_order_blocks_loop(candles, "M5")
+    assert smc_vectorized.detect_order_blocks(columns, "M5") == expected, f"order blocks differ ({label})"
+
+    expected = strategy._detect_fair_value_gaps_loop(candles)
+    assert smc_vectorized.detect_fair_value_gaps(columns) == expected, f"FVGs differ ({label})"
+
+    expected = strategy._detect_liquidity_zones_loop(candles)
+    assert smc_vectorized.detect_liquidity_zones(columns) == expected, f"liquidity zones differ ({label})"
+
+
+def test_parity_random_walk():
+    """Identical results on random walks of many lengths"""
+    print("\n=== Testing parity on random walks ===")
+
+    for size in SIZES:
+        for seed in (1, 2, 3):
+            _check_parity(f"size={size} seed={seed}", make_candles(size, seed))
+    print(f"✓ {len(SIZES) * 3} random walks match")
+
+
+def test_parity_ties_and_volume():
+    """Identical results with equal highs/lows and missing volume"""
+    print("\n=== Testing parity with ties and missing volume ===")
+
+    for volume in ("all", "none", "some"):
+        for seed in (4, 5):
+            _check_parity(f"coarse volume={volume}", make_candles(2000, seed, volume, coarse=True))
+            _check_parity(f"volume={volume}", make_candles(2000, seed, volume))
+    print("✓ Ties and missing volume match")
+
+
+def _naive_liquidity_zones(strategy: SMCStrategy, candles: list, left: int, right: int) -> list:
+    """The original nested-loop swing scan, generalised to any window"""
+    zones = []
+    margin = max(10, left, right)
+    if len(candles) < 20:
+        return zones
+    for i in range(margin, len(candles) - margin):
+        current = candles[i]
+        if all(candles[j]['high'] <= current['high'] for j in range(i - left, i + right + 1) if j != i):
+            zones.append({'type': 'high', 'level': current['high'], 'timestamp': current['timestamp'],
+                          'strength': strategy._calculate_liquidity_strength(candles, i, 'high')})
+        if all(candles[j]['low'] >= current['low'] for j in range(i - left, i + right + 1) if j != i):
+            zones.append({'type': 'low', 'level': current['low'], 'timestamp': current['timestamp'],
+                          'strength': strategy._calculate_liquidity_strength(candles, i, 'low')})
+    return zones
+
+
+def test_sliding_extremes():
+    """Monotonic-deque and block-based window extremes match brute force"""
+    print("\n=== Testing sliding window extremes ===")
+
+    rng = random.Random(11)
+    for size in (1, 2, 7, 50, 301):
+        values = [float(rng.randint(0, 20)) for _ in range(size)]
+        for left, right in ((0, 0), (1, 0), (5, 4), (5, 5), (3, 9), (40, 40)):
+            for highest, func in ((True, max), (False, min)):
+                expected = [func(values[i - left:i + right + 1])
+                            if i - left >= 0 and i + right < size else None
+                            for i in range(size)]
+                assert sliding_extremes(values, left, right, highest) == expected
+                rolled = smc_vectorized.rolling_extreme(np.array(values), left + right + 1, highest)
+                assert rolled.tolist() == [v for v in expected if v is not None]
+    print("✓ Window extremes match brute force")
+
+
+def test_liquidity_zone_windows():
+    """Linear-time swing detection matches the nested loops for any window"""
+    print("\n=== Testing liquidity zone windows ===")
+
+    strategy = SMCStrategy()
+    for coarse in (False, True):
+        candles = make_candles(1500, 9, coarse=coarse)
+        columns = CandleArray.from_dicts(candles)
+        assert strategy.detect_liquidity_zones(candles) == _naive_liquidity_zones(strategy, candles, 5, 4)
+        for window in (1, 2, 3, 5, 8, 15, 30):
+            for symmetric in (False, True):
+                right = window if symmetric else window - 1
+                expected = _naive_liquidity_zones(strategy, candles, window, right)
+                assert strategy._detect_liquidity_zones_loop(candles, window, right) == expected
+                assert strategy.detect_liquidity_zones(columns, window, symmetric) == expected, \
+                    f"window={window} symmetric={symmetric}"
+    print("✓ Every window and both modes match")
+
+
+def test_breaker_block_sweep():
+    """Bisect + single sweep matches the per-order-block scan"""
+    print("\n=== Testing breaker block sweep ===")
+
+    strategy = SMCStrategy()
+    for seed, coarse in ((1, False), (2, True)):
+        candles = make_candles(3000, seed, coarse=coarse)
+        order_blocks = strategy.detect_order_blocks(candles, "M5")
+        # Same-timestamp candles and hand-made blocks with unknown types
+        candles[100]['timestamp'] = candles[101]['timestamp']
+        order_blocks += [dict(order_blocks[0], type='neutral'), dict(order_blocks[-1])]
+        expected = strategy._detect_breaker_blocks_scan(candles, order_blocks)
+        assert expected
+        assert strategy.detect_breaker_blocks(candles, order_blocks) == expected
+        assert strategy.detect_breaker_blocks(CandleArray.from_dicts(candles), order_blocks) == expected
+
+    # Unsorted candles fall back to the scan
+    shuffled = candles[:500]
+    random.Random(3).shuffle(shuffled)
+    assert (strategy.detect_breaker_blocks(shuffled, order_blocks) ==
+            strategy._detect_breaker_blocks_scan(shuffled, order_blocks))
+    assert strategy.detect_breaker_blocks(candles, []) == []
+    assert strategy.detect_breaker_blocks([], order_blocks) == []
+    print("✓ Breaker blocks match the scan")
+
+
+def test_strategy_uses_vectorized_path():
+    """SMCStrategy accepts lists and CandleArrays alike"""
+    print("\n=== Testing SMCStrategy dispatch ===")
+
+    strategy = SMCStrategy()
+    candles = make_candles(1000, 7)
+    columns = CandleArray.from_dicts(candles)
+    assert strategy.detect_order_blocks(candles) == strategy.detect_order_blocks(columns)
+    assert strategy.detect_order_blocks(candles) == strategy._detect_order_blocks_loop(candles, "H1")
+    assert strategy.detect_liquidity_zones(columns) == strategy._detect_liquidity_zones_loop(candles)
+    assert columns[-1]['close'] == candles[-1]['close']
+    assert columns[10:20].to_dicts() == candles[10:20]
+    assert strategy.detect_trend_breakout(columns) == strategy.detect_trend_breakout(candles)
+    print("✓ Lists and CandleArrays give the same results")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("SMC Vectorized Detector Test Suite")
+    print("=" * 50)
+
+    try:
+        test_parity_random_walk()
+        test_parity_ties_and_volume()
+        test_sliding_extremes()
+        test_liquidity_zone_windows()
+        test_breaker_block_sweep()
+        test_strategy_uses_vectorized_path()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,6 @@ Manages trading across multiple symbols and brokers
 import json
 from typing import Dict, List, Set, Optional
 from pathlib import Path
-from datetime import datetime
 
 # NOTE:
 # This project is commonly executed by adding `trading-bridge/python` to `sys.path`
@@ -15,24 +14,29 @@ from datetime import datetime
 from bridge.signal_manager import TradeSignal
 from brokers.base_broker import BaseBroker, OrderResult
 from brokers.broker_factory import BrokerFactory
+from trader.position_book import PositionBook
+from trader.position_monitor import PositionMonitor, PositionSnapshot
 
 
 class MultiSymbolTrader:
     """Manages trading across multiple symbols and brokers"""
     
-    def __init__(self, bridge=None, broker_manager=None):
+    def __init__(self, bridge=None, broker_manager=None, monitor_timeout: float = 5.0,
+                 monitor_timeouts: Optional[Dict[str, float]] = None):
         """
         Initialize MultiSymbolTrader
         
         Args:
             bridge: MQL5Bridge instance (optional)
             broker_manager: Dictionary of broker_name -> broker_instance (optional)
+            monitor_timeout: Seconds monitor_positions waits for each broker
+            monitor_timeouts: Broker name -> timeout overrides (optional)
         """
         self.bridge = bridge
         self.brokers: Dict[str, BaseBroker] = broker_manager or {}
         self.symbols: Set[str] = set()
         self.symbol_configs: Dict[str, Dict] = {}
-        self.active_positions: Dict[str, Dict] = {}
+        self.active_positions = PositionBook()
         
         # Load symbol configurations
         self._load_symbol_configs()
@@ -40,6 +44,9 @@ class MultiSymbolTrader:
         # Load brokers if not provided
         if not self.brokers:
             self.brokers = BrokerFactory.create_all_brokers()
+        
+        self.position_monitor = PositionMonitor(self.brokers, monitor_timeout, monitor_timeouts)
+        self.last_position_snapshot: Optional[PositionSnapshot] = None
     
     def _load_symbol_configs(self):
         """Load symbol configurations from file"""
@@ -204,55 +211,63 @@ class MultiSymbolTrader:
     
     def _count_positions(self, symbol_key: str) -> int:
         """Count current positions for symbol"""
-        count = 0
-        for pos_key, pos_data in self.active_positions.items():
-            if pos_key.startswith(symbol_key):
-                count += 1
-        return count
+        return self.active_positions.count(symbol_key)
     
     def _add_position(self, symbol_key: str, order_id: str, action: str, lot_size: float):
         """Add position to tracking"""
-        position_key = f"{symbol_key}_{order_id}"
-        self.active_positions[position_key] = {
-            'symbol_key': symbol_key,
-            'order_id': order_id,
-            'action': action,
-            'lot_size': lot_size,
-            'timestamp': datetime.now().isoformat()
-        }
+        self.active_positions.add(symbol_key, order_id, action, lot_size)
     
-    def monitor_positions(self) -> Dict[str, List]:
+    def get_net_exposure(self, symbol: str, broker: Optional[str] = None) -> float:
+        """
+        Get net tracked lots of a symbol
+        
+        Args:
+            symbol: Trading symbol
+            broker: Broker name (default: all brokers)
+            
+        Returns:
+            Net lots (BUY positive, SELL negative)
+        """
+        return self.active_positions.net_exposure(symbol, broker)
+    
+    def monitor_positions(self, timeout: Optional[float] = None) -> Dict[str, List]:
         """
         Monitor all positions across brokers
         
+        Brokers are queried concurrently; see poll_positions().
+        
+        Args:
+            timeout: Seconds to wait for each broker (default: monitor_timeout)
+            
         Returns:
-            Dictionary of broker_name -> list of positions
+            Dictionary of broker_name -> list of positions (the last known
+            ones for brokers that timed out or failed)
         """
-        all_positions = {}
+        return self.poll_positions(timeout).positions()
+    
+    def poll_positions(self, timeout: Optional[float] = None) -> PositionSnapshot:
+        """
+        Poll all brokers in parallel and reconcile active positions tracking
         
-        for broker_name, broker in self.brokers.items():
-            try:
-                positions = broker.get_positions()
-                all_positions[broker_name] = positions
-                
-                # Update active positions tracking
-                for pos in positions:
-                    symbol_key = f"{pos.symbol}@{broker_name}"
-                    if pos.position_id:
-                        position_key = f"{symbol_key}_{pos.position_id}"
-                        self.active_positions[position_key] = {
-                            'symbol_key': symbol_key,
-                            'position_id': pos.position_id,
-                            'volume': pos.volume,
-                            'type': pos.type,
-                            'profit': pos.profit,
-                            'timestamp': datetime.now().isoformat()
-                        }
-            except Exception as e:
-                print(f"[ERROR] {broker_name}: {e}")
-                all_positions[broker_name] = []
+        Args:
+            timeout: Seconds to wait for each broker (default: monitor_timeout)
+            
+        Returns:
+            PositionSnapshot: per-broker positions with staleness markers, and
+            the positions opened, closed or modified since the last poll
+        """
+        snapshot = self.position_monitor.poll(timeout)
+        
+        for broker_name, entry in snapshot.brokers.items():
+            if entry.stale:
+                print(f"[ERROR] {broker_name}: {entry.error}")
+                continue
+            
+            # Reconcile active positions tracking with the broker's list
+            self.active_positions.reconcile(broker_name, entry.positions, entry.fetched_at)
         
-        return all_positions
+        self.last_position_snapshot = snapshot
+        return snapshot
     
     def get_symbol_config(self, symbol: str, broker: str) -> Optional[Dict]:
         """
@@ -288,4 +303,7 @@ class MultiSymbolTrader:
         symbol_key = f"{symbol}@{broker}"
         if symbol_key in self.symbol_configs:
             self.symbol_configs[symbol_key]['enabled'] = False
-
+    
+    def close(self):
+        """Stop the position monitoring threads"""
+        self.position_monitor.close()
@@ -0,0 +1,240 @@
+"""
+Position Book
+Open positions indexed by symbol key, broker and order id, with running counts and net exposure
+"""
+import threading
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from brokers.base_broker import Position
+from trader.position_monitor import position_key
+
+
+def signed_volume(side: str, volume: float) -> float:
+    """Volume as exposure: positive for BUY, negative for SELL"""
+    return -volume if side.upper() == 'SELL' else volume
+
+
+class PositionBook(Mapping):
+    """
+    Tracked positions of a MultiSymbolTrader
+
+    A read-only mapping of position key ('<symbol>@<broker>_<id>') to the
+    position entry, with indexes kept up to date on every change so that
+    pre-trade checks (positions per symbol@broker, net exposure) cost the
+    same with five hundred open positions as with one. Entries come from
+    orders the trader placed (add) and from broker position polls
+    (reconcile, which makes the broker's list authoritative).
+    """
+
+    def __init__(self):
+        """Initialize an empty PositionBook"""
+        self._entries: Dict[str, Dict] = {}
+        self._added: Dict[str, float] = {}  # position key -> time.time() it was placed by add()
+        self._by_symbol: Dict[str, Set[str]] = {}  # symbol@broker -> position keys
+        self._by_broker: Dict[str, Set[str]] = {}
+        self._by_order: Dict[Tuple[str, str], str] = {}  # (broker, order id) -> position key
+        self._net: Dict[str, float] = {}  # symbol@broker -> signed lots
+        self._net_symbol: Dict[str, float] = {}  # symbol -> signed lots across brokers
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key: str) -> Dict:
+        return self._entries[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, symbol_key: str, order_id: str, action: str, lot_size: float) -> str:
+        """
+        Track an order the trader placed
+
+        Args:
+            symbol_key: '<symbol>@<broker>'
+            order_id: Broker order id
+            action: BUY or SELL
+            lot_size: Position size in lots
+
+        Returns:
+            Position key
+        """
+        symbol, broker = symbol_key.split('@', 1)
+        key = f"{symbol_key}_{order_id}"
+        with self._lock:
+            self._put(key, {
+                'symbol_key': symbol_key,
+                'symbol': symbol,
+                'broker': broker,
+                'order_id': order_id,
+                'position_id': None,
+                'type': action,
+                'volume': lot_size,
+                'profit': 0.0,
+                'timestamp': datetime.now().isoformat()
+            })
+            self._added[key] = time.time()
+        return key
+
+    def update(self, broker: str, position: Position) -> str:
+        """
+        Track or refresh a position reported by a broker
+
+        Args:
+            broker: Broker name
+            position: Position from get_positions()
+
+        Returns:
+            Position key
+        """
+        key = position_key(broker, position)
+        with self._lock:
+            previous = self._entries.get(key)
+            self._put(key, {
+                'symbol_key': f"{position.symbol}@{broker}",
+                'symbol': position.symbol,
+                'broker': broker,
+                'order_id': previous['order_id'] if previous else position.position_id,
+                'position_id': position.position_id,
+                'type': position.type,
+                'volume': position.volume,
+                'profit': position.profit,
+                'timestamp': datetime.now().isoformat()
+            })
+            self._added.pop(key, None)
+        return key
+
+    def remove(self, key: str) -> Optional[Dict]:
+        """
+        Stop tracking a position
+
+        Args:
+            key: Position key
+
+        Returns:
+            The removed entry, or None if it was not tracked
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            self._added.pop(key, None)
+            self._unindex(key, entry)
+            return entry
+
+    def reconcile(self, broker: str, positions: List[Position],
+                  fetched_at: Optional[float] = None) -> Dict[str, List[str]]:
+        """
+        Make a broker's tracked positions match what the broker reports
+
+        Reported positions are added or refreshed and tracked positions the
+        broker no longer reports are removed, except orders placed after
+        `fetched_at`, which the broker's list may not include yet.
+
+        Args:
+            broker: Broker name
+            positions: The broker's complete fetch_positions() result (not
+                get_positions(), which returns [] when the request fails)
+            fetched_at: time.time() the positions were requested (default: now)
+
+        Returns:
+            {'added': [...], 'updated': [...], 'removed': [...]} position keys
+        """
+        if fetched_at is None:
+            fetched_at = time.time()
+        result = {'added': [], 'updated': [], 'removed': []}
+        with self._lock:
+            reported = set()
+            for position in positions:
+                known = position_key(broker, position) in self._entries
+                key = self.update(broker, position)
+                reported.add(key)
+                result['updated' if known else 'added'].append(key)
+            for key in list(self._by_broker.get(broker, ())):
+                if key not in reported and self._added.get(key, 0.0) <= fetched_at:
+                    self.remove(key)
+                    result['removed'].append(key)
+        return result
+
+    def count(self, symbol_key: str) -> int:
+        """Positions tracked for a '<symbol>@<broker>' key"""
+        return len(self._by_symbol.get(symbol_key, ()))
+
+    def count_broker(self, broker: str) -> int:
+        """Positions tracked on a broker"""
+        return len(self._by_broker.get(broker, ()))
+
+    def net_exposure(self, symbol: str, broker: Optional[str] = None) -> float:
+        """
+        Net lots of a symbol (BUY positive, SELL negative)
+
+        Args:
+            symbol: Trading symbol
+            broker: Broker name (default: summed across brokers)
+
+        Returns:
+            Signed lots
+        """
+        if broker is None:
+            return self._net_symbol.get(symbol, 0.0)
+        return self._net.get(f"{symbol}@{broker}", 0.0)
+
+    def find_order(self, broker: str, order_id: str) -> Optional[Dict]:
+        """Entry of a broker order or position id, or None"""
+        key = self._by_order.get((broker, order_id))
+        return self._entries.get(key) if key else None
+
+    def positions(self, symbol_key: Optional[str] = None, broker: Optional[str] = None) -> List[Dict]:
+        """
+        Tracked entries, optionally for one '<symbol>@<broker>' key or broker
+
+        Args:
+            symbol_key: '<symbol>@<broker>' filter
+            broker: Broker filter
+
+        Returns:
+            List of entries
+        """
+        with self._lock:
+            if symbol_key is not None:
+                keys = self._by_symbol.get(symbol_key, set())
+                if broker is not None:
+                    keys = keys & self._by_broker.get(broker, set())
+            elif broker is not None:
+                keys = self._by_broker.get(broker, set())
+            else:
+                keys = self._entries
+            return [self._entries[key] for key in keys]
+
+    def _put(self, key: str, entry: Dict):
+        """Store an entry and index it (lock held)"""
+        previous = self._entries.get(key)
+        if previous is not None:
+            self._unindex(key, previous)
+        self._entries[key] = entry
+        self._by_symbol.setdefault(entry['symbol_key'], set()).add(key)
+        self._by_broker.setdefault(entry['broker'], set()).add(key)
+        for order_id in {entry['order_id'], entry['position_id']} - {None}:
+            self._by_order[(entry['broker'], order_id)] = key
+        exposure = signed_volume(entry['type'], entry['volume'])
+        for net, name in ((self._net, entry['symbol_key']), (self._net_symbol, entry['symbol'])):
+            net[name] = round(net.get(name, 0.0) + exposure, 8)
+
+    def _unindex(self, key: str, entry: Dict):
+        """Drop an entry from the indexes (lock held)"""
+        for index, name in ((self._by_symbol, entry['symbol_key']), (self._by_broker, entry['broker'])):
+            keys = index[name]
+            keys.discard(key)
+            if not keys:
+                del index[name]
+        for order_id in {entry['order_id'], entry['position_id']} - {None}:
+            if self._by_order.get((entry['broker'], order_id)) == key:
+                del self._by_order[(entry['broker'], order_id)]
+        exposure = signed_volume(entry['type'], entry['volume'])
+        for net, name in ((self._net, entry['symbol_key']), (self._net_symbol, entry['symbol'])):
+            net[name] = round(net[name] - exposure, 8)
+            if not net[name]:
+                del net[name]
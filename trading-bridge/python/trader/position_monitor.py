@@ -0,0 +1,205 @@
+"""
+Position Monitor
+Polls every broker's open positions concurrently with per-broker timeouts and diffs them between polls
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from brokers.base_broker import BaseBroker, Position
+
+logger = logging.getLogger(__name__)
+
+
+def position_key(broker: str, position: Position) -> str:
+    """
+    Tracking key of a position: '<symbol>@<broker>_<position id>'
+
+    Positions without an id (netting accounts) are keyed by their side.
+    """
+    return f"{position.symbol}@{broker}_{position.position_id or position.type}"
+
+
+def position_changed(old: Position, new: Position) -> bool:
+    """True if a position was resized, reversed or re-opened (price and profit updates don't count)"""
+    return old.volume != new.volume or old.type != new.type or old.open_price != new.open_price
+
+
+@dataclass
+class BrokerPositions:
+    """Open positions of one broker as of its last successful poll"""
+    broker: str
+    positions: List[Position] = field(default_factory=list)
+    fetched_at: Optional[float] = None  # time.time() the last successful request was sent, None if never
+    stale: bool = False  # Not refreshed by this poll (timed out or failed)
+    error: Optional[str] = None
+
+    def age(self, now: Optional[float] = None) -> Optional[float]:
+        """Seconds since the positions were fetched (None if never)"""
+        if self.fetched_at is None:
+            return None
+        return (now or time.time()) - self.fetched_at
+
+
+@dataclass
+class PositionDiff:
+    """Changes since the previous poll, keyed by position_key()"""
+    opened: Dict[str, Position] = field(default_factory=dict)
+    closed: Dict[str, Position] = field(default_factory=dict)
+    modified: Dict[str, Tuple[Position, Position]] = field(default_factory=dict)  # (old, new)
+
+    def __bool__(self) -> bool:
+        return bool(self.opened or self.closed or self.modified)
+
+
+@dataclass
+class PositionSnapshot:
+    """Result of one poll across brokers"""
+    brokers: Dict[str, BrokerPositions]
+    diff: PositionDiff
+    polled_at: float
+    duration_ms: float
+
+    @property
+    def complete(self) -> bool:
+        """True if every broker answered in time"""
+        return not self.stale_brokers()
+
+    def stale_brokers(self) -> List[str]:
+        """Brokers whose positions were not refreshed by this poll"""
+        return [name for name, entry in self.brokers.items() if entry.stale]
+
+    def positions(self) -> Dict[str, List[Position]]:
+        """Broker name -> positions (the last known ones for stale brokers)"""
+        return {name: entry.positions for name, entry in self.brokers.items()}
+
+
+class PositionMonitor:
+    """
+    Concurrent position poller
+
+    Each poll asks every broker for its positions on a thread pool and
+    waits at most the broker's timeout, so a poll takes as long as the
+    slowest broker that answers in time rather than the sum of all of them.
+    A broker that times out or fails keeps its last known positions, marked
+    stale; a request still running from an earlier poll is waited on again
+    instead of sending another one. Only refreshed brokers contribute to the
+    diff, so a slow broker never shows up as all of its positions closing.
+    """
+
+    def __init__(self, brokers: Dict[str, BaseBroker], timeout: float = 5.0,
+                 timeouts: Optional[Dict[str, float]] = None, max_workers: int = 16):
+        """
+        Initialize PositionMonitor
+
+        Args:
+            brokers: Broker name -> broker (read on every poll, so brokers may be added later)
+            timeout: Default seconds to wait for a broker
+            timeouts: Broker name -> timeout overrides
+            max_workers: Most brokers queried at once
+        """
+        self.brokers = brokers
+        self.timeout = timeout
+        self.timeouts = dict(timeouts or {})
+        self.max_workers = max_workers
+        self._state: Dict[str, BrokerPositions] = {}
+        self._known: Dict[str, Dict[str, Position]] = {}  # broker -> {position key: position}
+        self._pending: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def poll(self, timeout: Optional[float] = None) -> PositionSnapshot:
+        """
+        Fetch positions from every broker concurrently
+
+        Args:
+            timeout: Seconds to wait for each broker (default: its configured timeout)
+
+        Returns:
+            PositionSnapshot with per-broker positions, staleness and the diff since the last poll
+        """
+        start = time.monotonic()
+        polled_at = time.time()
+        brokers = dict(self.brokers)
+        pool = self._pool()
+        with self._lock:
+            for name, broker in brokers.items():
+                if name not in self._pending:
+                    self._pending[name] = pool.submit(self._fetch, broker)
+
+        diff = PositionDiff()
+        snapshot: Dict[str, BrokerPositions] = {}
+        for name in sorted(brokers, key=lambda n: self._timeout(n, timeout)):
+            future = self._pending[name]
+            remaining = start + self._timeout(name, timeout) - time.monotonic()
+            wait([future], timeout=max(0.0, remaining))
+            previous = self._state.get(name) or BrokerPositions(name)
+            if not future.done():
+                error = f"timed out after {self._timeout(name, timeout):g}s"
+                logger.warning(f"{name} positions {error}, keeping the last known ones")
+                entry = BrokerPositions(name, previous.positions, previous.fetched_at, True, error)
+            else:
+                with self._lock:
+                    del self._pending[name]
+                try:
+                    positions, fetched_at = future.result()
+                    entry = BrokerPositions(name, positions, fetched_at)
+                    self._diff(name, positions, diff)
+                except Exception as e:
+                    logger.warning(f"{name} positions failed: {e}")
+                    entry = BrokerPositions(name, previous.positions, previous.fetched_at, True, str(e))
+            self._state[name] = snapshot[name] = entry
+
+        return PositionSnapshot(
+            brokers={name: snapshot[name] for name in brokers},
+            diff=diff,
+            polled_at=polled_at,
+            duration_ms=(time.monotonic() - start) * 1000
+        )
+
+    def _timeout(self, broker: str, timeout: Optional[float]) -> float:
+        """Seconds to wait for a broker"""
+        if timeout is not None:
+            return timeout
+        return self.timeouts.get(broker, self.timeout)
+
+    @staticmethod
+    def _fetch(broker: BaseBroker) -> Tuple[List[Position], float]:
+        """Get a broker's positions and the time they were requested"""
+        requested_at = time.time()
+        # fetch_positions raises on error responses, which get_positions turns into []
+        return broker.fetch_positions(), requested_at
+
+    def _diff(self, broker: str, positions: List[Position], diff: PositionDiff):
+        """Record a refreshed broker's changes and remember its positions"""
+        known = self._known.get(broker, {})
+        current = {position_key(broker, pos): pos for pos in positions}
+        for key, pos in current.items():
+            old = known.get(key)
+            if old is None:
+                diff.opened[key] = pos
+            elif position_changed(old, pos):
+                diff.modified[key] = (old, pos)
+        for key, pos in known.items():
+            if key not in current:
+                diff.closed[key] = pos
+        self._known[broker] = current
+
+    def _pool(self) -> ThreadPoolExecutor:
+        """Polling thread pool (started on first use)"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                        thread_name_prefix='position-monitor')
+        return self._executor
+
+    def close(self):
+        """Stop the polling threads (requests still running are left to finish)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._pending.clear()
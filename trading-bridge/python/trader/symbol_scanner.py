@@ -0,0 +1,427 @@
+"""
+Multi-Symbol Strategy Scanner
+Evaluates SMCStrategy for every configured symbol in parallel and trades the signals
+"""
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from brokers.base_broker import OrderResult
+from market_data.resampler import MultiTimeframeResampler
+from risk.risk_calculator import RiskCalculator
+from strategies.candles import CandleArray
+from strategies.smc_strategy import SMCStrategy
+
+logger = logging.getLogger(__name__)
+
+TIMEFRAMES = ('H1', 'M15', 'M5')
+
+# Rows of a shared candle buffer
+_OPEN, _HIGH, _LOW, _CLOSE, _VOLUME, _HAS_VOLUME, _TIMESTAMP = range(7)
+
+
+def _timestamp_value(timestamp) -> float:
+    """Candle timestamp as a float (datetimes and ISO strings become epoch seconds)"""
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    if isinstance(timestamp, str):
+        return datetime.fromisoformat(timestamp).timestamp()
+    return float(timestamp)
+
+
+def candle_view(data: np.ndarray, length: int) -> CandleArray:
+    """
+    CandleArray over the first `length` candles of a buffer, without copying prices
+
+    Args:
+        data: 7 x capacity float64 buffer (see SharedCandleBuffer)
+        length: Number of candles stored
+
+    Returns:
+        CandleArray whose price and volume columns are views into data
+    """
+    return CandleArray(
+        open=data[_OPEN, :length],
+        high=data[_HIGH, :length],
+        low=data[_LOW, :length],
+        close=data[_CLOSE, :length],
+        volume=data[_VOLUME, :length],
+        timestamp=data[_TIMESTAMP, :length].astype(object),
+        has_volume=data[_HAS_VOLUME, :length] != 0
+    )
+
+
+class SharedCandleBuffer:
+    """
+    Candles for one symbol/timeframe in a shared memory block
+
+    The block holds 7 float64 rows (open, high, low, close, volume,
+    has_volume, timestamp) of `capacity` candles. Worker processes attach to
+    it by name, so a scan task only pickles (name, capacity, length) instead
+    of the candles. Timestamps are stored as floats (datetimes as epoch seconds).
+    """
+
+    ROWS = 7
+
+    def __init__(self, capacity: int = 5000):
+        """
+        Initialize SharedCandleBuffer
+
+        Args:
+            capacity: Most recent candles kept
+        """
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.capacity = capacity
+        self.block = shared_memory.SharedMemory(create=True, size=self.ROWS * capacity * 8)
+        self.data = np.ndarray((self.ROWS, capacity), dtype=np.float64, buffer=self.block.buf)
+        self.length = 0
+
+    @property
+    def name(self) -> str:
+        """Shared memory block name"""
+        return self.block.name
+
+    def descriptor(self) -> Tuple[str, int, int]:
+        """What a worker needs to find the candles: (name, capacity, length)"""
+        return self.block.name, self.capacity, self.length
+
+    def write(self, candles) -> int:
+        """
+        Store the latest candles
+
+        Only candles newer than the last stored one are copied. If that candle
+        is not in `candles` (new history) the buffer is rewritten. When full,
+        the oldest quarter is dropped to make room.
+
+        Args:
+            candles: Closed OHLCV candles in time order (list of dicts or CandleArray)
+
+        Returns:
+            Number of candles written
+        """
+        n = len(candles)
+        start = 0
+        if self.length:
+            last = self.data[_TIMESTAMP, self.length - 1]
+            start = n
+            while start > 0 and _timestamp_value(candles[start - 1]['timestamp']) > last:
+                start -= 1
+            if start == 0 or _timestamp_value(candles[start - 1]['timestamp']) != last:
+                self.length = 0
+                start = 0
+
+        start = max(start, n - self.capacity)
+        new = [candles[i] for i in range(start, n)]
+        k = len(new)
+        if self.length + k > self.capacity:
+            keep = min(self.length, max(0, self.capacity - k - self.capacity // 4))
+            self.data[:, :keep] = self.data[:, self.length - keep:self.length]
+            self.length = keep
+
+        end = self.length + k
+        for row, key in ((_OPEN, 'open'), (_HIGH, 'high'), (_LOW, 'low'), (_CLOSE, 'close')):
+            self.data[row, self.length:end] = [c[key] for c in new]
+        self.data[_VOLUME, self.length:end] = [c.get('volume', 0) for c in new]
+        self.data[_HAS_VOLUME, self.length:end] = ['volume' in c for c in new]
+        self.data[_TIMESTAMP, self.length:end] = [_timestamp_value(c['timestamp']) for c in new]
+        self.length = end
+        return k
+
+    def candles(self) -> CandleArray:
+        """Stored candles as a CandleArray (views into the shared block)"""
+        return candle_view(self.data, self.length)
+
+    def close(self):
+        """Release and remove the shared memory block"""
+        self.data = None
+        self.block.close()
+        try:
+            self.block.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _evaluate(strategy: SMCStrategy, symbol: str, broker: str,
+              frames: Dict[str, CandleArray]) -> Optional[Dict]:
+    """Run the entry signal calculation for one symbol@broker"""
+    return strategy.calculate_entry_signal(symbol, frames['H1'], frames['M15'], frames['M5'], series=broker)
+
+
+# Per-process state of pool workers: strategies by (config, broker), attached blocks by name
+_worker_strategies: Dict[Tuple, SMCStrategy] = {}
+_worker_blocks: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+def _worker_evaluate(task: Tuple) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Evaluate one symbol in a pool worker process
+
+    Strategies are kept per broker for the life of the worker, so their
+    structure trackers and indicators only process bars closed since the
+    worker last saw the symbol.
+
+    Args:
+        task: (symbol, broker, strategy config path, {timeframe: (name, capacity, length)})
+
+    Returns:
+        (signal or None, error message or None)
+    """
+    symbol, broker, config_path, descriptors = task
+    try:
+        strategy = _worker_strategies.get((config_path, broker))
+        if strategy is None:
+            strategy = _worker_strategies[(config_path, broker)] = SMCStrategy(config_path)
+        frames = {}
+        for timeframe, (name, capacity, length) in descriptors.items():
+            attached = _worker_blocks.get(name)
+            if attached is None:
+                block = shared_memory.SharedMemory(name=name)
+                data = np.ndarray((SharedCandleBuffer.ROWS, capacity), dtype=np.float64, buffer=block.buf)
+                attached = _worker_blocks[name] = (block, data)
+            frames[timeframe] = candle_view(attached[1], length)
+        return _evaluate(strategy, symbol, broker, frames), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+class SymbolScanner:
+    """
+    Evaluates SMCStrategy across every symbol of a MultiSymbolTrader in parallel
+
+    Candles are pushed with update_candles() (between scans) into one
+    SharedCandleBuffer per symbol/timeframe, or only the M5 (or M1) candles
+    are pushed with update_base_candles() and the other timeframes are
+    resampled from them. scan() fans calculate_entry_signal out over a
+    process pool (workers attach to the buffers, nothing is pickled but the
+    buffer names) or a thread pool, then sizes each signal with
+    RiskCalculator and sends it through MultiSymbolTrader.execute_trade.
+    """
+
+    def __init__(self, trader, workers: Optional[int] = None, use_processes: bool = True,
+                 capacity: int = 5000, strategy_config: Optional[str] = None,
+                 risk_calculator: Optional[RiskCalculator] = None, tp_ratio: float = 2.0):
+        """
+        Initialize SymbolScanner
+
+        Args:
+            trader: MultiSymbolTrader whose symbols are scanned and traded
+            workers: Pool size (default: CPU count; 0 = evaluate in the calling thread)
+            use_processes: Process pool (True) or thread pool (False)
+            capacity: Candles kept per symbol/timeframe
+            strategy_config: SMCStrategy config path
+            risk_calculator: RiskCalculator for lot size and take profit
+            tp_ratio: Risk-reward ratio when a signal has no take profit
+        """
+        self.trader = trader
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.use_processes = use_processes
+        self.capacity = capacity
+        self.strategy_config = strategy_config
+        self.risk_calculator = risk_calculator or RiskCalculator()
+        self.tp_ratio = tp_ratio
+        self._buffers: Dict[Tuple[str, str], SharedCandleBuffer] = {}
+        self._strategies: Dict[str, SMCStrategy] = {}  # thread/inline evaluation, by broker
+        self._resamplers: Dict[str, MultiTimeframeResampler] = {}
+        self._executor: Optional[Executor] = None
+        self.last_scan: Dict = {}
+
+    def update_candles(self, symbol: str, broker: str, timeframe: str, candles) -> int:
+        """
+        Store the latest closed candles of one symbol/timeframe
+
+        Args:
+            symbol: Trading symbol
+            broker: Broker name
+            timeframe: 'H1', 'M15' or 'M5'
+            candles: Closed OHLCV candles in time order
+
+        Returns:
+            Number of new candles stored
+        """
+        if timeframe not in TIMEFRAMES:
+            raise ValueError(f"Unsupported timeframe {timeframe} (expected one of {TIMEFRAMES})")
+        key = (f"{symbol}@{broker}", timeframe)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = SharedCandleBuffer(self.capacity)
+        return buffer.write(candles)
+
+    def update_base_candles(self, symbol: str, broker: str, candles, timeframe: str = 'M5') -> int:
+        """
+        Store the latest closed candles of the lowest timeframe and derive the others
+
+        M15 and H1 (and M5 from M1) candles are built incrementally from this
+        stream, so only one timeframe has to be fetched per symbol and all
+        three stay consistent with each other.
+
+        Args:
+            symbol: Trading symbol
+            broker: Broker name
+            candles: Closed 'M5' or 'M1' candles in time order (windows may overlap)
+            timeframe: Timeframe of candles
+
+        Returns:
+            Number of new base candles
+        """
+        key = f"{symbol}@{broker}"
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            if timeframe not in ('M1', 'M5'):
+                raise ValueError(f"Base timeframe must be M1 or M5, not {timeframe}")
+            resampler = self._resamplers[key] = MultiTimeframeResampler(timeframe, TIMEFRAMES, self.capacity)
+        elif timeframe != resampler.base_timeframe:
+            raise ValueError(f"{key} is resampled from {resampler.base_timeframe}, not {timeframe}")
+
+        added = resampler.sync(candles)
+        if added:
+            for tf in TIMEFRAMES:
+                closed = resampler.candles(tf)
+                if closed:
+                    self.update_candles(symbol, broker, tf, closed)
+        return added
+
+    def scan(self, account_balance: Optional[float] = None, execute: bool = True) -> List[Dict]:
+        """
+        Evaluate every enabled symbol and trade the signals
+
+        Args:
+            account_balance: Balance for position sizing (default: each broker's account balance)
+            execute: Send signals to execute_trade (False = only return them)
+
+        Returns:
+            List of {'symbol_key', 'signal', 'result'} for every signal found
+        """
+        start = time.perf_counter()
+        keys, tasks = [], []
+        for symbol_key in sorted(self.trader.symbols):
+            config = self.trader.symbol_configs.get(symbol_key, {})
+            buffers = [self._buffers.get((symbol_key, tf)) for tf in TIMEFRAMES]
+            if not config.get('enabled', True) or any(b is None or not b.length for b in buffers):
+                continue
+            keys.append(symbol_key)
+            tasks.append((config['symbol'], config['broker'], self.strategy_config,
+                          {tf: b.descriptor() for tf, b in zip(TIMEFRAMES, buffers)}))
+
+        outcomes = self._run(tasks)
+        evaluated = time.perf_counter()
+
+        found = []
+        balances: Dict[str, Optional[float]] = {}
+        for symbol_key, (signal, error) in zip(keys, outcomes):
+            if error:
+                logger.error(f"Evaluation failed for {symbol_key}: {error}")
+            if not signal:
+                continue
+            result = self._execute(symbol_key, signal, account_balance, balances) if execute else None
+            found.append({'symbol_key': symbol_key, 'signal': signal, 'result': result})
+
+        self.last_scan = {
+            'symbols': len(tasks),
+            'signals': len(found),
+            'errors': sum(1 for _, error in outcomes if error),
+            'evaluate_ms': (evaluated - start) * 1e3,
+            'total_ms': (time.perf_counter() - start) * 1e3
+        }
+        return found
+
+    def _run(self, tasks: List[Tuple]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+        """Evaluate tasks on the pool (or inline)"""
+        if not tasks:
+            return []
+        if self.workers == 0:
+            return [self._local_evaluate(task) for task in tasks]
+        if self._executor is None:
+            if self.use_processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='symbol-scanner')
+        if self.use_processes:
+            chunksize = max(1, len(tasks) // (self.workers * 4))
+            return list(self._executor.map(_worker_evaluate, tasks, chunksize=chunksize))
+        return list(self._executor.map(self._local_evaluate, tasks))
+
+    def _local_evaluate(self, task: Tuple) -> Tuple[Optional[Dict], Optional[str]]:
+        """Evaluate one symbol in this process, reading the buffers directly"""
+        symbol, broker, config_path, descriptors = task
+        try:
+            strategy = self._strategies.get(broker)
+            if strategy is None:
+                strategy = self._strategies[broker] = SMCStrategy(config_path)
+            frames = {tf: self._buffers[(f"{symbol}@{broker}", tf)].candles() for tf in descriptors}
+            return _evaluate(strategy, symbol, broker, frames), None
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}"
+
+    def _execute(self, symbol_key: str, signal: Dict, account_balance: Optional[float],
+                 balances: Dict[str, Optional[float]]) -> OrderResult:
+        """Size a signal and send it through MultiSymbolTrader.execute_trade"""
+        config = self.trader.symbol_configs[symbol_key]
+        symbol, broker = config['symbol'], config['broker']
+
+        balance = account_balance
+        if balance is None:
+            if broker not in balances:
+                balances[broker] = None
+                broker_instance = self.trader.brokers.get(broker)
+                if broker_instance:
+                    try:
+                        balances[broker] = broker_instance.get_account_info().balance
+                    except Exception as e:
+                        logger.error(f"Account info failed for {broker}: {e}")
+            balance = balances[broker]
+        if not balance:
+            return OrderResult(
+                success=False,
+                message=f"No account balance for {broker}",
+                error_code="NO_ACCOUNT_BALANCE"
+            )
+
+        entry, stop_loss, direction = signal['entry_price'], signal['stop_loss'], signal['direction']
+        take_profit = signal.get('take_profit') or self.risk_calculator.calculate_take_profit(
+            entry, stop_loss, direction, self.tp_ratio)
+        sizing = self.risk_calculator.calculate_position_sizing(
+            symbol, balance, config.get('risk_percent', 1.0), entry, stop_loss, take_profit,
+            config.get('min_lot_size', 0.01), config.get('max_lot_size', 10.0))
+
+        return self.trader.execute_trade(
+            symbol=symbol,
+            broker=broker,
+            action=direction,
+            lot_size=sizing.lot_size,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
+            comment="SMC scanner"
+        )
+
+    def get_stats(self) -> Dict:
+        """Get scanner statistics"""
+        return {
+            'workers': self.workers,
+            'mode': 'process' if self.use_processes else 'thread',
+            'buffers': len(self._buffers),
+            'last_scan': self.last_scan
+        }
+
+    def close(self):
+        """Stop the pool and release the shared candle buffers"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        for buffer in self._buffers.values():
+            buffer.close()
+        self._buffers.clear()
+        self._resamplers.clear()
+
+    def __enter__(self) -> 'SymbolScanner':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
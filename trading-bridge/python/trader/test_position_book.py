@@ -0,0 +1,163 @@
+"""
+Position Book Test Script
+Checks position indexes, net exposure and reconciliation against broker position polls
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brokers.base_broker import Position
+from brokers.test_http_client import SECRET, make_api, serve_fake_bitget
+from trader.multi_symbol_trader import MultiSymbolTrader
+from trader.position_book import PositionBook
+from trader.test_position_monitor import SlowBroker, make_position
+from trader.test_symbol_scanner import FakeBroker
+
+
+def test_indexes():
+    """Counts, exposure and order lookups follow adds and removals"""
+    print("\n=== Testing position indexes ===")
+
+    book = PositionBook()
+    book.add("EURUSD@EXNESS", "1", "BUY", 0.3)
+    book.add("EURUSD@EXNESS", "2", "SELL", 0.1)
+    book.add("EURUSD@EXNESS2", "1", "BUY", 1.0)  # shares a prefix with EURUSD@EXNESS
+    book.add("GBPUSD@EXNESS", "3", "SELL", 0.5)
+
+    assert len(book) == 4 and "EURUSD@EXNESS_2" in book
+    assert book.count("EURUSD@EXNESS") == 2 and book.count("EURUSD@EXNESS2") == 1
+    assert book.count("USDJPY@EXNESS") == 0 and book.count_broker("EXNESS") == 3
+    assert book.net_exposure("EURUSD", "EXNESS") == 0.2
+    assert book.net_exposure("EURUSD") == 1.2 and book.net_exposure("GBPUSD") == -0.5
+    assert book.find_order("EXNESS2", "1")['volume'] == 1.0 and book.find_order("EXNESS2", "2") is None
+    assert sorted(e['order_id'] for e in book.positions("EURUSD@EXNESS")) == ["1", "2"]
+    assert len(book.positions(broker="EXNESS")) == 3
+
+    assert book.remove("EURUSD@EXNESS_1")['type'] == "BUY" and book.remove("EURUSD@EXNESS_1") is None
+    assert book.count("EURUSD@EXNESS") == 1 and book.net_exposure("EURUSD", "EXNESS") == -0.1
+    book.remove("EURUSD@EXNESS_2")
+    assert book.count("EURUSD@EXNESS") == 0 and book.net_exposure("EURUSD", "EXNESS") == 0.0
+    assert book.find_order("EXNESS", "1") is None and book.net_exposure("EURUSD") == 1.0
+    print("✓ Counts, net exposure and order ids indexed")
+
+
+def test_reconcile():
+    """The broker's list wins, except for orders placed after it was requested"""
+    print("\n=== Testing reconciliation ===")
+
+    book = PositionBook()
+    book.add("EURUSD@EXNESS", "11", "BUY", 0.1)
+    book.add("EURUSD@EXNESS", "12", "BUY", 0.1)
+    book.add("GBPUSD@BITGET", "o-1", "SELL", 0.2)
+    requested_at = time.time()
+    book.add("EURUSD@EXNESS", "13", "BUY", 0.1)  # placed while the poll was in flight
+
+    # Ticket 11 is still open (partially closed), 12 was closed, 14 was opened outside the trader
+    result = book.reconcile("EXNESS", [make_position("EURUSD", "11", volume=0.05),
+                                       make_position("EURUSD", "14", volume=0.2)], requested_at)
+    assert result == {'added': ["EURUSD@EXNESS_14"], 'updated': ["EURUSD@EXNESS_11"],
+                      'removed': ["EURUSD@EXNESS_12"]}
+    assert book.count("EURUSD@EXNESS") == 3 and "EURUSD@EXNESS_13" in book
+    assert book["EURUSD@EXNESS_11"]['volume'] == 0.05 and book.net_exposure("EURUSD") == 0.35
+    assert book.find_order("EXNESS", "11")['position_id'] == "11"
+    assert book.count_broker("BITGET") == 1  # other brokers untouched
+
+    # The next poll includes ticket 13; BITGET reports its own position id for the order
+    book.reconcile("EXNESS", [make_position("EURUSD", "13")])
+    assert book.count("EURUSD@EXNESS") == 1 and book.net_exposure("EURUSD", "EXNESS") == 0.1
+    netting = Position("GBPUSD", 0.2, "SELL", 1.27, 1.26, 2.0, 0.0, 0.0)
+    book.reconcile("BITGET", [netting])
+    assert list(book) == ["EURUSD@EXNESS_13", "GBPUSD@BITGET_SELL"]
+    assert book.net_exposure("GBPUSD") == -0.2 and book["GBPUSD@BITGET_SELL"]['profit'] == 2.0
+    print("✓ Reconciled against the broker's positions")
+
+
+def test_trader_position_limits():
+    """execute_trade checks limits through the book; polls reconcile it"""
+    print("\n=== Testing MultiSymbolTrader position book ===")
+
+    broker = SlowBroker()
+    trader = MultiSymbolTrader(broker_manager={"FAKE": broker, "FAKE2": FakeBroker()})
+    trader.add_symbol("EURUSD", "FAKE", {'max_positions': 2})
+    trader.add_symbol("EURUSD", "FAKE2", {'max_positions': 1})
+    try:
+        assert trader.execute_trade("EURUSD", "FAKE2", "SELL", 0.5).success
+        assert trader.execute_trade("EURUSD", "FAKE", "BUY", 0.1).success  # not counted against FAKE2
+        assert trader.execute_trade("EURUSD", "FAKE", "BUY", 0.2).success
+        blocked = trader.execute_trade("EURUSD", "FAKE", "BUY", 0.1)
+        assert blocked.error_code == "MAX_POSITIONS_REACHED"
+        assert trader.get_net_exposure("EURUSD", "FAKE") == 0.3
+        assert round(trader.get_net_exposure("EURUSD"), 8) == -0.2
+
+        # The broker reports only order 1 (ticket ids match order ids): order 2 was closed
+        broker.positions = [make_position("EURUSD", "1")]
+        trader.monitor_positions()
+        assert trader._count_positions("EURUSD@FAKE") == 1
+        assert trader._count_positions("EURUSD@FAKE2") == 0  # FAKE2 reports no positions
+        assert trader.execute_trade("EURUSD", "FAKE", "BUY", 0.1).success
+    finally:
+        trader.close()
+    print("✓ Limits enforced per symbol@broker, closed positions released")
+
+
+def test_failed_poll_keeps_positions():
+    """A broker answering with an error leaves its tracked positions (and limits) in place"""
+    print("\n=== Testing failed polls ===")
+
+    server = serve_fake_bitget()
+    api = make_api(server.url)
+    trader = MultiSymbolTrader(broker_manager={"BITGET": api})
+    trader.add_symbol("BTCUSDT", "BITGET", {'max_positions': 1, 'max_lot_size': 1.0})
+    try:
+        trader.monitor_positions()
+        assert list(trader.active_positions) == ["BTCUSDT@BITGET_p1"]
+
+        api.api_secret = "wrong"  # error response body, get_positions() returns []
+        assert api.get_positions() == []
+        positions = trader.monitor_positions()
+        assert [p.position_id for p in positions["BITGET"]] == ["p1"]
+        assert trader.last_position_snapshot.stale_brokers() == ["BITGET"]
+        assert trader._count_positions("BTCUSDT@BITGET") == 1
+        blocked = trader.execute_trade("BTCUSDT", "BITGET", "BUY", 0.1)
+        assert blocked.error_code == "MAX_POSITIONS_REACHED"
+
+        api.api_secret = SECRET
+        assert trader.poll_positions().complete
+        assert list(trader.active_positions) == ["BTCUSDT@BITGET_p1"]
+    finally:
+        trader.close()
+        api.close()
+        server.shutdown()
+        server.server_close()
+    print("✓ Error responses never release position limits")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Position Book Test Suite")
+    print("=" * 50)
+
+    try:
+        test_indexes()
+        test_reconcile()
+        test_trader_position_limits()
+        test_failed_poll_keeps_positions()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
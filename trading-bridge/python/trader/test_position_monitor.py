@@ -0,0 +1,227 @@
+"""
+Position Monitor Test Script
+Checks concurrent polling, per-broker timeouts, staleness markers and position diffs
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brokers.base_broker import Position
+from brokers.test_http_client import SECRET, make_api, serve_fake_bitget
+from trader.multi_symbol_trader import MultiSymbolTrader
+from trader.position_monitor import PositionMonitor, position_key
+from trader.test_symbol_scanner import FakeBroker
+
+
+def make_position(symbol: str, position_id: str, volume: float = 0.1, profit: float = 0.0) -> Position:
+    """Open BUY position"""
+    return Position(symbol=symbol, volume=volume, type="BUY", open_price=1.1, current_price=1.1,
+                    profit=profit, swap=0.0, commission=0.0, position_id=position_id)
+
+
+class SlowBroker(FakeBroker):
+    """Fake broker answering get_positions() after a delay, or failing"""
+
+    def __init__(self, delay: float = 0.0, positions: Optional[List[Position]] = None):
+        super().__init__()
+        self.delay = delay
+        self.positions = positions or []
+        self.error: Optional[Exception] = None
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        self.calls += 1
+        time.sleep(self.delay)
+        self.release.wait()
+        if self.error:
+            raise self.error
+        return list(self.positions)
+
+
+def test_concurrent_poll():
+    """Brokers are queried in parallel: a poll takes the slowest broker's time, not the sum"""
+    print("\n=== Testing concurrent polling ===")
+
+    brokers = {f"B{i}": SlowBroker(0.2, [make_position("EURUSD", str(i))]) for i in range(4)}
+    monitor = PositionMonitor(brokers, timeout=1.0)
+    try:
+        start = time.monotonic()
+        snapshot = monitor.poll()
+        elapsed = time.monotonic() - start
+        assert elapsed < 0.4, elapsed
+        assert snapshot.complete and snapshot.stale_brokers() == []
+        assert {name: len(p) for name, p in snapshot.positions().items()} == {f"B{i}": 1 for i in range(4)}
+        assert all(entry.age() < 1.0 for entry in snapshot.brokers.values())
+    finally:
+        monitor.close()
+    print(f"✓ 4 brokers x 200 ms polled in {elapsed * 1000:.0f} ms")
+
+
+def test_timeouts_and_staleness():
+    """A slow broker is marked stale with its last known positions, then catches up"""
+    print("\n=== Testing per-broker timeouts ===")
+
+    fast = SlowBroker(positions=[make_position("EURUSD", "1")])
+    slow = SlowBroker(positions=[make_position("BTCUSDT", "7")])
+    monitor = PositionMonitor({"FAST": fast, "SLOW": slow}, timeout=1.0, timeouts={"SLOW": 0.1})
+    try:
+        first = monitor.poll()
+        assert first.complete and first.brokers["SLOW"].fetched_at is not None
+
+        slow.release.clear()
+        start = time.monotonic()
+        second = monitor.poll()
+        assert time.monotonic() - start < 0.3
+        entry = second.brokers["SLOW"]
+        assert second.stale_brokers() == ["SLOW"] and not second.complete
+        assert entry.positions == first.brokers["SLOW"].positions
+        assert entry.fetched_at == first.brokers["SLOW"].fetched_at and "timed out" in entry.error
+        assert not second.brokers["FAST"].stale
+
+        # The request still running is reused rather than sent again
+        third = monitor.poll(timeout=0.05)
+        assert third.brokers["SLOW"].stale and slow.calls == 2
+        slow.release.set()
+        time.sleep(0.05)
+        fourth = monitor.poll()
+        assert fourth.complete and slow.calls == 2
+        assert fourth.brokers["SLOW"].fetched_at > first.brokers["SLOW"].fetched_at
+
+        slow.error = ConnectionError("connection reset")
+        failed = monitor.poll()
+        assert failed.brokers["SLOW"].stale and failed.brokers["SLOW"].error == "connection reset"
+        assert failed.brokers["SLOW"].positions == fourth.brokers["SLOW"].positions
+        assert not failed.diff
+    finally:
+        slow.release.set()
+        monitor.close()
+    print("✓ Stale brokers keep their last positions and fetch time")
+
+
+def test_error_responses():
+    """A broker answering with an error is stale, not a broker whose positions all closed"""
+    print("\n=== Testing broker error responses ===")
+
+    server = serve_fake_bitget()
+    api = make_api(server.url)
+    monitor = PositionMonitor({"BITGET": api}, timeout=1.0)
+    try:
+        first = monitor.poll()
+        assert list(first.diff.opened) == ["BTCUSDT@BITGET_p1"]
+
+        api.api_secret = "wrong"  # every request now gets a 401 error body
+        assert api.get_positions() == []
+        failed = monitor.poll()
+        entry = failed.brokers["BITGET"]
+        assert entry.stale and entry.error == "40009: sign signature error"
+        assert [p.position_id for p in entry.positions] == ["p1"] and not failed.diff
+
+        api.api_secret = SECRET
+        assert monitor.poll().complete and not monitor.poll().diff
+    finally:
+        monitor.close()
+        api.close()
+        server.shutdown()
+        server.server_close()
+    print("✓ Error responses keep the last known positions")
+
+
+def test_diff():
+    """Opened, closed and resized positions are reported once; price updates are not changes"""
+    print("\n=== Testing position diffs ===")
+
+    broker = SlowBroker(positions=[make_position("EURUSD", "1"), make_position("GBPUSD", "2")])
+    other = SlowBroker(positions=[make_position("XAUUSD", "9")])
+    monitor = PositionMonitor({"FAKE": broker, "OTHER": other}, timeout=0.1)
+    try:
+        diff = monitor.poll().diff
+        assert sorted(diff.opened) == ["EURUSD@FAKE_1", "GBPUSD@FAKE_2", "XAUUSD@OTHER_9"]
+        assert not diff.closed and not diff.modified
+        assert not monitor.poll().diff
+
+        broker.positions = [make_position("EURUSD", "1", profit=12.5),
+                            make_position("GBPUSD", "2", volume=0.05),
+                            make_position("USDJPY", "3")]
+        diff = monitor.poll().diff
+        assert list(diff.opened) == ["USDJPY@FAKE_3"]
+        assert list(diff.modified) == ["GBPUSD@FAKE_2"]
+        old, new = diff.modified["GBPUSD@FAKE_2"]
+        assert (old.volume, new.volume) == (0.1, 0.05)
+
+        broker.positions = broker.positions[1:]
+        other.release.clear()
+        diff = monitor.poll().diff
+        assert list(diff.closed) == ["EURUSD@FAKE_1"]  # OTHER timed out: its position is not closed
+        other.positions = []  # closed while the request was in flight
+        other.release.set()
+        time.sleep(0.05)
+        diff = monitor.poll().diff
+        assert list(diff.closed) == ["XAUUSD@OTHER_9"] and not diff.opened
+
+        netting = Position("EURUSD", 1.0, "SELL", 1.1, 1.1, 0.0, 0.0, 0.0)
+        assert position_key("FAKE", netting) == "EURUSD@FAKE_SELL"
+    finally:
+        other.release.set()
+        monitor.close()
+    print("✓ Diffs report opened, closed and modified positions")
+
+
+def test_trader_monitor_positions():
+    """MultiSymbolTrader keeps its return shape and tracks refreshed positions"""
+    print("\n=== Testing MultiSymbolTrader.monitor_positions ===")
+
+    fast = SlowBroker(positions=[make_position("EURUSD", "1")])
+    slow = SlowBroker(0.3, [make_position("GBPUSD", "2")])
+    trader = MultiSymbolTrader(broker_manager={"FAST": fast, "SLOW": slow},
+                               monitor_timeouts={"SLOW": 0.05})
+    try:
+        start = time.monotonic()
+        positions = trader.monitor_positions()
+        assert time.monotonic() - start < 0.2
+        assert [p.position_id for p in positions["FAST"]] == ["1"] and positions["SLOW"] == []
+        assert "EURUSD@FAST_1" in trader.active_positions
+        assert trader.last_position_snapshot.stale_brokers() == ["SLOW"]
+
+        time.sleep(0.3)
+        snapshot = trader.poll_positions()
+        assert snapshot.complete and list(snapshot.diff.opened) == ["GBPUSD@SLOW_2"]
+        assert trader.active_positions["GBPUSD@SLOW_2"]['volume'] == 0.1
+    finally:
+        trader.close()
+    print("✓ Slow brokers no longer delay the others")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Position Monitor Test Suite")
+    print("=" * 50)
+
+    try:
+        test_concurrent_poll()
+        test_timeouts_and_staleness()
+        test_error_responses()
+        test_diff()
+        test_trader_monitor_positions()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
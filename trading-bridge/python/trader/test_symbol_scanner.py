@@ -0,0 +1,238 @@
+"""
+Symbol Scanner Test Script
+Checks shared candle buffers and parallel strategy evaluation
+"""
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backtest import TimeframeAggregator
+from brokers.base_broker import AccountInfo, BaseBroker, BrokerConfig, OrderResult, Position
+from strategies.candles import CandleArray
+from strategies.smc_strategy import SMCStrategy
+from strategies.test_smc_vectorized import make_candles
+from trader.multi_symbol_trader import MultiSymbolTrader
+from trader.symbol_scanner import SharedCandleBuffer, SymbolScanner
+
+
+SYMBOLS = ('EURUSD', 'GBPUSD', 'USDJPY', 'AUDUSD', 'XAUUSD', 'USDCAD')
+
+
+class FakeBroker(BaseBroker):
+    """Broker that records orders instead of sending them"""
+
+    def __init__(self):
+        super().__init__(BrokerConfig(name="FAKE", api_url="", account_id="1"))
+        self.orders = []
+
+    def place_order(self, symbol: str, action: str, lot_size: float,
+                    stop_loss: Optional[float] = None,
+                    take_profit: Optional[float] = None,
+                    comment: str = "") -> OrderResult:
+        self.orders.append((symbol, action, lot_size, stop_loss, take_profit))
+        return OrderResult(success=True, order_id=str(len(self.orders)))
+
+    def get_account_info(self) -> AccountInfo:
+        return AccountInfo(balance=10000.0, equity=10000.0, margin=0.0,
+                           free_margin=10000.0, margin_level=0.0)
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        return []
+
+    def close_position(self, position_id: str) -> OrderResult:
+        return OrderResult(success=True)
+
+    def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
+                        take_profit: Optional[float] = None) -> OrderResult:
+        return OrderResult(success=True)
+
+
+def make_trader() -> MultiSymbolTrader:
+    """Trader with SYMBOLS on the fake broker"""
+    trader = MultiSymbolTrader(broker_manager={"FAKE": FakeBroker()})
+    for symbol in SYMBOLS:
+        trader.add_symbol(symbol, "FAKE", {'max_positions': 100})
+    return trader
+
+
+def market_data() -> dict:
+    """H1/M15/M5 candles per symbol"""
+    return {
+        symbol: {
+            'H1': make_candles(600, 10 + i),
+            'M15': make_candles(600, 30 + i),
+            'M5': make_candles(600, 50 + i)
+        }
+        for i, symbol in enumerate(SYMBOLS)
+    }
+
+
+def without_timestamp(signal: dict) -> dict:
+    """Signal minus its creation time"""
+    return {k: v for k, v in signal.items() if k != 'timestamp'}
+
+
+def test_shared_buffer():
+    """Buffers append new candles, rewrite on new history and drop the oldest when full"""
+    print("\n=== Testing SharedCandleBuffer ===")
+
+    candles = make_candles(1000, 1, volume="some")
+    buffer = SharedCandleBuffer(capacity=400)
+    try:
+        assert buffer.write(candles[:100]) == 100
+        assert buffer.write(candles[:130]) == 30
+        assert buffer.write(candles[:130]) == 0
+        expected = CandleArray.from_dicts(candles[:130])
+        stored = buffer.candles()
+        for column in ('open', 'high', 'low', 'close', 'volume', 'has_volume'):
+            assert (getattr(stored, column) == getattr(expected, column)).all(), column
+        assert stored.timestamp.tolist() == [c['timestamp'].timestamp() for c in candles[:130]]
+        assert stored.close.base is not None  # a view into the shared block, not a copy
+
+        for end in range(131, 1001, 37):
+            buffer.write(candles[:end])
+        buffer.write(candles)
+        assert 300 <= buffer.length <= 400
+        assert buffer.candles().close.tolist() == [c['close'] for c in candles[-buffer.length:]]
+
+        other = make_candles(50, 2)
+        assert buffer.write(other) == 50 and buffer.length == 50
+    finally:
+        buffer.close()
+    print("✓ Buffers append, rewrite and roll over")
+
+
+def _scan_all(scanner: SymbolScanner, data: dict) -> list:
+    """Push growing histories and scan after each step"""
+    found = []
+    for end in range(200, 601, 40):
+        for symbol, frames in data.items():
+            for timeframe, candles in frames.items():
+                scanner.update_candles(symbol, "FAKE", timeframe, candles[:end])
+        found.append(scanner.scan())
+    return found
+
+
+def test_scan_matches_direct_evaluation():
+    """Inline, thread and process scans give the signals a direct evaluation gives"""
+    print("\n=== Testing scan modes ===")
+
+    data = market_data()
+    expected = []
+    for end in range(200, 601, 40):
+        step = {}
+        for symbol in sorted(SYMBOLS):
+            frames = data[symbol]
+            signal = SMCStrategy().calculate_entry_signal(
+                symbol, frames['H1'][:end], frames['M15'][:end], frames['M5'][:end])
+            if signal:
+                step[f"{symbol}@FAKE"] = without_timestamp(signal)
+        expected.append(step)
+    assert sum(len(step) for step in expected) > 0
+
+    for workers, use_processes in ((0, False), (3, False), (2, True)):
+        trader = make_trader()
+        with SymbolScanner(trader, workers=workers, use_processes=use_processes) as scanner:
+            scans = _scan_all(scanner, data)
+            assert scanner.last_scan['symbols'] == len(SYMBOLS)
+            assert scanner.last_scan['errors'] == 0
+        got = [{f['symbol_key']: without_timestamp(f['signal']) for f in scan} for scan in scans]
+        assert got == expected, f"workers={workers} processes={use_processes}"
+        assert all(f['result'].success for scan in scans for f in scan)
+        orders = trader.brokers["FAKE"].orders
+        assert len(orders) == sum(len(step) for step in expected)
+        assert all(lot >= 0.01 and sl is not None and tp is not None for _, _, lot, sl, tp in orders)
+    print(f"✓ All modes match ({sum(len(step) for step in expected)} signals traded)")
+
+
+def test_scan_skips_and_limits():
+    """Symbols without data or disabled are skipped; execute=False only reports"""
+    print("\n=== Testing scan filters ===")
+
+    data = market_data()
+    trader = make_trader()
+    trader.disable_symbol('GBPUSD', 'FAKE')
+    with SymbolScanner(trader, workers=0) as scanner:
+        for symbol, frames in data.items():
+            if symbol == 'EURUSD':
+                continue
+            for timeframe, candles in frames.items():
+                scanner.update_candles(symbol, "FAKE", timeframe, candles)
+        found = scanner.scan(execute=False)
+        assert scanner.last_scan['symbols'] == len(SYMBOLS) - 2
+        assert all(f['result'] is None for f in found)
+        assert not trader.brokers["FAKE"].orders
+        try:
+            scanner.update_candles('EURUSD', 'FAKE', 'D1', data['EURUSD']['H1'])
+            raise AssertionError("Unsupported timeframe must be rejected")
+        except ValueError:
+            pass
+    print("✓ Disabled and incomplete symbols are skipped")
+
+
+def test_base_candles():
+    """Scanning M5-only updates gives the signals of H1/M15 aggregated from the same M5"""
+    print("\n=== Testing M5-only updates ===")
+
+    m5 = {symbol: make_candles(4800, 70 + i) for i, symbol in enumerate(SYMBOLS)}
+    steps = range(3600, 4801, 60)
+    expected = []
+    for end in steps:
+        step = {}
+        for symbol in sorted(SYMBOLS):
+            m15, h1 = TimeframeAggregator(15), TimeframeAggregator(60)
+            frames = {'M15': [], 'H1': []}
+            for bar in m5[symbol][:end]:
+                frames['M15'].extend(m15.update(bar))
+                frames['H1'].extend(h1.update(bar))
+            signal = SMCStrategy().calculate_entry_signal(symbol, frames['H1'], frames['M15'], m5[symbol][:end])
+            if signal:
+                step[f"{symbol}@FAKE"] = without_timestamp(signal)
+        expected.append(step)
+    assert sum(len(step) for step in expected) > 0
+
+    with SymbolScanner(make_trader(), workers=0) as scanner:
+        got = []
+        for end in steps:
+            for symbol in SYMBOLS:
+                assert scanner.update_base_candles(symbol, "FAKE", m5[symbol][max(0, end - 3000):end]) > 0
+            got.append({f['symbol_key']: without_timestamp(f['signal']) for f in scanner.scan(execute=False)})
+        assert scanner.update_base_candles('EURUSD', 'FAKE', m5['EURUSD'][:end]) == 0
+        try:
+            scanner.update_base_candles('EURUSD', 'FAKE', m5['EURUSD'], timeframe='M1')
+            raise AssertionError("Changing the base timeframe must be rejected")
+        except ValueError:
+            pass
+    assert got == expected
+    print(f"✓ {sum(len(step) for step in expected)} signals from one fetched timeframe")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 50)
+    print("Symbol Scanner Test Suite")
+    print("=" * 50)
+
+    try:
+        test_shared_buffer()
+        test_scan_matches_direct_evaluation()
+        test_scan_skips_and_limits()
+        test_base_candles()
+
+        print("\n" + "=" * 50)
+        print("✓ All tests passed!")
+        print("=" * 50)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())